@@ -0,0 +1 @@
+"""Benchmark suite for the calculation core and API hot paths (see harness.py)."""
@@ -0,0 +1,112 @@
+"""
+Run the benchmark suite.
+
+Usage:
+  python -m benchmarks                       # run everything, print a table
+  python -m benchmarks -k changes            # only cases matching "changes"
+  python -m benchmarks -k api                # one group (core, api, stream)
+  python -m benchmarks --save local          # store as baselines/local.json
+  python -m benchmarks --compare local       # compare; exit 1 on regression
+  python -m benchmarks --json out.json       # machine-readable results
+
+Run with PYTHONPATH=./src:. (make bench does this). Keep Numba JIT enabled;
+NUMBA_DISABLE_JIT=1 measures the interpreter fallback instead. The service
+file cache goes to a throwaway VEDACORE_CACHE_DIR unless one is set.
+"""
+
+from __future__ import annotations
+
+import argparse
+import atexit
+import json
+import os
+import shutil
+import sys
+import tempfile
+import traceback
+
+from dataclasses import asdict
+
+if "VEDACORE_CACHE_DIR" not in os.environ:
+    _cache_dir = tempfile.mkdtemp(prefix="vc-bench-cache-")
+    atexit.register(shutil.rmtree, _cache_dir, ignore_errors=True)
+    os.environ["VEDACORE_CACHE_DIR"] = _cache_dir
+
+from benchmarks import cases  # noqa: F401  (registers cases)
+from benchmarks.harness import (
+    DEFAULT_THRESHOLD,
+    compare,
+    format_seconds,
+    load_baseline,
+    machine_info,
+    registered,
+    run_case,
+    save_baseline,
+)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("-k", dest="pattern", help="substring of case name, or a group name")
+    parser.add_argument("--rounds", type=int, help="override rounds per case")
+    parser.add_argument("--list", action="store_true", help="list cases and exit")
+    parser.add_argument("--save", metavar="NAME", help="save results as baseline NAME")
+    parser.add_argument("--compare", metavar="NAME", help="compare against baseline NAME")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help=f"relative median slowdown counted as regression (default {DEFAULT_THRESHOLD})")
+    parser.add_argument("--json", metavar="PATH", help="write results to PATH")
+    args = parser.parse_args(argv)
+
+    selected = registered(args.pattern)
+    if args.list:
+        for case in selected:
+            print(f"{case.group:8} {case.name}")
+        return 0
+    if not selected:
+        print(f"No benchmark matches {args.pattern!r}", file=sys.stderr)
+        return 2
+
+    results = []
+    failed = []
+    print(f"{'case':32} {'median':>12} {'p95':>12} {'min':>12} {'ops/s':>12}")
+    for case in selected:
+        try:
+            r = run_case(case, rounds=args.rounds)
+        except Exception:
+            failed.append(case.name)
+            print(f"{case.name:32} FAILED")
+            traceback.print_exc(limit=3)
+            continue
+        results.append(r)
+        print(f"{r.name:32} {format_seconds(r.median_s):>12} {format_seconds(r.p95_s):>12} "
+              f"{format_seconds(r.min_s):>12} {r.ops_per_s:>12.1f}")
+
+    regressions = []
+    if args.compare:
+        baseline = load_baseline(args.compare)
+        if baseline is None:
+            print(f"\nNo baseline named {args.compare!r}; run with --save {args.compare} first.")
+        else:
+            print(f"\nAgainst baseline {args.compare!r} (threshold {args.threshold:.0%}):")
+            for row in compare(results, baseline, args.threshold):
+                ratio = f"{row['ratio']:.2f}x" if "ratio" in row else "-"
+                print(f"  {row['name']:32} {row['status']:>10} {ratio:>8}")
+                if row["status"] == "regression":
+                    regressions.append(row["name"])
+
+    if args.save and results:
+        print(f"\nSaved baseline: {save_baseline(args.save, results)}")
+    if args.json:
+        with open(args.json, "w") as fh:
+            json.dump({"machine": machine_info(), "results": [asdict(r) for r in results]}, fh, indent=2)
+
+    if failed:
+        print(f"\nFailed cases: {', '.join(failed)}", file=sys.stderr)
+    if regressions:
+        print(f"Regressions: {', '.join(regressions)}", file=sys.stderr)
+    return 1 if (failed or regressions) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
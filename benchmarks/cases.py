@@ -0,0 +1,246 @@
+"""
+cases.py — Benchmark cases for the calculation core and API hot paths.
+
+Groups:
+- core: ephemeris positions, KP chain, lord-change detection, houses, dasha
+- api: adapter/service entry points behind the heavy endpoints (ATS,
+  strategy day, activation for N cities)
+- stream: StreamManager publish fan-out to N local subscribers
+
+Imports happen inside each setup so listing cases stays cheap and a broken
+subsystem only fails its own case. Inputs advance on every call (next
+minute, next day) so per-timestamp caches do not turn a case into a dict
+lookup benchmark.
+"""
+
+from __future__ import annotations
+
+import itertools
+
+from datetime import UTC, date, datetime, timedelta
+
+from benchmarks.harness import bench
+
+T0 = datetime(2025, 3, 12, 14, 30, tzinfo=UTC)
+DAY0 = date(2025, 3, 3)
+
+ACTIVATION_CITIES = 25
+SSE_SUBSCRIBERS = 1000
+
+
+def _minutes(step: int = 1):
+    """Endless UTC timestamps starting at T0, ``step`` minutes apart."""
+    return (T0 + timedelta(minutes=i * step) for i in itertools.count())
+
+
+def _init_houses() -> None:
+    from refactor.house_config import initialize_house_config
+
+    try:
+        initialize_house_config()
+    except Exception:
+        pass  # already initialized
+
+
+# ---------------------------------------------------------------------------
+# core
+# ---------------------------------------------------------------------------
+
+
+@bench("positions.moon", number=200)
+def positions_moon():
+    from refactor.facade import get_positions
+
+    ts = _minutes()
+    return lambda: get_positions(next(ts), 2, use_hft_cache=False)
+
+
+@bench("positions.all_planets", number=20)
+def positions_all_planets():
+    from refactor.facade import get_positions
+
+    ts = _minutes()
+
+    def run():
+        t = next(ts)
+        return [get_positions(t, pid, use_hft_cache=False) for pid in range(1, 10)]
+
+    return run
+
+
+@bench("positions.batch_day", rounds=5)
+def positions_batch_day():
+    """One Moon position per minute for a trading session (390 minutes)."""
+    from refactor.facade import get_positions_batch
+
+    days = itertools.count()
+
+    def run():
+        start = T0 + timedelta(days=next(days))
+        return get_positions_batch([start + timedelta(minutes=m) for m in range(390)], 2)
+
+    return run
+
+
+@bench("hft_cache.lookup", number=100_000)
+def hft_cache_lookup():
+    """Cached Moon lookups cycling over a prefilled NY session (23,400 s)."""
+    from refactor.hft_cache import PlanetPositionCache
+
+    cache = PlanetPositionCache()
+    cache.prefill(T0, T0 + timedelta(seconds=23_399))
+    stamps = itertools.cycle([T0 + timedelta(seconds=s) for s in range(23_400)])
+    return lambda: cache.get_position(next(stamps), 2, True)
+
+
+@bench("hft_cache.prefill_hour", rounds=3)
+def hft_cache_prefill_hour():
+    from refactor.hft_cache import PlanetPositionCache
+
+    hours = itertools.count()
+
+    def run():
+        start = T0 + timedelta(hours=next(hours))
+        return PlanetPositionCache().prefill(start, start + timedelta(seconds=3599))
+
+    return run
+
+
+@bench("kp_chain.longitude", number=2000)
+def kp_chain_longitude():
+    from refactor.kp_chain import kp_chain_for_longitude
+
+    lons = itertools.cycle([i * 0.137 % 360.0 for i in range(10_000)])
+    return lambda: kp_chain_for_longitude(next(lons), levels=3)
+
+
+@bench("varga.sign_matrix_day", rounds=5)
+def varga_sign_matrix_day():
+    """All 16 Shodasavarga signs for 9 planets x 390 session minutes."""
+    import numpy as np
+
+    from refactor.varga import varga_sign_matrix
+    from refactor.varga_config import get_varga_config
+    from refactor.varga_piecewise import register_piecewise_schemes
+
+    register_piecewise_schemes()
+    config = get_varga_config()
+    divisors = config.get_shodasavarga_divisors()
+    schemes = [config.get_scheme_for_divisor(d) for d in divisors]
+    lons = np.random.default_rng(0).uniform(0.0, 360.0, (9, 390))
+    return lambda: varga_sign_matrix(lons, divisors, schemes)
+
+
+@bench("changes.moon_day", rounds=5)
+def changes_moon_day():
+    from refactor.facade import get_kp_lord_changes
+
+    days = itertools.count()
+
+    def run():
+        start = T0 + timedelta(days=next(days))
+        return get_kp_lord_changes(start, start + timedelta(days=1), planet_id=2)
+
+    return run
+
+
+@bench("changes.moon_week", rounds=3)
+def changes_moon_week():
+    from refactor.facade import get_kp_lord_changes
+
+    weeks = itertools.count()
+
+    def run():
+        start = T0 + timedelta(weeks=next(weeks))
+        return get_kp_lord_changes(start, start + timedelta(days=7), planet_id=2)
+
+    return run
+
+
+@bench("houses.placidus", number=100)
+def houses_placidus():
+    from refactor.houses import compute_houses
+
+    _init_houses()
+    ts = _minutes(7)
+    return lambda: compute_houses(next(ts), 40.7128, -74.0060)
+
+
+@bench("dasha.full_cycle_l3", rounds=5)
+def dasha_full_cycle():
+    from refactor.dasha import VimshottariDashaEngine
+
+    engine = VimshottariDashaEngine()
+    moons = itertools.count()
+    birth = datetime(1990, 1, 1, 12, tzinfo=UTC)
+    return lambda: engine.calculate_full_cycle(birth, (next(moons) * 7.3) % 360.0, levels=3)
+
+
+# ---------------------------------------------------------------------------
+# api
+# ---------------------------------------------------------------------------
+
+
+@bench("ats.calculate", group="api", number=20)
+def ats_calculate():
+    from interfaces.ats_system_adapter import ATSSystemAdapter
+
+    adapter = ATSSystemAdapter()
+    ts = _minutes(5)
+    return lambda: adapter.calculate(next(ts))
+
+
+@bench("strategy.day", group="api", rounds=3)
+def strategy_day():
+    from interfaces.initialize import initialize_systems
+    from interfaces.registry import get_system
+
+    _init_houses()
+    initialize_systems()
+    adapter = get_system("KP_STRATEGY")
+    days = itertools.count()
+    return lambda: adapter.day(DAY0 + timedelta(days=next(days)))
+
+
+@bench(f"activation.cities_{ACTIVATION_CITIES}", group="api", rounds=5)
+def activation_cities():
+    import api.routers.activation as activation
+
+    _init_houses()
+    locations = [
+        activation.LocationRef(
+            id=f"city{i}", name=f"City {i}", latitude=-50.0 + 4.0 * i, longitude=-170.0 + 13.0 * i
+        )
+        for i in range(ACTIVATION_CITIES)
+    ]
+    ts = _minutes()
+
+    def run():
+        return activation._compute_activation_for_locations(
+            next(ts), locations, "default", "KP", "bench"
+        )
+
+    return run
+
+
+# ---------------------------------------------------------------------------
+# stream
+# ---------------------------------------------------------------------------
+
+
+@bench(f"sse.fanout_{SSE_SUBSCRIBERS}", group="stream", number=20)
+async def sse_fanout():
+    """Publish one frame to N subscribers of a topic and drain their queues."""
+    from api.services.stream_manager import StreamManager
+
+    manager = StreamManager()
+    manager._resume_init_attempted = True  # in-memory ring only
+    queues = [await manager.subscribe("kp.moon.chain") for _ in range(SSE_SUBSCRIBERS)]
+    payload = {"planet": "moon", "nl": 5, "sl": 3, "ssl": 9, "lon": 129.57}
+
+    async def run():
+        await manager.publish("kp.moon.chain", payload, event="update")
+        for q in queues:
+            q.get_nowait()
+
+    return run
@@ -0,0 +1,228 @@
+"""
+harness.py — Minimal, dependency-free benchmark runner with stored baselines.
+
+Cases register through the ``bench`` decorator. The decorated function is a
+*setup* step: it runs untimed and returns the callable to measure. Setup and
+the callable may be sync or return coroutines; coroutines run on a per-case
+event loop. Each round times ``number`` calls of that callable; statistics
+are per call.
+
+Results can be saved as a named baseline (benchmarks/baselines/<name>.json)
+and later runs compared against it: a case regresses when its median is more
+than ``threshold`` slower than the baseline median.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import gc
+import inspect
+import json
+import os
+import platform
+import statistics
+import subprocess
+import time
+
+from collections.abc import Callable
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any
+
+BASELINE_DIR = Path(__file__).resolve().parent / "baselines"
+DEFAULT_THRESHOLD = 0.20  # 20% slower median = regression
+
+
+@dataclass
+class Case:
+    name: str
+    group: str
+    setup: Callable[[], Any]
+    number: int = 1
+    rounds: int = 10
+    warmup: int = 1
+
+
+@dataclass
+class Result:
+    name: str
+    group: str
+    number: int
+    rounds: int
+    min_s: float
+    median_s: float
+    mean_s: float
+    p95_s: float
+    stdev_s: float
+    ops_per_s: float
+
+
+_REGISTRY: dict[str, Case] = {}
+
+
+def bench(
+    name: str, *, group: str = "core", number: int = 1, rounds: int = 10, warmup: int = 1
+) -> Callable[[Callable[[], Any]], Callable[[], Any]]:
+    """Register a benchmark case; the decorated function returns the timed callable."""
+
+    def register(setup: Callable[[], Any]) -> Callable[[], Any]:
+        if name in _REGISTRY:
+            raise ValueError(f"Duplicate benchmark name: {name}")
+        _REGISTRY[name] = Case(name, group, setup, number, rounds, warmup)
+        return setup
+
+    return register
+
+
+def registered(pattern: str | None = None) -> list[Case]:
+    """Registered cases, optionally filtered by substring of name or group."""
+    cases = list(_REGISTRY.values())
+    if pattern:
+        cases = [c for c in cases if pattern in c.name or pattern == c.group]
+    return cases
+
+
+def _percentile(sorted_values: list[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    k = (len(sorted_values) - 1) * pct
+    lo = int(k)
+    hi = min(lo + 1, len(sorted_values) - 1)
+    return sorted_values[lo] + (sorted_values[hi] - sorted_values[lo]) * (k - lo)
+
+
+def summarize(case: Case, per_call: list[float]) -> Result:
+    """Reduce per-call round timings to a Result."""
+    ordered = sorted(per_call)
+    median = statistics.median(ordered)
+    return Result(
+        name=case.name,
+        group=case.group,
+        number=case.number,
+        rounds=len(ordered),
+        min_s=ordered[0],
+        median_s=median,
+        mean_s=statistics.fmean(ordered),
+        p95_s=_percentile(ordered, 0.95),
+        stdev_s=statistics.stdev(ordered) if len(ordered) > 1 else 0.0,
+        ops_per_s=(1.0 / median) if median > 0 else float("inf"),
+    )
+
+
+def run_case(case: Case, rounds: int | None = None) -> Result:
+    """Set up a case, warm it up, and time ``rounds`` rounds of ``number`` calls.
+
+    Setup and calls share one event loop, so async setups (subscribing
+    queues, priming caches) and the coroutines they time see the same loop.
+    """
+    loop = asyncio.new_event_loop()
+
+    def resolve(value):
+        return loop.run_until_complete(value) if inspect.isawaitable(value) else value
+
+    try:
+        fn = resolve(case.setup())
+        for _ in range(case.warmup):
+            resolve(fn())
+        timings = []
+        gc_was_enabled = gc.isenabled()
+        gc.collect()
+        gc.disable()
+        try:
+            for _ in range(rounds or case.rounds):
+                t0 = time.perf_counter()
+                for _ in range(case.number):
+                    resolve(fn())
+                timings.append((time.perf_counter() - t0) / case.number)
+        finally:
+            if gc_was_enabled:
+                gc.enable()
+    finally:
+        loop.close()
+    return summarize(case, timings)
+
+
+# ---------------------------------------------------------------------------
+# Baselines
+# ---------------------------------------------------------------------------
+
+
+def machine_info() -> dict[str, Any]:
+    try:
+        rev = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, timeout=5
+        ).stdout.strip()
+    except Exception:
+        rev = ""
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpus": os.cpu_count(),
+        "git_rev": rev,
+        "numba_jit": os.getenv("NUMBA_DISABLE_JIT", "0") != "1",
+        "created": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+    }
+
+
+def baseline_path(name: str) -> Path:
+    path = Path(name)
+    if path.suffix == ".json" or path.parent != Path("."):
+        return path
+    return BASELINE_DIR / f"{name}.json"
+
+
+def save_baseline(name: str, results: list[Result]) -> Path:
+    """Write results as a named baseline, merging with existing cases."""
+    path = baseline_path(name)
+    existing = load_baseline(name) or {}
+    merged = {**existing, **{r.name: asdict(r) for r in results}}
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps({"machine": machine_info(), "results": merged}, indent=2, sort_keys=True))
+    return path
+
+
+def load_baseline(name: str) -> dict[str, dict[str, Any]] | None:
+    path = baseline_path(name)
+    if not path.exists():
+        return None
+    return json.loads(path.read_text()).get("results", {})
+
+
+def compare(
+    results: list[Result],
+    baseline: dict[str, dict[str, Any]],
+    threshold: float = DEFAULT_THRESHOLD,
+) -> list[dict[str, Any]]:
+    """Per-case comparison rows; ``status`` is ok, faster, regression or new."""
+    rows = []
+    for r in results:
+        base = baseline.get(r.name)
+        if not base:
+            rows.append({"name": r.name, "status": "new", "median_s": r.median_s})
+            continue
+        ratio = r.median_s / base["median_s"] if base["median_s"] > 0 else 1.0
+        if ratio > 1.0 + threshold:
+            status = "regression"
+        elif ratio < 1.0 - threshold:
+            status = "faster"
+        else:
+            status = "ok"
+        rows.append(
+            {
+                "name": r.name,
+                "status": status,
+                "median_s": r.median_s,
+                "baseline_median_s": base["median_s"],
+                "ratio": ratio,
+            }
+        )
+    return rows
+
+
+def format_seconds(value: float) -> str:
+    if value >= 1:
+        return f"{value:.3f} s"
+    if value >= 1e-3:
+        return f"{value * 1e3:.3f} ms"
+    return f"{value * 1e6:.1f} us"
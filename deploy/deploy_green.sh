@@ -15,6 +15,21 @@ docker compose pull api_green
 echo "[2/4] Starting green (warm-up)…"
 docker compose up -d api_green
 
+# The image ships prebuilt Numba/house-grid/atlas caches, so green is usually
+# ready within a couple of seconds; poll its own readiness before flipping.
+echo "Waiting for green readiness…"
+for i in $(seq 1 60); do
+  if docker compose exec -T api_green curl -fsS --max-time 2 "http://127.0.0.1:8000/api/v1/health/ready" >/dev/null 2>&1; then
+    echo "Green ready after ~${i}s."
+    break
+  fi
+  if [ "$i" -eq 60 ]; then
+    echo "Green not ready after 60s; leaving blue in place." >&2
+    exit 1
+  fi
+  sleep 1
+done
+
 echo "[3/4] Switching proxy upstream to green…"
 sed -i 's/reverse_proxy \(api_\)\w\+:8000/reverse_proxy api_green:8000/' Caddyfile
 docker compose exec caddy caddy reload
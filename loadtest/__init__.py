@@ -0,0 +1 @@
+"""End-to-end load-test harness for the API (see __main__.py for usage)."""
@@ -0,0 +1,91 @@
+"""
+Load-test the API end to end (auth, QPS guard, idempotency, usage metering,
+streaming) with local stand-ins for Redis and Postgres.
+
+Usage:
+  python -m loadtest                          # uvicorn subprocess, all scenarios
+  python -m loadtest --mode inprocess         # ASGI in this process (REST only)
+  python -m loadtest -k chart,kp_chain -c 32 -d 20
+  python -m loadtest --base http://127.0.0.1:8000   # an already running server
+  python -m loadtest --out after.json --compare before.json
+
+Reports p50/p95/p99 latency, throughput and server RSS per scenario; --out
+writes a JSON report, --compare prints relative changes against an older one.
+Run with PYTHONPATH=./src:. (make loadtest does this). fakeredis[lua] enables
+the Redis stand-in; without it the app uses its in-process fallbacks.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import sys
+
+from loadtest import runner, scenarios
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m loadtest", description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mode", choices=("uvicorn", "inprocess"), default="uvicorn")
+    parser.add_argument("--base", help="target an already running server instead of starting one")
+    parser.add_argument("-k", dest="pattern", help="comma-separated scenario names or kinds (rest, sse, ws)")
+    parser.add_argument("-c", "--concurrency", type=int, default=16, help="virtual users per REST scenario")
+    parser.add_argument("-d", "--duration", type=float, default=10.0, help="seconds per REST scenario")
+    parser.add_argument("--redis", choices=("auto", "fake", "none"), default="auto")
+    parser.add_argument("--enforce-limits", action="store_true", help="keep configured rate limits")
+    parser.add_argument("--no-idempotency", action="store_true", help="do not send Idempotency-Key headers")
+    parser.add_argument("--out", metavar="PATH", help="write the JSON report to PATH")
+    parser.add_argument("--compare", metavar="PATH", help="diff against an earlier JSON report")
+    args = parser.parse_args(argv)
+
+    selected = scenarios.select(args.pattern)
+    if not selected:
+        print(f"No scenario matches {args.pattern!r}", file=sys.stderr)
+        return 2
+
+    if args.base or args.mode == "uvicorn":
+        target = runner.ServerTarget(args.base, redis=args.redis, enforce_limits=args.enforce_limits)
+        mode = "external" if args.base else "uvicorn"
+    else:
+        target = runner.InProcessTarget(redis=args.redis, enforce_limits=args.enforce_limits)
+        mode = "inprocess"
+
+    # Idempotency keys only exercise a store when Redis (or the stand-in) is there
+    idempotency = not args.no_idempotency and target.standins.get("redis", "").startswith(("fakeredis", "external"))
+
+    print(f"Load test against {target.base_url} ({mode}; stand-ins: {target.standins})")
+    try:
+        results = asyncio.run(
+            runner.run_all(target, selected, concurrency=args.concurrency, duration=args.duration,
+                           idempotency=idempotency)
+        )
+        db_after = target.db_snapshot()
+    finally:
+        target.close()
+
+    report = runner.build_report(target, results, mode=mode, concurrency=args.concurrency,
+                                 duration=args.duration, db_after=db_after)
+    if db_after:
+        print(f"Stand-in DB after run: {db_after}")
+    if args.out:
+        with open(args.out, "w") as fh:
+            json.dump(report, fh, indent=2, sort_keys=True)
+        print(f"Report: {args.out}")
+    if args.compare:
+        with open(args.compare) as fh:
+            previous = json.load(fh)
+        print(f"\nAgainst {args.compare} (relative change; + is higher):")
+        for row in runner.diff_reports(previous, report):
+            if row.get("status") == "new":
+                print(f"  {row['scenario']:14} new")
+                continue
+            fmt = lambda v: "n/a" if v is None else f"{v:+.1%}"  # noqa: E731
+            print(f"  {row['scenario']:14} throughput {fmt(row['throughput']):>8}  p95 {fmt(row['p95']):>8}  "
+                  f"p99 {fmt(row['p99']):>8}  rss {fmt(row['rss_peak']):>8}")
+    return 1 if any(r["errors"] for r in results.values()) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
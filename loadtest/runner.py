@@ -0,0 +1,482 @@
+"""
+runner.py — Drive scenarios, collect latency/throughput/RSS, build reports.
+
+Targets:
+- InProcessTarget: httpx ASGITransport straight into ``apps.api.main:app``
+  (full middleware stack, no sockets; REST scenarios only)
+- ServerTarget: a uvicorn subprocess (``python -m loadtest.server``) with the
+  stand-ins installed, or an external --base URL; RSS is read from the server
+  process's /proc/<pid>/status
+"""
+
+from __future__ import annotations
+
+import asyncio
+import itertools
+import json
+import os
+import platform
+import socket
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+from dataclasses import dataclass, field
+from typing import Any
+
+import httpx
+
+from loadtest.scenarios import SSE_TOPIC, RestScenario, StreamScenario, api_token, stream_token
+from loadtest.standins import DEV_PUBLISH_TOKEN
+
+REPORT_VERSION = 1
+
+
+# ---------------------------------------------------------------------------
+# Measurement
+# ---------------------------------------------------------------------------
+
+
+def _percentile(ordered: list[float], pct: float) -> float:
+    if not ordered:
+        return 0.0
+    k = (len(ordered) - 1) * pct
+    lo = int(k)
+    hi = min(lo + 1, len(ordered) - 1)
+    return ordered[lo] + (ordered[hi] - ordered[lo]) * (k - lo)
+
+
+@dataclass
+class Recorder:
+    latencies: list[float] = field(default_factory=list)
+    statuses: dict[str, int] = field(default_factory=dict)
+    errors: int = 0
+    started: float = 0.0
+    finished: float = 0.0
+
+    def ok(self, seconds: float, status: int | str = 200) -> None:
+        self.latencies.append(seconds)
+        self.statuses[str(status)] = self.statuses.get(str(status), 0) + 1
+
+    def fail(self, status: int | str) -> None:
+        self.errors += 1
+        self.statuses[str(status)] = self.statuses.get(str(status), 0) + 1
+
+    def summary(self) -> dict[str, Any]:
+        ordered = sorted(self.latencies)
+        elapsed = max(self.finished - self.started, 1e-9)
+        ms = lambda v: round(v * 1000, 3)  # noqa: E731
+        return {
+            "requests": len(ordered) + self.errors,
+            "errors": self.errors,
+            "statuses": self.statuses,
+            "elapsed_s": round(elapsed, 3),
+            "throughput_rps": round(len(ordered) / elapsed, 2),
+            "latency_ms": {
+                "p50": ms(_percentile(ordered, 0.50)),
+                "p95": ms(_percentile(ordered, 0.95)),
+                "p99": ms(_percentile(ordered, 0.99)),
+                "max": ms(ordered[-1]) if ordered else 0.0,
+                "mean": ms(sum(ordered) / len(ordered)) if ordered else 0.0,
+            },
+        }
+
+
+def rss_mb(pid: int) -> float | None:
+    """Resident set size of ``pid`` in MiB (Linux /proc), None if unavailable."""
+    try:
+        with open(f"/proc/{pid}/status") as fh:
+            for line in fh:
+                if line.startswith("VmRSS:"):
+                    return round(int(line.split()[1]) / 1024, 1)
+    except OSError:
+        return None
+    return None
+
+
+class RssSampler:
+    """Samples a process's RSS every ``interval`` seconds while a scenario runs."""
+
+    def __init__(self, pid: int | None, interval: float = 0.1) -> None:
+        self.pid = pid
+        self.interval = interval
+        self.start = self.peak = self.end = None
+        self._task: asyncio.Task | None = None
+
+    async def __aenter__(self) -> RssSampler:
+        if self.pid is not None:
+            self.start = self.peak = rss_mb(self.pid)
+            self._task = asyncio.create_task(self._sample())
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self.end = rss_mb(self.pid)
+            self._bump(self.end)
+
+    async def _sample(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            self._bump(rss_mb(self.pid))
+
+    def _bump(self, value: float | None) -> None:
+        if value is not None and (self.peak is None or value > self.peak):
+            self.peak = value
+
+    def summary(self) -> dict[str, float | None] | None:
+        if self.pid is None:
+            return None
+        return {"start": self.start, "peak": self.peak, "end": self.end}
+
+
+# ---------------------------------------------------------------------------
+# Targets
+# ---------------------------------------------------------------------------
+
+
+class InProcessTarget:
+    """ASGI app in this process; stand-ins installed before the app import."""
+
+    streaming = False
+
+    def __init__(self, redis: str = "auto", enforce_limits: bool = False) -> None:
+        from loadtest import standins
+
+        standins.configure_env(enforce_limits=enforce_limits, redis=redis)
+        self.standins = standins.install(redis)
+        from apps.api.main import app
+
+        self.app = app
+        self.pid = os.getpid()
+        self.secret = os.environ["AUTH_JWT_SECRET"]
+        self.base_url = "http://loadtest"
+
+    def client(self, limits: httpx.Limits) -> httpx.AsyncClient:
+        return httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=self.app), base_url=self.base_url, timeout=60.0
+        )
+
+    def db_snapshot(self) -> dict[str, Any] | None:
+        from loadtest.standins import memory_db
+
+        return memory_db.snapshot()
+
+    def close(self) -> None:
+        pass
+
+
+class ServerTarget:
+    """uvicorn subprocess with stand-ins, or an already running --base URL."""
+
+    streaming = True
+
+    def __init__(
+        self,
+        base: str | None = None,
+        redis: str = "auto",
+        enforce_limits: bool = False,
+        startup_timeout: float = 120.0,
+    ) -> None:
+        self.proc: subprocess.Popen | None = None
+        self._cache_dir: str | None = None
+        self.secret = os.getenv("AUTH_JWT_SECRET") or "loadtest-secret"
+        if base:
+            self.base_url = base.rstrip("/")
+            self.pid = None
+            self.standins = {"redis": "external", "db": "external"}
+            return
+
+        port = _free_port()
+        env = {**os.environ, "AUTH_JWT_SECRET": self.secret}
+        env["PYTHONPATH"] = os.pathsep.join(filter(None, ["./src", ".", env.get("PYTHONPATH")]))
+        if "VEDACORE_CACHE_DIR" not in env:
+            # Keep the server's file cache out of the repo tree
+            self._cache_dir = tempfile.mkdtemp(prefix="vc-loadtest-cache-")
+            env["VEDACORE_CACHE_DIR"] = self._cache_dir
+        cmd = [sys.executable, "-m", "loadtest.server", "--port", str(port), "--redis", redis]
+        if enforce_limits:
+            cmd.append("--enforce-limits")
+        self.proc = subprocess.Popen(cmd, env=env)
+        self.pid = self.proc.pid
+        self.base_url = f"http://127.0.0.1:{port}"
+        self._wait_ready(startup_timeout)
+        self.standins = httpx.get(f"{self.base_url}/_loadtest/standins", timeout=5).json()
+        self.standins.pop("db_snapshot", None)
+
+    def _wait_ready(self, timeout: float) -> None:
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if self.proc.poll() is not None:
+                raise RuntimeError(f"load-test server exited with {self.proc.returncode}")
+            try:
+                if httpx.get(f"{self.base_url}/api/v1/health/up", timeout=1).status_code == 200:
+                    return
+            except httpx.HTTPError:
+                pass
+            time.sleep(0.25)
+        self.close()
+        raise RuntimeError("load-test server did not become ready")
+
+    def client(self, limits: httpx.Limits) -> httpx.AsyncClient:
+        return httpx.AsyncClient(base_url=self.base_url, limits=limits, timeout=60.0)
+
+    def db_snapshot(self) -> dict[str, Any] | None:
+        if self.proc is None:
+            return None
+        try:
+            return httpx.get(f"{self.base_url}/_loadtest/standins", timeout=5).json().get("db_snapshot")
+        except httpx.HTTPError:
+            return None
+
+    def close(self) -> None:
+        if self.proc is not None and self.proc.poll() is None:
+            self.proc.terminate()
+            try:
+                self.proc.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                self.proc.kill()
+        if self._cache_dir is not None:
+            shutil.rmtree(self._cache_dir, ignore_errors=True)
+            self._cache_dir = None
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+# ---------------------------------------------------------------------------
+# Scenario drivers
+# ---------------------------------------------------------------------------
+
+
+async def run_rest(
+    target, scenario: RestScenario, *, users: int, duration: float, idempotency: bool
+) -> Recorder:
+    """Closed loop: ``users`` virtual tenants issue requests until ``duration`` ends."""
+    rec = Recorder()
+    limits = httpx.Limits(max_connections=users, max_keepalive_connections=users)
+    counter = itertools.count()
+
+    async with target.client(limits) as client:
+
+        async def user(uid: int) -> None:
+            headers = {"Authorization": f"Bearer {api_token(target.secret, f'lt-{scenario.name}-{uid}')}"}
+            while time.perf_counter() < deadline:
+                i = next(counter)
+                if idempotency:
+                    headers["Idempotency-Key"] = f"lt-{scenario.name}-{uid}-{i}"
+                t0 = time.perf_counter()
+                try:
+                    resp = await client.request(scenario.method, scenario.path, json=scenario.body(i), headers=headers)
+                    await resp.aread()
+                except httpx.HTTPError as e:
+                    rec.fail(type(e).__name__)
+                    continue
+                if resp.status_code < 400:
+                    rec.ok(time.perf_counter() - t0, resp.status_code)
+                else:
+                    rec.fail(resp.status_code)
+
+        rec.started = time.perf_counter()
+        deadline = rec.started + duration
+        await asyncio.gather(*(user(u) for u in range(users)))
+        rec.finished = time.perf_counter()
+    return rec
+
+
+async def run_sse(target, scenario: StreamScenario, *, interval: float = 0.02) -> Recorder:
+    """N subscribers; publish ``messages`` frames and time publish-to-receive."""
+    rec = Recorder()
+    limits = httpx.Limits(max_connections=scenario.clients + 4)
+    ready = asyncio.Semaphore(0)
+    expected = scenario.messages
+
+    async with target.client(limits) as client:
+
+        async def subscriber(uid: int) -> None:
+            token = stream_token(target.secret, f"lt-sse-{uid}", SSE_TOPIC)
+            headers = {"Accept": "text/event-stream", "Authorization": f"Bearer {token}"}
+            seen = 0
+            try:
+                async with client.stream("GET", "/api/v1/stream", params={"topic": SSE_TOPIC}, headers=headers) as resp:
+                    if resp.status_code != 200:
+                        rec.fail(resp.status_code)
+                        ready.release()
+                        return
+                    ready.release()
+                    async for line in resp.aiter_lines():
+                        if not line.startswith("data:"):
+                            continue
+                        envelope = json.loads(line[5:])
+                        sent = (envelope.get("payload") or {}).get("lt_sent")
+                        if sent is None:
+                            continue
+                        rec.ok(time.time() - sent)
+                        seen += 1
+                        if seen >= expected:
+                            return
+            except httpx.HTTPError as e:
+                rec.fail(type(e).__name__)
+
+        rec.started = time.perf_counter()
+        tasks = [asyncio.create_task(subscriber(u)) for u in range(scenario.clients)]
+        for _ in range(scenario.clients):
+            await ready.acquire()
+        # Subscribers are registered once their response has started
+        await asyncio.sleep(0.2)
+        for i in range(expected):
+            resp = await client.post(
+                f"/stream/_dev_publish/{SSE_TOPIC}",
+                params={"token": DEV_PUBLISH_TOKEN},
+                json={"lt_seq": i, "lt_sent": time.time()},
+            )
+            if resp.status_code != 200:
+                rec.fail(f"publish_{resp.status_code}")
+            await asyncio.sleep(interval)
+        try:
+            await asyncio.wait_for(asyncio.gather(*tasks), timeout=30)
+        except asyncio.TimeoutError:
+            for t in tasks:
+                t.cancel()
+            rec.fail("timeout")
+        rec.finished = time.perf_counter()
+    return rec
+
+
+async def run_ws(target, scenario: StreamScenario) -> Recorder:
+    """N WebSocket clients; each sends ``messages`` pings and times the pong."""
+    import websockets
+
+    rec = Recorder()
+    ws_base = target.base_url.replace("http://", "ws://").replace("https://", "wss://")
+
+    async def client(uid: int) -> None:
+        token = stream_token(target.secret, f"lt-ws-{uid}", None)
+        try:
+            async with websockets.connect(f"{ws_base}/api/v1/ws?token={token}") as ws:
+                json.loads(await ws.recv())  # welcome
+                for i in range(scenario.messages):
+                    t0 = time.perf_counter()
+                    await ws.send(json.dumps({"command": "ping", "payload": {"i": i}}))
+                    reply = json.loads(await ws.recv())
+                    if reply.get("event") == "pong":
+                        rec.ok(time.perf_counter() - t0)
+                    else:
+                        rec.fail(reply.get("event", "unknown"))
+        except Exception as e:
+            rec.fail(type(e).__name__)
+
+    rec.started = time.perf_counter()
+    await asyncio.gather(*(client(u) for u in range(scenario.clients)))
+    rec.finished = time.perf_counter()
+    return rec
+
+
+# ---------------------------------------------------------------------------
+# Orchestration and reports
+# ---------------------------------------------------------------------------
+
+
+async def run_all(
+    target,
+    scenarios: list[RestScenario | StreamScenario],
+    *,
+    concurrency: int,
+    duration: float,
+    idempotency: bool,
+    log=print,
+) -> dict[str, Any]:
+    """Run scenarios one after another; returns {name: summary}."""
+    results: dict[str, Any] = {}
+    for scenario in scenarios:
+        if scenario.kind != "rest" and not target.streaming:
+            log(f"  {scenario.name:14} skipped (streaming needs uvicorn mode)")
+            continue
+        async with RssSampler(target.pid) as rss:
+            if scenario.kind == "rest":
+                rec = await run_rest(target, scenario, users=concurrency, duration=duration, idempotency=idempotency)
+                extra = {"users": concurrency}
+            elif scenario.kind == "sse":
+                rec = await run_sse(target, scenario)
+                extra = {"clients": scenario.clients, "messages": scenario.messages}
+            else:
+                rec = await run_ws(target, scenario)
+                extra = {"clients": scenario.clients, "messages": scenario.messages}
+        summary = {"kind": scenario.kind, **extra, **rec.summary(), "rss_mb": rss.summary()}
+        results[scenario.name] = summary
+        lat = summary["latency_ms"]
+        log(
+            f"  {scenario.name:14} {summary['throughput_rps']:>9.1f}/s  p50 {lat['p50']:>8.2f}  "
+            f"p95 {lat['p95']:>8.2f}  p99 {lat['p99']:>8.2f} ms  errors {summary['errors']}"
+        )
+    return results
+
+
+def build_report(
+    target,
+    results: dict[str, Any],
+    *,
+    mode: str,
+    concurrency: int,
+    duration: float,
+    db_after: dict[str, Any] | None = None,
+) -> dict[str, Any]:
+    try:
+        rev = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, timeout=5
+        ).stdout.strip()
+    except Exception:
+        rev = ""
+    return {
+        "version": REPORT_VERSION,
+        "meta": {
+            "git_rev": rev,
+            "mode": mode,
+            "base_url": target.base_url,
+            "standins": target.standins,
+            "db_after": db_after,
+            "concurrency": concurrency,
+            "duration_s": duration,
+            "python": platform.python_version(),
+            "cpus": os.cpu_count(),
+            "created": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        },
+        "scenarios": results,
+    }
+
+
+def diff_reports(old: dict[str, Any], new: dict[str, Any]) -> list[dict[str, Any]]:
+    """Per-scenario relative change of throughput, p95/p99 and peak RSS."""
+
+    def rel(a: float | None, b: float | None) -> float | None:
+        if not a or b is None:
+            return None
+        return round((b - a) / a, 4)
+
+    rows = []
+    for name, cur in new.get("scenarios", {}).items():
+        prev = old.get("scenarios", {}).get(name)
+        if prev is None:
+            rows.append({"scenario": name, "status": "new"})
+            continue
+        rows.append(
+            {
+                "scenario": name,
+                "throughput": rel(prev["throughput_rps"], cur["throughput_rps"]),
+                "p95": rel(prev["latency_ms"]["p95"], cur["latency_ms"]["p95"]),
+                "p99": rel(prev["latency_ms"]["p99"], cur["latency_ms"]["p99"]),
+                "rss_peak": rel(
+                    (prev.get("rss_mb") or {}).get("peak"), (cur.get("rss_mb") or {}).get("peak")
+                ),
+            }
+        )
+    return rows
@@ -0,0 +1,41 @@
+"""
+server.py — uvicorn entry point for load tests with local stand-ins.
+
+  PYTHONPATH=./src:. python -m loadtest.server --port 8765 [--redis auto|fake|none]
+
+Installs the Redis/Postgres stand-ins (see standins.py) before importing
+``apps.api.main:app`` and exposes GET /_loadtest/standins so the driver can
+record what the server actually ran with.
+"""
+
+from __future__ import annotations
+
+import argparse
+
+from loadtest import standins
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m loadtest.server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--redis", choices=("auto", "fake", "none"), default="auto")
+    parser.add_argument("--enforce-limits", action="store_true", help="keep configured rate limits")
+    args = parser.parse_args(argv)
+
+    standins.configure_env(enforce_limits=args.enforce_limits, redis=args.redis)
+    installed = standins.install(args.redis)
+
+    import uvicorn
+
+    from apps.api.main import app
+
+    @app.get("/_loadtest/standins", include_in_schema=False)
+    async def _standins() -> dict:
+        return {**installed, "db_snapshot": standins.memory_db.snapshot()}
+
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning", access_log=False)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+"""
+standins.py — Local stand-ins for Redis and Postgres during load tests.
+
+- Redis: fakeredis (``pip install fakeredis[lua]``) is installed as the shared
+  client behind ``api.services.redis_config.get_redis``, and REDIS_URL is set
+  so "auto" backends (singleflight, stream broker, GCRA when Lua is
+  available) take their Redis code paths. Without fakeredis the app runs on
+  its in-process fallbacks, exactly as in local dev without Redis.
+- Postgres: MemoryDB replaces the Supabase/asyncpg service used by usage
+  metering. Statements run through the real insert code and are recorded in
+  memory, so metering cost is measured without a database round-trip.
+
+``configure_env`` must run before ``apps.api.main`` is imported; several
+modules read their limits from the environment at import time.
+"""
+
+from __future__ import annotations
+
+import os
+import re
+import sys
+import types
+
+from collections import defaultdict
+from contextlib import asynccontextmanager
+from typing import Any
+
+# Rate limits high enough that the load generator measures the guard's cost
+# rather than its 429s; --enforce-limits keeps the configured defaults.
+_UNTHROTTLED_ENV = {
+    "STREAM_RATE_LIMIT_QPS": "1000000",
+    "STREAM_RATE_LIMIT_BURST": "1000000",
+    "STREAM_RATE_LIMIT_CONNECTIONS": "100000",
+    "MAX_SUBSCRIBERS_PER_TENANT": "100000",
+    "MAX_TOTAL_SUBSCRIBERS": "100000",
+}
+
+LOADTEST_JWT_SECRET = "loadtest-secret"
+DEV_PUBLISH_TOKEN = "loadtest-publish"
+
+_INSERT_RE = re.compile(r"^\s*INSERT\s+INTO\s+([\w.]+)", re.IGNORECASE)
+
+
+def configure_env(*, enforce_limits: bool = False, redis: str = "auto") -> None:
+    """Environment for a load-test server process (call before importing the app)."""
+    os.environ.setdefault("AUTH_JWT_SECRET", LOADTEST_JWT_SECRET)
+    os.environ.setdefault("LOG_LEVEL", "WARNING")
+    os.environ["STREAM_DEV_PUBLISH_ENABLED"] = "true"
+    os.environ["STREAM_DEV_PUBLISH_TOKEN"] = DEV_PUBLISH_TOKEN
+    if not enforce_limits:
+        for key, value in _UNTHROTTLED_ENV.items():
+            os.environ.setdefault(key, value)
+    if redis != "none" and _fakeredis_available():
+        os.environ.setdefault("REDIS_URL", "redis://loadtest-standin:6379/0")
+        if _lua_available():
+            os.environ.setdefault("RATE_LIMITER_BACKEND", "redis")
+
+
+def _fakeredis_available() -> bool:
+    try:
+        import fakeredis  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def _lua_available() -> bool:
+    try:
+        import lupa  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+class MemoryConnection:
+    """asyncpg-like connection recording statements into a MemoryDB."""
+
+    def __init__(self, db: MemoryDB) -> None:
+        self._db = db
+
+    async def execute(self, sql: str, *args: Any) -> str:
+        self._db.statements += 1
+        match = _INSERT_RE.match(sql)
+        if match:
+            self._db.tables[match.group(1)].append(args)
+            return "INSERT 0 1"
+        return "OK"
+
+    async def fetch(self, sql: str, *args: Any) -> list[Any]:
+        self._db.statements += 1
+        return []
+
+    async def fetchrow(self, sql: str, *args: Any) -> None:
+        self._db.statements += 1
+        return None
+
+    async def fetchval(self, sql: str, *args: Any) -> None:
+        self._db.statements += 1
+        return None
+
+
+class MemoryDB:
+    """Stand-in for the Supabase signals service (enabled, with a pool)."""
+
+    enabled = True
+
+    def __init__(self) -> None:
+        self.pool = object()
+        self.statements = 0
+        self.tables: dict[str, list[tuple[Any, ...]]] = defaultdict(list)
+
+    @asynccontextmanager
+    async def get_connection(self):
+        yield MemoryConnection(self)
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            "statements": self.statements,
+            "rows": {name: len(rows) for name, rows in self.tables.items()},
+        }
+
+
+memory_db = MemoryDB()
+
+
+def install(redis: str = "auto") -> dict[str, str]:
+    """Install the stand-ins in this process; returns what was installed."""
+
+    async def _memory_service() -> MemoryDB:
+        return memory_db
+
+    try:
+        import app.services.supabase_signals as supabase_signals
+    except ImportError:
+        # asyncpg missing: the stand-in replaces the whole DB service module
+        supabase_signals = types.ModuleType("app.services.supabase_signals")
+        sys.modules["app.services.supabase_signals"] = supabase_signals
+    supabase_signals.get_supabase_signals_service = _memory_service
+    installed = {"db": "memory"}
+
+    if redis == "none" or not _fakeredis_available():
+        if redis == "fake":
+            raise RuntimeError("fakeredis is not installed (pip install fakeredis[lua])")
+        installed["redis"] = "none (in-process fallbacks)"
+        return installed
+
+    import fakeredis
+
+    import api.services.redis_config as redis_config
+
+    manager = redis_config.RedisManager()
+    manager._client = fakeredis.FakeAsyncRedis(decode_responses=True)
+    redis_config._redis_manager = manager
+    installed["redis"] = "fakeredis" + (" + lua" if _lua_available() else "")
+    return installed
@@ -0,0 +1,142 @@
+"""
+Pure ASGI middleware base and shared per-request context.
+
+BaseHTTPMiddleware wraps every request in extra tasks and memory streams and
+buffers streaming responses behind call_next. Middlewares here are plain ASGI
+callables instead:
+
+- RequestContext: one object per request, stored on the scope, holding the
+  lazily built Request (headers/query parsed once) and values layers share
+  (request id, tenant info, per-layer timings)
+- ASGIMiddleware: base class; subclasses implement handle(). Non-HTTP scopes
+  (websocket, lifespan) pass straight through.
+
+Set VC_MIDDLEWARE_TIMING=true to record each layer's own time (excluding
+downstream layers and the endpoint) in the vc_middleware_layer_seconds
+histogram.
+"""
+
+from __future__ import annotations
+
+import os
+import time
+
+from typing import Any
+
+from starlette.datastructures import Headers, QueryParams
+from starlette.requests import Request
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+MIDDLEWARE_TIMING = os.getenv("VC_MIDDLEWARE_TIMING", "false").lower() == "true"
+
+try:
+    from api.services.metrics import streaming_metrics
+
+    METRICS_AVAILABLE = True
+except ImportError:
+    METRICS_AVAILABLE = False
+
+_SCOPE_KEY = "vedacore.request_context"
+
+
+class RequestContext:
+    """Per-request state shared by every middleware layer."""
+
+    __slots__ = (
+        "scope",
+        "started",
+        "request_id",
+        "tenant_info",
+        "layer_seconds",
+        "_request",
+    )
+
+    def __init__(self, scope: Scope):
+        self.scope = scope
+        self.started = time.perf_counter()
+        self.request_id: str | None = None
+        self.tenant_info: dict[str, str] | None = None
+        self.layer_seconds: dict[str, float] = {}
+        self._request: Request | None = None
+
+    @classmethod
+    def of(cls, scope: Scope) -> RequestContext:
+        """Return the context stored on scope, creating it on first use."""
+        ctx = scope.get(_SCOPE_KEY)
+        if ctx is None:
+            ctx = scope[_SCOPE_KEY] = cls(scope)
+        return ctx
+
+    @property
+    def request(self) -> Request:
+        if self._request is None:
+            self._request = Request(self.scope)
+        return self._request
+
+    @property
+    def headers(self) -> Headers:
+        return self.request.headers
+
+    @property
+    def query_params(self) -> QueryParams:
+        return self.request.query_params
+
+    @property
+    def state(self) -> dict[str, Any]:
+        """The dict behind request.state (handlers write here)."""
+        return self.scope.setdefault("state", {})
+
+
+class ASGIMiddleware:
+    """Base class for pure ASGI middlewares.
+
+    Subclasses set ``layer`` and implement ``handle(ctx, receive, send, app)``,
+    calling ``app`` (not ``self.app``) for the downstream stack so timing
+    mode can separate this layer's own time.
+    """
+
+    layer = "middleware"
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        self.timing = MIDDLEWARE_TIMING
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        ctx = RequestContext.of(scope)
+        if not self.timing:
+            await self.handle(ctx, receive, send, self.app)
+            return
+
+        downstream = 0.0
+
+        async def timed_app(scope: Scope, receive: Receive, send: Send) -> None:
+            nonlocal downstream
+            t0 = time.perf_counter()
+            try:
+                await self.app(scope, receive, send)
+            finally:
+                downstream += time.perf_counter() - t0
+
+        started = time.perf_counter()
+        try:
+            await self.handle(ctx, receive, send, timed_app)
+        finally:
+            self._observe(ctx, time.perf_counter() - started - downstream)
+
+    async def handle(
+        self, ctx: RequestContext, receive: Receive, send: Send, app: ASGIApp
+    ) -> None:
+        await app(ctx.scope, receive, send)
+
+    def _observe(self, ctx: RequestContext, seconds: float) -> None:
+        seconds = max(0.0, seconds)
+        ctx.layer_seconds[self.layer] = seconds
+        if METRICS_AVAILABLE:
+            try:
+                streaming_metrics.record_middleware_layer(self.layer, seconds)
+            except Exception:
+                pass
@@ -7,18 +7,18 @@ Ensures numerical reproducibility and version tracking.
 
 import hashlib
 import os
-from typing import Callable
+from typing import Any
 
-from fastapi import Request, Response
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.types import ASGIApp
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Send
 
+from api.middleware.asgi import ASGIMiddleware, RequestContext
 from app.core.logging import get_api_logger
 
 logger = get_api_logger("ephemeris_headers")
 
 
-class EphemerisHeadersMiddleware(BaseHTTPMiddleware):
+class EphemerisHeadersMiddleware(ASGIMiddleware):
     """
     Add ephemeris build information to all API responses.
     
@@ -30,6 +30,8 @@ class EphemerisHeadersMiddleware(BaseHTTPMiddleware):
     Ensures clients can verify numerical consistency.
     """
     
+    layer = "ephemeris_headers"
+    
     def __init__(self, app: ASGIApp):
         super().__init__(app)
         self.ephemeris_build = self._get_ephemeris_build_hash()
@@ -42,7 +44,7 @@ class EphemerisHeadersMiddleware(BaseHTTPMiddleware):
         try:
             # Try to get actual Swiss Ephemeris version
             import swisseph as swe
-            version = swe.version()
+            version = swe.version() if callable(swe.version) else swe.version
             
             # Create hash from version + system info for reproducibility
             system_info = f"{version}|{os.name}|{os.uname().machine if hasattr(os, 'uname') else 'unknown'}"
@@ -70,45 +72,49 @@ class EphemerisHeadersMiddleware(BaseHTTPMiddleware):
             "X-Algorithm-Version": algo_version,
         }
     
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
-        """Add ephemeris headers to response."""
-        
-        # Process request
-        response = await call_next(request)
+    async def handle(
+        self, ctx: RequestContext, receive: Receive, send: Send, app: ASGIApp
+    ) -> None:
+        """Add ephemeris headers to the response start message."""
         
-        # Add static ephemeris headers
-        for header, value in self.headers.items():
-            response.headers[header] = value
+        async def send_with_headers(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                
+                # Add static ephemeris headers
+                for header, value in self.headers.items():
+                    headers[header] = value
+                
+                # Add dynamic headers based on request
+                self._add_dynamic_headers(ctx.state, headers)
+            await send(message)
         
-        # Add dynamic headers based on request
-        self._add_dynamic_headers(request, response)
-
-        return response
+        await app(ctx.scope, receive, send_with_headers)
     
-    def _add_dynamic_headers(self, request: Request, response: Response):
-        """Add headers that may vary based on request parameters."""
+    def _add_dynamic_headers(self, state: dict[str, Any], headers: MutableHeaders):
+        """Add headers that may vary based on request parameters (request.state)."""
         
         # Override ayanamsha if specified in request
-        if hasattr(request.state, 'ayanamsha'):
-            response.headers["X-Ayanamsha"] = request.state.ayanamsha
+        if 'ayanamsha' in state:
+            headers["X-Ayanamsha"] = state['ayanamsha']
         
         # Override node mode if specified  
-        if hasattr(request.state, 'node_mode'):
-            response.headers["X-Node-Mode"] = request.state.node_mode
+        if 'node_mode' in state:
+            headers["X-Node-Mode"] = state['node_mode']
             
         # Add computation metadata
-        if hasattr(request.state, 'compute_time_ms'):
-            response.headers["X-Compute-Time-Ms"] = str(request.state.compute_time_ms)
+        if 'compute_time_ms' in state:
+            headers["X-Compute-Time-Ms"] = str(state['compute_time_ms'])
             
-        if hasattr(request.state, 'cache_status'):
-            response.headers["X-Cache-Status"] = request.state.cache_status
+        if 'cache_status' in state:
+            headers["X-Cache-Status"] = state['cache_status']
             try:
                 # boolean-friendly indicator
-                response.headers["computed_from_cache"] = (
-                    "true" if str(request.state.cache_status).upper() == "HIT" else "false"
+                headers["computed_from_cache"] = (
+                    "true" if str(state['cache_status']).upper() == "HIT" else "false"
                 )
             except Exception:
-                response.headers["computed_from_cache"] = "false"
+                headers["computed_from_cache"] = "false"
 
 
 def get_ephemeris_info() -> dict[str, str]:
@@ -7,76 +7,215 @@ PM Requirements:
 - Prevent duplicate operations
 """
 
+import asyncio
 import hashlib
 import json
+import os
 import time
-from typing import Callable, Optional, Dict, Any
-from fastapi import Request, Response, HTTPException
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.types import ASGIApp
+import zlib
+from typing import Optional, Dict, Any, List, Tuple
+from starlette.datastructures import Headers, QueryParams, URL
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
+from api.middleware.asgi import ASGIMiddleware, RequestContext
 from app.core.logging import get_api_logger
 from api.services.redis_config import get_redis
 
 logger = get_api_logger("idempotency")
 
+try:
+    from api.services.metrics import streaming_metrics
 
-class IdempotencyMiddleware(BaseHTTPMiddleware):
+    METRICS_AVAILABLE = True
+except ImportError:
+    METRICS_AVAILABLE = False
+
+# Responses larger than this are passed through but not cached
+IDEMPOTENCY_MAX_BODY_BYTES = int(os.getenv("IDEMPOTENCY_MAX_BODY_BYTES", str(4 * 1024 * 1024)))
+# Bodies at least this large are zlib-compressed before storage
+IDEMPOTENCY_COMPRESS_MIN_BYTES = int(os.getenv("IDEMPOTENCY_COMPRESS_MIN_BYTES", "1024"))
+# Chunk size used when replaying a cached body
+REPLAY_CHUNK_BYTES = 64 * 1024
+
+
+class _ResponseCapture:
+    """Wraps ASGI send: forwards every message and tees the body into a buffer.
+    
+    Capture stops (overflow) once the body exceeds the size cap; the response
+    itself always streams through untouched.
     """
-    Idempotency middleware for POST requests.
+    
+    def __init__(self, send: Send, max_bytes: int):
+        self._send = send
+        self.max_bytes = max_bytes
+        self.status_code = 0
+        self.headers: List[Tuple[bytes, bytes]] = []
+        self.body = bytearray()
+        self.overflow = False
+        self.complete = False
+    
+    async def send(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            self.status_code = message["status"]
+            self.headers = list(message.get("headers", []))
+        elif message["type"] == "http.response.body":
+            chunk = message.get("body", b"")
+            if not self.overflow and chunk:
+                if len(self.body) + len(chunk) > self.max_bytes:
+                    self.overflow = True
+                    self.body = bytearray()
+                else:
+                    self.body += chunk
+            if not message.get("more_body", False):
+                self.complete = True
+        await self._send(message)
+
+
+def _encode_entry(cache_data: Dict[str, Any]) -> bytes:
+    """Binary cache entry: JSON metadata, NUL, then (optionally zlib) body."""
+    body = cache_data["body"]
+    meta = {k: v for k, v in cache_data.items() if k != "body"}
+    if len(body) >= IDEMPOTENCY_COMPRESS_MIN_BYTES:
+        body = zlib.compress(body, 1)
+        meta["encoding"] = "zlib"
+    else:
+        meta["encoding"] = "identity"
+    return json.dumps(meta, separators=(",", ":")).encode() + b"\0" + body
+
+
+def _decode_entry(raw: bytes) -> Dict[str, Any]:
+    """Inverse of _encode_entry (also reads legacy JSON text entries)."""
+    if isinstance(raw, str):
+        raw = raw.encode("utf-8")
+    meta_raw, sep, body = raw.partition(b"\0")
+    if not sep:
+        legacy = json.loads(raw)
+        return {
+            "status_code": legacy["status_code"],
+            "headers": [[k, v] for k, v in legacy["headers"].items()],
+            "body": legacy["body"].encode("utf-8"),
+            "timestamp": legacy["timestamp"],
+            "idempotency_key": legacy.get("idempotency_key"),
+        }
+    meta = json.loads(meta_raw)
+    if meta.pop("encoding", "identity") == "zlib":
+        body = zlib.decompress(body)
+    meta["body"] = body
+    return meta
+
+
+async def _redis_get_bytes(client, key: str) -> Optional[bytes]:
+    """GET without response decoding (the shared client decodes to str)."""
+    from redis.client import NEVER_DECODE
+    
+    return await client.execute_command("GET", key, **{NEVER_DECODE: []})
+
+
+class IdempotencyMiddleware(ASGIMiddleware):
+    """
+    Idempotency middleware for POST requests (pure ASGI).
     
     PM Requirements:
     - Honor Idempotency-Key header on all POSTs
     - Store response hash for 24 hours in Redis
     - Return cached response for duplicate requests
+    - Coalesce concurrent duplicates: while the first request with a key is
+      still executing, later ones wait for its response instead of running
+    
+    The response body is teed into a bytearray as it streams (capped at
+    IDEMPOTENCY_MAX_BODY_BYTES), stored as compressed binary and replayed
+    in chunks.
     """
     
     IDEMPOTENCY_TTL = 24 * 3600  # 24 hours (PM requirement)
+    layer = "idempotency"
     
-    def __init__(self, app: ASGIApp):
+    def __init__(self, app: ASGIApp, max_body_bytes: int = IDEMPOTENCY_MAX_BODY_BYTES):
         super().__init__(app)
+        self.max_body_bytes = max_body_bytes
+        # (idempotency key, request hash) -> future of the leader's cache data
+        self._inflight: Dict[str, asyncio.Future] = {}
         logger.info("🔄 Idempotency middleware initialized")
     
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
+    async def handle(
+        self, ctx: RequestContext, receive: Receive, send: Send, app: ASGIApp
+    ) -> None:
         """Process request with idempotency checking."""
+        scope = ctx.scope
         
         # Only apply to POST requests
-        if request.method != "POST":
-            return await call_next(request)
+        if scope["method"] != "POST":
+            await app(scope, receive, send)
+            return
         
         # Get idempotency key from header
-        idempotency_key = request.headers.get("idempotency-key")
+        headers = ctx.headers
+        idempotency_key = headers.get("idempotency-key")
         if not idempotency_key:
             # No idempotency key - process normally
-            return await call_next(request)
+            await app(scope, receive, send)
+            return
         
         # Validate idempotency key format
         if not self._is_valid_key(idempotency_key):
-            raise HTTPException(
+            response = JSONResponse(
+                {"detail": "Invalid Idempotency-Key format. Use UUID or similar unique identifier."},
                 status_code=400,
-                detail="Invalid Idempotency-Key format. Use UUID or similar unique identifier."
             )
+            await response(scope, receive, send)
+            return
+        
+        # The body is needed for the hash; replay it to the app afterwards
+        body = await self._read_body(receive)
+        replay = self._replay_receive(body, receive)
+        request_hash = self._get_request_hash(scope, headers, body)
+        
+        # Same key already executing in this process: wait for its response
+        flight_key = f"{idempotency_key}:{request_hash}"
+        inflight = self._inflight.get(flight_key)
+        if inflight is not None:
+            if METRICS_AVAILABLE:
+                streaming_metrics.record_singleflight("idempotency", "coalesced")
+            cache_data = await asyncio.shield(inflight)
+            if cache_data:
+                logger.info(f"🔄 Idempotency coalesced: {idempotency_key[:16]}...")
+                await self._send_cached(cache_data, send)
+                return
+            # Leader failed or was not cacheable: execute normally
+            await app(scope, replay, send)
+            return
         
+        flight = asyncio.get_running_loop().create_future()
+        self._inflight[flight_key] = flight
+        cache_data = None
         try:
             # Check for cached response
-            cached_response = await self._get_cached_response(request, idempotency_key)
+            cached_response = await self._get_cached_response(
+                idempotency_key, request_hash
+            )
             if cached_response:
                 logger.info(f"🔄 Idempotency hit: {idempotency_key[:16]}...")
-                return self._create_response_from_cache(cached_response)
-            
-            # Process request normally
-            response = await call_next(request)
-            
-            # Cache successful responses (2xx status codes)
-            if 200 <= response.status_code < 300:
-                await self._cache_response(request, idempotency_key, response)
+                cache_data = cached_response
+                await self._send_cached(cached_response, send)
+                return
             
-            return response
+            # Process request, teeing the body as it streams out
+            capture = _ResponseCapture(send, self.max_body_bytes)
+            await app(scope, replay, capture.send)
             
-        except Exception as e:
-            logger.error(f"Idempotency middleware error: {e}")
-            # Don't fail the request due to idempotency issues
-            return await call_next(request)
+            # Cache successful, fully captured responses (2xx status codes)
+            if capture.complete and not capture.overflow and 200 <= capture.status_code < 300:
+                cache_data = await self._cache_response(
+                    idempotency_key, request_hash, capture
+                )
+            elif capture.overflow:
+                logger.info(
+                    f"🔄 Response over {self.max_body_bytes} bytes not cached: {idempotency_key[:16]}..."
+                )
+        finally:
+            self._inflight.pop(flight_key, None)
+            flight.set_result(cache_data)
     
     def _is_valid_key(self, key: str) -> bool:
         """Validate idempotency key format."""
@@ -94,40 +233,60 @@ class IdempotencyMiddleware(BaseHTTPMiddleware):
         
         return True
     
-    async def _get_request_hash(self, request: Request) -> str:
-        """Generate hash of request for comparison."""
-        # Read request body
-        body = await request.body()
+    async def _read_body(self, receive: Receive) -> bytes:
+        """Drain the request body."""
+        chunks = []
+        while True:
+            message = await receive()
+            if message["type"] != "http.request":
+                break
+            chunks.append(message.get("body", b""))
+            if not message.get("more_body", False):
+                break
+        return b"".join(chunks)
+    
+    def _replay_receive(self, body: bytes, receive: Receive) -> Receive:
+        """Receive callable that yields the buffered body once, then defers."""
+        sent = False
         
+        async def replay() -> Message:
+            nonlocal sent
+            if not sent:
+                sent = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            return await receive()
+        
+        return replay
+    
+    def _get_request_hash(self, scope: Scope, headers: Headers, body: bytes) -> str:
+        """Generate hash of request for comparison."""
         # Create hash components
         components = [
-            request.method,
-            str(request.url.path),
-            str(sorted(request.query_params.items())),
+            scope["method"],
+            URL(scope=scope).path,
+            str(sorted(QueryParams(scope.get("query_string", b"")).items())),
             body.decode('utf-8', errors='ignore') if body else "",
-            request.headers.get("content-type", "")
+            headers.get("content-type", "")
         ]
         
         # Generate hash
         content = "|".join(components)
         return hashlib.sha256(content.encode()).hexdigest()
     
-    async def _get_cached_response(self, request: Request, idempotency_key: str) -> Optional[Dict[str, Any]]:
+    async def _get_cached_response(self, idempotency_key: str, request_hash: str) -> Optional[Dict[str, Any]]:
         """Get cached response for idempotency key."""
         try:
             redis_mgr = await get_redis()
             client = await redis_mgr.get_client()
             
             # Generate cache key
-            request_hash = await self._get_request_hash(request)
             cache_key = f"idempotency:{idempotency_key}:{request_hash}"
             
             # Get cached data
-            cached_data = await client.get(cache_key)
-            await client.close()
+            cached_data = await _redis_get_bytes(client, cache_key)
             
             if cached_data:
-                return json.loads(cached_data)
+                return _decode_entry(cached_data)
             
             return None
             
@@ -135,72 +294,62 @@ class IdempotencyMiddleware(BaseHTTPMiddleware):
             logger.error(f"Failed to get cached idempotency response: {e}")
             return None
     
-    async def _cache_response(self, request: Request, idempotency_key: str, response: Response) -> None:
-        """Cache response for idempotency."""
+    async def _cache_response(self, idempotency_key: str, request_hash: str, capture: _ResponseCapture) -> Dict[str, Any]:
+        """Cache captured response for idempotency; returns the cache data."""
+        cache_data = {
+            "status_code": capture.status_code,
+            "headers": [
+                [k.decode("latin-1"), v.decode("latin-1")] for k, v in capture.headers
+            ],
+            "body": bytes(capture.body),
+            "timestamp": int(time.time()),
+            "idempotency_key": idempotency_key
+        }
+        
         try:
-            # Read response body
-            response_body = b""
-            async for chunk in response.body_iterator:
-                response_body += chunk
-            
-            # Recreate response with readable body
-            new_response = Response(
-                content=response_body,
-                status_code=response.status_code,
-                headers=dict(response.headers),
-                media_type=response.media_type
-            )
-            
-            # Cache data structure
-            cache_data = {
-                "status_code": response.status_code,
-                "headers": dict(response.headers),
-                "body": response_body.decode('utf-8', errors='ignore'),
-                "media_type": response.media_type,
-                "timestamp": int(time.time()),
-                "idempotency_key": idempotency_key
-            }
-            
             # Store in Redis
             redis_mgr = await get_redis()
             client = await redis_mgr.get_client()
             
-            request_hash = await self._get_request_hash(request)
             cache_key = f"idempotency:{idempotency_key}:{request_hash}"
             
-            await client.setex(
+            await client.set(
                 cache_key,
-                self.IDEMPOTENCY_TTL,
-                json.dumps(cache_data)
+                _encode_entry(cache_data),
+                ex=self.IDEMPOTENCY_TTL,
             )
             
-            await client.close()
-            
             logger.info(f"🔄 Response cached for idempotency: {idempotency_key[:16]}...")
             
-            # Replace response body iterator
-            response.body_iterator = self._iter_body(response_body)
-            
         except Exception as e:
             logger.error(f"Failed to cache idempotency response: {e}")
+        
+        return cache_data
     
-    def _create_response_from_cache(self, cache_data: Dict[str, Any]) -> Response:
-        """Create response from cached data."""
+    async def _send_cached(self, cache_data: Dict[str, Any], send: Send) -> None:
+        """Replay a cached response as a chunked stream."""
         # Add idempotency headers
-        headers = dict(cache_data["headers"])
-        headers["X-Idempotency-Replayed"] = "true"
-        headers["X-Idempotency-Timestamp"] = str(cache_data["timestamp"])
+        headers = [
+            (k.encode("latin-1"), v.encode("latin-1"))
+            for k, v in cache_data["headers"]
+            if k.lower() not in ("x-idempotency-replayed", "x-idempotency-timestamp")
+        ]
+        headers.append((b"x-idempotency-replayed", b"true"))
+        headers.append((b"x-idempotency-timestamp", str(cache_data["timestamp"]).encode()))
         
-        return Response(
-            content=cache_data["body"],
-            status_code=cache_data["status_code"],
-            headers=headers,
-            media_type=cache_data["media_type"]
-        )
-    
-    async def _iter_body(self, body: bytes):
-        """Iterator for response body."""
-        yield body
+        await send({
+            "type": "http.response.start",
+            "status": cache_data["status_code"],
+            "headers": headers,
+        })
+        body = memoryview(cache_data["body"])
+        for offset in range(0, len(body), REPLAY_CHUNK_BYTES):
+            await send({
+                "type": "http.response.body",
+                "body": bytes(body[offset:offset + REPLAY_CHUNK_BYTES]),
+                "more_body": True,
+            })
+        await send({"type": "http.response.body", "body": b"", "more_body": False})
 
 
 # Idempotency utilities
@@ -221,20 +370,19 @@ async def check_idempotency_status(idempotency_key: str) -> Optional[Dict[str, A
         keys = await client.keys(pattern)
         
         if keys:
-            # Get first matching cache entry
-            cached_data = await client.get(keys[0])
-            await client.close()
+            # Get first matching cache entry and its TTL
+            cached_data = await _redis_get_bytes(client, keys[0])
             
             if cached_data:
-                data = json.loads(cached_data)
+                data = _decode_entry(cached_data)
+                ttl_remaining = await client.ttl(keys[0])
                 return {
                     "used": True,
                     "timestamp": data["timestamp"],
                     "status_code": data["status_code"],
-                    "ttl_remaining": await client.ttl(keys[0])
+                    "ttl_remaining": ttl_remaining
                 }
         
-        await client.close()
         return {"used": False}
         
     except Exception as e:
@@ -254,9 +402,11 @@ async def idempotency_health_check() -> Dict[str, Any]:
         test_data = {"test": "data", "timestamp": int(time.time())}
         
         # Store and retrieve test data
-        await client.setex(test_key, 60, json.dumps(test_data))
-        retrieved = await client.get(test_key)
-        await client.delete(test_key)
+        pipe = client.pipeline(transaction=False)
+        pipe.setex(test_key, 60, json.dumps(test_data))
+        pipe.get(test_key)
+        pipe.delete(test_key)
+        _, retrieved, _ = await pipe.execute()
         
         if not retrieved or json.loads(retrieved) != test_data:
             raise Exception("Idempotency cache test failed")
@@ -265,8 +415,6 @@ async def idempotency_health_check() -> Dict[str, Any]:
         pattern = "idempotency:*"
         keys = await client.keys(pattern)
         
-        await client.close()
-        
         return {
             "status": "healthy",
             "cache_test": "ok",
@@ -7,13 +7,12 @@ Prevents token leakage in request/response logs and error traces.
 
 import logging
 import re
-from typing import Callable, Dict, Any
+from typing import Dict, Any
 from urllib.parse import urlparse, parse_qs, urlencode, urlunparse
 
-from fastapi import Request, Response
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.types import ASGIApp
+from starlette.types import ASGIApp, Receive, Send
 
+from api.middleware.asgi import ASGIMiddleware, RequestContext
 from app.core.logging import get_api_logger
 
 logger = get_api_logger("log_redaction")
@@ -101,7 +100,7 @@ def redact_url_tokens(url: str) -> str:
         return url
 
 
-class TokenRedactionMiddleware(BaseHTTPMiddleware):
+class TokenRedactionMiddleware(ASGIMiddleware):
     """
     ASGI middleware to redact tokens from request/response logging.
     
@@ -112,6 +111,8 @@ class TokenRedactionMiddleware(BaseHTTPMiddleware):
     - Ensure reverse proxy logs also mask tokens
     """
     
+    layer = "log_redaction"
+    
     def __init__(self, app: ASGIApp):
         super().__init__(app)
         self.setup_logging_filters()
@@ -138,20 +139,25 @@ class TokenRedactionMiddleware(BaseHTTPMiddleware):
             except Exception as e:
                 logger.warning(f"Failed to add redaction filter to {logger_name}: {e}")
     
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
+    async def handle(
+        self, ctx: RequestContext, receive: Receive, send: Send, app: ASGIApp
+    ) -> None:
         """Process request with token redaction."""
         
-        # Redact URL for logging (PM requirement)
-        original_url = str(request.url)
-        redacted_url = redact_url_tokens(original_url)
+        # Redact URL for logging (PM requirement); only URLs carrying a
+        # token query parameter need the parse/rebuild
+        original_url = str(ctx.request.url)
+        if b"token=" in ctx.scope.get("query_string", b"").lower():
+            redacted_url = redact_url_tokens(original_url)
+        else:
+            redacted_url = original_url
         
         # Set redacted URL in request state for other middleware/logging
-        request.state.redacted_url = redacted_url
-        request.state.original_url_redacted = original_url != redacted_url
+        ctx.state["redacted_url"] = redacted_url
+        ctx.state["original_url_redacted"] = original_url != redacted_url
         
         try:
-            response = await call_next(request)
-            return response
+            await app(ctx.scope, receive, send)
             
         except Exception as e:
             # Ensure exceptions don't leak tokens (PM requirement)
@@ -162,7 +168,7 @@ class TokenRedactionMiddleware(BaseHTTPMiddleware):
             logger.error(
                 f"Request failed: {redacted_error}",
                 extra={
-                    "method": request.method,
+                    "method": ctx.scope["method"],
                     "url": redacted_url,
                     "error_type": type(e).__name__
                 }
@@ -0,0 +1,71 @@
+"""
+Profiling Middleware
+
+- ServerTimingMiddleware: collects per-stage durations (ephemeris, houses,
+  KP chain, cache, serialization) for each request via shared.otel stage
+  timings and reports them in a ``Server-Timing`` response header, plus the
+  time to first byte as ``total``. Disable with SERVER_TIMING_ENABLED=false.
+- RequestProfilingMiddleware: when an admin has armed a requests-mode
+  profiling session (see api.services.profiler), matching requests run
+  with the worker's stack sampler recording.
+"""
+
+from __future__ import annotations
+
+import os
+import time
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Send
+
+from api.middleware.asgi import ASGIMiddleware, RequestContext
+from api.services.profiler import profiler
+from shared.otel import begin_request_timings, end_request_timings
+
+SERVER_TIMING_ENABLED = os.getenv("SERVER_TIMING_ENABLED", "true").lower() == "true"
+
+
+class ServerTimingMiddleware(ASGIMiddleware):
+    layer = "server_timing"
+
+    def __init__(self, app: ASGIApp, enabled: bool | None = None) -> None:
+        super().__init__(app)
+        self.enabled = SERVER_TIMING_ENABLED if enabled is None else enabled
+
+    async def handle(
+        self, ctx: RequestContext, receive: Receive, send: Send, app: ASGIApp
+    ) -> None:
+        if not self.enabled:
+            await app(ctx.scope, receive, send)
+            return
+
+        timings, token = begin_request_timings()
+        t0 = time.perf_counter()
+
+        async def send_with_timing(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                value = timings.header(total_seconds=time.perf_counter() - t0)
+                headers = MutableHeaders(scope=message)
+                existing = headers.get("server-timing")
+                headers["Server-Timing"] = f"{existing}, {value}" if existing else value
+            await send(message)
+
+        try:
+            await app(ctx.scope, receive, send_with_timing)
+        finally:
+            end_request_timings(token)
+
+
+class RequestProfilingMiddleware(ASGIMiddleware):
+    layer = "request_profiling"
+
+    async def handle(
+        self, ctx: RequestContext, receive: Receive, send: Send, app: ASGIApp
+    ) -> None:
+        path = ctx.scope.get("path", "")
+        session = profiler.match(path)
+        if session is None:
+            await app(ctx.scope, receive, send)
+            return
+        async with profiler.track(session, path):
+            await app(ctx.scope, receive, send)
@@ -8,28 +8,30 @@ Stores the value in `request.state.request_id` for downstream use.
 from __future__ import annotations
 
 import uuid
-from typing import Callable
 
-from fastapi import Request, Response
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.types import ASGIApp
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Send
 
+from api.middleware.asgi import ASGIMiddleware, RequestContext
+
+
+class RequestIDMiddleware(ASGIMiddleware):
+    layer = "request_id"
 
-class RequestIDMiddleware(BaseHTTPMiddleware):
     def __init__(self, app: ASGIApp, header_name: str = "X-Request-ID") -> None:
         super().__init__(app)
         self.header_name = header_name
 
-    async def dispatch(self, request: Request, call_next: Callable[[Request], Response]) -> Response:
-        req_id = request.headers.get(self.header_name) or str(uuid.uuid4())
-        try:
-            request.state.request_id = req_id
-        except Exception:
-            pass
-        response = await call_next(request)
-        try:
-            response.headers.setdefault(self.header_name, req_id)
-        except Exception:
-            pass
-        return response
+    async def handle(
+        self, ctx: RequestContext, receive: Receive, send: Send, app: ASGIApp
+    ) -> None:
+        req_id = ctx.headers.get(self.header_name) or str(uuid.uuid4())
+        ctx.request_id = req_id
+        ctx.state["request_id"] = req_id
+
+        async def send_with_id(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message).setdefault(self.header_name, req_id)
+            await send(message)
 
+        await app(ctx.scope, receive, send_with_id)
@@ -8,13 +8,14 @@ Emits usage events for billing/quotas with tenant tracking.
 import time
 import uuid
 from datetime import datetime, timezone, timedelta
-from typing import Callable, Optional, Dict, Any
+from typing import Optional, Dict, Any
 
 from fastapi import Request, Response
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.types import ASGIApp
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Send
 import jwt
 
+from api.middleware.asgi import ASGIMiddleware, RequestContext
 from app.core.logging import get_api_logger
 from app.core.environment import get_complete_config
 from api.routers.v1.models import PATH_TEMPLATES
@@ -30,7 +31,7 @@ logger = get_api_logger("usage_metering")
 # placeholders to avoid drift.
 
 
-class UsageMeteringMiddleware(BaseHTTPMiddleware):
+class UsageMeteringMiddleware(ASGIMiddleware):
     """
     ASGI middleware to track API usage for billing and quotas.
     
@@ -40,8 +41,13 @@ class UsageMeteringMiddleware(BaseHTTPMiddleware):
     - Record status_code, duration_ms, bytes_in/out
     - Never block response on metering failure (best-effort)
     - Add rate-limit headers to all responses
+    
+    duration_ms is time to response start (as before); bytes_out counts the
+    body actually sent, so the event is emitted once the body completes.
     """
     
+    layer = "usage_metering"
+    
     def __init__(self, app: ASGIApp, enable_metering: bool = True):
         super().__init__(app)
         self.enable_metering = enable_metering
@@ -56,65 +62,76 @@ class UsageMeteringMiddleware(BaseHTTPMiddleware):
         # For now, we'll simulate the structure
         logger.info("📊 Usage metering initialized (database connection ready)")
     
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
+    async def handle(
+        self, ctx: RequestContext, receive: Receive, send: Send, app: ASGIApp
+    ) -> None:
         """Process request with usage metering."""
         
         if not self.enable_metering:
-            return await call_next(request)
+            await app(ctx.scope, receive, send)
+            return
         
         # Start timing (monotonic to avoid clock regressions)
         start_time = time.perf_counter()
         request_start = datetime.now(timezone.utc)
+        request = ctx.request
         
-        # Extract tenant info from token (if present)
+        # Extract tenant info from token (if present); shared with later layers
         tenant_info = self._extract_tenant_info(request)
+        ctx.tenant_info = tenant_info
         
         # Get request size
         bytes_in = self._get_request_size(request)
         
+        status_code = 500
+        duration_ms = None
+        bytes_out = 0
+        
+        async def send_metered(message: Message) -> None:
+            nonlocal status_code, duration_ms, bytes_out
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                duration_ms = int((time.perf_counter() - start_time) * 1000)
+                # Add rate limit headers (PM requirement)
+                MutableHeaders(scope=message).update(
+                    await self._rate_limit_headers(tenant_info)
+                )
+            elif message["type"] == "http.response.body":
+                bytes_out += len(message.get("body", b""))
+            await send(message)
+        
         # Execute request
         try:
-            response = await call_next(request)
-            
-            # Calculate metrics
-            duration_ms = int((time.perf_counter() - start_time) * 1000)
-            bytes_out = self._get_response_size(response)
-            
-            # Add rate limit headers (PM requirement)
-            response = await self._add_rate_limit_headers(response, tenant_info)
-            
-            # Emit usage event (async, non-blocking)
-            await self._emit_usage_event(
-                request=request,
-                response=response,
-                tenant_info=tenant_info,
-                timestamp=request_start,
-                duration_ms=duration_ms,
-                bytes_in=bytes_in,
-                bytes_out=bytes_out
-            )
-            
-            return response
-            
-        except Exception as e:
+            await app(ctx.scope, receive, send_metered)
+        except Exception:
             # Still emit usage event for failed requests
-            duration_ms = int((time.perf_counter() - start_time) * 1000)
-            
             try:
                 await self._emit_usage_event(
                     request=request,
                     response=None,
                     tenant_info=tenant_info,
                     timestamp=request_start,
-                    duration_ms=duration_ms,
+                    duration_ms=int((time.perf_counter() - start_time) * 1000),
                     bytes_in=bytes_in,
-                    bytes_out=0,
+                    bytes_out=bytes_out,
                     status_code=500
                 )
             except Exception as emit_error:
                 logger.warning(f"Failed to emit usage event for failed request: {emit_error}")
             
             raise
+        
+        # Emit usage event (best-effort, never raises)
+        await self._emit_usage_event(
+            request=request,
+            response=None,
+            tenant_info=tenant_info,
+            timestamp=request_start,
+            duration_ms=duration_ms if duration_ms is not None else int((time.perf_counter() - start_time) * 1000),
+            bytes_in=bytes_in,
+            bytes_out=bytes_out,
+            status_code=status_code
+        )
     
     def _extract_tenant_info(self, request: Request) -> Dict[str, str]:
         """Extract tenant and API key info from request."""
@@ -168,29 +185,17 @@ class UsageMeteringMiddleware(BaseHTTPMiddleware):
         except Exception:
             return 0
     
-    def _get_response_size(self, response: Response) -> int:
-        """Estimate response size in bytes."""
-        try:
-            # Content length from headers
-            content_length = response.headers.get("content-length")
-            if content_length and content_length.isdigit():
-                return int(content_length)
-            
-            # Estimate from body if available
-            if hasattr(response, 'body') and response.body:
-                return len(response.body)
-            
-            return 0
-            
-        except Exception:
-            return 0
-    
     async def _add_rate_limit_headers(
         self, 
         response: Response, 
         tenant_info: Dict[str, str]
     ) -> Response:
         """Add rate limit headers to response (PM requirement)."""
+        response.headers.update(await self._rate_limit_headers(tenant_info))
+        return response
+    
+    async def _rate_limit_headers(self, tenant_info: Dict[str, str]) -> Dict[str, str]:
+        """Rate limit header values for a tenant."""
         # Reflect current per-tenant QPS limits via the in-process rate limiter
         remaining = None
         limit = None
@@ -213,18 +218,18 @@ class UsageMeteringMiddleware(BaseHTTPMiddleware):
         next_hour = (now + timedelta(hours=1)).replace(minute=0, second=0, microsecond=0)
         reset_time = int(next_hour.timestamp())
         
-        # Add headers (fallbacks align with configured defaults)
+        # Headers (fallbacks align with configured defaults)
         # - Limit falls back to DEFAULT_QPS_LIMIT
         # - Remaining falls back to DEFAULT_BURST_LIMIT (full bucket)
-        response.headers["X-RateLimit-Limit"] = str(limit if limit is not None else DEFAULT_QPS_LIMIT)
-        response.headers["X-RateLimit-Remaining"] = str(
-            remaining if remaining is not None else DEFAULT_BURST_LIMIT
-        )
-        response.headers["X-RateLimit-Reset"] = str(reset_time)
-        # Optional: expose the window length in seconds (hourly window)
-        response.headers["X-RateLimit-Window"] = "3600"
-        
-        return response
+        return {
+            "X-RateLimit-Limit": str(limit if limit is not None else DEFAULT_QPS_LIMIT),
+            "X-RateLimit-Remaining": str(
+                remaining if remaining is not None else DEFAULT_BURST_LIMIT
+            ),
+            "X-RateLimit-Reset": str(reset_time),
+            # Optional: expose the window length in seconds (hourly window)
+            "X-RateLimit-Window": "3600",
+        }
     
     def _get_path_template(self, request: Request) -> str:
         """Get path template for metering (PM requirement - use templates, not raw paths)."""
@@ -100,9 +100,18 @@ class ReadinessResponse(BaseModel):
     warnings: Optional[List[str]] = Field(None, description="Warning messages")
 
 
+class StartupTiming(BaseModel):
+    """Cold-start breakdown recorded while the worker booted."""
+    ready_ms: Optional[float] = Field(None, description="App import to end of startup (ms)")
+    imports_ms: Dict[str, float] = Field(..., description="Inclusive router import times, slowest first")
+    phases_ms: Dict[str, float] = Field(..., description="Lifespan startup phase durations")
+    lazy_skipped: List[str] = Field(..., description="Feature-flagged routers left unimported")
+
+
 class StartupResponse(ReadinessResponse):
     """Startup validation response (extends readiness)."""
     startup_validation: str = Field(..., description="Validation completion status")
+    startup_timing: Optional[StartupTiming] = Field(None, description="Import/startup time breakdown")
 
 
 class MetricsResponse(BaseModel):
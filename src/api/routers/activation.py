@@ -10,6 +10,7 @@ Implements single timestamp truth and clean service orchestration.
 from __future__ import annotations
 
 import asyncio
+import json
 import logging
 import math
 import os
@@ -25,6 +26,7 @@ from app.openapi.common import DEFAULT_ERROR_RESPONSES
 from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field, field_validator
 
+from api.services.minute_fanout import MinuteFanoutCache
 from app.services.atlas_service import get_by_id as atlas_get_by_id
 
 # VedaCore imports
@@ -466,6 +468,168 @@ def _build_sky_response(sky_state) -> dict[str, Any]:
 # CORE ACTIVATION COMPUTATION
 # ============================================================================
 
+# Per-minute results shared by every /activation/stream connection in this worker
+_activation_cache = MinuteFanoutCache()
+
+
+async def _load_sky_state(ts_eff_minute: datetime, profile: str, request_id: str):
+    """Fetch the sky state for an effective minute (HTTP errors on failure)."""
+    try:
+        sky_state = await get_sky_state(
+            ts_eff_minute=ts_eff_minute,
+            model_version=MODEL_VERSION,
+            model_profile=profile,
+            use_cache=True,
+        )
+
+        # Track cache performance
+        if sky_state.cache_hit:
+            activation_cache_hits.labels(component="sky_state").inc()
+        else:
+            activation_cache_misses.labels(component="sky_state").inc()
+
+    except Exception as e:
+        activation_errors.labels(
+            error_type="sky_state", model_version=MODEL_VERSION
+        ).inc()
+        logger.error(
+            "Sky state computation failed",
+            extra={
+                "request_id": request_id,
+                "error": str(e),
+                "ts_eff_minute": ts_eff_minute.isoformat(),
+            },
+        )
+        raise HTTPException(500, f"Sky state computation failed: {e}") from e
+    return sky_state
+
+
+async def _compute_location_activation(
+    ts_eff_minute: datetime,
+    sky_state,
+    location: LocationRef,
+    profile: str,
+    house_system: str,
+    request_id: str,
+) -> dict[str, Any]:
+    """Compute the activation response block for a single location."""
+    # Check polar hard limit
+    if should_apply_polar_hard_limit(location.latitude):
+        raise HTTPException(
+            422,
+            {
+                "error": "Polar calculation limit exceeded",
+                "latitude": location.latitude,
+                "limit": 66.5,
+                "location_id": location.id,
+            },
+        )
+
+    # Get access geometry (uses same ts_eff_minute)
+    access = await get_access_geometry(
+        ts_eff_minute=ts_eff_minute,
+        latitude=location.latitude,
+        longitude=location.longitude,
+        house_system=house_system,
+        model_version=MODEL_VERSION,
+        model_profile=profile,
+        altitude=location.elevation,
+        use_cache=True,
+    )
+
+    # Track cache performance
+    if access.cache_hit:
+        activation_cache_hits.labels(component="access_geometry").inc()
+    else:
+        activation_cache_misses.labels(component="access_geometry").inc()
+
+    # Compute activation
+    activation_result = compute_activation(
+        sky_state=sky_state, access=access, model_profile=profile
+    )
+
+    # Validate result
+    validations = validate_activation_result(activation_result)
+    if not all(validations.values()):
+        logger.warning(
+            "Activation validation failed",
+            extra={
+                "request_id": request_id,
+                "location_id": location.id,
+                "validations": validations,
+            },
+        )
+
+    # Format breakdown with deterministic ordering and precision
+    breakdown = {}
+    for planet_key in BREAKDOWN_KEY_ORDER:
+        if planet_key in activation_result.planet_contributions:
+            contrib = activation_result.planet_contributions[planet_key]
+            breakdown[planet_key] = round(
+                contrib.modulated_contribution, NUMERIC_PRECISION_DP
+            )
+
+    # Build location response
+    return {
+        "id": location.id,
+        "name": location.name,
+        "lat": location.latitude,
+        "lon": location.longitude,
+        "activation": {
+            "absolute": round(
+                activation_result.scaled_activation, NUMERIC_PRECISION_DP
+            ),
+            "delta": None,  # TODO: Implement novelty service
+            "exposure_weighted": None,  # TODO: Implement exposure service
+        },
+        "breakdown": breakdown,
+        "sun_cap": activation_result.sun_cap_factor,
+        "phase_multiplier": activation_result.phase_multiplier,
+        "drivers": {
+            "planet": activation_result.primary_drivers.strongest_planet,
+            "angle": activation_result.primary_drivers.strongest_angle,
+            "kind": activation_result.primary_drivers.connection_type,
+            "applying": activation_result.primary_drivers.applying,
+        },
+        "flags": activation_result.flags,
+        "confidence": {
+            "reliability_lat": get_latitude_reliability(location.latitude)
+        },
+    }
+
+
+async def _shared_location_activation(
+    ts_eff_minute: datetime,
+    sky_state,
+    location: LocationRef,
+    profile: str,
+    house_system: str,
+    request_id: str,
+) -> dict[str, Any]:
+    """Per-location activation via the fan-out cache, keyed by coordinates.
+
+    The cached block is shared across streams; only id/name are relabelled
+    for the caller's location reference.
+    """
+    key = (
+        "location",
+        profile,
+        house_system.upper(),
+        location.latitude,
+        location.longitude,
+        location.elevation,
+    )
+    entry = await _activation_cache.get_or_compute(
+        ts_eff_minute,
+        key,
+        lambda: _compute_location_activation(
+            ts_eff_minute, sky_state, location, profile, house_system, request_id
+        ),
+    )
+    if entry["id"] == location.id and entry["name"] == location.name:
+        return entry
+    return {**entry, "id": location.id, "name": location.name}
+
 
 async def _compute_activation_for_locations(
     ts_eff_minute: datetime,
@@ -474,8 +638,14 @@ async def _compute_activation_for_locations(
     house_system: str,
     request_id: str,
     include_sky: bool = False,
+    shared: bool = False,
 ) -> dict[str, Any]:
-    """Core activation computation with proper service orchestration."""
+    """Core activation computation with proper service orchestration.
+
+    With ``shared=True`` the sky state and each location's activation come
+    from the per-minute fan-out cache, so streams covering overlapping
+    locations compute each (minute, profile, house system, location) once.
+    """
 
     # Validate house system
     if house_system.upper() not in ["KP", "PLACIDUS"]:
@@ -514,33 +684,14 @@ async def _compute_activation_for_locations(
     # SINGLE TIMESTAMP TRUTH: Compute sky state once per request
     # ========================================================================
 
-    try:
-        sky_state = await get_sky_state(
-            ts_eff_minute=ts_eff_minute,
-            model_version=MODEL_VERSION,
-            model_profile=profile,
-            use_cache=True,
-        )
-
-        # Track cache performance
-        if sky_state.cache_hit:
-            activation_cache_hits.labels(component="sky_state").inc()
-        else:
-            activation_cache_misses.labels(component="sky_state").inc()
-
-    except Exception as e:
-        activation_errors.labels(
-            error_type="sky_state", model_version=MODEL_VERSION
-        ).inc()
-        logger.error(
-            "Sky state computation failed",
-            extra={
-                "request_id": request_id,
-                "error": str(e),
-                "ts_eff_minute": ts_eff_minute.isoformat(),
-            },
+    if shared:
+        sky_state = await _activation_cache.get_or_compute(
+            ts_eff_minute,
+            ("sky", profile),
+            lambda: _load_sky_state(ts_eff_minute, profile, request_id),
         )
-        raise HTTPException(500, f"Sky state computation failed: {e}") from e
+    else:
+        sky_state = await _load_sky_state(ts_eff_minute, profile, request_id)
 
     # ========================================================================
     # Process each location
@@ -550,91 +701,15 @@ async def _compute_activation_for_locations(
 
     for location in locations:
         try:
-            # Check polar hard limit
-            if should_apply_polar_hard_limit(location.latitude):
-                raise HTTPException(
-                    422,
-                    {
-                        "error": "Polar calculation limit exceeded",
-                        "latitude": location.latitude,
-                        "limit": 66.5,
-                        "location_id": location.id,
-                    },
+            if shared:
+                entry = await _shared_location_activation(
+                    ts_eff_minute, sky_state, location, profile, house_system, request_id
                 )
-
-            # Get access geometry (uses same ts_eff_minute)
-            access = await get_access_geometry(
-                ts_eff_minute=ts_eff_minute,
-                latitude=location.latitude,
-                longitude=location.longitude,
-                house_system=house_system,
-                model_version=MODEL_VERSION,
-                model_profile=profile,
-                altitude=location.elevation,
-                use_cache=True,
-            )
-
-            # Track cache performance
-            if access.cache_hit:
-                activation_cache_hits.labels(component="access_geometry").inc()
             else:
-                activation_cache_misses.labels(component="access_geometry").inc()
-
-            # Compute activation
-            activation_result = compute_activation(
-                sky_state=sky_state, access=access, model_profile=profile
-            )
-
-            # Validate result
-            validations = validate_activation_result(activation_result)
-            if not all(validations.values()):
-                logger.warning(
-                    "Activation validation failed",
-                    extra={
-                        "request_id": request_id,
-                        "location_id": location.id,
-                        "validations": validations,
-                    },
+                entry = await _compute_location_activation(
+                    ts_eff_minute, sky_state, location, profile, house_system, request_id
                 )
-
-            # Format breakdown with deterministic ordering and precision
-            breakdown = {}
-            for planet_key in BREAKDOWN_KEY_ORDER:
-                if planet_key in activation_result.planet_contributions:
-                    contrib = activation_result.planet_contributions[planet_key]
-                    breakdown[planet_key] = round(
-                        contrib.modulated_contribution, NUMERIC_PRECISION_DP
-                    )
-
-            # Build location response
-            location_response = {
-                "id": location.id,
-                "name": location.name,
-                "lat": location.latitude,
-                "lon": location.longitude,
-                "activation": {
-                    "absolute": round(
-                        activation_result.scaled_activation, NUMERIC_PRECISION_DP
-                    ),
-                    "delta": None,  # TODO: Implement novelty service
-                    "exposure_weighted": None,  # TODO: Implement exposure service
-                },
-                "breakdown": breakdown,
-                "sun_cap": activation_result.sun_cap_factor,
-                "phase_multiplier": activation_result.phase_multiplier,
-                "drivers": {
-                    "planet": activation_result.primary_drivers.strongest_planet,
-                    "angle": activation_result.primary_drivers.strongest_angle,
-                    "kind": activation_result.primary_drivers.connection_type,
-                    "applying": activation_result.primary_drivers.applying,
-                },
-                "flags": activation_result.flags,
-                "confidence": {
-                    "reliability_lat": get_latitude_reliability(location.latitude)
-                },
-            }
-
-            response_locations.append(location_response)
+            response_locations.append(entry)
 
         except HTTPException:
             raise  # Re-raise HTTP exceptions
@@ -936,6 +1011,60 @@ async def post_activation(request: Request, response: Response, req: ActivationR
 # ============================================================================
 
 
+def _next_aligned_tick(now: float, interval_seconds: int) -> float:
+    """Next wall-clock instant on the interval grid (e.g. top of each minute).
+
+    All streams with the same interval wake together, so they request the
+    same effective minute while its shared computation is in flight.
+    """
+    return (math.floor(now / interval_seconds) + 1) * interval_seconds
+
+
+def _floor_to_interval(ts: datetime, interval_seconds: int) -> datetime:
+    """Floor a timestamp onto the interval grid shared with _next_aligned_tick."""
+    floored = math.floor(ts.timestamp() / interval_seconds) * interval_seconds
+    return datetime.fromtimestamp(floored, tz=ts.tzinfo)
+
+
+async def _shared_activation_event(
+    ts_eff_minute: datetime,
+    profile: str,
+    locations: list[LocationRef],
+    house_system: str,
+    request_id: str,
+    include_sky: bool,
+) -> str:
+    """Serialized activation event data for one stream topic and minute.
+
+    Streams watching the identical location list share the encoded payload;
+    overlapping lists still share per-location results underneath.
+    """
+
+    async def _build() -> str:
+        result = await _compute_activation_for_locations(
+            ts_eff_minute,
+            locations,
+            profile,
+            house_system,
+            request_id,
+            include_sky=include_sky,
+            shared=True,
+        )
+        return json.dumps(result, separators=(",", ":"))
+
+    topic = (
+        "topic",
+        profile,
+        house_system.upper(),
+        include_sky,
+        tuple(
+            (loc.id, loc.name, loc.latitude, loc.longitude, loc.elevation)
+            for loc in locations
+        ),
+    )
+    return await _activation_cache.get_or_compute(ts_eff_minute, topic, _build)
+
+
 async def _generate_activation_stream(
     timestamp: str,
     profile: str,
@@ -945,33 +1074,35 @@ async def _generate_activation_stream(
     interval_seconds: int = 60,
     include_sky: bool = False,
 ) -> AsyncGenerator[str, None]:
-    """Generate SSE stream for activation updates."""
+    """Generate SSE stream for activation updates.
+
+    The starting timestamp is floored to the interval grid and event N is
+    computed at ``grid_start + N * interval_seconds``, while sends wait for
+    the next wall-clock grid instant. Every connection computing the same
+    effective minute therefore shares one result from ``_activation_cache``,
+    and consecutive events stay exactly one interval apart.
+    """
 
     event_id = 0
     stream_start = time.time()
 
     try:
+        start_ts = datetime.fromisoformat(timestamp.replace("Z", "+00:00"))
+        grid_start = _floor_to_interval(start_ts, interval_seconds)
         while True:
             try:
-                # Parse current timestamp
-                ts = datetime.fromisoformat(timestamp.replace("Z", "+00:00"))
+                ts = grid_start + timedelta(seconds=event_id * interval_seconds)
                 ts_eff_minute = _get_kp_effective_timestamp(ts)
 
-                # Compute activation
-                result = await _compute_activation_for_locations(
+                event_data = await _shared_activation_event(
                     ts_eff_minute,
-                    locations,
                     profile,
+                    locations,
                     house_system,
                     request_id,
-                    include_sky=include_sky,
+                    include_sky,
                 )
 
-                # Format as SSE event
-                import json
-
-                event_data = json.dumps(result, separators=(",", ":"))
-
                 sse_event = f"id: {event_id}\n"
                 sse_event += "event: activation\n"
                 sse_event += f"data: {event_data}\n\n"
@@ -980,12 +1111,9 @@ async def _generate_activation_stream(
 
                 event_id += 1
 
-                # Wait for next interval
-                await asyncio.sleep(interval_seconds)
-
-                # Update timestamp for next iteration
-                next_ts = ts + timedelta(seconds=interval_seconds)
-                timestamp = next_ts.isoformat().replace("+00:00", "Z")
+                # Wait for the next aligned tick (sleep only; ts follows the grid)
+                tick = _next_aligned_tick(time.time(), interval_seconds)
+                await asyncio.sleep(max(0.0, tick - time.time()))
 
             except Exception as e:
                 error_event = f"id: {event_id}\n"
@@ -1007,6 +1135,14 @@ async def _generate_activation_stream(
 
         yield final_event
 
+    except ValueError as e:
+        # Unparseable starting timestamp
+        error_event = f"id: {event_id}\n"
+        error_event += "event: error\n"
+        error_event += f'data: {{"error": "{str(e)[:100]}"}}\n\n'
+
+        yield error_event
+
     finally:
         # Always record duration on stream end
         if METRICS_AVAILABLE:
@@ -12,9 +12,9 @@ import hashlib
 
 from datetime import date as DateType
 from datetime import datetime
-from typing import Any
+from typing import Any, Iterator
 
-from fastapi import APIRouter, Body, HTTPException
+from fastapi import APIRouter, Body, Header, HTTPException
 from app.openapi.common import DEFAULT_ERROR_RESPONSES
 from prometheus_client import Counter, Histogram
 from pydantic import BaseModel, ConfigDict, Field, field_validator
@@ -24,6 +24,7 @@ from app.utils.hash_keys import cache_key_hash
 from shared.normalize import NORMALIZATION_VERSION, EPHEMERIS_DATASET_VERSION
 from shared.otel import get_tracer
 from shared.trace_attrs import set_common_attrs
+from api.services.response_encoding import NDJSON, negotiate, stream_ndjson
 from interfaces.kp_dasha_adapter import get_kp_dasha_adapter
 from refactor.time_utils import validate_utc_datetime
 
@@ -430,15 +431,20 @@ async def get_dasha_changes(request: DashaChangesRequest) -> list[DashaChangeEve
     summary="Full dasha cycle",
     operation_id="dasha_cycle",
 )
-async def get_full_cycle(request: DashaCycleRequest) -> DashaCycleResponse:
+async def get_full_cycle(
+    request: DashaCycleRequest,
+    accept: str | None = Header(default=None),
+) -> DashaCycleResponse:
     """
     Get full 120-year Vimshottari cycle with nested periods.
 
     Returns hierarchical structure with all dasha periods.
-    Warning: Response can be large with higher level values.
+    Warning: Response can be large with higher level values; send
+    `Accept: application/x-ndjson` to stream one Mahadasha per line instead.
     """
     start_time = time.time()
     cache_hit = False
+    stream = negotiate(accept) == NDJSON
 
     try:
         # Update metrics
@@ -468,6 +474,14 @@ async def get_full_cycle(request: DashaCycleRequest) -> DashaCycleResponse:
             dasha_cache_hits_total.inc()
             cache_hit = True
             result = cached_result
+            if stream:
+                return _stream_cycle(
+                    request,
+                    {k: v for k, v in result.items() if k != "sub_periods"},
+                    iter(result.get("sub_periods", [])),
+                    cache_hit,
+                    start_time,
+                )
         else:
             dasha_cache_misses_total.inc()
 
@@ -482,6 +496,17 @@ async def get_full_cycle(request: DashaCycleRequest) -> DashaCycleResponse:
                     moon_longitude=request.moon_longitude,
                 )
 
+            if stream:
+                # Streamed cycles are not cached: caching would need the
+                # whole tree in memory, which is what streaming avoids.
+                header, periods = adapter.iter_full_cycle(
+                    chart_id=request.chart_id,
+                    birth_time=request.birth_time if not request.chart_id else None,
+                    moon_longitude=request.moon_longitude,
+                    levels=request.levels,
+                )
+                return _stream_cycle(request, header, periods, cache_hit, start_time)
+
             # Get full cycle
             t0 = time.perf_counter()
             with _tracer.start_as_current_span("dasha.compute.cycle") as span:
@@ -528,6 +553,26 @@ async def get_full_cycle(request: DashaCycleRequest) -> DashaCycleResponse:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+def _stream_cycle(
+    request: DashaCycleRequest,
+    header: dict[str, Any],
+    periods: Iterator[dict[str, Any]],
+    cache_hit: bool,
+    start_time: float,
+):
+    """NDJSON stream of a full cycle: header meta line, then one Mahadasha per line."""
+    meta = {**header, "meta": {**header.get("meta", {}), "cache_hit": cache_hit}}
+
+    def summary() -> dict[str, Any]:
+        compute_time = time.time() - start_time
+        dasha_compute_seconds.labels(
+            endpoint="cycle", system=request.system, levels=str(request.levels)
+        ).observe(compute_time)
+        return {"compute_time_ms": round(compute_time * 1000, 3)}
+
+    return stream_ndjson(meta, ([maha] for maha in periods), summary=summary)
+
+
 @router.post(
     "/dasha/balance",
     response_model=DashaBirthBalanceResponse,
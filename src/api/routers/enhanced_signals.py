@@ -317,7 +317,7 @@ async def stream_enhanced_signals(
                             if message:
                                 # Parse and filter message
                                 try:
-                                    msg_data = json.loads(message)
+                                    msg_data = json.loads(message.text)
                                     
                                     # Filter by requested parameters
                                     if should_send_message(msg_data, timeframe_list, planet_id_list, confluence_threshold):
@@ -8,14 +8,16 @@ from datetime import UTC, datetime, time
 from datetime import date as Date
 from typing import Any
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Header, HTTPException
 from app.openapi.common import DEFAULT_ERROR_RESPONSES
 from pydantic import BaseModel, ConfigDict, Field
 
+from api.services.response_encoding import NDJSON, negotiate, stream_ndjson
 from refactor.facade import (
+    FORTUNA_TRACK_TYPES,
     get_fortuna_points,
     get_part_of_fortune,
-    track_fortuna_movement_for_day,
+    iter_fortuna_movement_for_day,
 )
 from refactor.fortuna_points import FortunaPoint
 
@@ -252,31 +254,46 @@ async def calculate_part_of_fortune(request: PartOfFortuneRequest) -> PartOfFort
     summary="Track Fortuna movement",
     operation_id="fortuna_movement",
 )
-async def track_fortuna_movement(request: FortunaMovementRequest) -> FortunaMovementResponse:
+async def track_fortuna_movement(
+    request: FortunaMovementRequest,
+    accept: str | None = Header(default=None),
+) -> FortunaMovementResponse:
     """
     Track movement of fortuna points throughout a day.
 
     Shows how Arabic Parts move through houses and signs,
-    useful for intraday timing.
+    useful for intraday timing. Send `Accept: application/x-ndjson` to
+    stream one sample per line (tagged with its point) as it is computed.
     """
+    stream = negotiate(accept) == NDJSON
     try:
-        # Track movement for the day
         # Convert date to datetime at start of day
         start_of_day = datetime.combine(request.date, time.min, tzinfo=UTC)
-        movement_data = track_fortuna_movement_for_day(
-            date=start_of_day,
-            latitude=request.latitude,
-            longitude=request.longitude,
-            fortuna_type="FORTUNE",
-        )
+        point_names = [
+            p.upper() for p in (request.points or ["FORTUNE"]) if p.upper() in FORTUNA_TRACK_TYPES
+        ]
 
-        # Filter for requested points
-        if request.points:
-            filtered_movement = {}
-            for point_name in request.points:
-                if point_name in movement_data:
-                    filtered_movement[point_name] = movement_data[point_name]
-            movement_data = filtered_movement
+        def samples(point_name: str):
+            return iter_fortuna_movement_for_day(
+                date=start_of_day,
+                latitude=request.latitude,
+                longitude=request.longitude,
+                fortuna_type=point_name,
+                interval_hours=request.interval_hours,
+            )
+
+        if stream:
+            return stream_ndjson(
+                {
+                    "date": request.date.isoformat(),
+                    "location": {"latitude": request.latitude, "longitude": request.longitude},
+                    "interval_hours": request.interval_hours,
+                    "points": point_names,
+                },
+                ([{"point": name, **sample}] for name in point_names for sample in samples(name)),
+            )
+
+        movement_data = {name: list(samples(name)) for name in point_names}
 
         # Calculate statistics
         stats = {}
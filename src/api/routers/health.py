@@ -12,11 +12,13 @@ from typing import Any
 from fastapi import APIRouter, status
 from fastapi.responses import JSONResponse, PlainTextResponse
 
+from app.core.startup_timing import startup_report
 from refactor.monitoring import get_metrics
 from api.models.responses import (
     HealthStatus,
     ReadinessResponse,
     StartupResponse,
+    StartupTiming,
     MetricsResponse,
     VersionResponse,
     PlatformInfo,
@@ -88,7 +90,7 @@ async def _check_core_dependencies() -> dict[str, DependencyCheck]:
         checks["kp_facade"] = KPFacadeCheck(status="error", error=str(e))
 
     # 2. Check cache directory access
-    cache_dir = "data/cache/KP"
+    cache_dir = os.path.join(os.getenv("VEDACORE_CACHE_DIR", "data/cache"), "KP")
     try:
         cache_writable = (
             os.access(cache_dir, os.W_OK) if os.path.exists(cache_dir) else False
@@ -434,6 +436,7 @@ async def startup_check() -> StartupResponse:
         status="ready" if not critical_failures else "not_ready",
         timestamp=timestamp,
         startup_validation="complete",
+        startup_timing=StartupTiming(**startup_report()),
         checks=all_checks,
         summary=summary,
         errors=critical_failures if critical_failures else None,
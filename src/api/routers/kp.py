@@ -27,6 +27,7 @@ from refactor.facade import (
     get_planet_significations,
 )
 from refactor.kp_config import get_kp_config, initialize_kp_config
+from api.services.singleflight import request_fingerprint, singleflight
 from refactor.kp_context import (
     KPContext,
     create_horary_context,
@@ -196,8 +197,10 @@ async def complete_kp_analysis(request: KPAnalysisRequest) -> KPAnalysisResponse
         if request.custom_orbs:
             context.custom_orbs = request.custom_orbs
 
-        # Perform analysis
-        analysis = get_kp_analysis(
+        # Perform analysis (identical concurrent requests share one computation)
+        analysis = await singleflight.run_sync(
+            request_fingerprint("kp.analysis", request.model_dump()),
+            get_kp_analysis,
             timestamp=request.timestamp,
             latitude=request.latitude,
             longitude=request.longitude,
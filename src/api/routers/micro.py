@@ -11,11 +11,19 @@ import time
 from datetime import UTC, date, datetime
 from typing import Any, Literal
 
-from fastapi import APIRouter, Body, HTTPException, Query
+from fastapi import APIRouter, Body, Header, HTTPException, Query
 from prometheus_client import Counter, Gauge, Histogram
 from pydantic import BaseModel, Field, field_validator
 
 from interfaces.registry import get_system
+from api.services.response_encoding import (
+    JSON,
+    NDJSON,
+    encode_timeseries,
+    negotiate,
+    stream_ndjson,
+)
+from api.services.singleflight import request_fingerprint, singleflight
 from api.models.responses import (
     MicroDayResponse,
     MicroRangeResponse,
@@ -128,13 +136,18 @@ class InstantRequest(BaseModel):
     response_model=MicroDayResponse,
     operation_id="micro_day",
 )
-async def micro_day(req: DayRequest = Body(...)) -> MicroDayResponse:
+async def micro_day(
+    req: DayRequest = Body(...),
+    accept: str | None = Header(default=None),
+) -> MicroDayResponse:
     """
     Generate volatility windows for a single day.
 
     Returns a timeline of micro-volatility windows with scores and factors.
+    Compact encodings are available via the Accept header (see strategy/day).
     """
     micro_requests.labels(endpoint="day", system=req.system).inc()
+    fmt = negotiate(accept)
 
     try:
         start_time = time.time()
@@ -148,8 +161,10 @@ async def micro_day(req: DayRequest = Body(...)) -> MicroDayResponse:
         # Parse date
         day = date.fromisoformat(req.date)
 
-        # Generate timeline
-        result = adapter.day(day)
+        # Generate timeline (identical concurrent requests share one computation)
+        result = await singleflight.run_sync(
+            request_fingerprint("micro.day", req.model_dump()), adapter.day, day
+        )
 
         # Update metrics
         compute_time = time.time() - start_time
@@ -164,6 +179,19 @@ async def micro_day(req: DayRequest = Body(...)) -> MicroDayResponse:
             )
             micro_window_count.labels(strength=strength, system=req.system).set(count)
 
+        if fmt != JSON:
+            return encode_timeseries(
+                fmt,
+                {
+                    "date": req.date,
+                    "system": req.system,
+                    "summary": result.get("summary", {}),
+                    "computation_time_ms": compute_time * 1000,
+                },
+                result.get("windows", []),
+                time_fields=("start", "end"),
+            )
+
         return MicroDayResponse(
             date=req.date,
             system=req.system,
@@ -186,13 +214,20 @@ async def micro_day(req: DayRequest = Body(...)) -> MicroDayResponse:
     response_model=MicroRangeResponse,
     operation_id="micro_range",
 )
-async def micro_range(req: RangeRequest = Body(...)) -> MicroRangeResponse:
+async def micro_range(
+    req: RangeRequest = Body(...),
+    accept: str | None = Header(default=None),
+) -> MicroRangeResponse:
     """
     Generate volatility windows for a date range.
 
     Returns merged timeline across multiple days.
+    Compact encodings are available via the Accept header (see strategy/day);
+    `application/x-ndjson` streams windows day by day as they are computed,
+    followed by a summary line.
     """
     micro_requests.labels(endpoint="range", system=req.system).inc()
+    fmt = negotiate(accept)
 
     try:
         start_time = time.time()
@@ -213,6 +248,9 @@ async def micro_range(req: RangeRequest = Body(...)) -> MicroRangeResponse:
                 status_code=400, detail="End date must be >= start date"
             )
 
+        if fmt == NDJSON and hasattr(adapter, "iter_range"):
+            return _stream_range(req, adapter, start_day, end_day, start_time)
+
         # Generate timeline
         result = adapter.range(start_day, end_day)
 
@@ -222,13 +260,28 @@ async def micro_range(req: RangeRequest = Body(...)) -> MicroRangeResponse:
             compute_time
         )
 
+        if fmt != JSON:
+            return encode_timeseries(
+                fmt,
+                {
+                    "start_date": req.start,
+                    "end_date": req.end,
+                    "system": req.system,
+                    "summary": result.get("summary", {}),
+                    "computation_time_ms": compute_time * 1000,
+                },
+                result.get("windows", []),
+                time_fields=("start", "end"),
+            )
+
+        windows = result.get("windows", [])
         return MicroRangeResponse(
             start_date=req.start,
             end_date=req.end,
             system=req.system,
-            timeline=result.get("timeline", []),
+            daily_windows=_group_by_day(windows),
+            total_windows=len(windows),
             summary=result.get("summary", {}),
-            computation_time_ms=compute_time * 1000,
         )
 
     except HTTPException:
@@ -239,6 +292,53 @@ async def micro_range(req: RangeRequest = Body(...)) -> MicroRangeResponse:
         raise HTTPException(status_code=500, detail=f"Internal error: {e!s}")
 
 
+def _group_by_day(windows: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    """Group sorted window dicts into [{"date", "windows"}] by start date."""
+    days: dict[str, list[dict[str, Any]]] = {}
+    for window in windows:
+        days.setdefault(str(window.get("start", ""))[:10], []).append(window)
+    return [{"date": day, "windows": items} for day, items in days.items()]
+
+
+def _stream_range(req: RangeRequest, adapter: Any, start_day: date, end_day: date, start_time: float):
+    """NDJSON stream of /micro/range with a running summary."""
+    try:
+        days = adapter.iter_range(start_day, end_day)
+    except ValueError as e:
+        micro_errors.labels(endpoint="range", error_type="invalid_range").inc()
+        raise HTTPException(status_code=400, detail=str(e))
+
+    counts = {"high": 0, "medium": 0, "low": 0}
+    totals = {"windows": 0, "max_score": 0.0}
+
+    def batches():
+        for windows in days:
+            for w in windows:
+                counts[w["strength"]] = counts.get(w["strength"], 0) + 1
+                totals["max_score"] = max(totals["max_score"], w["score"])
+            totals["windows"] += len(windows)
+            yield windows
+
+    def summary() -> dict[str, Any]:
+        compute_time = time.time() - start_time
+        micro_compute_time.labels(endpoint="range", system=req.system).observe(compute_time)
+        return {
+            "days_analyzed": (end_day - start_day).days + 1,
+            "total_windows": totals["windows"],
+            "high_volatility": counts["high"],
+            "medium_volatility": counts["medium"],
+            "low_volatility": counts["low"],
+            "max_score": round(totals["max_score"], 4),
+            "computation_time_ms": compute_time * 1000,
+        }
+
+    return stream_ndjson(
+        {"start_date": req.start, "end_date": req.end, "system": req.system},
+        batches(),
+        summary=summary,
+    )
+
+
 @router.get(
     "/next",
     summary="Find next volatility window",
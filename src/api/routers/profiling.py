@@ -0,0 +1,180 @@
+"""
+Profiling API Router - On-demand sampling profiles of this worker
+
+Notes:
+- Disabled unless PROFILING_ENABLED=true (endpoints return 404).
+- Requires a JWT with admin/owner role or the 'debug:profile' scope.
+- Output is collapsed stacks (text/plain, one ``stack count`` line per
+  distinct stack), ready for flamegraph.pl, speedscope or inferno;
+  ``format=json`` returns the session summary with the stacks as a map.
+- Profiles cover the worker that served the request; with several uvicorn
+  workers, repeat the call (the response carries ``worker_pid``).
+"""
+
+from __future__ import annotations
+
+import os
+
+from typing import Any
+
+from fastapi import APIRouter, Body, Depends, HTTPException, Query
+from fastapi.responses import JSONResponse, PlainTextResponse
+from pydantic import BaseModel, Field
+
+from api.models.responses import Problem
+from api.services.auth import AuthContext, require_jwt_header_or_query
+from api.services.profiler import (
+    PROFILE_MAX_REQUESTS,
+    PROFILE_MAX_SECONDS,
+    ProfilerBusyError,
+    ProfileSession,
+    profiler,
+)
+from app.openapi.common import DEFAULT_ERROR_RESPONSES
+
+PROFILING_ENABLED = os.getenv("PROFILING_ENABLED", "false").lower() == "true"
+PROFILE_SCOPE = "debug:profile"
+
+router = APIRouter(prefix="/api/v1/admin/profile", tags=["admin"], responses=DEFAULT_ERROR_RESPONSES)
+
+_GATE_RESPONSES = {
+    403: {"model": Problem, "description": "Forbidden (admin or debug:profile required)"},
+    404: {"description": "Profiling disabled on this deployment"},
+    409: {"model": Problem, "description": "Another profiling session is running"},
+}
+
+
+class ArmRequestsBody(BaseModel):
+    path_prefix: str = Field(..., description="Profile requests whose path starts with this", examples=["/api/v1/strategy/day"])
+    count: int = Field(10, ge=1, le=PROFILE_MAX_REQUESTS, description="Number of matching requests to profile")
+    timeout_s: float = Field(PROFILE_MAX_SECONDS, gt=0, description="Give up after this many seconds")
+    interval_ms: float = Field(5.0, ge=1.0, le=100.0, description="Sampling interval")
+    include_idle: bool = Field(False, description="Keep samples of threads parked waiting for work")
+
+
+def _problem(status: int, title: str, detail: str, code: str) -> JSONResponse:
+    problem = Problem(
+        type=f"https://api.vedacore.io/problems/{title.lower().replace(' ', '-')}",
+        title=title,
+        status=status,
+        detail=detail,
+        code=code,
+    )
+    return JSONResponse(status_code=status, content=problem.model_dump())
+
+
+def _gate(auth_context: AuthContext) -> JSONResponse | None:
+    """404 when profiling is off; 403 unless admin/owner or debug:profile scope."""
+    if not PROFILING_ENABLED:
+        raise HTTPException(status_code=404, detail="Profiling endpoints disabled")
+    role = (auth_context.role or "").lower()
+    scopes = (auth_context.scopes or "").split()
+    if role not in ("admin", "owner") and PROFILE_SCOPE not in scopes:
+        return _problem(403, "Forbidden", f"Admin role or '{PROFILE_SCOPE}' scope required", "FORBIDDEN_PROFILE")
+    return None
+
+
+def _render(session: ProfileSession, fmt: str) -> Any:
+    summary = session.summary()
+    if fmt == "json":
+        return {**summary, "stacks": dict(session.sampler.stacks.most_common())}
+    headers = {
+        "X-Profile-Id": session.id,
+        "X-Profile-Samples": str(summary["samples"]),
+        "X-Profile-Worker": str(summary["worker_pid"]),
+    }
+    return PlainTextResponse(session.sampler.folded() + "\n", headers=headers)
+
+
+@router.post(
+    "/sample",
+    summary="Sample this worker for N seconds",
+    description="Runs the stack sampler for `seconds` and returns collapsed stacks.",
+    operation_id="admin_profileSample",
+    responses=_GATE_RESPONSES,
+)
+async def profile_sample(
+    seconds: float = Query(10.0, gt=0, le=PROFILE_MAX_SECONDS, description="Sampling window"),
+    interval_ms: float = Query(5.0, ge=1.0, le=100.0, description="Sampling interval"),
+    include_idle: bool = Query(False, description="Keep samples of idle threads"),
+    format: str = Query("folded", pattern="^(folded|json)$", description="folded or json"),
+    auth_context: AuthContext = Depends(require_jwt_header_or_query),
+):
+    denied = _gate(auth_context)
+    if denied is not None:
+        return denied
+    try:
+        session = await profiler.profile_for(seconds, interval_ms / 1000.0, include_idle)
+    except ProfilerBusyError as e:
+        return _problem(409, "Conflict", str(e), "PROFILER_BUSY")
+    return _render(session, format)
+
+
+@router.post(
+    "/requests",
+    summary="Profile the next N matching requests",
+    description="Arms a session; poll GET /requests/{id} for the result.",
+    operation_id="admin_profileRequests",
+    responses=_GATE_RESPONSES,
+)
+async def profile_requests(
+    body: ArmRequestsBody = Body(...),
+    auth_context: AuthContext = Depends(require_jwt_header_or_query),
+):
+    denied = _gate(auth_context)
+    if denied is not None:
+        return denied
+    try:
+        session = profiler.arm(
+            body.path_prefix,
+            body.count,
+            timeout=body.timeout_s,
+            interval=body.interval_ms / 1000.0,
+            include_idle=body.include_idle,
+        )
+    except ProfilerBusyError as e:
+        return _problem(409, "Conflict", str(e), "PROFILER_BUSY")
+    return JSONResponse(status_code=202, content=session.summary())
+
+
+@router.get(
+    "/requests/{session_id}",
+    summary="Profiling session status or result",
+    description="Summary while running; collapsed stacks once done (or with partial=true).",
+    operation_id="admin_profileResult",
+    responses=_GATE_RESPONSES,
+)
+async def profile_result(
+    session_id: str,
+    format: str = Query("folded", pattern="^(folded|json)$", description="folded or json"),
+    partial: bool = Query(False, description="Return stacks collected so far"),
+    auth_context: AuthContext = Depends(require_jwt_header_or_query),
+):
+    denied = _gate(auth_context)
+    if denied is not None:
+        return denied
+    session = profiler.get(session_id)
+    if session is None:
+        raise HTTPException(status_code=404, detail=f"Unknown profiling session {session_id}")
+    if not session.done and not partial:
+        return session.summary()
+    return _render(session, format)
+
+
+@router.delete(
+    "/requests/{session_id}",
+    summary="Stop a profiling session",
+    operation_id="admin_profileCancel",
+    responses=_GATE_RESPONSES,
+)
+async def profile_cancel(
+    session_id: str,
+    auth_context: AuthContext = Depends(require_jwt_header_or_query),
+):
+    denied = _gate(auth_context)
+    if denied is not None:
+        return denied
+    session = profiler.cancel(session_id)
+    if session is None:
+        raise HTTPException(status_code=404, detail=f"Unknown profiling session {session_id}")
+    return session.summary()
@@ -5,7 +5,7 @@ Intraday signals router for KP lord changes
 
 import logging
 
-from datetime import datetime
+from datetime import UTC, datetime
 
 from fastapi import APIRouter, Depends, HTTPException
 from app.openapi.common import DEFAULT_ERROR_RESPONSES
@@ -66,7 +66,7 @@ async def get_intraday_signals(
         try:
             # Parse date and convert to NY timezone
             date_obj = datetime.strptime(request.date, "%Y-%m-%d")
-            ny_date = NY_TZ.localize(date_obj.replace(hour=0, minute=0, second=0))
+            ny_date = datetime(date_obj.year, date_obj.month, date_obj.day, tzinfo=NY_TZ)
 
             # Check cache first
             cache_key = f"intraday:{request.date}:{request.interval}:{'-'.join(request.session_filter)}"
@@ -111,7 +111,7 @@ async def get_intraday_signals(
 
                 # Get positions at slice midpoint
                 midpoint = slice_start + (slice_end - slice_start) / 2
-                midpoint_utc = midpoint.astimezone(NY_TZ).replace(tzinfo=None)
+                midpoint_utc = midpoint.astimezone(UTC)
 
                 position_data = await facade.get_position(midpoint_utc)
 
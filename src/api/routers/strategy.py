@@ -11,11 +11,13 @@ import time
 from datetime import UTC, date, datetime
 from typing import Any
 
-from fastapi import APIRouter, Body, HTTPException, Query
+from fastapi import APIRouter, Body, Header, HTTPException, Query
 from prometheus_client import Counter, Gauge, Histogram
 from pydantic import BaseModel, Field, field_validator
 
 from interfaces.registry import get_system
+from api.services.response_encoding import JSON, encode_timeseries, negotiate
+from api.services.singleflight import request_fingerprint, singleflight
 from api.models.responses import (
     StrategyConfigResponse,
     StrategyDayResponse,
@@ -140,13 +142,19 @@ class ConfigDryrunRequest(BaseModel):
     response_model=StrategyDayResponse,
     operation_id="strategy_day",
 )
-async def strategy_day(req: DayRequest = Body(...)) -> StrategyDayResponse:
+async def strategy_day(
+    req: DayRequest = Body(...),
+    accept: str | None = Header(default=None),
+) -> StrategyDayResponse:
     """
     Generate minute-by-minute confidence timeline for a trading day.
 
     Returns confidence scores, direction hints, and applied rules for each minute.
+    Send `Accept: application/x-ndjson`, `application/msgpack` or
+    `application/vnd.apache.arrow.stream` for a compact encoding.
     """
     strategy_requests.labels(endpoint="day", ticker=req.ticker).inc()
+    fmt = negotiate(accept)
 
     try:
         start_time = time.time()
@@ -160,8 +168,13 @@ async def strategy_day(req: DayRequest = Body(...)) -> StrategyDayResponse:
         # Parse date
         day = date.fromisoformat(req.date)
 
-        # Generate timeline
-        result = adapter.day(day, ticker=req.ticker)
+        # Generate timeline (identical concurrent requests share one computation)
+        result = await singleflight.run_sync(
+            request_fingerprint("strategy.day", req.model_dump()),
+            adapter.day,
+            day,
+            ticker=req.ticker,
+        )
 
         # Update metrics
         compute_time = time.time() - start_time
@@ -194,6 +207,18 @@ async def strategy_day(req: DayRequest = Body(...)) -> StrategyDayResponse:
             for rule in signal.get("rules_applied", []):
                 strategy_rules_applied.labels(rule_name=rule).inc()
 
+        if fmt != JSON:
+            return encode_timeseries(
+                fmt,
+                {
+                    "date": req.date,
+                    "ticker": req.ticker,
+                    "summary": result.get("summary", {}),
+                    "computation_time_ms": compute_time * 1000,
+                },
+                result.get("timeline", []),
+            )
+
         return StrategyDayResponse(
             date=req.date,
             ticker=req.ticker,
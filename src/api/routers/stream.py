@@ -125,7 +125,7 @@ async def stream_topic(
     if METRICS_AVAILABLE:
         streaming_metrics.record_connection(tenant_id, topic, "sse")
 
-    async def event_generator() -> AsyncGenerator[dict[str, Any], None]:
+    async def event_generator() -> AsyncGenerator[dict[str, Any] | bytes, None]:
         """Generate SSE events with proper cleanup."""
         try:
             # Hint client about retry interval
@@ -138,16 +138,8 @@ async def stream_topic(
                     last_seq = -1
                 try:
                     backlog = await stream_manager.replay_since(topic, last_seq)
-                    for raw in backlog:
-                        try:
-                            msg_obj = json.loads(raw)
-                        except Exception:
-                            continue
-                        yield {
-                            "id": str(msg_obj.get("seq", "")),
-                            "event": str(msg_obj.get("event", "update")),
-                            "data": raw,
-                        }
+                    for frame in backlog:
+                        yield frame.sse
                 except Exception:
                     pass
 
@@ -157,23 +149,11 @@ async def stream_topic(
                     break
 
                 # Get next message (includes heartbeats)
-                data = await stream_manager.next_message(q, heartbeat_secs=15)
+                frame = await stream_manager.next_message(q, heartbeat_secs=15)
 
-                # Extract sequence number for SSE resumption (PM requirement)
-                try:
-                    msg_obj = json.loads(data)
-                    event_id = str(msg_obj.get("seq", ""))
-                    event_type = str(msg_obj.get("event", "update"))
-                except (json.JSONDecodeError, KeyError):
-                    event_id = ""
-                    event_type = "update"
-
-                # Yield SSE event with resumption support
-                yield {
-                    "id": event_id,
-                    "event": event_type,
-                    "data": data,  # JSON payload as string
-                }
+                # Pre-framed id/event/data bytes, shared across subscribers
+                # (id carries seq for SSE resumption - PM requirement)
+                yield frame.sse
 
                 # Count delivered messages
                 nonlocal messages_delivered
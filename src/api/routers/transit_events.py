@@ -4,11 +4,12 @@ Transit Events API Router
 Endpoints for transit event detection and analysis
 """
 
+import asyncio
 import logging
 
-from datetime import UTC, datetime
+from datetime import UTC, datetime, timedelta
 
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, Header, HTTPException, Query
 from pydantic import BaseModel, Field
 
 from config.feature_flags import FeatureFlags, require_feature
@@ -20,6 +21,7 @@ from refactor.transit_gate_system import KPGateCalculator, compute_dispositor_ma
 from refactor.transit_moon_engine import get_moon_engine
 from refactor.transit_promise_checker import TransitPromiseChecker
 from refactor.transit_resonance import get_resonance_kernel
+from api.services.response_encoding import NDJSON, negotiate, stream_ndjson
 from api.models.responses import (
     TransitConfigResponse,
     TransitGatesResponse,
@@ -52,6 +54,18 @@ class DetectEventsRequest(BaseModel):
     longitude: float | None = Field(None, description="Location longitude for RP")
 
 
+class BacktestRequest(BaseModel):
+    """Request for replaying event detection over a historical range"""
+
+    start: datetime = Field(..., description="First sample (UTC)")
+    end: datetime = Field(..., description="Last sample (UTC)")
+    step_minutes: int = Field(1, ge=1, le=1440, description="Sample spacing")
+    fire_threshold: int = Field(60, ge=0, le=100, description="Minimum score to fire")
+    cooldown_minutes: int = Field(10, ge=0, description="Dedup cooldown (simulated time)")
+    include_dasha: bool = Field(True, description="Include dasha alignment")
+    include_promise: bool = Field(True, description="Include promise checking")
+
+
 class MoonTriggersRequest(BaseModel):
     """Request for Moon triggers on specific planets"""
 
@@ -83,6 +97,9 @@ class EventResponse(BaseModel):
     moon_chain: dict | None = Field(None, description="Current Moon KP chain")
 
 
+# Longest range accepted by /backtest
+MAX_BACKTEST_DAYS = 366
+
 # Singleton instances
 _event_detector: TransitEventDetector | None = None
 
@@ -168,7 +185,7 @@ async def detect_events(request: DetectEventsRequest) -> EventResponse:
             }
 
         # Detect events
-        events = detector.detect_events(
+        events = await detector.detect_events_async(
             request.ts, planet_positions, aspects, dasha_data, rp_data, promise_data
         )
 
@@ -205,6 +222,75 @@ async def detect_events(request: DetectEventsRequest) -> EventResponse:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.post(
+    "/backtest",
+    response_model=EventResponse,
+    summary="Backtest transit events",
+    operation_id="transit_backtest",
+)
+@require_feature(FeatureFlags.ENABLE_TRANSIT_EVENTS)
+async def backtest_events(
+    request: BacktestRequest,
+    accept: str | None = Header(default=None),
+) -> EventResponse:
+    """
+    Replay event detection over a historical range.
+
+    Scores every sample with the live formula, vectorized over time, and
+    dedups in simulated time. Ledger and live metrics are not touched. Send
+    `Accept: application/x-ndjson` to stream events a week at a time.
+    """
+    if request.end < request.start:
+        raise HTTPException(status_code=400, detail="end must not be before start")
+    if request.end - request.start > timedelta(days=MAX_BACKTEST_DAYS):
+        raise HTTPException(
+            status_code=400, detail=f"Range exceeds {MAX_BACKTEST_DAYS} days"
+        )
+
+    from refactor.transit_backtest import iter_backtest_events
+
+    dasha_data = {"active": "VENUS", "sub": "MERCURY"} if request.include_dasha else None
+    promise_data = (
+        {"FINANCE": [2, 3, 6], "GAINS": [3, 6, 11]} if request.include_promise else None
+    )
+    batches = iter_backtest_events(
+        get_event_detector(),
+        request.start,
+        request.end,
+        timedelta(minutes=request.step_minutes),
+        dasha_data=dasha_data,
+        promise_data=promise_data,
+        fire_threshold=request.fire_threshold,
+        cooldown_minutes=request.cooldown_minutes,
+    )
+
+    if negotiate(accept) == NDJSON:
+        return stream_ndjson(
+            {
+                "start": request.start.isoformat(),
+                "end": request.end.isoformat(),
+                "step_minutes": request.step_minutes,
+                "fire_threshold": request.fire_threshold,
+            },
+            ([e.to_dict() for e in batch] for batch in batches),
+        )
+
+    try:
+        start_time = datetime.now()
+        events = await asyncio.to_thread(
+            lambda: [e.to_dict() for batch in batches for e in batch]
+        )
+        calc_time = (datetime.now() - start_time).total_seconds() * 1000
+    except Exception as e:
+        logger.error(f"Error backtesting events: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+    return EventResponse(
+        events=events,
+        metrics={"calc_ms": round(calc_time, 2), "n_events": len(events)},
+    )
+
+
 @router.post(
     "/moon-triggers",
     response_model=EventResponse,
@@ -8,7 +8,7 @@ All endpoints enforce sidereal zodiac and traditional methods.
 from datetime import datetime
 from typing import Dict, List, Optional, Any
 
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Header
 from app.openapi.common import DEFAULT_ERROR_RESPONSES
 from pydantic import BaseModel, Field
 
@@ -21,6 +21,8 @@ from .models import (
     PATH_TEMPLATES
 )
 
+from api.services.response_encoding import NDJSON, negotiate, stream_ndjson
+
 router = APIRouter(prefix="/api/v1/jyotish", tags=["reference"], responses=DEFAULT_ERROR_RESPONSES)
 
 
@@ -141,26 +143,46 @@ async def calculate_chart(request: ChartRequest) -> BaseResponse:
     summary="Analyze Transit Window",
     operation_id="v1_jyotish_transitsWindow",
 ) 
-async def analyze_transit_window(request: TransitsWindowRequest) -> BaseResponse:
+async def analyze_transit_window(
+    request: TransitsWindowRequest,
+    accept: Optional[str] = Header(default=None),
+) -> BaseResponse:
     """
     Analyze transits within specified time window.
     
-    Returns significant transit events, aspects, and overall window scoring
-    for timing decisions.
+    Returns KP lord change events (Moon by default; `filters.planets` and
+    `filters.levels` select others) and overall window scoring for timing
+    decisions. Send `Accept: application/x-ndjson` to stream events in
+    6-hour chunks as they are computed.
     """
+    stream = negotiate(accept) == NDJSON
     try:
-        # This would integrate with existing transit analysis
-        # For now, return basic structure
         from datetime import timedelta
+
+        from refactor.facade import iter_kp_lord_changes
         
         window_start = request.datetime
         window_end = window_start + timedelta(hours=request.window_hours)
+        planet_ids = tuple(request.filters.get("planets") or (2,))
+        levels = tuple(request.filters.get("levels") or ("nl", "sl", "sl2"))
+
+        chunks = iter_kp_lord_changes(window_start, window_end, planet_ids, levels)
+
+        if stream:
+            return stream_ndjson(
+                {
+                    "window_start": window_start.isoformat(),
+                    "window_end": window_end.isoformat(),
+                    "planets": list(planet_ids),
+                    "levels": list(levels),
+                },
+                ([change.to_dict() for change in changes] for changes in chunks),
+            )
         
-        # Placeholder - would call actual transit analysis
         transit_data = TransitsWindowResponse(
             window_start=window_start,
             window_end=window_end,
-            transits=[],
+            transits=[change.to_dict() for changes in chunks for change in changes],
             scoring={"overall": 0.0}
         )
         
@@ -15,6 +15,7 @@ from pydantic import BaseModel, Field
 from shared.otel import get_tracer
 from shared.normalize import NORMALIZATION_VERSION, EPHEMERIS_DATASET_VERSION
 from shared.trace_attrs import set_common_attrs
+from api.services.singleflight import request_fingerprint, singleflight
 
 from .models import (
     BaseKPRequest,
@@ -115,21 +116,28 @@ async def calculate_kp_chart(request: ChartRequest) -> BaseResponse:
         from interfaces.kp_houses_adapter import get_kp_houses_data
         from refactor.kp_significators import get_house_significators
         
-        # Get KP houses data
-        with _tracer.start_as_current_span("kp.chart"):
+        def _compute():
+            # Get KP houses data
             kp_data = get_kp_houses_data(
                 timestamp=request.datetime,
                 latitude=request.lat,
                 longitude=request.lon
             )
+            
+            # Get significators if requested
+            significators = None
+            if request.include_significators:
+                significators = get_house_significators(
+                    timestamp=request.datetime,
+                    latitude=request.lat,
+                    longitude=request.lon
+                )
+            return kp_data, significators
         
-        # Get significators if requested
-        significators = None
-        if request.include_significators:
-            significators = get_house_significators(
-                timestamp=request.datetime,
-                latitude=request.lat,
-                longitude=request.lon
+        # Identical concurrent chart requests share one computation
+        with _tracer.start_as_current_span("kp.chart"):
+            kp_data, significators = await singleflight.run_sync(
+                request_fingerprint("v1.kp.chart", request.model_dump()), _compute
             )
         
         chart_data = KPChartResponse(
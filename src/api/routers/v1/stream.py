@@ -88,12 +88,13 @@ def verify_stream_token(token: str, expected_topic: Optional[str] = None, source
         )
 
 
-async def generate_sse_stream(topic: str, tenant_id: str) -> AsyncIterator[str]:
+async def generate_sse_stream(topic: str, tenant_id: str) -> AsyncIterator[str | bytes]:
     """
     Generate Server-Sent Events stream for topic.
     
     Yields formatted SSE events with proper envelope structure
-    following PM specification.
+    following PM specification. Published events are yielded as the
+    pre-framed bytes shared by all subscribers.
     """
     try:
         # Import streaming service
@@ -105,26 +106,10 @@ async def generate_sse_stream(topic: str, tenant_id: str) -> AsyncIterator[str]:
         while True:
             try:
                 # Wait for message with timeout
-                message = await asyncio.wait_for(queue.get(), timeout=30.0)
-                # message is a JSON string envelope produced by stream_manager.publish
-                try:
-                    obj = json.loads(message)
-                except Exception:
-                    # Fallback: wrap raw message
-                    obj = {
-                        "v": 1,
-                        "ts": datetime.utcnow().isoformat() + "Z",
-                        "seq": 0,
-                        "topic": topic,
-                        "event": "update",
-                        "payload": message,
-                    }
-                # Send as SSE event with id/event
-                eid = str(obj.get("seq", ""))
-                ev = str(obj.get("event", "update"))
-                data = json.dumps(obj)
-                yield f"id: {eid}\nevent: {ev}\ndata: {data}\n\n"
-                
+                frame = await asyncio.wait_for(queue.get(), timeout=30.0)
+                # Frame carries the id/event/data bytes encoded once at publish
+                yield frame.sse
+
             except asyncio.TimeoutError:
                 # Send heartbeat
                 heartbeat = {
@@ -229,7 +214,7 @@ async def stream_events(
             pass
         raise
     
-    async def sse_with_resume() -> AsyncIterator[str]:
+    async def sse_with_resume() -> AsyncIterator[str | bytes]:
         # Emit retry hint once
         yield "retry: 15000\n\n"
         # Check resume gap (buffer exhaustion)
@@ -278,14 +263,8 @@ async def stream_events(
                     streaming_metrics.record_sse_resume_replayed(topic, len(backlog))
                 except Exception:
                     pass
-                for raw in backlog:
-                    try:
-                        obj = json.loads(raw)
-                    except Exception:
-                        continue
-                    eid = str(obj.get("seq", ""))
-                    ev = str(obj.get("event", "update"))
-                    yield f"id: {eid}\nevent: {ev}\ndata: {raw}\n\n"
+                for frame in backlog:
+                    yield frame.sse
             except Exception:
                 pass
         # Then continue with live stream
@@ -306,14 +285,7 @@ async def stream_events(
                         return
                 except Exception:
                     pass
-            # chunk may be data-only; upgrade to include id/event when possible
-            try:
-                obj = json.loads(chunk.replace("data: ", "").strip())
-                eid = str(obj.get("seq", ""))
-                ev = str(obj.get("event", "update"))
-                yield f"id: {eid}\nevent: {ev}\ndata: {json.dumps(obj)}\n\n"
-            except Exception:
-                yield chunk
+            yield chunk
 
     # Generate SSE stream with anti-buffer + anti-leak headers
     headers = {
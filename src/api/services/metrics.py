@@ -210,6 +210,34 @@ vc_stream_disconnects_total = Counter(
     ["reason"],  # reason: normal, error, timeout, client_disconnect
 )
 
+# ===========================
+# REQUEST COALESCING METRICS
+# ===========================
+
+# Single-flight outcomes: leader computed, coalesced onto an in-flight call,
+# or waited on another worker's Redis lock
+vc_singleflight_requests_total = Counter(
+    "vc_singleflight_requests_total",
+    "Requests handled by the single-flight layer",
+    ["namespace", "outcome"],  # outcome: leader, coalesced, cross_worker_wait
+)
+
+# ===========================
+# MIDDLEWARE METRICS
+# ===========================
+
+# Own time per middleware layer (opt-in via VC_MIDDLEWARE_TIMING=true);
+# excludes downstream layers and the endpoint
+vc_middleware_layer_seconds = Histogram(
+    "vc_middleware_layer_seconds",
+    "Time spent inside each middleware layer",
+    ["layer"],
+    buckets=(
+        0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005,
+        0.001, 0.0025, 0.005, 0.01, 0.05, float("inf"),
+    ),
+)
+
 # ===========================
 # SYSTEM HEALTH METRICS
 # ===========================
@@ -396,6 +424,14 @@ class StreamingMetricsCollector:
         """Record a stream disconnection with reason."""
         vc_stream_disconnects_total.labels(reason=reason).inc()
 
+    def record_singleflight(self, namespace: str, outcome: str):
+        """Record a single-flight outcome (leader, coalesced, cross_worker_wait)."""
+        vc_singleflight_requests_total.labels(namespace=namespace, outcome=outcome).inc()
+
+    def record_middleware_layer(self, layer: str, seconds: float):
+        """Record time spent inside one middleware layer."""
+        vc_middleware_layer_seconds.labels(layer=layer).observe(seconds)
+
 
 # Global metrics collector instance
 streaming_metrics = StreamingMetricsCollector()
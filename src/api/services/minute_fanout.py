@@ -0,0 +1,81 @@
+"""
+minute_fanout.py — Minute-scoped, single-flight result cache for streams.
+
+Streaming endpoints that recompute the same minute for many connections
+(e.g. /activation/stream) share work through this cache:
+
+- Results are keyed by (effective minute, key); the most recently created
+  minute buckets are kept (insertion order, not minute order, so a late
+  request for an older minute is not evicted as soon as it is stored)
+- Concurrent callers for the same key await one in-flight computation
+- A caller that disconnects does not cancel the shared computation
+- Failed computations are dropped so the next caller retries
+"""
+
+from __future__ import annotations
+
+import asyncio
+
+from collections.abc import Awaitable, Callable, Hashable
+from datetime import datetime
+from typing import Any, TypeVar
+
+T = TypeVar("T")
+
+DEFAULT_RETAIN_MINUTES = 3
+
+
+class MinuteFanoutCache:
+    """Per-minute single-flight cache shared by all stream connections."""
+
+    def __init__(self, retain_minutes: int = DEFAULT_RETAIN_MINUTES) -> None:
+        self.retain_minutes = max(1, int(retain_minutes))
+        self._buckets: dict[datetime, dict[Hashable, asyncio.Future]] = {}
+        self.stats = {"hits": 0, "misses": 0, "evicted_minutes": 0}
+
+    async def get_or_compute(
+        self,
+        minute: datetime,
+        key: Hashable,
+        factory: Callable[[], Awaitable[T]],
+    ) -> T:
+        """Return the cached result for (minute, key), computing it at most once."""
+        bucket = self._buckets.get(minute)
+        if bucket is None:
+            bucket = self._buckets[minute] = {}
+            self._prune()
+        fut = bucket.get(key)
+        if fut is None:
+            self.stats["misses"] += 1
+            fut = asyncio.ensure_future(factory())
+            bucket[key] = fut
+            fut.add_done_callback(
+                lambda f, b=bucket, k=key: self._drop_failed(b, k, f)
+            )
+        else:
+            self.stats["hits"] += 1
+        return await asyncio.shield(fut)
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            **self.stats,
+            "minutes": len(self._buckets),
+            "entries": sum(len(b) for b in self._buckets.values()),
+        }
+
+    def clear(self) -> None:
+        self._buckets.clear()
+
+    def _prune(self) -> None:
+        # dicts keep insertion order: the first keys are the oldest buckets
+        while len(self._buckets) > self.retain_minutes:
+            del self._buckets[next(iter(self._buckets))]
+            self.stats["evicted_minutes"] += 1
+
+    @staticmethod
+    def _drop_failed(
+        bucket: dict[Hashable, asyncio.Future], key: Hashable, fut: asyncio.Future
+    ) -> None:
+        if fut.cancelled() or fut.exception() is not None:
+            if bucket.get(key) is fut:
+                del bucket[key]
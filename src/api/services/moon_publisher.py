@@ -6,6 +6,12 @@ Implements PM requirements:
 - Feature-flagged with MOON_PUBLISHER_ENABLED
 - 2-5 second cadence for steady heartbeat
 - Only publishes to allowed topics with proper ACLs
+
+Event-scheduled: the Moon is sampled once per tracking horizon and fitted
+with a quadratic, the next NL/SL/SL2 boundary is solved ahead of time and a
+``moon_change`` event is emitted at that instant. Position ticks between
+boundaries are interpolated from the fit, so steady-state ticks do no
+ephemeris work.
 """
 
 import asyncio
@@ -13,9 +19,12 @@ import os
 import random
 import time
 
-from datetime import timedelta
+from dataclasses import dataclass
+from datetime import UTC, datetime
 from typing import Any
 
+import numpy as np
+
 from .stream_manager import stream_manager
 
 # Configuration
@@ -23,8 +32,85 @@ MOON_PUBLISHER_ENABLED = os.getenv("MOON_PUBLISHER_ENABLED", "false").lower() ==
 MOON_PUBLISHER_INTERVAL_MS = int(
     os.getenv("MOON_PUBLISHER_INTERVAL_MS", "2000")
 )  # 2 seconds default
+MOON_TRACK_HORIZON_S = int(
+    os.getenv("MOON_TRACK_HORIZON_S", "600")
+)  # Refit the Moon polynomial every 10 minutes
 MOON_TOPIC = "kp.v1.moon.chain"
 
+MOON_ID = 2
+_JD_UNIX_EPOCH = 2440587.5
+_LEVELS = ("nl", "sl", "sl2")
+
+
+def _unix_to_jd(t: float) -> float:
+    return t / 86400.0 + _JD_UNIX_EPOCH
+
+
+def _iso(t: float) -> str:
+    return datetime.fromtimestamp(t, UTC).isoformat()
+
+
+class MoonTrack:
+    """Quadratic fit of the Moon's longitude over a short horizon.
+
+    Three ephemeris samples (start, middle, end) pin the polynomial; over
+    ten minutes the interpolation error is far below a KP boundary's width.
+    """
+
+    def __init__(self, t0: float, horizon_s: float):
+        from refactor.swe_backend import get_planet_series
+
+        self.t0 = t0
+        self.valid_until = t0 + horizon_s
+        offsets = np.array([0.0, horizon_s / 2.0, horizon_s])
+        lons, _ = get_planet_series(
+            np.array([_unix_to_jd(t0 + x) for x in offsets]), [MOON_ID]
+        )[MOON_ID]
+        # Unwrap across 360° so the fit is continuous
+        lons = lons[0] + np.mod(lons - lons[0], 360.0)
+        self._coef = np.polyfit(offsets, lons, 2)
+        self.ephemeris_calls = 3
+
+    def longitude_unwrapped(self, t: float) -> float:
+        return float(np.polyval(self._coef, t - self.t0))
+
+    def longitude(self, t: float) -> float:
+        return self.longitude_unwrapped(t) % 360.0
+
+    def speed(self, t: float) -> float:
+        """Speed in degrees/day."""
+        return float(np.polyval(np.polyder(self._coef), t - self.t0)) * 86400.0
+
+    def crossing_time(self, target: float, after: float) -> float | None:
+        """Unix time when the unwrapped longitude reaches target, or None past horizon."""
+        if target > self.longitude_unwrapped(self.valid_until):
+            return None
+        t = after
+        for _ in range(6):
+            rate = self.speed(t) / 86400.0
+            if rate <= 0:
+                return None
+            t -= (self.longitude_unwrapped(t) - target) / rate
+        return t
+
+
+@dataclass(frozen=True)
+class ScheduledChange:
+    """A KP chain boundary crossing solved ahead of time."""
+
+    at: float  # Unix time
+    boundary: float  # Unwrapped longitude
+    chain_before: tuple[int, int, int]
+    chain_after: tuple[int, int, int]
+
+    @property
+    def levels(self) -> list[str]:
+        return [
+            level
+            for level, a, b in zip(_LEVELS, self.chain_before, self.chain_after)
+            if a != b
+        ]
+
 
 class MoonPublisher:
     """
@@ -37,13 +123,20 @@ class MoonPublisher:
     def __init__(self):
         self.enabled = MOON_PUBLISHER_ENABLED
         self.interval_ms = MOON_PUBLISHER_INTERVAL_MS
+        self.horizon_s = MOON_TRACK_HORIZON_S
         self.topic = MOON_TOPIC
         self.task: asyncio.Task | None = None
         self.should_stop = False
         self.sequence = 0  # For consumer dedupe (PM requirement)
         self.backoff_seconds = 0  # Exponential backoff on failures
+        self._track: MoonTrack | None = None
+        self._next_change: ScheduledChange | None = None
         self.stats = {
             "published": 0,
+            "changes_published": 0,
+            "ephemeris_calls": 0,
+            "next_change_at": None,
+            "is_leader": None,
             "errors": 0,
             "backoff_events": 0,
             "started_at": None,
@@ -80,20 +173,65 @@ class MoonPublisher:
             "enabled": self.enabled,
             "running": self.task and not self.task.done() if self.task else False,
             "interval_ms": self.interval_ms,
+            "horizon_s": self.horizon_s,
             "topic": self.topic,
             **self.stats,
         }
 
+    # ------------------------------------------------------------------
+    # Schedule
+    # ------------------------------------------------------------------
+
+    def _ensure_track(self, now: float) -> MoonTrack:
+        """Refit the Moon polynomial when the current horizon has expired."""
+        if self._track is None or now >= self._track.valid_until:
+            self._track = MoonTrack(now, self.horizon_s)
+            self.stats["ephemeris_calls"] += self._track.ephemeris_calls
+            self._next_change = self._schedule_after(
+                now, self._track.longitude_unwrapped(now)
+            )
+        return self._track
+
+    def _schedule_after(self, t: float, longitude: float) -> ScheduledChange | None:
+        """Solve the next KP boundary crossing after (t, longitude) within the horizon."""
+        from refactor.kp_chain import next_kp_boundary
+        from refactor.swe_backend import get_planet_series
+
+        track = self._track
+        # Boundary comes back on the track's unwrapped scale
+        boundary, before, after = next_kp_boundary(longitude)
+        at = track.crossing_time(boundary, t)
+        if at is None:
+            self.stats["next_change_at"] = None
+            return None
+
+        # One exact ephemeris Newton step polishes the interpolated time
+        lons, speeds = get_planet_series(np.array([_unix_to_jd(at)]), [MOON_ID])[MOON_ID]
+        self.stats["ephemeris_calls"] += 1
+        err = ((float(lons[0]) - boundary % 360.0) + 180.0) % 360.0 - 180.0
+        if speeds[0] > 0:
+            at -= err / float(speeds[0]) * 86400.0
+
+        self.stats["next_change_at"] = _iso(at)
+        return ScheduledChange(at, boundary, before, after)
+
+    # ------------------------------------------------------------------
+    # Loop
+    # ------------------------------------------------------------------
+
     async def _publisher_loop(self) -> None:
-        """Main publisher loop - runs in background."""
+        """Main publisher loop - sleeps until the next tick or boundary."""
         import logging
 
         logger = logging.getLogger(__name__)
 
         logger.info(
-            f"Moon publisher started: topic={self.topic} interval={self.interval_ms}ms"
+            f"Moon publisher started: topic={self.topic} interval={self.interval_ms}ms "
+            f"horizon={self.horizon_s}s"
         )
 
+        next_tick = time.time()
+
         while not self.should_stop:
             try:
                 # Apply backoff if in error state (PM requirement: max 10s)
@@ -103,30 +241,50 @@ class MoonPublisher:
                     )
                     await asyncio.sleep(self.backoff_seconds)
                     self.stats["backoff_events"] += 1
-
-                # Calculate current Moon position using VedaCore KP engine
-                moon_data = await self._get_moon_chain_data()
-
-                # Add sequence field for consumer dedupe (PM requirement)
-                self.sequence += 1
-                moon_data["seq"] = self.sequence
-
-                # Publish to stream manager (in-process, no external calls)
-                await stream_manager.publish(
-                    self.topic, moon_data, event="moon_update", v=1
+                    self._track = None  # Refit after errors
+                    next_tick = time.time()
+
+                # Only the topic leader computes; followers relay its frames
+                leader = await stream_manager.ensure_topic_leadership(self.topic)
+                self.stats["is_leader"] = leader
+                if not leader:
+                    self._track = None
+                    self._next_change = None
+                    await asyncio.sleep(self.interval_ms / 1000.0)
+                    next_tick = time.time()
+                    continue
+
+                now = time.time()
+                track = self._ensure_track(now)
+                change = self._next_change
+                wake = min(
+                    next_tick,
+                    change.at if change else track.valid_until,
+                    track.valid_until,
                 )
-
-                # Record metrics
-                try:
-                    from .metrics import streaming_metrics
-
-                    streaming_metrics.record_stream_publish_event(self.topic)
-                except ImportError:
-                    pass  # Metrics not available
+                if wake > now:
+                    await asyncio.sleep(wake - now)
+
+                now = time.time()
+                if change is not None and now >= change.at:
+                    # Reschedule first so the boundary tick advertises the
+                    # following change rather than the one just crossed
+                    self._next_change = self._schedule_after(
+                        change.at, change.boundary + 1e-9
+                    )
+                    await self._publish_change(change)
+                    # Chain changed: tick immediately with the new lords (the
+                    # interpolated longitude at change.at may sit a hair short)
+                    await self._publish_tick(change.at, chain=change.chain_after)
+                elif now >= next_tick:
+                    await self._publish_tick(now)
+                    # Jitter ticks only (PM requirement: ±250ms to avoid thundering herd)
+                    jitter = random.uniform(-250, 250) / 1000.0
+                    next_tick = now + max(0.1, self.interval_ms / 1000.0 + jitter)
+                else:
+                    continue  # Woke for a track refit
 
                 # Update stats and reset backoff on success
-                self.stats["published"] += 1
-                self.stats["last_publish"] = time.time()
                 self.stats["last_error"] = None
                 self.backoff_seconds = 0  # Reset on success
 
@@ -136,6 +294,8 @@ class MoonPublisher:
                         f"Moon publisher: {self.stats['published']} messages published to {self.topic}"
                     )
 
+            except asyncio.CancelledError:
+                break
             except Exception as e:
                 self.stats["errors"] += 1
                 self.stats["last_error"] = str(e)
@@ -149,81 +309,93 @@ class MoonPublisher:
                 logger.warning(
                     f"Moon publisher will backoff for {self.backoff_seconds}s"
                 )
-                continue  # Skip sleep, go directly to backoff
-
-            # Wait for next interval with jitter (PM requirement: ±250ms to avoid thundering herd)
-            try:
-                base_sleep = self.interval_ms / 1000.0
-                jitter_ms = random.uniform(-250, 250) / 1000.0  # ±250ms jitter
-                sleep_duration = max(0.1, base_sleep + jitter_ms)  # Minimum 100ms
-
-                await asyncio.sleep(sleep_duration)
-            except asyncio.CancelledError:
-                break
 
         logger.info("Moon publisher stopped")
 
-    async def _get_moon_chain_data(self) -> dict[str, Any]:
-        """
-        Get current Moon KP chain data using VedaCore calculations.
+    async def _publish(self, payload: dict[str, Any], event: str) -> None:
+        # Add sequence field for consumer dedupe (PM requirement)
+        self.sequence += 1
+        payload["seq"] = self.sequence
 
-        Returns real-time Moon degree, speed, and KP lord hierarchy.
-        """
+        # Publish to stream manager (in-process, no external calls)
+        await stream_manager.publish(self.topic, payload, event=event, v=1)
+
+        # Record metrics
         try:
-            # Import VedaCore facade for calculations
-            from datetime import datetime
-            from zoneinfo import ZoneInfo
+            from .metrics import streaming_metrics
 
-            from refactor import facade
+            streaming_metrics.record_stream_publish_event(self.topic)
+        except ImportError:
+            pass  # Metrics not available
 
-            # Get current UTC time
-            now = datetime.now(ZoneInfo("UTC"))
+        self.stats["published"] += 1
+        self.stats["last_publish"] = time.time()
 
-            # Calculate Moon position and KP chain
-            moon_data = facade.get_planet_position(now, planet_id=2)  # Moon = 2
+    async def _publish_tick(
+        self, t: float, chain: tuple[int, int, int] | None = None
+    ) -> None:
+        await self._publish(self._get_moon_chain_data(t, chain), "moon_update")
 
-            # Get KP lord changes for context
-            lord_changes = facade.get_kp_lord_changes(
-                now - timedelta(minutes=5),
-                now + timedelta(minutes=5),
-                planet_id=2,
-                levels=("nl", "sl", "sl2"),
-            )
+    async def _publish_change(self, change: ScheduledChange) -> None:
+        from refactor.constants import PLANET_NAMES
 
-            return {
-                "timestamp": now.isoformat(),
-                "degree": round(moon_data.get("degree", 0), 4),
-                "speed": round(moon_data.get("speed", 0), 4),
-                "zodiac_sign": moon_data.get("zodiac_sign", "unknown"),
-                "nakshatra": moon_data.get("nakshatra", "unknown"),
-                "kp_lords": {
-                    "nl": moon_data.get("nl", "unknown"),
-                    "sl": moon_data.get("sl", "unknown"),
-                    "sl2": moon_data.get("sl2", "unknown"),
-                },
-                "upcoming_changes": len(lord_changes),
+        def _names(chain: tuple[int, int, int]) -> dict[str, str]:
+            return {level: PLANET_NAMES[p] for level, p in zip(_LEVELS, chain)}
+
+        await self._publish(
+            {
+                "timestamp": _iso(change.at),
+                "degree": round(change.boundary % 360.0, 4),
+                "levels": change.levels,
+                "from": _names(change.chain_before),
+                "to": _names(change.chain_after),
                 "publisher": "moon_service",
-                "flags": {"real_time": True, "kp_chain": True},
-            }
-
-        except Exception as e:
-            # Fallback data if calculations fail
-            import logging
-
-            logger = logging.getLogger(__name__)
-            logger.warning(f"Moon calculation failed, using fallback: {e}")
-
-            return {
-                "timestamp": datetime.now(ZoneInfo("UTC")).isoformat(),
-                "degree": 0.0,
-                "speed": 0.0,
-                "zodiac_sign": "fallback",
-                "nakshatra": "fallback",
-                "kp_lords": {"nl": "fallback", "sl": "fallback", "sl2": "fallback"},
-                "upcoming_changes": 0,
-                "publisher": "moon_service_fallback",
-                "flags": {"real_time": False, "kp_chain": False, "error": str(e)},
-            }
+                "flags": {"real_time": True, "kp_chain": True, "exact": True},
+            },
+            "moon_change",
+        )
+        self.stats["changes_published"] += 1
+
+    def _get_moon_chain_data(
+        self, t: float, chain: tuple[int, int, int] | None = None
+    ) -> dict[str, Any]:
+        """
+        Moon KP chain snapshot interpolated from the current track.
+
+        Returns Moon degree, speed, and KP lord hierarchy without touching
+        the ephemeris. ``chain`` overrides the lords derived from the
+        interpolated longitude (used for the tick emitted at a boundary).
+        """
+        from refactor.angles_indices import nakshatra_number, sign_number
+        from refactor.constants import NAKSHATRA_NAMES, PLANET_NAMES, SIGN_NAMES
+        from refactor.kp_chain import get_kp_lords_for_planet
+
+        track = self._track
+        lon = track.longitude(t)
+        nl, sl, sl2 = chain or get_kp_lords_for_planet(lon)
+        change = self._next_change
+        horizon_end = t + 300.0
+
+        return {
+            "timestamp": _iso(t),
+            "degree": round(lon, 4),
+            "speed": round(track.speed(t), 4),
+            "zodiac_sign": SIGN_NAMES.get(sign_number(lon), "unknown"),
+            "nakshatra": NAKSHATRA_NAMES.get(nakshatra_number(lon), "unknown"),
+            "kp_lords": {
+                "nl": PLANET_NAMES.get(nl, "unknown"),
+                "sl": PLANET_NAMES.get(sl, "unknown"),
+                "sl2": PLANET_NAMES.get(sl2, "unknown"),
+            },
+            "upcoming_changes": int(change is not None and change.at <= horizon_end),
+            "next_change": (
+                {"timestamp": _iso(change.at), "levels": change.levels}
+                if change is not None
+                else None
+            ),
+            "publisher": "moon_service",
+            "flags": {"real_time": True, "kp_chain": True, "interpolated": True},
+        }
 
 
 # Singleton instance
@@ -0,0 +1,305 @@
+"""
+profiler.py — On-demand sampling profiler for a single API worker.
+
+A background thread snapshots every thread's Python stack with
+sys._current_frames() at a fixed interval and counts identical stacks.
+Output is the collapsed ("folded") format read by flamegraph.pl, speedscope
+and inferno: one ``root;caller;...;leaf count`` line per distinct stack.
+
+Two session kinds, at most one active per worker:
+- duration: sample for N seconds regardless of traffic
+- requests: sample only while requests matching a path prefix are in flight,
+  until N of them have finished (or the session times out)
+
+Sampling sees the whole worker, so in requests mode concurrent unmatched
+requests running at the same moment land in the same profile. Sessions live
+in process memory; with several uvicorn workers each worker is profiled
+separately (the response carries the worker pid).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import sys
+import threading
+import time
+import uuid
+
+from collections import Counter
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Any
+
+from app.core.logging import get_api_logger
+
+logger = get_api_logger("profiler")
+
+PROFILE_MAX_SECONDS = float(os.getenv("PROFILE_MAX_SECONDS", "60"))
+PROFILE_MAX_REQUESTS = int(os.getenv("PROFILE_MAX_REQUESTS", "100"))
+DEFAULT_INTERVAL_S = 0.005
+MAX_STACK_DEPTH = 128
+
+# Leaf functions of threads parked waiting for work; dropped unless include_idle
+_IDLE_LEAVES = {
+    ("threading.py", "wait"),
+    ("threading.py", "_wait_for_tstate_lock"),
+    ("queue.py", "get"),
+    ("selectors.py", "select"),
+    ("thread.py", "_worker"),
+}
+
+
+class ProfilerBusyError(RuntimeError):
+    """Raised when a profiling session is already running on this worker."""
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    filename = os.path.basename(code.co_filename)
+    module = frame.f_globals.get("__name__", filename)
+    return f"{module}:{code.co_name}".replace(";", ":")
+
+
+def fold_stack(frame, max_depth: int = MAX_STACK_DEPTH) -> tuple[str, bool]:
+    """Collapse a frame chain to ``root;...;leaf``; also report whether idle."""
+    leaf = frame.f_code
+    idle = (os.path.basename(leaf.co_filename), leaf.co_name) in _IDLE_LEAVES
+    labels = []
+    while frame is not None and len(labels) < max_depth:
+        labels.append(_frame_label(frame))
+        frame = frame.f_back
+    labels.reverse()
+    return ";".join(labels), idle
+
+
+class StackSampler:
+    """Samples all threads' stacks on a daemon thread.
+
+    Samples are only recorded while ``active`` is set, so a sampler can stay
+    running across a session and record just the interesting windows.
+    """
+
+    def __init__(self, interval: float = DEFAULT_INTERVAL_S, include_idle: bool = False) -> None:
+        self.interval = max(0.001, interval)
+        self.include_idle = include_idle
+        self.stacks: Counter[str] = Counter()
+        self.samples = 0
+        self.active = threading.Event()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self, active: bool = True) -> None:
+        if active:
+            self.active.set()
+        self._thread = threading.Thread(target=self._run, name="vc-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self.active.clear()
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+
+    def _run(self) -> None:
+        own = threading.get_ident()
+        names = {}
+        while not self._stop.wait(self.interval):
+            if not self.active.is_set():
+                continue
+            self.sample_once(own, names)
+
+    def sample_once(self, skip_ident: int | None = None, names: dict[int, str] | None = None) -> None:
+        names = names if names is not None else {}
+        frames = sys._current_frames()
+        for ident, frame in frames.items():
+            if ident == skip_ident:
+                continue
+            stack, idle = fold_stack(frame)
+            if idle and not self.include_idle:
+                continue
+            if ident not in names:
+                names[ident] = next(
+                    (t.name for t in threading.enumerate() if t.ident == ident), f"thread-{ident}"
+                )
+            self.stacks[f"{names[ident]};{stack}"] += 1
+        self.samples += 1
+
+    def folded(self) -> str:
+        return "\n".join(f"{stack} {count}" for stack, count in self.stacks.most_common())
+
+
+@dataclass
+class ProfileSession:
+    id: str
+    mode: str  # "duration" | "requests"
+    sampler: StackSampler
+    path_prefix: str | None = None
+    target_requests: int = 0
+    deadline: float = 0.0
+    started: float = field(default_factory=time.time)
+    finished: float | None = None
+    requests_done: int = 0
+    in_flight: int = 0
+    paths: Counter[str] = field(default_factory=Counter)
+
+    @property
+    def done(self) -> bool:
+        return self.finished is not None
+
+    def summary(self) -> dict[str, Any]:
+        end = self.finished or time.time()
+        return {
+            "id": self.id,
+            "mode": self.mode,
+            "status": "done" if self.done else "running",
+            "worker_pid": os.getpid(),
+            "path_prefix": self.path_prefix,
+            "target_requests": self.target_requests or None,
+            "requests_profiled": self.requests_done,
+            "paths": dict(self.paths),
+            "interval_ms": self.sampler.interval * 1000,
+            "samples": self.sampler.samples,
+            "distinct_stacks": len(self.sampler.stacks),
+            "elapsed_s": round(end - self.started, 3),
+        }
+
+
+class Profiler:
+    """Per-worker profiling sessions (one active at a time)."""
+
+    def __init__(self, keep_finished: int = 8) -> None:
+        self.keep_finished = keep_finished
+        self._sessions: dict[str, ProfileSession] = {}
+        self._active: ProfileSession | None = None
+        self._lock = threading.Lock()
+
+    def _begin(self, session: ProfileSession) -> None:
+        with self._lock:
+            self._expire_active()
+            if self._active is not None:
+                raise ProfilerBusyError(f"Profiling session {self._active.id} is still running")
+            self._active = session
+            self._sessions[session.id] = session
+            while len(self._sessions) > self.keep_finished + 1:
+                oldest = next(iter(self._sessions))
+                if oldest == session.id:
+                    break
+                del self._sessions[oldest]
+
+    def _finish(self, session: ProfileSession) -> None:
+        if session.done:
+            return
+        session.sampler.stop()
+        session.finished = time.time()
+        if self._active is session:
+            self._active = None
+        logger.info(
+            f"Profiling session {session.id} finished: {session.sampler.samples} samples, "
+            f"{session.requests_done} requests"
+        )
+
+    def _expire_active(self) -> None:
+        active = self._active
+        if active is not None and active.deadline and time.time() >= active.deadline:
+            self._finish(active)
+
+    # -- duration mode -------------------------------------------------------
+
+    async def profile_for(
+        self, seconds: float, interval: float = DEFAULT_INTERVAL_S, include_idle: bool = False
+    ) -> ProfileSession:
+        """Sample the whole worker for ``seconds`` and return the finished session."""
+        seconds = min(max(seconds, 0.01), PROFILE_MAX_SECONDS)
+        session = ProfileSession(
+            id=uuid.uuid4().hex[:12],
+            mode="duration",
+            sampler=StackSampler(interval, include_idle),
+            deadline=time.time() + seconds + 1.0,
+        )
+        self._begin(session)
+        session.sampler.start(active=True)
+        try:
+            await asyncio.sleep(seconds)
+        finally:
+            with self._lock:
+                self._finish(session)
+        return session
+
+    # -- requests mode -------------------------------------------------------
+
+    def arm(
+        self,
+        path_prefix: str,
+        count: int,
+        timeout: float = PROFILE_MAX_SECONDS,
+        interval: float = DEFAULT_INTERVAL_S,
+        include_idle: bool = False,
+    ) -> ProfileSession:
+        """Profile the next ``count`` requests whose path starts with ``path_prefix``."""
+        session = ProfileSession(
+            id=uuid.uuid4().hex[:12],
+            mode="requests",
+            sampler=StackSampler(interval, include_idle),
+            path_prefix=path_prefix,
+            target_requests=min(max(count, 1), PROFILE_MAX_REQUESTS),
+            deadline=time.time() + min(max(timeout, 1.0), PROFILE_MAX_SECONDS * 10),
+        )
+        self._begin(session)
+        session.sampler.start(active=False)
+        return session
+
+    def match(self, path: str) -> ProfileSession | None:
+        """Armed requests-mode session that wants this path, if any (hot path)."""
+        session = self._active
+        if session is None or session.mode != "requests":
+            return None
+        if not path.startswith(session.path_prefix or "/"):
+            return None
+        if session.requests_done + session.in_flight >= session.target_requests:
+            return None
+        if time.time() >= session.deadline:
+            with self._lock:
+                self._finish(session)
+            return None
+        return session
+
+    @asynccontextmanager
+    async def track(self, session: ProfileSession, path: str):
+        """Record samples while this request is in flight."""
+        with self._lock:
+            session.in_flight += 1
+            session.sampler.active.set()
+        try:
+            yield
+        finally:
+            with self._lock:
+                session.in_flight -= 1
+                session.requests_done += 1
+                session.paths[path] += 1
+                if session.in_flight == 0:
+                    session.sampler.active.clear()
+                if session.requests_done >= session.target_requests:
+                    self._finish(session)
+
+    # -- lookup --------------------------------------------------------------
+
+    def get(self, session_id: str) -> ProfileSession | None:
+        with self._lock:
+            self._expire_active()
+        return self._sessions.get(session_id)
+
+    def cancel(self, session_id: str) -> ProfileSession | None:
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is not None:
+                self._finish(session)
+        return session
+
+    def active(self) -> ProfileSession | None:
+        with self._lock:
+            self._expire_active()
+            return self._active
+
+
+profiler = Profiler()
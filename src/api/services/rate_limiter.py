@@ -4,10 +4,14 @@ rate_limiter.py — Token bucket rate limiting for VedaCore streaming.
 Features:
 - Per-tenant QPS (queries per second) limits
 - Per-tenant connection limits
-- Token bucket algorithm with burst allowance
-- Thread-safe operation with asyncio locks
+- Token bucket algorithm with burst allowance (lazy refill on check)
+- Lock-free QPS path: bucket math has no awaits, so a check is atomic on
+  the event loop; connection bookkeeping keeps per-tenant asyncio locks
+- Sampled usage gauges and amortized idle-tenant cleanup
 - Usage event logging for 429 responses
-- Redis backend with in-memory fallback (PM requirement)
+- Optional distributed GCRA backend (RATE_LIMITER_BACKEND=redis): one Lua
+  call per check so limits hold across workers; falls back to the local
+  bucket if Redis is unavailable
 
 Usage:
 - Check connection limits before allowing SSE/WebSocket connections
@@ -49,6 +53,37 @@ DEFAULT_CONNECTION_LIMIT = int(os.getenv("STREAM_RATE_LIMIT_CONNECTIONS", "5"))
 DEFAULT_BURST_LIMIT = int(os.getenv("STREAM_RATE_LIMIT_BURST", "20"))
 # Idle TTL (seconds) after which inactive tenants can be pruned
 IDLE_TTL_SECONDS = float(os.getenv("RATE_LIMITER_IDLE_TTL", "600"))  # 10 minutes default
+# Update usage gauges on every Nth allowed check per tenant (violations always)
+METRICS_SAMPLE_EVERY = max(1, int(os.getenv("RATE_LIMITER_METRICS_SAMPLE", "16")))
+# Run an idle-tenant sweep every N checks, examining at most SWEEP_BATCH tenants
+CLEANUP_EVERY = max(1, int(os.getenv("RATE_LIMITER_CLEANUP_EVERY", "1024")))
+CLEANUP_SWEEP_BATCH = max(1, int(os.getenv("RATE_LIMITER_CLEANUP_BATCH", "64")))
+# QPS backend: memory (per process) | redis (GCRA shared across workers) | auto
+RATE_LIMITER_BACKEND = os.getenv("RATE_LIMITER_BACKEND", "memory").strip().lower() or "memory"
+RATE_LIMITER_REDIS_PREFIX = os.getenv(
+    "RATE_LIMITER_REDIS_PREFIX", f"rl:gcra:{os.getenv('VC_ENV', 'local')}:"
+)
+
+# GCRA (generic cell rate algorithm): one theoretical-arrival-time key per
+# tenant. Uses the Redis clock so every worker agrees on "now". Returns
+# {allowed, remaining tokens, retry after ms} as strings (floats would be
+# truncated to integers on the way out of Lua).
+_GCRA_SCRIPT = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) * 1000 + tonumber(t[2]) / 1000
+local emission = tonumber(ARGV[1])
+local tolerance = emission * tonumber(ARGV[2])
+local increment = emission * tonumber(ARGV[3])
+local tat = tonumber(redis.call('GET', KEYS[1]) or now)
+if tat < now then tat = now end
+local new_tat = tat + increment
+local wait = new_tat - tolerance - now
+if wait > 0 then
+  return {0, tostring((tolerance - (tat - now)) / emission), tostring(wait)}
+end
+redis.call('SET', KEYS[1], tostring(new_tat), 'PX', math.max(1, math.ceil(new_tat - now)))
+return {1, tostring((tolerance - (new_tat - now)) / emission), '0'}
+"""
 
 
 @dataclass
@@ -115,6 +150,8 @@ class TenantLimits:
     active_connections: int = 0
     # Last activity timestamp (monotonic seconds)
     last_activity: float = 0.0
+    # Allowed QPS checks, for sampling usage gauges
+    allowed_checks: int = 0
 
     def get_qps_bucket(self) -> TokenBucket:
         """Get or create QPS token bucket."""
@@ -123,6 +160,25 @@ class TenantLimits:
         return self.qps_bucket
 
 
+class RedisGCRALimiter:
+    """Distributed QPS limiting with GCRA, one EVALSHA round-trip per check."""
+
+    def __init__(self, client: Any, *, prefix: str = RATE_LIMITER_REDIS_PREFIX):
+        self.client = client
+        self.prefix = prefix
+        self._script = client.register_script(_GCRA_SCRIPT)
+
+    async def allow(
+        self, tenant_id: str, rate: float, burst: int, cost: float = 1.0
+    ) -> tuple[bool, float, float]:
+        """Return (allowed, remaining tokens, retry after seconds)."""
+        emission_ms = 1000.0 / max(rate, 1e-9)
+        allowed, remaining, wait_ms = await self._script(
+            keys=[f"{self.prefix}{tenant_id}"], args=[emission_ms, burst, cost]
+        )
+        return bool(int(allowed)), max(0.0, float(remaining)), float(wait_ms) / 1000.0
+
+
 class RateLimiter:
     """
     Multi-tenant rate limiter with connection and QPS limits.
@@ -142,7 +198,13 @@ class RateLimiter:
             "qps_violations": 0,
             "connection_violations": 0,
             "total_checks": 0,
+            "distributed_checks": 0,
+            "distributed_fallbacks": 0,
         }
+        # Distributed backend, resolved on first QPS check
+        self._backend: RedisGCRALimiter | None = None
+        self._backend_resolved = False
+        self._sweep_cursor = 0
 
     def _default_limits(self) -> TenantLimits:
         """Create default limits for new tenants."""
@@ -160,42 +222,107 @@ class RateLimiter:
         - API endpoint calls
         - Message publishing operations
         - Stream subscription requests
-        """
-        lock = self._locks.setdefault(tenant_id, asyncio.Lock())
-        async with lock:
-            limits = self._limits[tenant_id]
-            bucket = limits.get_qps_bucket()
-            self._metrics["total_checks"] += 1
 
-            allowed = bucket.allow(cost)
-            if not allowed:
-                self._metrics["qps_violations"] += 1
-                logger.warning(f"QPS limit exceeded for tenant {tenant_id}")
-
-                # Record metrics
-                if METRICS_AVAILABLE:
-                    streaming_metrics.record_rate_limit_violation(
-                        tenant_id, "qps", "api_call"
-                    )
-            else:
-                # Update current usage percentage
-                if METRICS_AVAILABLE:
-                    remaining_tokens = bucket.remaining_tokens()
-                    usage_percent = max(
-                        0,
-                        (limits.burst_limit - remaining_tokens)
-                        / limits.burst_limit
-                        * 100,
-                    )
-                    streaming_metrics.update_rate_limit_usage(
-                        tenant_id, "qps", usage_percent
-                    )
+        Uses the distributed GCRA backend when configured, else the local
+        lock-free bucket.
+        """
+        backend = await self._get_backend()
+        if backend is None:
+            return self.allow_qps_nowait(tenant_id, cost)
 
-            # Update last activity timestamp and attempt cleanup if idle
-            limits.last_activity = time.monotonic()
-            self._maybe_cleanup_tenant(tenant_id, limits)
+        limits = self._limits[tenant_id]
+        try:
+            allowed, remaining, _ = await backend.allow(
+                tenant_id, limits.qps_limit, limits.burst_limit, cost
+            )
+        except Exception as e:
+            self._metrics["distributed_fallbacks"] += 1
+            logger.debug(f"GCRA backend unavailable, using local bucket: {e}")
+            return self.allow_qps_nowait(tenant_id, cost)
+
+        self._metrics["distributed_checks"] += 1
+        # Mirror the shared state locally so snapshot_limits/headers reflect it
+        bucket = limits.get_qps_bucket()
+        bucket.tokens = min(float(limits.burst_limit), remaining)
+        bucket.last_update = time.monotonic()
+        self._record_check(tenant_id, limits, allowed)
+        return allowed
+
+    def allow_qps_nowait(self, tenant_id: str, cost: float = 1.0) -> bool:
+        """Local, lock-free QPS check (no awaits, so atomic on the event loop)."""
+        limits = self._limits[tenant_id]
+        allowed = limits.get_qps_bucket().allow(cost)
+        self._record_check(tenant_id, limits, allowed)
+        return allowed
+
+    def _record_check(self, tenant_id: str, limits: TenantLimits, allowed: bool) -> None:
+        """Counters, sampled gauges and amortized cleanup after a QPS check."""
+        self._metrics["total_checks"] += 1
+        limits.last_activity = time.monotonic()
+
+        if not allowed:
+            self._metrics["qps_violations"] += 1
+            logger.warning(f"QPS limit exceeded for tenant {tenant_id}")
+
+            # Record metrics
+            if METRICS_AVAILABLE:
+                streaming_metrics.record_rate_limit_violation(
+                    tenant_id, "qps", "api_call"
+                )
+        else:
+            limits.allowed_checks += 1
+            # Update current usage percentage (sampled; tokens were just refilled)
+            if METRICS_AVAILABLE and (limits.allowed_checks - 1) % METRICS_SAMPLE_EVERY == 0:
+                usage_percent = max(
+                    0,
+                    (limits.burst_limit - limits.get_qps_bucket().tokens)
+                    / limits.burst_limit
+                    * 100,
+                )
+                streaming_metrics.update_rate_limit_usage(
+                    tenant_id, "qps", usage_percent
+                )
 
-            return allowed
+        if self._metrics["total_checks"] % CLEANUP_EVERY == 0:
+            self._sweep_idle_tenants()
+
+    def _sweep_idle_tenants(self) -> None:
+        """Examine a bounded slice of tenants for idle cleanup."""
+        tenants = list(self._limits)
+        if not tenants:
+            return
+        start = self._sweep_cursor % len(tenants)
+        batch = tenants[start : start + CLEANUP_SWEEP_BATCH]
+        self._sweep_cursor = start + len(batch)
+        for tenant_id in batch:
+            lock = self._locks.get(tenant_id)
+            if lock is not None and lock.locked():
+                continue
+            self._maybe_cleanup_tenant(tenant_id)
+
+    async def _get_backend(self) -> RedisGCRALimiter | None:
+        if self._backend_resolved:
+            return self._backend
+        self._backend_resolved = True
+        backend = RATE_LIMITER_BACKEND
+        if backend == "auto":
+            backend = "redis" if os.getenv("REDIS_URL") else "memory"
+        if backend != "redis":
+            return None
+        try:
+            from .redis_config import get_redis
+
+            client = await (await get_redis()).get_client()
+            self._backend = RedisGCRALimiter(client)
+            logger.info("Rate limiter using distributed GCRA backend")
+        except Exception as e:
+            logger.warning(f"GCRA backend unavailable, limits are per-process: {e}")
+        return self._backend
+
+    def attach_backend(self, backend: RedisGCRALimiter | None) -> None:
+        """Use an explicit distributed backend (None: local buckets only)."""
+        self._backend = backend
+        self._backend_resolved = True
 
     async def allow_connection(self, tenant_id: str) -> bool:
         """
@@ -6,8 +6,13 @@ PM Requirements:
 - Set reasonable eviction policy (allkeys-lru) 
 - Alert at 80% memory usage
 - Backpressure controls for streaming
+
+Connections: one sized, health-checked pool per process and a single shared
+client on top of it. Multi-command operations are pipelined so each costs
+one network round-trip.
 """
 
+import asyncio
 import os
 import redis.asyncio as redis
 from urllib.parse import urlparse
@@ -17,6 +22,13 @@ from app.core.logging import get_api_logger
 
 logger = get_api_logger("redis_config")
 
+# GETDEL for servers older than 6.2 (and managed providers without it)
+_GETDEL_SCRIPT = """
+local value = redis.call('GET', KEYS[1])
+if value then redis.call('DEL', KEYS[1]) end
+return value
+"""
+
 
 @dataclass
 class RedisConfig:
@@ -47,6 +59,8 @@ class RedisConfig:
     retry_on_timeout: bool = True
     socket_keepalive: bool = True
     health_check_interval: int = 30
+    socket_timeout: float = 5.0
+    socket_connect_timeout: float = 2.0
 
 
 class RedisManager:
@@ -55,6 +69,8 @@ class RedisManager:
     def __init__(self, config: Optional[RedisConfig] = None):
         self.config = config or RedisConfig()
         self._pool = None
+        self._client: Optional[redis.Redis] = None
+        self._init_lock = asyncio.Lock()
         self._subscriber_counts: Dict[str, int] = {}
         self._total_subscribers = 0
         
@@ -67,6 +83,10 @@ class RedisManager:
                 self._pool = redis.ConnectionPool.from_url(
                     redis_url,
                     max_connections=self.config.max_connections,
+                    retry_on_timeout=self.config.retry_on_timeout,
+                    socket_keepalive=self.config.socket_keepalive,
+                    socket_timeout=self.config.socket_timeout,
+                    socket_connect_timeout=self.config.socket_connect_timeout,
                     health_check_interval=self.config.health_check_interval,
                     decode_responses=True,
                 )
@@ -80,12 +100,16 @@ class RedisManager:
                     max_connections=self.config.max_connections,
                     retry_on_timeout=self.config.retry_on_timeout,
                     socket_keepalive=self.config.socket_keepalive,
+                    socket_timeout=self.config.socket_timeout,
+                    socket_connect_timeout=self.config.socket_connect_timeout,
                     health_check_interval=self.config.health_check_interval,
                     decode_responses=True,
                 )
             
-            # Configure Redis for production durability
-            client = redis.Redis(connection_pool=self._pool)
+            # One shared client for the process; connections come from the
+            # pool per command and are health-checked before reuse
+            self._client = redis.Redis(connection_pool=self._pool)
+            client = self._client
             
             # Set memory/persistence policy when allowed (managed providers like Upstash forbid CONFIG SET)
             try:
@@ -98,8 +122,7 @@ class RedisManager:
             logger.info(f"✅ Redis configured: {self.config.host}:{self.config.port}")
             logger.info(f"🔧 Memory policy: {self.config.maxmemory_policy}")
             logger.info(f"💾 Max memory: {self.config.maxmemory}")
-            
-            await client.close()
+            logger.info(f"🔌 Pool size: {self.config.max_connections}")
             
         except Exception as e:
             logger.error(f"❌ Redis initialization failed: {e}")
@@ -107,57 +130,47 @@ class RedisManager:
             raise
     
     async def get_client(self) -> redis.Redis:
-        """Get Redis client from pool."""
-        if not self._pool:
-            await self.initialize()
-        return redis.Redis(connection_pool=self._pool)
+        """Get the shared Redis client backed by the pool.
+        
+        The client is shared process-wide; callers must not rely on close()
+        releasing anything (with an external pool it is a no-op).
+        """
+        if self._client is None:
+            # Concurrent first callers must not each build (and leak) a pool
+            async with self._init_lock:
+                if self._client is None:
+                    await self.initialize()
+        return self._client
     
     async def store_jti(self, jti: str, tenant_id: str) -> None:
         """Store JTI with TTL for one-time token validation (PM requirement)."""
         client = await self.get_client()
-        try:
-            key = f"jti:{jti}"
-            await client.setex(key, self.config.jti_ttl_seconds, tenant_id)
-            logger.debug(f"JTI stored: {jti[:8]}... TTL={self.config.jti_ttl_seconds}s")
-        finally:
-            await client.close()
+        key = f"jti:{jti}"
+        await client.setex(key, self.config.jti_ttl_seconds, tenant_id)
+        logger.debug(f"JTI stored: {jti[:8]}... TTL={self.config.jti_ttl_seconds}s")
     
     async def check_jti(self, jti: str) -> Optional[str]:
         """Check if JTI exists and return tenant_id, then delete (one-time use)."""
         client = await self.get_client()
-        try:
-            key = f"jti:{jti}"
-            
-            # Get and delete atomically
-            pipe = client.pipeline()
-            pipe.get(key)
-            pipe.delete(key)
-            results = await pipe.execute()
-            
-            tenant_id = results[0]
-            if tenant_id:
-                logger.debug(f"JTI consumed: {jti[:8]}... tenant={tenant_id}")
-            
-            return tenant_id
-        finally:
-            await client.close()
+        key = f"jti:{jti}"
+        
+        # Get and delete atomically in one round-trip
+        tenant_id = await client.eval(_GETDEL_SCRIPT, 1, key)
+        if tenant_id:
+            logger.debug(f"JTI consumed: {jti[:8]}... tenant={tenant_id}")
+        
+        return tenant_id
     
     async def cache_response(self, key: str, data: Any, ttl_override: Optional[int] = None) -> None:
         """Cache API response with TTL."""
         client = await self.get_client()
-        try:
-            ttl = ttl_override or self.config.cache_ttl_seconds
-            await client.setex(f"cache:{key}", ttl, str(data))
-        finally:
-            await client.close()
+        ttl = ttl_override or self.config.cache_ttl_seconds
+        await client.setex(f"cache:{key}", ttl, str(data))
     
     async def get_cached_response(self, key: str) -> Optional[str]:
         """Get cached response."""
         client = await self.get_client()
-        try:
-            return await client.get(f"cache:{key}")
-        finally:
-            await client.close()
+        return await client.get(f"cache:{key}")
     
     async def register_subscriber(self, tenant_id: str, topic: str) -> bool:
         """Register subscriber with backpressure control (PM requirement)."""
@@ -177,19 +190,17 @@ class RedisManager:
         self._total_subscribers += 1
         
         client = await self.get_client()
-        try:
-            # Store subscriber info with TTL
-            subscriber_key = f"subscriber:{tenant_id}:{topic}"
-            await client.setex(subscriber_key, self.config.stream_token_ttl_seconds, "active")
-            
-            # Update metrics
-            await client.incr("metrics:total_subscribers")
-            await client.incr(f"metrics:tenant_subscribers:{tenant_id}")
-            
-            logger.info(f"📡 Subscriber registered: {tenant_id} -> {topic}")
-            return True
-        finally:
-            await client.close()
+        
+        # Subscriber info with TTL plus metrics counters, one round-trip
+        subscriber_key = f"subscriber:{tenant_id}:{topic}"
+        pipe = client.pipeline(transaction=False)
+        pipe.setex(subscriber_key, self.config.stream_token_ttl_seconds, "active")
+        pipe.incr("metrics:total_subscribers")
+        pipe.incr(f"metrics:tenant_subscribers:{tenant_id}")
+        await pipe.execute()
+        
+        logger.info(f"📡 Subscriber registered: {tenant_id} -> {topic}")
+        return True
     
     async def unregister_subscriber(self, tenant_id: str, topic: str) -> None:
         """Unregister subscriber and update counts."""
@@ -201,56 +212,52 @@ class RedisManager:
         self._total_subscribers = max(0, self._total_subscribers - 1)
         
         client = await self.get_client()
-        try:
-            subscriber_key = f"subscriber:{tenant_id}:{topic}"
-            await client.delete(subscriber_key)
-            
-            # Update metrics
-            await client.decr("metrics:total_subscribers")
-            await client.decr(f"metrics:tenant_subscribers:{tenant_id}")
-            
-            logger.info(f"📡 Subscriber unregistered: {tenant_id} -> {topic}")
-        finally:
-            await client.close()
+        
+        subscriber_key = f"subscriber:{tenant_id}:{topic}"
+        pipe = client.pipeline(transaction=False)
+        pipe.delete(subscriber_key)
+        pipe.decr("metrics:total_subscribers")
+        pipe.decr(f"metrics:tenant_subscribers:{tenant_id}")
+        await pipe.execute()
+        
+        logger.info(f"📡 Subscriber unregistered: {tenant_id} -> {topic}")
     
     async def get_memory_usage(self) -> Dict[str, Any]:
         """Get Redis memory usage for alerting (PM requirement)."""
         client = await self.get_client()
-        try:
-            info = await client.memory_usage()
-            stats = await client.memory_stats()
+        stats = await client.memory_stats()
             
-            used_memory = stats.get('used_memory', 0)
-            max_memory = stats.get('maxmemory', 0)
-            
-            if max_memory > 0:
-                usage_ratio = used_memory / max_memory
-                alert = usage_ratio > self.config.memory_alert_threshold
-            else:
-                usage_ratio = 0.0
-                alert = False
-            
-            return {
-                "used_memory_bytes": used_memory,
-                "max_memory_bytes": max_memory,
-                "usage_ratio": usage_ratio,
-                "memory_alert": alert,
-                "total_subscribers": self._total_subscribers,
-                "tenant_counts": dict(self._subscriber_counts)
-            }
-        finally:
-            await client.close()
+        used_memory = stats.get('used_memory', 0)
+        max_memory = stats.get('maxmemory', 0)
+        
+        if max_memory > 0:
+            usage_ratio = used_memory / max_memory
+            alert = usage_ratio > self.config.memory_alert_threshold
+        else:
+            usage_ratio = 0.0
+            alert = False
+        
+        return {
+            "used_memory_bytes": used_memory,
+            "max_memory_bytes": max_memory,
+            "usage_ratio": usage_ratio,
+            "memory_alert": alert,
+            "total_subscribers": self._total_subscribers,
+            "tenant_counts": dict(self._subscriber_counts)
+        }
     
     async def health_check(self) -> Dict[str, Any]:
         """Redis health check for monitoring."""
         try:
             client = await self.get_client()
             
-            # Test basic operations
+            # Test basic operations (single round-trip)
             test_key = "health_check"
-            await client.set(test_key, "ok", ex=10)
-            value = await client.get(test_key)
-            await client.delete(test_key)
+            pipe = client.pipeline(transaction=False)
+            pipe.set(test_key, "ok", ex=10)
+            pipe.get(test_key)
+            pipe.delete(test_key)
+            _, value, _ = await pipe.execute()
             
             if value != "ok":
                 raise Exception("Redis read/write test failed")
@@ -258,8 +265,6 @@ class RedisManager:
             # Get memory stats
             memory_stats = await self.get_memory_usage()
             
-            await client.close()
-            
             return {
                 "status": "healthy",
                 "connection": "ok",
@@ -276,6 +281,7 @@ class RedisManager:
     
     async def close(self) -> None:
         """Close Redis connection pool."""
+        self._client = None
         if self._pool:
             await self._pool.disconnect()
             logger.info("Redis connection pool closed")
@@ -0,0 +1,355 @@
+"""
+response_encoding.py — Content negotiation and compact encodings for
+timeseries responses.
+
+Heavy timeline endpoints (/strategy/day, /micro/day, /micro/range) normally
+return JSON validated through Pydantic response models. Backtesting clients
+can ask for a compact form instead via the Accept header:
+
+- application/x-ndjson: one JSON meta line, then one line per row
+- application/msgpack: columnar; numeric columns as raw little-endian
+  typed arrays (timestamps as int64 epoch-ms, floats as float32). A time
+  column with missing values is sent as a list of epoch-ms / nil with
+  dtype "timestamp_ms_nullable"
+- application/vnd.apache.arrow.stream: Arrow IPC stream of the same columns,
+  meta in the schema metadata
+
+Compact paths skip per-row model construction entirely. msgpack and pyarrow
+are declared in requirements.txt; a process without one of them simply does
+not offer that format.
+
+Long-range endpoints stream NDJSON instead (stream_ndjson): rows are produced
+by a generator one batch (a day, a period, an hour) at a time, so memory
+stays flat and the first bytes leave before the range is finished.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+
+from datetime import datetime
+from typing import Any, Callable, Iterable
+
+import numpy as np
+
+from fastapi import HTTPException
+from fastapi.responses import Response, StreamingResponse
+
+from shared.otel import stage, timed_stage
+
+try:
+    import orjson
+
+    def _dumps(obj: Any) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY)
+
+except ImportError:  # pragma: no cover - orjson is a declared dependency
+
+    def _dumps(obj: Any) -> bytes:
+        return json.dumps(obj, separators=(",", ":"), default=str).encode()
+
+
+try:
+    from fastapi.responses import ORJSONResponse as _JSONResponseBase
+except ImportError:  # pragma: no cover
+    from fastapi.responses import JSONResponse as _JSONResponseBase
+
+
+try:
+    import msgpack
+
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    MSGPACK_AVAILABLE = False
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc
+
+    ARROW_AVAILABLE = True
+except ImportError:
+    ARROW_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+JSON = "json"
+NDJSON = "ndjson"
+MSGPACK = "msgpack"
+ARROW = "arrow"
+
+MEDIA_TYPES = {
+    JSON: "application/json",
+    NDJSON: "application/x-ndjson",
+    MSGPACK: "application/msgpack",
+    ARROW: "application/vnd.apache.arrow.stream",
+}
+
+_ACCEPT_FORMATS = {
+    "application/x-ndjson": NDJSON,
+    "application/jsonl": NDJSON,
+    "application/msgpack": MSGPACK,
+    "application/x-msgpack": MSGPACK,
+    "application/vnd.apache.arrow.stream": ARROW,
+}
+
+_JSON_MEDIA = {"application/json", "application/*", "*/*"}
+
+
+def available_formats() -> list[str]:
+    """Formats this process can produce."""
+    formats = [JSON, NDJSON]
+    if MSGPACK_AVAILABLE:
+        formats.append(MSGPACK)
+    if ARROW_AVAILABLE:
+        formats.append(ARROW)
+    return formats
+
+
+def negotiate(accept: str | None) -> str:
+    """Pick a response format from an Accept header (highest q first).
+
+    Falls back to JSON unless the client asked only for compact formats this
+    process cannot produce, in which case it raises 406.
+    """
+    if not accept:
+        return JSON
+
+    ranked: list[tuple[float, int, str]] = []
+    for index, part in enumerate(accept.split(",")):
+        media, _, params = part.strip().partition(";")
+        q = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        if q > 0:
+            ranked.append((-q, index, media.strip().lower()))
+    ranked.sort()
+
+    formats = available_formats()
+    wanted_compact = False
+    for _, _, media in ranked:
+        fmt = _ACCEPT_FORMATS.get(media)
+        if fmt is not None:
+            if fmt in formats:
+                return fmt
+            wanted_compact = True
+        elif media in _JSON_MEDIA:
+            return JSON
+
+    if wanted_compact:
+        raise HTTPException(
+            status_code=406,
+            detail=f"Requested encoding not available; supported: {', '.join(MEDIA_TYPES[f] for f in formats)}",
+        )
+    return JSON
+
+
+# ---------------------------------------------------------------------------
+# Columnar conversion
+# ---------------------------------------------------------------------------
+
+
+def _epoch_ms(value: Any) -> int | None:
+    if value is None:
+        return None
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    return int(value.timestamp() * 1000)
+
+
+def _flatten(row: dict[str, Any]) -> dict[str, Any]:
+    """One level of flattening: {"factors": {"moon": 0.2}} -> {"factors.moon": 0.2}."""
+    flat: dict[str, Any] = {}
+    for key, value in row.items():
+        if isinstance(value, dict):
+            for sub, sub_value in value.items():
+                flat[f"{key}.{sub}"] = sub_value
+        else:
+            flat[key] = value
+    return flat
+
+
+def columnize(
+    rows: Iterable[dict[str, Any]], time_fields: Iterable[str] = ("t",)
+) -> dict[str, np.ndarray | list]:
+    """Convert row dicts into typed columns.
+
+    Time fields (ISO strings or datetimes) become int64 epoch-ms arrays, or
+    a list of epoch-ms with None where a row has no time,
+    floats float32, ints int64 (float32 if any row has a float or is missing),
+    bools bool.
+    Strings, lists and mixed values stay Python lists. Nested dicts are
+    flattened one level; missing numeric values become NaN.
+    """
+    flat_rows = [_flatten(r) for r in rows]
+    time_fields = set(time_fields)
+
+    names: dict[str, None] = {}
+    for row in flat_rows:
+        for key in row:
+            names.setdefault(key, None)
+
+    columns: dict[str, np.ndarray | list] = {}
+    for name in names:
+        values = [row.get(name) for row in flat_rows]
+        present = [v for v in values if v is not None]
+
+        if name in time_fields:
+            if len(present) == len(values):
+                columns[name] = np.fromiter(
+                    (_epoch_ms(v) for v in values), dtype=np.int64, count=len(values)
+                )
+            else:
+                columns[name] = [_epoch_ms(v) for v in values]
+        elif present and all(isinstance(v, bool) for v in present) and len(present) == len(values):
+            columns[name] = np.array(values, dtype=bool)
+        elif present and all(isinstance(v, (int, float)) and not isinstance(v, bool) for v in present):
+            if len(present) == len(values) and all(isinstance(v, int) for v in present):
+                columns[name] = np.array(values, dtype=np.int64)
+            else:
+                columns[name] = np.array(
+                    [np.nan if v is None else v for v in values], dtype=np.float32
+                )
+        else:
+            columns[name] = values
+    return columns
+
+
+def _dtype_name(column: np.ndarray | list, is_time: bool) -> str:
+    if is_time:
+        return "timestamp_ms" if isinstance(column, np.ndarray) else "timestamp_ms_nullable"
+    if isinstance(column, np.ndarray):
+        return str(column.dtype)
+    return "object"
+
+
+# ---------------------------------------------------------------------------
+# Encoders
+# ---------------------------------------------------------------------------
+
+
+def encode_ndjson(meta: dict[str, Any], rows: Iterable[dict[str, Any]]) -> bytes:
+    """Meta line followed by one JSON document per row."""
+    lines = [_dumps({"meta": meta})]
+    lines.extend(_dumps(row) for row in rows)
+    lines.append(b"")
+    return b"\n".join(lines)
+
+
+def encode_msgpack(
+    meta: dict[str, Any], columns: dict[str, np.ndarray | list], time_fields: Iterable[str] = ("t",)
+) -> bytes:
+    """Columnar msgpack: typed columns carry raw little-endian bytes."""
+    time_fields = set(time_fields)
+    length = len(next(iter(columns.values()), []))
+    packed = {}
+    for name, column in columns.items():
+        dtype = _dtype_name(column, name in time_fields)
+        if isinstance(column, np.ndarray):
+            data = column.astype(column.dtype.newbyteorder("<"), copy=False).tobytes()
+        else:
+            data = column
+        packed[name] = {"dtype": dtype, "data": data}
+    return msgpack.packb({"meta": meta, "length": length, "columns": packed}, use_bin_type=True)
+
+
+def encode_arrow(
+    meta: dict[str, Any], columns: dict[str, np.ndarray | list], time_fields: Iterable[str] = ("t",)
+) -> bytes:
+    """Arrow IPC stream; timestamps typed as timestamp[ms, UTC]."""
+    time_fields = set(time_fields)
+    arrays = []
+    names = []
+    for name, column in columns.items():
+        if name in time_fields:
+            arrays.append(pa.array(column, type=pa.timestamp("ms", tz="UTC")))
+        else:
+            arrays.append(pa.array(column))
+        names.append(name)
+    table = pa.Table.from_arrays(arrays, names=names)
+    table = table.replace_schema_metadata({"meta": _dumps(meta)})
+    sink = pa.BufferOutputStream()
+    with pyarrow.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+@timed_stage("serialization")
+def encode_timeseries(
+    fmt: str,
+    meta: dict[str, Any],
+    rows: list[dict[str, Any]],
+    *,
+    time_fields: Iterable[str] = ("t",),
+) -> Response:
+    """Build a compact response for a negotiated non-JSON format."""
+    time_fields = tuple(time_fields)
+    if fmt == NDJSON:
+        body = encode_ndjson(meta, rows)
+    elif fmt == MSGPACK:
+        body = encode_msgpack(meta, columnize(rows, time_fields), time_fields)
+    elif fmt == ARROW:
+        body = encode_arrow(meta, columnize(rows, time_fields), time_fields)
+    else:
+        raise ValueError(f"Unsupported compact format: {fmt}")
+    return Response(
+        content=body,
+        media_type=MEDIA_TYPES[fmt],
+        headers={"X-Row-Count": str(len(rows)), "Vary": "Accept"},
+    )
+
+
+class TimedJSONResponse(_JSONResponseBase):
+    """Default JSON response class; rendering is timed as the serialization stage.
+
+    Only the final render is covered: response-model validation runs inside
+    FastAPI's request handler before the response class is built.
+    """
+
+    def render(self, content: Any) -> bytes:
+        with stage("serialization"):
+            return super().render(content)
+
+
+def stream_ndjson(
+    meta: dict[str, Any],
+    batches: Iterable[list[dict[str, Any]]],
+    *,
+    summary: Callable[[], dict[str, Any]] | None = None,
+) -> StreamingResponse:
+    """Stream NDJSON: a meta line, each batch's rows, then an optional summary line.
+
+    ``batches`` is usually a sync generator; Starlette advances it in the
+    threadpool one batch per chunk, and the next batch is not computed until
+    the previous chunk has been handed to the server (backpressure).
+
+    Error contract: the 200 status and headers are already sent when the
+    first batch is computed, so a failure mid-stream cannot change the
+    status. Instead the stream ends with a single ``{"error": "<message>"}``
+    line and no summary line. Clients must treat a stream whose last line is
+    not ``{"summary": ...}`` (when a summary is expected) or is an error line
+    as truncated. Validation that can fail should run before calling this.
+    """
+
+    def lines():
+        yield _dumps({"meta": meta}) + b"\n"
+        try:
+            for batch in batches:
+                if batch:
+                    yield b"".join(_dumps(row) + b"\n" for row in batch)
+            if summary is not None:
+                yield _dumps({"summary": summary()}) + b"\n"
+        except Exception as e:
+            logger.exception("NDJSON stream aborted after response start")
+            yield _dumps({"error": str(e)}) + b"\n"
+
+    return StreamingResponse(
+        lines(),
+        media_type=MEDIA_TYPES[NDJSON],
+        headers={"Vary": "Accept", "X-Accel-Buffering": "no"},
+    )
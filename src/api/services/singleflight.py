@@ -0,0 +1,168 @@
+"""
+singleflight.py — Process-wide request coalescing for identical computations.
+
+During bursts (e.g. market open) many clients ask for the same day or chart
+at once. Instead of every request recomputing until the first one fills
+UnifiedCache, concurrent callers with the same fingerprint await one shared
+future:
+
+- request_fingerprint(): canonical key from namespace + parameters (hash_keys)
+- SingleFlight.do(): first caller computes, the rest await its result
+- SingleFlight.run_sync(): same, for blocking work moved to a worker thread
+- Optional cross-worker coalescing (SINGLEFLIGHT_REDIS=true): the leader takes
+  a short Redis lock; other workers wait for it to clear, then compute against
+  the warmed cache
+
+Results are shared by reference, so callers must treat them as read-only.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import uuid
+
+from collections.abc import Awaitable, Callable
+from typing import Any, TypeVar
+
+from app.core.logging import get_api_logger
+from app.utils.hash_keys import key_digest
+
+logger = get_api_logger("singleflight")
+
+T = TypeVar("T")
+
+SINGLEFLIGHT_REDIS = os.getenv("SINGLEFLIGHT_REDIS", "false").lower() == "true"
+SINGLEFLIGHT_LOCK_TTL_MS = int(os.getenv("SINGLEFLIGHT_LOCK_TTL_MS", "10000"))
+SINGLEFLIGHT_POLL_MS = int(os.getenv("SINGLEFLIGHT_POLL_MS", "25"))
+
+try:
+    from .metrics import streaming_metrics
+
+    METRICS_AVAILABLE = True
+except ImportError:
+    METRICS_AVAILABLE = False
+
+# Compare-and-delete so a slow leader never releases someone else's lock
+_UNLOCK_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+  return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+
+def request_fingerprint(namespace: str, params: Any) -> str:
+    """Canonical fingerprint for a request: namespace plus sorted-JSON params.
+
+    Args:
+        namespace: Logical operation name (e.g. "strategy.day")
+        params: JSON-like parameters (pydantic models: pass model_dump())
+
+    Returns:
+        "<namespace>:<32-hex digest>"
+    """
+    canonical = json.dumps(params, sort_keys=True, separators=(",", ":"), default=str)
+    return f"{namespace}:{key_digest(canonical, short=32)}"
+
+
+class SingleFlight:
+    """Coalesce concurrent calls that share a key onto one in-flight future."""
+
+    def __init__(
+        self,
+        *,
+        use_redis: bool = SINGLEFLIGHT_REDIS,
+        lock_ttl_ms: int = SINGLEFLIGHT_LOCK_TTL_MS,
+        lock_prefix: str | None = None,
+    ) -> None:
+        self._inflight: dict[str, asyncio.Future] = {}
+        self.use_redis = use_redis
+        self.lock_ttl_ms = lock_ttl_ms
+        self.lock_prefix = lock_prefix or (
+            f"sf:lock:{os.getenv('VC_ENV', 'local')}:"
+        )
+        self.stats = {"leader": 0, "coalesced": 0, "cross_worker_wait": 0}
+
+    async def do(self, key: str, factory: Callable[[], Awaitable[T]]) -> T:
+        """Return factory()'s result, sharing it with concurrent same-key callers.
+
+        A caller that is cancelled stops waiting without cancelling the
+        shared computation; a failure propagates to every waiter.
+        """
+        fut = self._inflight.get(key)
+        if fut is not None:
+            self._record(key, "coalesced")
+            return await asyncio.shield(fut)
+
+        fut = asyncio.ensure_future(self._lead(key, factory))
+        self._inflight[key] = fut
+        fut.add_done_callback(lambda f, k=key: self._forget(k, f))
+        self._record(key, "leader")
+        return await asyncio.shield(fut)
+
+    async def run_sync(self, key: str, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """Coalesce a blocking computation, running the leader's call in a thread."""
+        return await self.do(key, lambda: asyncio.to_thread(func, *args, **kwargs))
+
+    def in_flight(self) -> int:
+        return len(self._inflight)
+
+    # -------------------- Internal --------------------
+
+    def _forget(self, key: str, fut: asyncio.Future) -> None:
+        if self._inflight.get(key) is fut:
+            del self._inflight[key]
+        if not fut.cancelled():
+            fut.exception()  # mark retrieved; waiters re-raise it themselves
+
+    def _record(self, key: str, outcome: str) -> None:
+        self.stats[outcome] += 1
+        if METRICS_AVAILABLE:
+            try:
+                streaming_metrics.record_singleflight(key.split(":", 1)[0], outcome)
+            except Exception:
+                pass
+
+    async def _lead(self, key: str, factory: Callable[[], Awaitable[T]]) -> T:
+        if not self.use_redis:
+            return await factory()
+
+        client = None
+        token = uuid.uuid4().hex
+        lock_key = f"{self.lock_prefix}{key}"
+        acquired = False
+        try:
+            from .redis_config import get_redis
+
+            client = await (await get_redis()).get_client()
+            acquired = bool(
+                await client.set(lock_key, token, nx=True, px=self.lock_ttl_ms)
+            )
+            if not acquired:
+                # Another worker is computing: wait for its lock to clear,
+                # then compute against the cache it filled
+                self._record(key, "cross_worker_wait")
+                deadline = asyncio.get_running_loop().time() + self.lock_ttl_ms / 1000.0
+                while asyncio.get_running_loop().time() < deadline:
+                    await asyncio.sleep(SINGLEFLIGHT_POLL_MS / 1000.0)
+                    if not await client.exists(lock_key):
+                        break
+        except Exception as e:
+            logger.debug(f"Single-flight Redis lock unavailable for {key}: {e}")
+
+        try:
+            return await factory()
+        finally:
+            # The client is the process-wide pooled one: release the lock,
+            # never close it
+            if acquired:
+                try:
+                    await client.eval(_UNLOCK_SCRIPT, 1, lock_key, token)
+                except Exception:
+                    pass
+
+
+# Process-wide instance shared by routers
+singleflight = SingleFlight()
@@ -297,14 +297,12 @@ class StreamBackpressureManager:
             redis_mgr = await get_redis()
             client = await redis_mgr.get_client()
             
-            # Increment counter with reason label
+            # Increment counter with reason label, 24h TTL (one round-trip)
             metric_key = f"metrics:{metric_name}:{reason}"
-            await client.incr(metric_key)
-            
-            # Set TTL for metric (24 hours)
-            await client.expire(metric_key, 86400)
-            
-            await client.close()
+            pipe = client.pipeline(transaction=False)
+            pipe.incr(metric_key)
+            pipe.expire(metric_key, 86400)
+            await pipe.execute()
             
         except Exception as e:
             logger.error(f"Failed to record metric {metric_name}: {e}")
@@ -0,0 +1,300 @@
+"""
+stream_broker.py — Cross-worker fan-out for StreamManager.
+
+StreamManager keeps per-worker subscriber queues and ring buffers; a broker
+carries each published frame to every other worker so a client sees the same
+stream regardless of which uvicorn worker it lands on.
+
+- StreamBroker: adapter interface (publish, batched publish, per-topic leases)
+- LocalBroker: in-process stand-in sharing one bus between StreamManagers
+  (tests, single-worker dev)
+- RedisBroker: Redis pub/sub fan-out, SET NX PX leases renewed via Lua
+
+Messages carry the origin worker id so the publishing worker, which has
+already delivered locally, ignores its own echo.
+
+Environment:
+- STREAM_BROKER: none|auto|local|redis (default: none; auto = redis when REDIS_URL set)
+- STREAM_BROKER_REDIS_PREFIX: channel/lease prefix (default: sse:bus:<VC_ENV>:)
+- STREAM_LEADER_TTL_SECONDS: topic leadership lease length (default: 15)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import socket
+import time
+import uuid
+
+from abc import ABC, abstractmethod
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from app.core.logging import get_api_logger
+
+logger = get_api_logger("stream_broker")
+
+DEFAULT_LEADER_TTL_SECONDS = int(os.getenv("STREAM_LEADER_TTL_SECONDS", "15"))
+
+# Callback invoked for frames published by other workers: (topic, envelope_text)
+MessageHandler = Callable[[str, str], Awaitable[None] | None]
+
+_SEP = "\x1f"  # unit separator between origin id and envelope text
+
+
+def make_worker_id() -> str:
+    """Unique id for this worker process (host:pid:random)."""
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+
+class StreamBroker(ABC):
+    """Adapter interface for cross-worker stream fan-out."""
+
+    name = "base"
+
+    def __init__(self, worker_id: str | None = None) -> None:
+        self.worker_id = worker_id or make_worker_id()
+        self._handler: MessageHandler | None = None
+        self.stats: dict[str, int] = {
+            "published": 0,
+            "received": 0,
+            "echo_skipped": 0,
+        }
+
+    async def start(self, handler: MessageHandler) -> None:
+        """Begin delivering remote frames to ``handler``."""
+        self._handler = handler
+
+    async def close(self) -> None:
+        self._handler = None
+
+    async def publish(self, topic: str, text: str) -> None:
+        await self.publish_batch([(topic, text)])
+
+    @abstractmethod
+    async def publish_batch(self, items: list[tuple[str, str]]) -> None:
+        """Send several (topic, envelope_text) frames to the other workers."""
+
+    @abstractmethod
+    async def acquire_leadership(
+        self, topic: str, ttl: int = DEFAULT_LEADER_TTL_SECONDS
+    ) -> bool:
+        """Acquire or renew this worker's lease on ``topic``; True if leader."""
+
+    @abstractmethod
+    async def release_leadership(self, topic: str) -> None:
+        """Give up the lease on ``topic`` if this worker holds it."""
+
+    async def _deliver(self, topic: str, raw: str) -> None:
+        """Decode an on-the-wire message and hand remote frames to the handler."""
+        origin, _, text = raw.partition(_SEP)
+        if origin == self.worker_id:
+            self.stats["echo_skipped"] += 1
+            return
+        self.stats["received"] += 1
+        if self._handler is not None:
+            result = self._handler(topic, text)
+            if asyncio.iscoroutine(result):
+                await result
+
+    def _encode(self, text: str) -> str:
+        return f"{self.worker_id}{_SEP}{text}"
+
+
+# --------------------------- Local ---------------------------
+
+
+class LocalBus:
+    """Shared in-process bus standing in for Redis between LocalBrokers."""
+
+    def __init__(self) -> None:
+        self.brokers: list[LocalBroker] = []
+        self.leases: dict[str, tuple[str, float]] = {}
+
+
+_default_bus = LocalBus()
+
+
+class LocalBroker(StreamBroker):
+    """In-process broker; every LocalBroker on the same bus acts as a worker."""
+
+    name = "local"
+
+    def __init__(self, worker_id: str | None = None, bus: LocalBus | None = None):
+        super().__init__(worker_id)
+        self.bus = bus or _default_bus
+
+    async def start(self, handler: MessageHandler) -> None:
+        await super().start(handler)
+        if self not in self.bus.brokers:
+            self.bus.brokers.append(self)
+
+    async def close(self) -> None:
+        if self in self.bus.brokers:
+            self.bus.brokers.remove(self)
+        for topic, (owner, _) in list(self.bus.leases.items()):
+            if owner == self.worker_id:
+                self.bus.leases.pop(topic, None)
+        await super().close()
+
+    async def publish_batch(self, items: list[tuple[str, str]]) -> None:
+        for topic, text in items:
+            raw = self._encode(text)
+            for broker in list(self.bus.brokers):
+                await broker._deliver(topic, raw)
+            self.stats["published"] += 1
+
+    async def acquire_leadership(
+        self, topic: str, ttl: int = DEFAULT_LEADER_TTL_SECONDS
+    ) -> bool:
+        now = time.monotonic()
+        owner, expires = self.bus.leases.get(topic, (None, 0.0))
+        if owner is None or owner == self.worker_id or expires <= now:
+            self.bus.leases[topic] = (self.worker_id, now + ttl)
+            return True
+        return False
+
+    async def release_leadership(self, topic: str) -> None:
+        owner, _ = self.bus.leases.get(topic, (None, 0.0))
+        if owner == self.worker_id:
+            self.bus.leases.pop(topic, None)
+
+
+# --------------------------- Redis ---------------------------
+
+# Renew only if we still own the lease; acquire if free
+_LEASE_SCRIPT = """
+local owner = redis.call('GET', KEYS[1])
+if owner == ARGV[1] then
+  redis.call('PEXPIRE', KEYS[1], ARGV[2])
+  return 1
+elseif not owner then
+  redis.call('SET', KEYS[1], ARGV[1], 'PX', ARGV[2])
+  return 1
+end
+return 0
+"""
+
+_RELEASE_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+  return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+
+class RedisBroker(StreamBroker):
+    """Redis pub/sub broker: one channel per topic under a shared prefix."""
+
+    name = "redis"
+
+    def __init__(self, client: Any, *, prefix: str, worker_id: str | None = None):
+        super().__init__(worker_id)
+        self.client = client
+        self.prefix = prefix.rstrip(":") + ":"
+        self._pubsub = None
+        self._reader: asyncio.Task | None = None
+
+    def _channel(self, topic: str) -> str:
+        return f"{self.prefix}ch:{topic}"
+
+    def _lease_key(self, topic: str) -> str:
+        return f"{self.prefix}leader:{topic}"
+
+    async def start(self, handler: MessageHandler) -> None:
+        await super().start(handler)
+        self._pubsub = self.client.pubsub(ignore_subscribe_messages=True)
+        await self._pubsub.psubscribe(f"{self.prefix}ch:*")
+        self._reader = asyncio.create_task(self._read_loop())
+
+    async def close(self) -> None:
+        if self._reader and not self._reader.done():
+            self._reader.cancel()
+            try:
+                await self._reader
+            except asyncio.CancelledError:
+                pass
+        if self._pubsub is not None:
+            try:
+                await self._pubsub.punsubscribe()
+                await self._pubsub.close()
+            except Exception:
+                pass
+        await super().close()
+
+    async def _read_loop(self) -> None:
+        channel_prefix = f"{self.prefix}ch:"
+        while True:
+            try:
+                msg = await self._pubsub.get_message(timeout=1.0)
+                if not msg:
+                    continue
+                channel = msg.get("channel")
+                data = msg.get("data")
+                if isinstance(channel, bytes):
+                    channel = channel.decode("utf-8")
+                if isinstance(data, bytes):
+                    data = data.decode("utf-8")
+                await self._deliver(channel[len(channel_prefix):], data)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Stream broker read error: {e}")
+                await asyncio.sleep(1.0)
+
+    async def publish_batch(self, items: list[tuple[str, str]]) -> None:
+        if not items:
+            return
+        # One round-trip for the whole batch
+        pipe = self.client.pipeline(transaction=False)
+        for topic, text in items:
+            pipe.publish(self._channel(topic), self._encode(text))
+        await pipe.execute()
+        self.stats["published"] += len(items)
+
+    async def acquire_leadership(
+        self, topic: str, ttl: int = DEFAULT_LEADER_TTL_SECONDS
+    ) -> bool:
+        result = await self.client.eval(
+            _LEASE_SCRIPT, 1, self._lease_key(topic), self.worker_id, int(ttl * 1000)
+        )
+        return bool(result)
+
+    async def release_leadership(self, topic: str) -> None:
+        try:
+            await self.client.eval(
+                _RELEASE_SCRIPT, 1, self._lease_key(topic), self.worker_id
+            )
+        except Exception:
+            pass
+
+
+# --------------------------- Factory ---------------------------
+
+
+async def create_broker() -> StreamBroker | None:
+    """Build the broker selected by STREAM_BROKER, or None for single-worker mode."""
+    backend = os.getenv("STREAM_BROKER", "none").strip().lower() or "none"
+    if backend == "auto":
+        backend = "redis" if os.getenv("REDIS_URL") else "none"
+    if backend == "none":
+        return None
+    if backend == "local":
+        return LocalBroker()
+    if backend == "redis":
+        try:
+            from .redis_config import get_redis
+
+            redis_mgr = await get_redis()
+            client = await redis_mgr.get_client()
+            prefix = os.getenv(
+                "STREAM_BROKER_REDIS_PREFIX",
+                f"sse:bus:{os.getenv('VC_ENV', 'local')}:",
+            )
+            return RedisBroker(client, prefix=prefix)
+        except Exception as e:
+            logger.warning(f"Redis stream broker unavailable, staying local: {e}")
+            return None
+    logger.warning(f"Unknown STREAM_BROKER={backend!r}; cross-worker fan-out disabled")
+    return None
@@ -3,7 +3,11 @@ stream_manager.py — In‑process pub/sub for SSE & WebSockets (no Redis).
 - Topic registry with per-subscriber asyncio.Queue
 - Backpressure handling (drop-oldest strategy)
 - JSON envelope builder with seq and timestamp
+- Serialize-once frames: each publish is encoded a single time into an
+  immutable Frame carrying the WS text and the SSE wire bytes
 - Heartbeats for idle connections
+- Optional cross-worker fan-out through a StreamBroker adapter
+  (see stream_broker.py) with per-topic leader election
 
 CRITICAL FIX: Use dict-based subscriber tracking to avoid hashability issues
 """
@@ -11,25 +15,35 @@ CRITICAL FIX: Use dict-based subscriber tracking to avoid hashability issues
 from __future__ import annotations
 
 import asyncio
+import bisect
+import itertools
+import logging
 import time
 import os
 
 from collections import defaultdict, deque
 from dataclasses import dataclass
+from operator import itemgetter
 from typing import Any
 
+logger = logging.getLogger(__name__)
+
 try:
     import orjson as _orjson
 
     def _dumps(obj: Any) -> str:
         return _orjson.dumps(obj).decode("utf-8")
 
+    _loads = _orjson.loads
+
 except Exception:  # pragma: no cover
     import json as _json
 
     def _dumps(obj: Any) -> str:
         return _json.dumps(obj, separators=(",", ":"), ensure_ascii=False)
 
+    _loads = _json.loads
+
 
 # Import metrics for monitoring
 try:
@@ -48,27 +62,60 @@ DEFAULT_WAIT_TIMEOUT_SECS = 1  # poll interval while waiting for messages
 # --------------------------- Data -----------------------------
 
 
+@dataclass(frozen=True, slots=True)
+class Frame:
+    """One published envelope, serialized once and shared by every subscriber.
+
+    ``text`` is the JSON envelope (WebSocket text frame / SSE data line) and
+    ``sse`` the complete ``id:/event:/data:`` wire bytes.
+    """
+
+    seq: int
+    event: str
+    text: str
+    sse: bytes
+
+    @classmethod
+    def build(cls, seq: int, event: str, text: str) -> Frame:
+        sse = f"id: {seq}\nevent: {event}\ndata: {text}\n\n".encode()
+        return cls(seq=seq, event=event, text=text, sse=sse)
+
+    @classmethod
+    def from_text(cls, text: str | bytes) -> Frame:
+        """Rebuild a frame from a stored JSON envelope (e.g. Redis replay)."""
+        if isinstance(text, bytes):
+            text = text.decode("utf-8")
+        try:
+            obj = _loads(text)
+            seq = int(obj.get("seq", 0))
+            event = str(obj.get("event", "update"))
+        except Exception:
+            seq, event = 0, "update"
+        return cls.build(seq, event, text)
+
+
 @dataclass
 class Subscriber:
     """Represents a single subscriber queue attached to a topic."""
 
-    queue: asyncio.Queue[str]
+    queue: asyncio.Queue[Frame]
     created_at: float
     last_activity: float
 
 
 class StreamManager:
     """
-    In-memory topic pub/sub suitable for a single FastAPI/Uvicorn worker.
-    Scale-out path: replace _broadcast() with Redis/NATS via an adapter.
+    In-memory topic pub/sub for a FastAPI/Uvicorn worker.
+    Scale-out path: attach_broker() forwards every published frame to the
+    other workers, which store and broadcast it locally.
 
     CRITICAL FIX: Uses dict-based subscriber tracking to avoid hashability issues
     """
 
     def __init__(self) -> None:
         # FIXED: Use dict keyed by queue instead of set (avoids hashability issues)
-        self._topics: dict[str, dict[asyncio.Queue[str], Subscriber]] = defaultdict(
-            dict
+        self._topics: dict[str, dict[asyncio.Queue[Frame], Subscriber]] = (
+            defaultdict(dict)
         )
         self._lock = asyncio.Lock()
         self._seq = 0
@@ -77,12 +124,20 @@ class StreamManager:
             "dropped": 0,
             "subscribers": 0,
         }
-        # In-memory ring buffer per topic for SSE resume
-        self._ring: dict[str, deque[str]] = defaultdict(lambda: deque(maxlen=1000))
+        # In-memory ring buffer per topic for SSE resume: (seq, frame) in seq order
+        self._ring: dict[str, deque[tuple[int, Frame]]] = defaultdict(
+            lambda: deque(maxlen=1000)
+        )
         self._ring_size = 1000
         # Optional Redis-backed resume store (Upstash-compatible)
         self._resume_store = None
         self._resume_init_attempted = False
+        # Optional cross-worker broker and cached topic leases (topic -> renew_at)
+        self._broker = None
+        self._leases: dict[str, float] = {}
+        # Topics led locally while the broker's lease store is unreachable
+        # (topic -> retry_at)
+        self._degraded: dict[str, float] = {}
         try:
             from shared.otel import get_tracer  # lazy-safe
 
@@ -115,44 +170,152 @@ class StreamManager:
 
     # -------------------- Public API --------------------------
 
+    async def _build_frame(
+        self, topic: str, payload: dict[str, Any], event: str, v: int
+    ) -> Frame:
+        """Sequence, envelope and serialize one message, then deliver it locally.
+
+        Shared by publish() and publish_many(): stores the frame in the resume
+        ring (and Redis resume backend, if any) and fans it out to this
+        worker's subscribers. Forwarding to the broker is left to the caller.
+        """
+        # Global monotonic sequence (Upstash/Redis) with in-process fallback
+        seq = await self._next_global_seq(topic)
+        env = {
+            "v": v,
+            "ts": self._ts(),
+            "seq": seq,
+            "topic": topic,
+            "event": event,
+            "payload": payload,
+        }
+        frame = Frame.build(int(seq), event, _dumps(env))
+        # Store to ring buffer for resume
+        try:
+            self._store_ring(topic, frame)
+        except Exception:
+            pass
+        # Also store to Redis resume backend if available
+        try:
+            await self._maybe_store_resume(topic, frame.seq, frame.text)
+        except Exception:
+            pass
+        self._broadcast(topic, frame)
+        return frame
+
     async def publish(
         self, topic: str, payload: dict[str, Any], *, event: str = "update", v: int = 1
     ) -> None:
         """Publish a payload to all subscribers of a topic."""
         publish_start = time.time()
         with (self._tracer.start_as_current_span("stream.publish") if self._tracer else _null_cm()) as span:
-            # Global monotonic sequence (Upstash/Redis) with in-process fallback
-            seq = await self._next_global_seq(topic)
-            env = {
-                "v": v,
-                "ts": self._ts(),
-                "seq": seq,
-                "topic": topic,
-                "event": event,
-                "payload": payload,
-            }
-            data = _dumps(env)
+            frame = await self._build_frame(topic, payload, event, v)
             try:
                 span.set_attribute("stream.topic", topic)
-                span.set_attribute("stream.seq", int(seq))
+                span.set_attribute("stream.seq", frame.seq)
             except Exception:
                 pass
-            # Store to ring buffer for resume
+            if self._broker is not None:
+                try:
+                    await self._broker.publish(topic, frame.text)
+                except Exception:
+                    pass
+
+        # Record metrics
+        if METRICS_AVAILABLE:
+            latency = time.time() - publish_start
+            streaming_metrics.record_message_published(topic, latency)
+
+    async def publish_many(
+        self, items: list[tuple[str, dict[str, Any], str]], *, v: int = 1
+    ) -> None:
+        """Publish several (topic, payload, event) messages in one batch.
+
+        Local fan-out happens per message; the broker receives the whole
+        batch in a single call (one Redis round-trip).
+        """
+        out: list[tuple[str, str]] = []
+        for topic, payload, event in items:
+            frame = await self._build_frame(topic, payload, event, v)
+            out.append((topic, frame.text))
+        if self._broker is not None and out:
             try:
-                self._store_ring(topic, data)
+                await self._broker.publish_batch(out)
             except Exception:
                 pass
-            # Also store to Redis resume backend if available
+
+    # -------------------- Cross-worker broker -----------------
+
+    async def attach_broker(self, broker) -> None:
+        """Attach a StreamBroker and start receiving other workers' frames."""
+        self._broker = broker
+        self._leases.clear()
+        self._degraded.clear()
+        await broker.start(self._on_remote_message)
+
+    async def detach_broker(self) -> None:
+        """Release held leases and close the attached broker, if any."""
+        broker, self._broker = self._broker, None
+        if broker is None:
+            return
+        for topic in list(self._leases):
             try:
-                await self._maybe_store_resume(topic, int(env.get("seq", 0)), data)
+                await broker.release_leadership(topic)
             except Exception:
                 pass
-            await self._broadcast(topic, data)
+        self._leases.clear()
+        self._degraded.clear()
+        await broker.close()
+
+    def _on_remote_message(self, topic: str, text: str) -> None:
+        # The origin worker already wrote the Redis resume store; only
+        # the local ring and local subscribers need the frame here.
+        frame = Frame.from_text(text)
+        try:
+            self._store_ring(topic, frame)
+        except Exception:
+            pass
+        self._broadcast(topic, frame)
 
-        # Record metrics
-        if METRICS_AVAILABLE:
-            latency = time.time() - publish_start
-            streaming_metrics.record_message_published(topic, latency)
+    async def ensure_topic_leadership(self, topic: str, ttl: int | None = None) -> bool:
+        """Return True if this worker should compute and publish ``topic``.
+
+        Without a broker every worker is its own leader. With one, the lease
+        is renewed at half its TTL and cached in between, so calling this on
+        every publisher tick costs nothing most of the time.
+
+        If the lease store errors (e.g. a Redis outage) the worker degrades
+        to local leadership, as in single-worker mode, rather than leaving
+        the topic without a publisher; the lease is retried every TTL/2.
+        """
+        broker = self._broker
+        if broker is None:
+            return True
+        from .stream_broker import DEFAULT_LEADER_TTL_SECONDS
+
+        ttl = ttl or DEFAULT_LEADER_TTL_SECONDS
+        now = time.monotonic()
+        renew_at = self._leases.get(topic) or self._degraded.get(topic)
+        if renew_at is not None and now < renew_at:
+            return True
+        try:
+            leader = await broker.acquire_leadership(topic, ttl)
+        except Exception as e:
+            if topic not in self._degraded:
+                logger.warning(
+                    f"Leadership lease for {topic!r} unavailable ({e}); "
+                    "publishing locally until the broker recovers"
+                )
+            self._leases.pop(topic, None)
+            self._degraded[topic] = now + ttl / 2
+            return True
+        if self._degraded.pop(topic, None) is not None:
+            logger.info(f"Leadership lease for {topic!r} reachable again (leader={leader})")
+        if leader:
+            self._leases[topic] = now + ttl / 2
+        else:
+            self._leases.pop(topic, None)
+        return leader
 
     async def heartbeat(self, topic: str) -> None:
         """Broadcast a heartbeat event to a topic (useful for WS groups)."""
@@ -164,9 +327,9 @@ class StreamManager:
 
     async def subscribe(
         self, topic: str, *, max_queue: int = DEFAULT_QUEUE_SIZE
-    ) -> asyncio.Queue[str]:
+    ) -> asyncio.Queue[Frame]:
         """Register a new subscriber queue for a topic."""
-        q: asyncio.Queue[str] = asyncio.Queue(maxsize=max_queue)
+        q: asyncio.Queue[Frame] = asyncio.Queue(maxsize=max_queue)
         sub = Subscriber(queue=q, created_at=time.time(), last_activity=time.time())
         async with self._lock:
             # FIXED: Store by queue in dict instead of adding to set
@@ -183,7 +346,7 @@ class StreamManager:
 
         return q
 
-    async def unsubscribe(self, topic: str, q: asyncio.Queue[str]) -> None:
+    async def unsubscribe(self, topic: str, q: asyncio.Queue[Frame]) -> None:
         """Remove a subscriber queue from a topic and drain it."""
         async with self._lock:
             topic_subs = self._topics.get(topic, {})
@@ -206,27 +369,28 @@ class StreamManager:
             pass
 
     async def next_message(
-        self, q: asyncio.Queue[str], *, heartbeat_secs: int = DEFAULT_HEARTBEAT_SECS
-    ) -> str:
+        self, q: asyncio.Queue[Frame], *, heartbeat_secs: int = DEFAULT_HEARTBEAT_SECS
+    ) -> Frame:
         """
         Await next message or return a heartbeat if idle.
-        SSE: yield the returned string as `data`.
-        WS:  send as text/json to the client.
+        SSE: write `frame.sse` as-is.
+        WS:  send `frame.text` to the client.
         """
         try:
             msg = await asyncio.wait_for(q.get(), timeout=heartbeat_secs)
             return msg
         except TimeoutError:
             # Emit a heartbeat envelope with a special topic "_hb"
+            seq = self._next_seq()
             env = {
                 "v": 1,
                 "ts": self._ts(),
-                "seq": self._next_seq(),
+                "seq": seq,
                 "topic": "_hb",
                 "event": "heartbeat",
                 "payload": {"kind": "idle"},
             }
-            return _dumps(env)
+            return Frame.build(seq, "heartbeat", _dumps(env))
 
     def stats(self) -> dict[str, Any]:
         """Return lightweight metrics snapshot."""
@@ -237,25 +401,28 @@ class StreamManager:
 
     # -------------------- Internal ----------------------------
 
-    async def _broadcast(self, topic: str, data: str) -> None:
-        """Fan-out to all subscriber queues with drop-oldest on backpressure."""
-        async with self._lock:
-            # FIXED: Get dict values instead of set items
-            subs = list(self._topics.get(topic, {}).values())
+    def _broadcast(self, topic: str, frame: Frame) -> None:
+        """Fan-out to all subscriber queues with drop-oldest on backpressure.
+
+        Synchronous on purpose: no await happens while iterating, so the
+        subscriber dict cannot change underneath us and no lock or snapshot
+        copy is needed. Every queue receives the same immutable Frame.
+        """
+        subs = self._topics.get(topic)
         if not subs:
             return
         dropped = 0
-        for sub in subs:
+        for q in subs:
             # Non-blocking put with drop-oldest strategy
             try:
-                sub.queue.put_nowait(data)
+                q.put_nowait(frame)
             except asyncio.QueueFull:
                 try:
-                    _ = sub.queue.get_nowait()  # drop oldest
+                    _ = q.get_nowait()  # drop oldest
                 except Exception:
                     pass
                 try:
-                    sub.queue.put_nowait(data)
+                    q.put_nowait(frame)
                 except Exception:
                     dropped += 1
                     continue
@@ -269,10 +436,25 @@ class StreamManager:
 
     # -------------------- Ring buffer -------------------------
 
-    def _store_ring(self, topic: str, data: str) -> None:
-        self._ring[topic].append(data)
+    def _store_ring(self, topic: str, frame: Frame | str) -> None:
+        if not isinstance(frame, Frame):
+            frame = Frame.from_text(frame)
+        ring = self._ring[topic]
+        if not ring or ring[-1][0] <= frame.seq:
+            ring.append((frame.seq, frame))
+            return
+        # Frames from other workers can arrive slightly out of order; keep
+        # the ring sorted so replay_since can bisect it.
+        if len(ring) == ring.maxlen:
+            if frame.seq < ring[0][0]:
+                return
+            ring.popleft()
+        idx = bisect.bisect_right(ring, frame.seq, key=itemgetter(0))
+        ring.insert(idx, (frame.seq, frame))
 
-    async def replay_since(self, topic: str, last_seq: int, limit: int = 500) -> list[str]:
+    async def replay_since(
+        self, topic: str, last_seq: int, limit: int = 500
+    ) -> list[Frame]:
         """Return messages with seq > last_seq from Redis if available, else memory ring."""
         with (self._tracer.start_as_current_span("stream.replay") if self._tracer else _null_cm()) as span:
             # Try Redis resume store first
@@ -289,24 +471,13 @@ class StreamManager:
                     except Exception:
                         pass
                     if items:
-                        return items
+                        return [Frame.from_text(raw) for raw in items]
             except Exception:
                 pass
-            # Fallback to memory ring
-            out: list[str] = []
-            try:
-                ring = list(self._ring.get(topic, ()))
-                for s in ring:
-                    try:
-                        obj = _orjson.loads(s) if '_orjson' in globals() else _json.loads(s)
-                    except Exception:
-                        continue
-                    if int(obj.get("seq", -1)) > last_seq:
-                        out.append(s)
-                        if len(out) >= limit:
-                            break
-            except Exception:
-                return out
+            # Fallback to memory ring: seqs are ascending, so bisect and slice
+            ring = self._ring.get(topic, ())
+            start = bisect.bisect_right(ring, last_seq, key=itemgetter(0))
+            out = [frame for _, frame in itertools.islice(ring, start, start + limit)]
             try:
                 span.set_attribute("stream.topic", topic)
                 span.set_attribute("stream.resume.since", int(last_seq))
@@ -353,14 +524,8 @@ class StreamManager:
             ring = self._ring.get(topic, ())
             mem_size = len(ring)
             if mem_size:
-                try:
-                    import json as _json
-                    first = _json.loads(ring[0])
-                    last = _json.loads(ring[-1])
-                    mem_min = int(first.get("seq", 0))
-                    mem_max = int(last.get("seq", 0))
-                except Exception:
-                    pass
+                mem_min = ring[0][0]
+                mem_max = ring[-1][0]
         except Exception:
             pass
         return {"redis": redis_stats, "memory": {"size": mem_size, "min_seq": mem_min, "max_seq": mem_max}}
@@ -26,6 +26,18 @@ except Exception:  # pragma: no cover
 
 from .redis_config import get_redis
 
+# Append one frame, keep the newest max_items (lowest scores go first) and
+# refresh the topic TTL atomically
+_STORE_SCRIPT = """
+redis.call('ZADD', KEYS[1], ARGV[1], ARGV[2])
+local excess = redis.call('ZCARD', KEYS[1]) - tonumber(ARGV[3])
+if excess > 0 then
+  redis.call('ZREMRANGEBYRANK', KEYS[1], 0, excess - 1)
+end
+redis.call('EXPIRE', KEYS[1], tonumber(ARGV[4]))
+return excess
+"""
+
 
 class RedisResumeStore:
     def __init__(self, client: Redis, *, prefix: str, ttl: int, max_items: int):
@@ -33,30 +45,17 @@ class RedisResumeStore:
         self.prefix = prefix.rstrip(":") + ":"
         self.ttl = ttl
         self.max_items = max_items
+        self._store_script = client.register_script(_STORE_SCRIPT)
 
     def _key(self, topic: str) -> str:
         return f"{self.prefix}{topic}"
 
     async def store(self, topic: str, seq: int, data: str) -> None:
         key = self._key(topic)
-        # ZADD score=seq, member=data
-        await self.client.zadd(key, {data: float(seq)})
-        # Trim if too large
-        try:
-            size = await self.client.zcard(key)
-            if size and size > self.max_items:
-                # Remove oldest (low scores) to keep last max_items
-                remove_count = int(size - self.max_items)
-                if remove_count > 0:
-                    await self.client.zremrangebyrank(key, 0, remove_count - 1)
-        except Exception:
-            # Non-fatal
-            pass
-        # Refresh TTL
-        try:
-            await self.client.expire(key, self.ttl)
-        except Exception:
-            pass
+        # ZADD + trim to last max_items + refresh TTL, one round-trip
+        await self._store_script(
+            keys=[key], args=[float(seq), data, self.max_items, self.ttl]
+        )
 
     async def replay_since(self, topic: str, last_seq: int, limit: int = 500) -> List[str]:
         key = self._key(topic)
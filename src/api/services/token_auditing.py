@@ -70,6 +70,16 @@ class TokenAuditRecord:
         return cls(**data)
 
 
+def _encode_mapping(data: Dict[str, Any]) -> Dict[str, str]:
+    """JSON-encode hash fields so None/bool/int survive the round-trip."""
+    return {k: json.dumps(v) for k, v in data.items()}
+
+
+def _decode_mapping(data: Dict[str, str]) -> Dict[str, Any]:
+    """Inverse of _encode_mapping."""
+    return {k: json.loads(v) for k, v in data.items()}
+
+
 class TokenAuditingService:
     """Service for token audit trail management."""
     
@@ -122,15 +132,21 @@ class TokenAuditingService:
                 error_details=error_details
             )
             
+            # Record, indexes and JTI tracking go out as one pipeline
+            client = await self._client()
+            pipe = client.pipeline(transaction=False)
+            
             # Store in Redis with TTL
-            await self._store_audit_record(audit_record)
+            self._store_audit_record(pipe, audit_record)
             
             # Update indexes for efficient querying
-            await self._update_audit_indexes(audit_record)
+            self._update_audit_indexes(pipe, audit_record)
             
             # Track JTI for replay prevention (streaming tokens)
             if event_type == TokenEventType.ISSUED and audit_record.topic:
-                await self._track_jti(audit_record)
+                self._track_jti(pipe, audit_record)
+            
+            await pipe.execute()
             
             logger.debug(f"Recorded token event: {event_type.value} for JTI {audit_record.jti}")
             return True
@@ -153,7 +169,7 @@ class TokenAuditingService:
             return []
         
         try:
-            redis = await get_redis()
+            client = await self._client()
             
             start_ts = int(start_time.timestamp())
             end_ts = int(end_time.timestamp())
@@ -162,16 +178,16 @@ class TokenAuditingService:
             
             # Get all audit keys within time range
             pattern = f"{self.audit_key_prefix}:*"
-            audit_keys = await redis.keys(pattern)
+            audit_keys = await client.keys(pattern)
+            rows = await self._hgetall_many(client, audit_keys)
             
             records = []
-            for key in audit_keys:
+            for key, data in zip(audit_keys, rows):
                 try:
-                    data = await redis.hgetall(key)
                     if not data:
                         continue
                         
-                    record = TokenAuditRecord.from_dict(data)
+                    record = TokenAuditRecord.from_dict(_decode_mapping(data))
                     
                     # Filter by time range
                     if not (start_ts <= record.event_timestamp <= end_ts):
@@ -226,10 +242,10 @@ class TokenAuditingService:
             return False
             
         try:
-            redis = await get_redis()
+            client = await self._client()
             key = f"{self.jti_tracking_prefix}:{jti}"
             
-            exists = await redis.exists(key)
+            exists = await client.exists(key)
             return bool(exists)
             
         except Exception as e:
@@ -242,10 +258,10 @@ class TokenAuditingService:
             return True
             
         try:
-            redis = await get_redis()
+            client = await self._client()
             key = f"{self.jti_tracking_prefix}:{jti}"
             
-            await redis.set(key, "used", ex=ttl_seconds)
+            await client.set(key, "used", ex=ttl_seconds)
             logger.debug(f"Marked JTI as used: {jti}")
             return True
             
@@ -314,30 +330,33 @@ class TokenAuditingService:
             return 0
             
         try:
-            redis = await get_redis()
+            client = await self._client()
             cutoff_timestamp = int((datetime.now(timezone.utc) - timedelta(days=self.retention_days)).timestamp())
             
             logger.info(f"Cleaning up audit records older than {self.retention_days} days")
             
             pattern = f"{self.audit_key_prefix}:*"
-            audit_keys = await redis.keys(pattern)
+            audit_keys = await client.keys(pattern)
+            rows = await self._hgetall_many(client, audit_keys)
             
-            deleted_count = 0
-            for key in audit_keys:
+            expired = []
+            for key, data in zip(audit_keys, rows):
                 try:
-                    data = await redis.hgetall(key)
                     if not data:
                         continue
                         
-                    event_timestamp = int(data.get("event_timestamp", 0))
+                    event_timestamp = int(_decode_mapping(data).get("event_timestamp") or 0)
                     if event_timestamp < cutoff_timestamp:
-                        await redis.delete(key)
-                        deleted_count += 1
+                        expired.append(key)
                         
                 except Exception as e:
-                    logger.warning(f"Failed to check/delete audit record {key}: {e}")
+                    logger.warning(f"Failed to check audit record {key}: {e}")
                     continue
             
+            if expired:
+                await client.delete(*expired)
+            deleted_count = len(expired)
+            
             logger.info(f"Cleaned up {deleted_count} expired audit records")
             return deleted_count
             
@@ -345,58 +364,50 @@ class TokenAuditingService:
             logger.error(f"Failed to cleanup expired records: {e}")
             return 0
     
-    async def _store_audit_record(self, record: TokenAuditRecord) -> bool:
-        """Store audit record in Redis with TTL."""
-        try:
-            redis = await get_redis()
-            
-            # Create unique key for this audit event
-            key = f"{self.audit_key_prefix}:{record.jti}:{record.event_timestamp}"
-            
-            # Store as hash with TTL
-            ttl_seconds = self.retention_days * 24 * 3600
-            await redis.hmset(key, record.to_dict())
-            await redis.expire(key, ttl_seconds)
-            
-            return True
-            
-        except Exception as e:
-            logger.error(f"Failed to store audit record: {e}")
-            return False
+    async def _client(self):
+        """Shared pooled Redis client."""
+        return await (await get_redis()).get_client()
     
-    async def _update_audit_indexes(self, record: TokenAuditRecord) -> bool:
-        """Update indexes for efficient querying."""
-        try:
-            redis = await get_redis()
-            
-            # Tenant index
-            tenant_key = f"{self.tenant_index_prefix}:{record.tid}"
-            await redis.sadd(tenant_key, f"{record.jti}:{record.event_timestamp}")
-            await redis.expire(tenant_key, self.retention_days * 24 * 3600)
-            
-            # Region index (if present)
-            if record.region:
-                region_key = f"{self.region_index_prefix}:{record.region}"
-                await redis.sadd(region_key, f"{record.jti}:{record.event_timestamp}")
-                await redis.expire(region_key, self.retention_days * 24 * 3600)
-            
-            return True
-            
-        except Exception as e:
-            logger.error(f"Failed to update audit indexes: {e}")
-            return False
+    async def _hgetall_many(self, client, keys: List[str]) -> List[Dict[str, Any]]:
+        """HGETALL for many keys in one round-trip."""
+        if not keys:
+            return []
+        pipe = client.pipeline(transaction=False)
+        for key in keys:
+            pipe.hgetall(key)
+        return await pipe.execute()
     
-    async def _track_jti(self, record: TokenAuditRecord) -> bool:
-        """Track JTI for replay prevention."""
-        try:
-            # Calculate TTL based on token expiration
-            ttl = max(300, record.exp - record.iat)  # Minimum 5 minutes
-            
-            return await self.mark_jti_used(record.jti, ttl)
-            
-        except Exception as e:
-            logger.error(f"Failed to track JTI: {e}")
-            return False
+    def _store_audit_record(self, pipe, record: TokenAuditRecord) -> None:
+        """Queue audit record hash with TTL on a pipeline."""
+        # Create unique key for this audit event
+        key = f"{self.audit_key_prefix}:{record.jti}:{record.event_timestamp}"
+        
+        # Store as hash with TTL
+        ttl_seconds = self.retention_days * 24 * 3600
+        pipe.hset(key, mapping=_encode_mapping(record.to_dict()))
+        pipe.expire(key, ttl_seconds)
+    
+    def _update_audit_indexes(self, pipe, record: TokenAuditRecord) -> None:
+        """Queue index updates for efficient querying."""
+        ttl_seconds = self.retention_days * 24 * 3600
+        member = f"{record.jti}:{record.event_timestamp}"
+        
+        # Tenant index
+        tenant_key = f"{self.tenant_index_prefix}:{record.tid}"
+        pipe.sadd(tenant_key, member)
+        pipe.expire(tenant_key, ttl_seconds)
+        
+        # Region index (if present)
+        if record.region:
+            region_key = f"{self.region_index_prefix}:{record.region}"
+            pipe.sadd(region_key, member)
+            pipe.expire(region_key, ttl_seconds)
+    
+    def _track_jti(self, pipe, record: TokenAuditRecord) -> None:
+        """Queue JTI tracking for replay prevention."""
+        # Calculate TTL based on token expiration
+        ttl = max(300, record.exp - record.iat)  # Minimum 5 minutes
+        pipe.set(f"{self.jti_tracking_prefix}:{record.jti}", "used", ex=ttl)
     
     def _hash_ip(self, ip: str) -> str:
         """Hash IP address for privacy-compliant storage."""
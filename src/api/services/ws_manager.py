@@ -19,7 +19,7 @@ from typing import Any
 
 from fastapi import WebSocket, WebSocketDisconnect
 
-from .stream_manager import stream_manager
+from .stream_manager import Frame, stream_manager
 
 # Import metrics for monitoring
 try:
@@ -40,7 +40,7 @@ class ClientState:
 
     websocket: WebSocket
     subscriptions: set[str] = field(default_factory=set)
-    queues: dict[str, asyncio.Queue[str]] = field(default_factory=dict)
+    queues: dict[str, asyncio.Queue[Frame]] = field(default_factory=dict)
     connected_at: float = field(default_factory=time.time)
     last_activity: float = field(default_factory=time.time)
     client_id: str = ""
@@ -247,19 +247,19 @@ class WSManager:
     # -------------------- Message Forwarding ------------------
 
     async def _forward_messages(
-        self, topic: str, queue: asyncio.Queue[str], state: ClientState
+        self, topic: str, queue: asyncio.Queue[Frame], state: ClientState
     ) -> None:
         """Forward messages from stream queue to WebSocket client."""
         try:
             while topic in state.subscriptions:
                 try:
                     # Get next message from stream (includes heartbeats)
-                    message = await stream_manager.next_message(
+                    frame = await stream_manager.next_message(
                         queue, heartbeat_secs=15
                     )
 
-                    # Send to WebSocket client
-                    await state.websocket.send_text(message)
+                    # Send the pre-encoded envelope to the WebSocket client
+                    await state.websocket.send_text(frame.text)
                     self._metrics["messages_sent"] += 1
 
                     # Record message delivery metrics
@@ -0,0 +1,75 @@
+"""
+Startup timing for cold-start diagnosis.
+
+Records how long the worker spends importing routers and running lifespan
+phases so /api/v1/health/startup can show where boot time goes. Import times
+are inclusive: a shared dependency (refactor.facade, numba) is charged to the
+first router that pulls it in, which is exactly the cost lazy mounting saves.
+"""
+
+import importlib
+import sys
+import time
+
+from collections.abc import Iterator
+from contextlib import contextmanager
+from types import ModuleType
+
+# Reference point: this module is imported first thing by apps.api.main
+_T0 = time.perf_counter()
+
+_imports: dict[str, float] = {}
+_phases: dict[str, float] = {}
+_skipped: list[str] = []
+_ready_at: float | None = None
+
+
+def timed_import(name: str) -> ModuleType:
+    """Import a module, recording its load time on first import."""
+    if name in sys.modules:
+        return sys.modules[name]
+    start = time.perf_counter()
+    module = importlib.import_module(name)
+    _imports[name] = time.perf_counter() - start
+    return module
+
+
+def record_skipped(name: str) -> None:
+    """Note a module left unimported because its feature flag is off."""
+    if name not in _skipped:
+        _skipped.append(name)
+
+
+@contextmanager
+def phase(name: str) -> Iterator[None]:
+    """Time a startup phase (configurations, warmup, ...)."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        _phases[name] = time.perf_counter() - start
+
+
+def mark_ready() -> None:
+    """Record the moment the lifespan handed control to the server."""
+    global _ready_at
+    _ready_at = time.perf_counter()
+
+
+def startup_report(top: int = 15) -> dict:
+    """Snapshot of the boot breakdown in milliseconds.
+
+    Args:
+        top: Number of slowest imports to include
+
+    Returns:
+        Dict with ready_ms (None until startup completes), imports_ms
+        (slowest first), phases_ms and lazy_skipped
+    """
+    slowest = sorted(_imports.items(), key=lambda kv: kv[1], reverse=True)[:top]
+    return {
+        "ready_ms": round((_ready_at - _T0) * 1000, 1) if _ready_at is not None else None,
+        "imports_ms": {name: round(s * 1000, 1) for name, s in slowest},
+        "phases_ms": {name: round(s * 1000, 1) for name, s in _phases.items()},
+        "lazy_skipped": list(_skipped),
+    }
@@ -4,10 +4,14 @@ Collects and aggregates advisory calculations based on feature flags.
 """
 
 import logging
+import os
 import time
 
+from collections.abc import Callable, Hashable
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
 from dataclasses import dataclass
-from datetime import UTC, datetime
+from datetime import UTC, date, datetime, timedelta
 from typing import Any
 
 from config.feature_flags import get_feature_flags
@@ -24,6 +28,112 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+# Worker pool for module calls (gives _call_with_timeout a real timeout).
+# A timed-out call cannot be interrupted and keeps its worker until it
+# returns, so a module is never resubmitted while an earlier call is still
+# running and is benched after repeated timeouts; at most one worker per
+# module can be held by hung calls.
+ADVISORY_WORKERS = int(os.getenv("ADVISORY_WORKERS", "4"))
+
+# Consecutive timeouts before a module is skipped, and for how long
+ADVISORY_TIMEOUT_STRIKES = int(os.getenv("ADVISORY_TIMEOUT_STRIKES", "3"))
+ADVISORY_TIMEOUT_COOLDOWN_S = float(os.getenv("ADVISORY_TIMEOUT_COOLDOWN_S", "60"))
+
+# Total compute time each module may spend across one range sweep
+ADVISORY_RANGE_BUDGET_MS = int(os.getenv("ADVISORY_RANGE_BUDGET_MS", "5000"))
+
+_executor: ThreadPoolExecutor | None = None
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=ADVISORY_WORKERS, thread_name_prefix="advisory"
+        )
+    return _executor
+
+
+def _timed_call(func: Callable, args: Any) -> tuple[Any, float]:
+    start = time.perf_counter()
+    result = func(args)
+    return result, (time.perf_counter() - start) * 1000
+
+
+# ============================================================================
+# MODULE INPUT SIGNATURES (range sweeps re-run a module only when these change)
+# ============================================================================
+
+
+def _sign_signature(ctx: dict[str, Any]) -> Hashable:
+    """Ascendant sign plus every planet's sign."""
+    planets = ctx.get("planets") or {}
+    return (
+        int((ctx.get("ascendant") or 0.0) / 30),
+        tuple((pid, planets[pid].get("sign")) for pid in sorted(planets)),
+    )
+
+
+def _day_signature(ctx: dict[str, Any]) -> Hashable:
+    """Local date of the step plus the sunrise/sunset it was given."""
+    return (ctx["date"], ctx.get("sunrise"), ctx.get("sunset"))
+
+
+# Modules not listed read exact longitudes or the timestamp and are
+# re-evaluated at every step (no signature is computed for them)
+MODULE_SIGNATURES: dict[str, Callable[[dict[str, Any]], Hashable]] = {
+    "ashtakavarga": _sign_signature,
+    "daily_windows": _day_signature,
+}
+
+
+def _load_planet_series(timestamps: list[datetime]) -> list[dict[int, dict]] | None:
+    """Planet state for every timestamp from one vectorized ephemeris pass.
+
+    Produces the same per-planet fields as AdvisoryContext._load_planets
+    (with the KP calculation offset applied like get_positions). Returns
+    None when the facade is unavailable so contexts fall back to mock data.
+    """
+    if not FACADE_AVAILABLE or not timestamps:
+        return None
+
+    import numpy as np
+
+    from refactor.kp_chain import kp_boundary_table
+    from refactor.swe_backend import get_planet_series
+
+    epoch = np.array(
+        [(t if t.tzinfo else t.replace(tzinfo=UTC)).timestamp() for t in timestamps]
+    )
+    jd = (epoch + 307) / 86400.0 + 2440587.5
+    series = get_planet_series(jd, list(range(1, 10)), with_latitude=True)
+    starts, lords = kp_boundary_table()
+
+    columns = {}
+    for planet_id, (lons, speeds, lats) in series.items():
+        chain = lords[np.searchsorted(starts, lons, side="right") - 1]
+        columns[planet_id] = (lons.tolist(), speeds.tolist(), lats.tolist(), chain.tolist())
+
+    out = []
+    for i in range(len(timestamps)):
+        planets = {}
+        for planet_id, (lons, speeds, lats, chain) in columns.items():
+            lon, speed = lons[i], speeds[i]
+            nl, sl, sl2 = chain[i]
+            planets[planet_id] = {
+                "longitude": lon,
+                "latitude": lats[i],
+                "speed": speed,
+                "retrograde": speed < 0,
+                "sign": int(lon / 30) + 1,
+                "nakshatra": int(lon * 27 / 360) + 1,
+                "nl": nl,
+                "sl": sl,
+                "sl2": sl2,
+            }
+        out.append(planets)
+    return out
+
 
 @dataclass
 class AdvisoryContext:
@@ -133,10 +243,16 @@ class AdvisoryContext:
             self.houses = {i: (i - 1) * 30.0 for i in range(1, 13)}
             self.ascendant = 0.0
 
+    @property
+    def local_date(self) -> date:
+        """Calendar date at the location (local mean time from longitude)."""
+        return (self.timestamp + timedelta(hours=self.longitude / 15.0)).date()
+
     def to_dict(self) -> dict[str, Any]:
         """Convert context to dictionary."""
         return {
             "timestamp": self.timestamp.isoformat(),
+            "date": self.local_date,
             "latitude": self.latitude,
             "longitude": self.longitude,
             "planets": self.planets,
@@ -154,6 +270,10 @@ class AdvisoryService:
     def __init__(self):
         self.flags = get_feature_flags()
         self.timeout_ms = self.flags.ADVISORY_TIMEOUT_MS
+        self.range_stats: dict[str, int] = {}
+        self._timeouts: dict[str, int] = {}
+        self._benched: dict[str, float] = {}
+        self._stuck: dict[str, Future] = {}
         self._init_modules()
 
     def _init_modules(self):
@@ -307,28 +427,26 @@ class AdvisoryService:
         if include_timing:
             result["timing"] = {}
 
-        # Collect from each enabled module
-        for module_name, module_func in self.modules.items():
-            try:
-                start_time = time.time()
-
-                # Call module with timeout protection
-                module_result = self._call_with_timeout(
-                    module_func, ctx.to_dict(), self.timeout_ms / 1000.0
-                )
+        # Collect from each enabled module (concurrently, each with its own timeout)
+        outcomes = self._evaluate_modules(ctx.to_dict(), list(self.modules))
+        for module_name in self.modules:
+            module_result, error, elapsed_ms = outcomes[module_name]
+            if error is not None:
+                logger.error(f"Error in {module_name}: {error}")
+                result["advisory"][module_name] = {"error": str(error)}
+                continue
 
-                if module_result:
-                    result["advisory"][module_name] = module_result
+            if module_result:
+                result["advisory"][module_name] = module_result
 
-                if include_timing:
-                    elapsed_ms = (time.time() - start_time) * 1000
-                    result["timing"][module_name] = round(elapsed_ms, 2)
+            if include_timing:
+                result["timing"][module_name] = round(elapsed_ms, 2)
 
-            except Exception as e:
-                logger.error(f"Error in {module_name}: {e}")
-                result["advisory"][module_name] = {"error": str(e)}
+        self._add_core_panchanga(result, timestamp)
+        return result
 
-        # Add core Panchanga if available (already implemented)
+    def _add_core_panchanga(self, result: dict[str, Any], timestamp: datetime) -> None:
+        """Add core Panchanga if available (already implemented)."""
         if self.flags.ENABLE_PANCHANGA_FULL and FACADE_AVAILABLE:
             try:
                 panchanga = get_lunar_panchanga(timestamp)
@@ -343,13 +461,91 @@ class AdvisoryService:
             except Exception as e:
                 logger.debug(f"Panchanga not available: {e}")
 
-        return result
+    def _evaluate_modules(
+        self, ctx: dict[str, Any], names: list[str]
+    ) -> dict[str, tuple[Any, Exception | None, float]]:
+        """Run modules in the worker pool, each under the per-module timeout.
+
+        A module whose earlier timed-out call is still running, or that has
+        timed out ADVISORY_TIMEOUT_STRIKES times in a row (for the next
+        ADVISORY_TIMEOUT_COOLDOWN_S seconds), is not submitted and reports a
+        TimeoutError instead.
+
+        Returns:
+            Mapping of module name to (result, error, elapsed_ms)
+        """
+        timeout_s = self.timeout_ms / 1000.0
+        executor = _get_executor()
+        outcomes = {}
+        submitted: list[tuple[str, Future, float]] = []
+        for name in names:
+            reason = self._skip_reason(name)
+            if reason is not None:
+                outcomes[name] = (None, TimeoutError(reason), 0.0)
+                continue
+            submitted.append(
+                (name, executor.submit(_timed_call, self.modules[name], ctx), time.monotonic())
+            )
+
+        for name, future, started in submitted:
+            remaining = max(0.0, started + timeout_s - time.monotonic())
+            try:
+                module_result, elapsed_ms = future.result(timeout=remaining)
+                outcomes[name] = (module_result, None, elapsed_ms)
+                self._timeouts.pop(name, None)
+            except FutureTimeoutError:
+                if not future.cancel():
+                    self._stuck[name] = future
+                self._record_timeout(name)
+                outcomes[name] = (
+                    None,
+                    TimeoutError(f"{name} timed out after {self.timeout_ms}ms"),
+                    float(self.timeout_ms),
+                )
+            except Exception as e:
+                self._timeouts.pop(name, None)
+                outcomes[name] = (None, e, (time.monotonic() - started) * 1000)
+        return outcomes
+
+    def _skip_reason(self, name: str) -> str | None:
+        """Why a module must not be submitted now, or None."""
+        stuck = self._stuck.get(name)
+        if stuck is not None:
+            if not stuck.done():
+                return f"{name} skipped: previous call still running after timeout"
+            del self._stuck[name]
+
+        until = self._benched.get(name)
+        if until is not None:
+            if time.monotonic() < until:
+                return f"{name} skipped after {ADVISORY_TIMEOUT_STRIKES} consecutive timeouts"
+            del self._benched[name]
+            self._timeouts.pop(name, None)
+        return None
+
+    def _record_timeout(self, name: str) -> None:
+        strikes = self._timeouts.get(name, 0) + 1
+        self._timeouts[name] = strikes
+        if strikes >= ADVISORY_TIMEOUT_STRIKES:
+            self._benched[name] = time.monotonic() + ADVISORY_TIMEOUT_COOLDOWN_S
+            logger.warning(
+                f"Advisory module {name} timed out {strikes} times in a row; "
+                f"skipping it for {ADVISORY_TIMEOUT_COOLDOWN_S:.0f}s"
+            )
 
     def _call_with_timeout(self, func, args, timeout_seconds):
-        """Call function with timeout (simplified version)."""
-        # In production, use threading or asyncio for proper timeout
-        # For now, just call directly
-        return func(args)
+        """Call function in the worker pool; raise TimeoutError past the deadline.
+
+        The worker thread cannot be interrupted, but the caller stops waiting.
+        """
+        future = _get_executor().submit(func, args)
+        try:
+            return future.result(timeout=timeout_seconds)
+        except FutureTimeoutError:
+            future.cancel()
+            raise TimeoutError(
+                f"Module call timed out after {timeout_seconds * 1000:.0f}ms"
+            ) from None
 
     def get_advisory_for_range(
         self,
@@ -361,6 +557,13 @@ class AdvisoryService:
     ) -> list[dict]:
         """Get advisory data for a time range.
 
+        Range-sweep mode: planet state is computed once for the whole range
+        and each module is re-evaluated only at steps where its input
+        signature (see MODULE_SIGNATURES) changes; other steps reuse the
+        previous result. Modules run in the worker pool under the per-module
+        timeout, and a module that times out or exhausts its range budget
+        (ADVISORY_RANGE_BUDGET_MS) is skipped for the rest of the sweep.
+
         Args:
             start_time: Start of range
             end_time: End of range
@@ -371,19 +574,79 @@ class AdvisoryService:
         Returns:
             List of advisory snapshots
         """
-        snapshots = []
+        timestamps = []
         current = start_time
-
         while current <= end_time:
-            snapshot = self.collect_advisory_layers(
-                current, latitude, longitude, include_timing=False
-            )
-            snapshots.append(snapshot)
-
+            timestamps.append(current)
             # Move to next interval
-            from datetime import timedelta
-
             current += timedelta(minutes=interval_minutes)
+        if not timestamps:
+            return []
+
+        # Planet state for the whole range in one pass; houses per step
+        planet_series = _load_planet_series(timestamps) or [None] * len(timestamps)
+
+        enabled = self.flags.enabled_features()
+        budgets = {name: float(ADVISORY_RANGE_BUDGET_MS) for name in self.modules}
+        disabled: dict[str, str] = {}
+        last: dict[str, tuple[Hashable, Any]] = {}
+        self.range_stats = {"steps": len(timestamps), "evaluated": 0, "reused": 0}
+
+        snapshots = []
+        for ts, planets in zip(timestamps, planet_series):
+            ctx = AdvisoryContext(
+                timestamp=ts, latitude=latitude, longitude=longitude, planets=planets
+            ).to_dict()
+
+            # Re-run a module only where its inputs changed since the last step
+            entries: dict[str, Any] = {}
+            pending: dict[str, Hashable | None] = {}
+            for name in self.modules:
+                if name in disabled:
+                    entries[name] = {"error": disabled[name]}
+                    continue
+                signature_of = MODULE_SIGNATURES.get(name)
+                if signature_of is None:
+                    # Always recompute; skip building a signature
+                    pending[name] = None
+                    continue
+                signature = signature_of(ctx)
+                previous = last.get(name)
+                if previous is not None and previous[0] == signature:
+                    entries[name] = previous[1]
+                    self.range_stats["reused"] += 1
+                else:
+                    pending[name] = signature
+
+            outcomes = self._evaluate_modules(ctx, list(pending))
+            for name, signature in pending.items():
+                module_result, error, elapsed_ms = outcomes[name]
+                self.range_stats["evaluated"] += 1
+                budgets[name] -= elapsed_ms
+                if error is not None:
+                    logger.error(f"Error in {name}: {error}")
+                    entries[name] = {"error": str(error)}
+                    if isinstance(error, TimeoutError):
+                        # A hung module would keep a worker busy every step
+                        disabled[name] = str(error)
+                else:
+                    entries[name] = module_result
+                if signature is not None:
+                    last[name] = (signature, entries[name])
+                if budgets[name] <= 0 and name not in disabled:
+                    disabled[name] = (
+                        f"{name} exceeded range budget of {ADVISORY_RANGE_BUDGET_MS}ms"
+                    )
+
+            snapshot = {
+                "timestamp": ts.isoformat(),
+                "enabled_features": enabled,
+                "advisory": {
+                    name: entries[name] for name in self.modules if entries.get(name)
+                },
+            }
+            self._add_core_panchanga(snapshot, ts)
+            snapshots.append(snapshot)
 
         return snapshots
 
@@ -20,6 +20,9 @@ Outputs (optional; created by CLI build):
     - data/atlas/atlas_normalized.csv
     - data/atlas/index.json
 
+When atlas_normalized.csv is newer than the inputs, load_atlas reads it
+instead of re-parsing and re-validating the raw files.
+
 This module is safe to import; data loads lazily on first use.
 """
 from __future__ import annotations
@@ -137,11 +140,32 @@ def _normalize() -> list[AtlasEntry]:
     return entries
 
 
+def _normalized_is_fresh() -> bool:
+    if not NORMALIZED_FILE.exists():
+        return False
+    built = NORMALIZED_FILE.stat().st_mtime
+    return all(p.stat().st_mtime <= built for p in (USCITIES_FILE, WORLD_CITIES_FILE) if p.exists())
+
+
+def _load_normalized() -> list[AtlasEntry]:
+    """Read the prebuilt atlas (already validated; skips per-row tz checks)."""
+    import csv
+
+    with NORMALIZED_FILE.open("r", encoding="utf-8", newline="") as f:
+        rows = csv.reader(f)
+        next(rows, None)  # header
+        return [
+            AtlasEntry(entry_id, name, country, float(lat), float(lon), tz, admin1 or None)
+            for entry_id, name, country, admin1, lat, lon, tz in rows
+        ]
+
+
 def load_atlas(force: bool = False) -> None:
     global _ATLAS_LOADED, _ATLAS, _INDEX_BY_ID
     if _ATLAS_LOADED and not force:
         return
-    entries = _normalize()
+    # The image build writes atlas_normalized.csv; raw CSVs are the fallback
+    entries = _load_normalized() if not force and _normalized_is_fresh() else _normalize()
     _ATLAS = entries
     _INDEX_BY_ID = {e.id: e for e in entries}
     _ATLAS_LOADED = True
@@ -10,12 +10,14 @@ Redis (production) vs file cache (development) selection per PM requirements.
 import asyncio
 import json
 import logging
+import os
 
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Any
 
 from app.utils.hash_keys import cache_key_hash
+from shared.otel import timed_stage
 
 logger = logging.getLogger(__name__)
 
@@ -26,14 +28,15 @@ class CacheService:
 
     Features:
     - JSON file storage in data/cache/{system}/ directory
+      (base directory overridable with VEDACORE_CACHE_DIR)
     - TTL-based expiration
     - Async-safe operations
     - Automatic cleanup of expired entries
     - System namespacing for multi-system support
     """
 
-    def __init__(self, cache_dir: str = "data/cache", system: str = "KP"):
-        self.base_cache_dir = Path(cache_dir)
+    def __init__(self, cache_dir: str | None = None, system: str = "KP"):
+        self.base_cache_dir = Path(cache_dir or os.getenv("VEDACORE_CACHE_DIR", "data/cache"))
         self.system = system
         self.cache_dir = self.base_cache_dir / system
         self.cache_dir.mkdir(parents=True, exist_ok=True)
@@ -59,6 +62,7 @@ class CacheService:
 
         return self.cache_dir / f"{key_hash}.json"
 
+    @timed_stage("cache")
     async def get(self, key: str) -> Any | None:
         """
         Get value from cache
@@ -99,6 +103,7 @@ class CacheService:
                 self._stats["misses"] += 1
                 return None
 
+    @timed_stage("cache")
     async def set(self, key: str, value: Any, ttl: int = 300) -> bool:
         """
         Set value in cache
@@ -16,11 +16,12 @@ import asyncio
 import json
 import logging
 import time
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from typing import Any, Dict, List, Optional
 
+import numpy as np
+
 from app.core.config import NY_TZ
-from app.core.timeframes import iter_slices
 from app.services.unified_cache import UnifiedCache
 from app.services.facade_adapter import FacadeAdapter
 from api.services.redis_config import RedisManager, get_redis
@@ -28,6 +29,25 @@ from refactor.monitoring import Timer
 
 logger = logging.getLogger(__name__)
 
+# Julian Day of 1970-01-01T00:00:00Z
+UNIX_EPOCH_JD = 2440587.5
+
+# KP finance offset applied to the calculation time
+KP_OFFSET_SECONDS = 307
+
+# Strength multiplier per timeframe (finer timeframes react more strongly)
+TIMEFRAME_MULTIPLIERS = {
+    "1m": 1.0,
+    "5m": 0.8,
+    "15m": 0.6,
+    "1h": 0.4,
+    "4h": 0.2,
+    "1d": 0.1
+}
+
+# Priority: NL > SL > SL2 > sign
+LEVEL_PRIORITY = {"nl": 4, "sl": 3, "sl2": 2, "sign": 1}
+
 class TimeframeAnalysis:
     """Represents signal analysis for a specific timeframe"""
     
@@ -48,8 +68,16 @@ class TimeframeAnalysis:
         if not self.last_update:
             return []
             
-        cutoff = datetime.utcnow() - timedelta(minutes=window_minutes)
-        return [s for s in self.signals if datetime.fromisoformat(s['timestamp']) > cutoff]
+        # Signal timestamps are tz-aware (NY); compare as aware UTC
+        cutoff = datetime.now(timezone.utc) - timedelta(minutes=window_minutes)
+        active = []
+        for s in self.signals:
+            ts = datetime.fromisoformat(s['timestamp'])
+            if ts.tzinfo is None:
+                ts = ts.replace(tzinfo=timezone.utc)
+            if ts > cutoff:
+                active.append(s)
+        return active
 
 
 class ConfluenceDetector:
@@ -251,7 +279,7 @@ class EnhancedSignalsService:
                 
                 # Parse date and prepare time range
                 date_obj = datetime.strptime(date, "%Y-%m-%d")
-                ny_date = NY_TZ.localize(date_obj.replace(hour=0, minute=0, second=0))
+                ny_date = date_obj.replace(hour=0, minute=0, second=0, tzinfo=NY_TZ)
                 
                 # Initialize timeframe analyses
                 timeframe_analyses = {
@@ -268,13 +296,14 @@ class EnhancedSignalsService:
                     # Get base changes for the planet
                     changes = await self.facade_adapter.get_changes_for_day(ny_date, planet_id)
                     
+                    # Single pass over all timeframes for this planet
+                    signals_by_tf = await self._analyze_multi_timeframe_signals(
+                        ny_date, timeframes, planet_id, changes
+                    )
+                    
                     for timeframe in timeframes:
-                        tf_signals = await self._analyze_timeframe_signals(
-                            ny_date, timeframe, planet_id, changes
-                        )
-                        
                         # Add to timeframe analysis
-                        for signal in tf_signals:
+                        for signal in signals_by_tf[timeframe]:
                             timeframe_analyses[timeframe].add_signal(signal)
                             planet_signals[planet_id].append(signal)
                 
@@ -329,149 +358,193 @@ class EnhancedSignalsService:
             await self._update_performance_stats(start_time)
             raise
     
-    async def _analyze_timeframe_signals(self, 
-                                       date: datetime, 
-                                       timeframe: str, 
-                                       planet_id: int,
-                                       changes: List[Any]) -> List[Dict[str, Any]]:
-        """Analyze signals for a specific timeframe"""
-        signals = []
-        interval_seconds = self.timeframes[timeframe]
-        
-        # Define analysis window based on timeframe
+    def _timeframe_window(self, date: datetime, timeframe: str) -> tuple[datetime, datetime]:
+        """Analysis window (NY time) for a timeframe"""
         if timeframe in ["1m", "5m", "15m"]:
             # Intraday analysis - full day
-            start_time = date.replace(hour=4, minute=0)  # Pre-market
-            end_time = date.replace(hour=20, minute=0)   # After-hours
-        elif timeframe == "1h":
+            return date.replace(hour=4, minute=0), date.replace(hour=20, minute=0)
+        if timeframe == "1h":
             # Extended hours
-            start_time = date.replace(hour=0, minute=0)
-            end_time = date.replace(hour=23, minute=59)
-        else:  # 4h, 1d
-            # Multi-day analysis for context
-            start_time = date - timedelta(days=1)
-            end_time = date + timedelta(days=1)
-        
-        # Generate time slices for this timeframe
-        for slice_start, slice_end in iter_slices(start_time, end_time, f"{interval_seconds}s"):
-            # Get position at slice midpoint
-            midpoint = slice_start + (slice_end - slice_start) / 2
-            midpoint_utc = midpoint.astimezone(NY_TZ).replace(tzinfo=None)
-            
-            try:
-                position_data = await self.facade_adapter.get_position(midpoint_utc, planet_id)
-                
-                # Analyze signal strength based on proximity to changes
-                signal_strength, signal_type = self._calculate_signal_strength(
-                    slice_start, changes, timeframe
-                )
-                
-                if signal_strength > 0:  # Only include meaningful signals
-                    signal = {
-                        "timestamp": slice_start.isoformat(),
-                        "timeframe": timeframe,
-                        "planet_id": planet_id,
-                        "planet_name": position_data.planet_name,
-                        "position": position_data.position,
-                        "speed": position_data.speed,
-                        "nl": position_data.nl,
-                        "sl": position_data.sl,
-                        "sl2": position_data.sl2,
-                        "signal_type": signal_type,
-                        "strength": signal_strength,
-                        "level": self._determine_primary_level_change(slice_start, changes),
-                        "direction": self._determine_signal_direction(position_data),
-                        "volume_profile": self._calculate_volume_profile(timeframe, signal_strength)
-                    }
-                    
-                    signals.append(signal)
-                    
-            except Exception as e:
-                logger.warning(f"Error analyzing {timeframe} signal at {slice_start}: {e}")
-                continue
-        
-        return signals
-    
-    def _calculate_signal_strength(self, timestamp: datetime, changes: List[Any], timeframe: str) -> tuple[float, str]:
-        """Calculate signal strength and type based on proximity to changes"""
-        if not changes:
-            return 0.0, "none"
-        
-        # Find nearest change
-        min_delta = float('inf')
-        nearest_change = None
-        
-        for change in changes:
-            delta = abs((change.timestamp_ny - timestamp).total_seconds())
-            if delta < min_delta:
-                min_delta = delta
-                nearest_change = change
-        
-        if min_delta == float('inf'):
-            return 0.0, "none"
-        
+            return date.replace(hour=0, minute=0), date.replace(hour=23, minute=59)
+        # 4h, 1d: multi-day analysis for context
+        return date - timedelta(days=1), date + timedelta(days=1)
+
+    async def _analyze_timeframe_signals(self,
+                                       date: datetime,
+                                       timeframe: str,
+                                       planet_id: int,
+                                       changes: List[Any]) -> List[Dict[str, Any]]:
+        """Analyze signals for a specific timeframe"""
+        result = await self._analyze_multi_timeframe_signals(
+            date, [timeframe], planet_id, changes
+        )
+        return result[timeframe]
+
+    async def _analyze_multi_timeframe_signals(self,
+                                             date: datetime,
+                                             timeframes: List[str],
+                                             planet_id: int,
+                                             changes: List[Any]) -> Dict[str, List[Dict[str, Any]]]:
+        """Analyze all timeframes for one planet in a single pass
+
+        Change proximity is scored for every slice of every timeframe against
+        a sorted array of change times (searchsorted, no per-slice rescans).
+        Only slices with a non-zero strength need a position, so their
+        midpoints from all timeframes are pooled, de-duplicated and sampled
+        with one vectorized ephemeris call; each timeframe then indexes into
+        that shared sample.
+        """
+        change_times, change_levels = self._change_arrays(changes)
+
+        plans = {}
+        for timeframe in timeframes:
+            interval = self.timeframes[timeframe]
+            window_start, window_end = self._timeframe_window(date, timeframe)
+            start_s = window_start.timestamp()
+            end_s = window_end.timestamp()
+            n = max(0, int(np.ceil((end_s - start_s) / interval)))
+            starts = start_s + np.arange(n, dtype=np.float64) * interval
+            mids = (starts + np.minimum(starts + interval, end_s)) / 2.0
+
+            strength, delta = self._signal_strengths(starts, change_times, timeframe)
+            keep = np.flatnonzero(strength > 0)  # Only include meaningful signals
+            plans[timeframe] = (window_start, keep, mids[keep], strength[keep], delta[keep], starts[keep])
+
+        # One ephemeris pass over every needed midpoint (shared across timeframes)
+        all_mids = np.concatenate([plan[2] for plan in plans.values()]) if plans else np.empty(0)
+        sample_times, inverse = np.unique(all_mids, return_inverse=True)
+        lons, speeds, lords = self._sample_positions(sample_times, planet_id)
+        planet_name = self.facade_adapter.planet_names.get(planet_id, f"Planet{planet_id}")
+
+        out: Dict[str, List[Dict[str, Any]]] = {}
+        offset = 0
+        for timeframe, (window_start, keep, mids, strength, delta, starts) in plans.items():
+            idx = inverse[offset:offset + keep.size]
+            offset += keep.size
+            levels = self._primary_levels(starts, change_times, change_levels)
+
+            signals = []
+            for j in range(keep.size):
+                s_idx = idx[j]
+                speed = float(speeds[s_idx])
+                strength_j = float(strength[j])
+                # From the epoch-second grid, not wall-clock arithmetic, so
+                # multi-day (4h/1d) windows stay aligned across DST changes
+                slice_start = datetime.fromtimestamp(float(starts[j]), tz=window_start.tzinfo)
+                signals.append({
+                    "timestamp": slice_start.isoformat(),
+                    "timeframe": timeframe,
+                    "planet_id": planet_id,
+                    "planet_name": planet_name,
+                    "position": float(lons[s_idx]),
+                    "speed": speed,
+                    "nl": int(lords[s_idx, 0]),
+                    "sl": int(lords[s_idx, 1]),
+                    "sl2": int(lords[s_idx, 2]),
+                    "signal_type": self._signal_type(float(delta[j])),
+                    "strength": strength_j,
+                    "level": levels[j],
+                    "direction": self._direction_for_speed(speed),
+                    "volume_profile": self._calculate_volume_profile(timeframe, strength_j)
+                })
+            out[timeframe] = signals
+
+        return out
+
+    @staticmethod
+    def _change_arrays(changes: List[Any]) -> tuple[np.ndarray, List[str]]:
+        """Change instants (epoch seconds, sorted) and their levels"""
+        ordered = sorted(changes, key=lambda c: c.timestamp_ny)
+        times = np.array([c.timestamp_ny.timestamp() for c in ordered], dtype=np.float64)
+        return times, [c.level for c in ordered]
+
+    def _sample_positions(self, epoch_seconds: np.ndarray,
+                          planet_id: int) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Longitude, speed and (NL, SL, SL2) arrays at the given UTC instants
+
+        Applies the 307s KP calculation offset like FacadeAdapter.get_position.
+        """
+        from refactor.kp_chain import kp_boundary_table
+        from refactor.swe_backend import get_planet_series
+
+        if epoch_seconds.size == 0:
+            return np.empty(0), np.empty(0), np.empty((0, 3), dtype=np.int8)
+
+        jd = (epoch_seconds + KP_OFFSET_SECONDS) / 86400.0 + UNIX_EPOCH_JD
+        lons, speeds = get_planet_series(jd, [planet_id])[planet_id]
+        starts, lords = kp_boundary_table()
+        seg = np.searchsorted(starts, lons, side="right") - 1
+        return lons, speeds, lords[seg]
+
+    def _signal_strengths(self, times: np.ndarray, change_times: np.ndarray,
+                          timeframe: str) -> tuple[np.ndarray, np.ndarray]:
+        """Signal strength and distance to the nearest change for each slice"""
+        if change_times.size == 0:
+            zeros = np.zeros(times.size)
+            return zeros, np.full(times.size, np.inf)
+
+        # Nearest change via searchsorted on the sorted change array
+        pos = np.searchsorted(change_times, times)
+        right = change_times[np.minimum(pos, change_times.size - 1)]
+        left = change_times[np.maximum(pos - 1, 0)]
+        delta = np.minimum(np.abs(right - times), np.abs(times - left))
+
         # Calculate strength based on proximity and timeframe
-        timeframe_multiplier = {
-            "1m": 1.0,
-            "5m": 0.8,
-            "15m": 0.6,
-            "1h": 0.4,
-            "4h": 0.2,
-            "1d": 0.1
-        }.get(timeframe, 0.1)
-        
+        timeframe_multiplier = TIMEFRAME_MULTIPLIERS.get(timeframe, 0.1)
+
         # Strength decreases with distance from change
         max_distance = self.timeframes[timeframe] * 2  # 2x timeframe interval
-        distance_factor = max(0, 1 - (min_delta / max_distance))
-        
-        strength = distance_factor * timeframe_multiplier * 100
-        
-        # Determine signal type
+        distance_factor = np.maximum(0.0, 1.0 - delta / max_distance)
+
+        strength = np.round(distance_factor * timeframe_multiplier * 100, 2)
+        return strength, delta
+
+    @staticmethod
+    def _signal_type(min_delta: float) -> str:
+        """Signal type from distance (seconds) to the nearest change"""
         if min_delta <= 60:  # Within 1 minute
-            signal_type = "immediate"
+            return "immediate"
         elif min_delta <= 300:  # Within 5 minutes
-            signal_type = "near_term"
+            return "near_term"
         elif min_delta <= 1800:  # Within 30 minutes
-            signal_type = "medium_term"
-        else:
-            signal_type = "background"
-        
-        return round(strength, 2), signal_type
-    
-    def _determine_primary_level_change(self, timestamp: datetime, changes: List[Any]) -> str:
-        """Determine the primary KP level that changed near this timestamp"""
-        if not changes:
-            return "none"
-        
-        # Find changes within reasonable window
-        window_changes = [
-            change for change in changes
-            if abs((change.timestamp_ny - timestamp).total_seconds()) <= 1800  # 30 minutes
-        ]
-        
-        if not window_changes:
-            return "none"
-        
-        # Priority: NL > SL > SL2 > sign
-        level_priority = {"nl": 4, "sl": 3, "sl2": 2, "sign": 1}
-        
-        best_level = "none"
-        best_priority = 0
-        
-        for change in window_changes:
-            priority = level_priority.get(change.level, 0)
-            if priority > best_priority:
-                best_priority = priority
-                best_level = change.level
-        
-        return best_level
-    
+            return "medium_term"
+        return "background"
+
+    @staticmethod
+    def _primary_levels(times: np.ndarray, change_times: np.ndarray,
+                        change_levels: List[str]) -> List[str]:
+        """Highest-priority KP level changing within 30 minutes of each time
+
+        Priority: NL > SL > SL2 > sign
+        """
+        if change_times.size == 0:
+            return ["none"] * times.size
+
+        priorities = [LEVEL_PRIORITY.get(level, 0) for level in change_levels]
+        lo = np.searchsorted(change_times, times - 1800, side="left")
+        hi = np.searchsorted(change_times, times + 1800, side="right")
+
+        levels = []
+        for a, b in zip(lo.tolist(), hi.tolist()):
+            best_level = "none"
+            best_priority = 0
+            for i in range(a, b):
+                if priorities[i] > best_priority:
+                    best_priority = priorities[i]
+                    best_level = change_levels[i]
+            levels.append(best_level)
+        return levels
+
     def _determine_signal_direction(self, position_data: Any) -> str:
         """Determine signal direction based on planetary motion and KP lords"""
+        return self._direction_for_speed(position_data.speed)
+
+    @staticmethod
+    def _direction_for_speed(speed: float) -> str:
         # Simplified direction logic - can be enhanced based on domain expertise
-        if position_data.speed > 0.5:
+        if speed > 0.5:
             return "bullish"
-        elif position_data.speed < -0.5:
+        elif speed < -0.5:
             return "bearish"
         else:
             return "neutral"
@@ -7,7 +7,7 @@ Handles data transformation and error handling
 import logging
 import sys
 
-from datetime import datetime, timedelta
+from datetime import UTC, date, datetime, timedelta
 from pathlib import Path
 
 # Add refactor directory to path
@@ -16,12 +16,31 @@ sys.path.insert(0, str(Path(__file__).parent.parent.parent / "refactor"))
 from app.core.config import NY_TZ
 from app.models.responses import ChangeEvent, PositionResponse
 from refactor.constants import PLANET_NAMES
+from refactor.core_types import KPLordChange
 from refactor.facade import get_kp_lord_changes, get_positions
 from refactor.monitoring import Timer
 
 logger = logging.getLogger(__name__)
 
 
+def _ny_midnight_utc(day: date) -> datetime:
+    """UTC instant of midnight America/New_York on the given calendar day."""
+    return datetime(day.year, day.month, day.day, tzinfo=NY_TZ).astimezone(UTC)
+
+
+def _to_change_event(change: KPLordChange) -> ChangeEvent:
+    """Facade KPLordChange -> API ChangeEvent (NY time derived from UTC)."""
+    return ChangeEvent(
+        timestamp_utc=change.timestamp_utc,
+        timestamp_ny=change.timestamp_utc.astimezone(NY_TZ),
+        planet_id=change.planet_id,
+        level=change.level,
+        old_lord=change.old_lord,
+        new_lord=change.new_lord,
+        position=change.position,
+    )
+
+
 class FacadeAdapter:
     """
     Adapter between FastAPI models and refactored facade
@@ -108,44 +127,18 @@ class FacadeAdapter:
                 if levels is None:
                     levels = ["nl", "sl", "sl2"]
 
-                # Convert NY date to UTC range
-                ny_start = date.replace(hour=0, minute=0, second=0, microsecond=0)
-                ny_end = ny_start + timedelta(days=1)
+                # NY calendar day -> UTC range (23h/25h on DST change days)
+                day = date.date() if isinstance(date, datetime) else date
+                utc_start = _ny_midnight_utc(day)
+                utc_end = _ny_midnight_utc(day + timedelta(days=1))
 
-                utc_start = ny_start.astimezone(NY_TZ).replace(tzinfo=None)
-                utc_end = ny_end.astimezone(NY_TZ).replace(tzinfo=None)
-
-                # Find changes using facade
+                # Find changes using facade (detection in raw UTC)
                 changes = get_kp_lord_changes(
-                    start_ts=utc_start,
-                    end_ts=utc_end,
-                    planet_id=planet_id,
-                    apply_kp_offset=True,
-                    check_interval_seconds=1,  # High precision for intraday
+                    utc_start, utc_end, planet_id=planet_id, levels=tuple(levels)
                 )
 
                 # Convert to API models
-                events = []
-                for change in changes:
-                    # Filter by level
-                    if change.level not in levels:
-                        continue
-
-                    # Convert UTC to NY time
-                    ny_time = NY_TZ.localize(change.timestamp.replace(tzinfo=None))
-
-                    event = ChangeEvent(
-                        timestamp_utc=change.timestamp,
-                        timestamp_ny=ny_time,
-                        planet_id=planet_id,
-                        level=change.level,
-                        old_lord=change.old_lord,
-                        new_lord=change.new_lord,
-                        position=change.position,
-                    )
-                    events.append(event)
-
-                return events
+                return [_to_change_event(change) for change in changes]
 
             except Exception as e:
                 logger.error(f"Error getting changes: {e}")
@@ -179,21 +172,13 @@ class FacadeAdapter:
                 start = datetime.strptime(start_date, "%Y-%m-%d")
                 end = datetime.strptime(end_date, "%Y-%m-%d")
 
-                # Convert to NY timezone
-                ny_start = NY_TZ.localize(start.replace(hour=0, minute=0, second=0))
-                ny_end = NY_TZ.localize(end.replace(hour=23, minute=59, second=59))
-
-                # Convert to UTC
-                utc_start = ny_start.astimezone(NY_TZ).replace(tzinfo=None)
-                utc_end = ny_end.astimezone(NY_TZ).replace(tzinfo=None)
+                # NY calendar days -> UTC range (end date inclusive)
+                utc_start = _ny_midnight_utc(start.date())
+                utc_end = _ny_midnight_utc(end.date() + timedelta(days=1))
 
                 # Find changes
                 changes = get_kp_lord_changes(
-                    start_ts=utc_start,
-                    end_ts=utc_end,
-                    planet_id=planet_id,
-                    apply_kp_offset=True,
-                    check_interval_seconds=60,  # Lower precision for longer ranges
+                    utc_start, utc_end, planet_id=planet_id, levels=tuple(levels)
                 )
 
                 # Convert and filter
@@ -204,18 +189,7 @@ class FacadeAdapter:
                     if change.level not in levels:
                         continue
 
-                    ny_time = NY_TZ.localize(change.timestamp.replace(tzinfo=None))
-
-                    event = ChangeEvent(
-                        timestamp_utc=change.timestamp,
-                        timestamp_ny=ny_time,
-                        planet_id=planet_id,
-                        level=change.level,
-                        old_lord=change.old_lord,
-                        new_lord=change.new_lord,
-                        position=change.position,
-                    )
-                    events.append(event)
+                    events.append(_to_change_event(change))
                     level_counts[change.level] += 1
 
                 return {
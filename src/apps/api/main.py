@@ -4,7 +4,10 @@ VedaCore Signals API - Main Application
 FastAPI application for KP ephemeris-based trading signals
 """
 
-from fastapi import FastAPI, HTTPException, Request, Depends
+# Imported first so the boot breakdown on /health/startup covers everything below
+from app.core.startup_timing import mark_ready, phase, record_skipped, timed_import
+
+from fastapi import APIRouter, FastAPI, HTTPException, Request, Depends
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import PlainTextResponse, JSONResponse
 
@@ -23,29 +26,6 @@ from pathlib import Path
 
 from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
 
-from api.routers.advisory import router as advisory_router
-from api.routers.atlas import router as atlas_router
-from api.routers.ats import router as ats_router
-from api.routers.dasha import router as dasha_router
-from api.routers.eclipse import router as eclipse_router
-from api.routers.fortuna import router as fortuna_router
-from api.routers.health import router as health_router
-from api.routers.houses import router as houses_router
-from api.routers.kp_horary import router as kp_horary_router
-from api.routers.kp_ruling_planets import router as kp_ruling_planets_router
-from api.routers.location import router as location_router
-from api.routers.location_stream import router as location_stream_router
-from api.routers.micro import router as micro_router
-from api.routers.moon import router as moon_router
-from api.routers.nodes import router as nodes_router
-from api.routers.panchanga import router as panchanga_router
-from api.routers.signals import router as signals_router
-from api.routers.enhanced_signals import router as enhanced_signals_router
-from api.routers.strategy import router as strategy_router
-from api.routers.stream import router as stream_router
-from api.routers.tara import router as tara_router
-from api.routers.transit_events import router as transit_events_router
-from api.routers.ws import router as ws_router
 from app.core.logging import get_api_logger, setup_logging
 from app.core.environment import get_complete_config
 from refactor.monitoring import set_feature_flag, setup_prometheus_metrics
@@ -56,6 +36,36 @@ from api.services.rate_limiter import check_qps_limit
 from fastapi.openapi.utils import get_openapi
 from shared.otel import init_tracing as _otel_init_tracing
 
+
+def _router(name: str):
+    """Import api.routers.<name>, timed for the /health/startup breakdown."""
+    return timed_import(f"api.routers.{name}").router
+
+
+advisory_router = _router("advisory")
+atlas_router = _router("atlas")
+dasha_router = _router("dasha")
+eclipse_router = _router("eclipse")
+fortuna_router = _router("fortuna")
+health_router = _router("health")
+houses_router = _router("houses")
+kp_horary_router = _router("kp_horary")
+kp_ruling_planets_router = _router("kp_ruling_planets")
+location_router = _router("location")
+location_stream_router = _router("location_stream")
+micro_router = _router("micro")
+moon_router = _router("moon")
+nodes_router = _router("nodes")
+panchanga_router = _router("panchanga")
+profiling_router = _router("profiling")
+signals_router = _router("signals")
+enhanced_signals_router = _router("enhanced_signals")
+strategy_router = _router("strategy")
+stream_router = _router("stream")
+tara_router = _router("tara")
+transit_events_router = _router("transit_events")
+ws_router = _router("ws")
+
 # Test/CI detection and warmup controls
 IN_TEST = (
     os.getenv("VC_TEST_MODE", "false").lower() == "true"
@@ -123,6 +133,7 @@ try:
     from api.middleware.usage_metering import UsageMeteringMiddleware
     from api.middleware.idempotency import IdempotencyMiddleware
     from api.middleware.request_id import RequestIDMiddleware
+    from api.middleware.profiling import RequestProfilingMiddleware, ServerTimingMiddleware
     from api.middleware.api_key_routing import install_api_key_routing_middleware
     from api.middleware.deprecation_headers import install_deprecation_headers_middleware
     from api.services.redis_config import get_redis, close_redis
@@ -133,16 +144,10 @@ except ImportError as e:
     logger.warning(f"Production hardening not available: {e}")
     PRODUCTION_HARDENING_AVAILABLE = False
 
-# Global Locality Research - Activation API (feature flagged)
+# Feature-flagged subsystems: their routers (and whatever they pull in) are
+# only imported when the flag is on, so disabled workers never pay for them.
 ACTIVATION_ENABLED = os.getenv("ACTIVATION_ENABLED", "false").lower() == "true"
-if ACTIVATION_ENABLED:
-    try:
-        from api.routers.activation import router as activation_router
-
-        logger.info("Activation API enabled - Global Locality Research system loaded")
-    except ImportError as e:
-        logger.warning(f"Activation API import failed: {e}")
-        ACTIVATION_ENABLED = False
+ATS_ENABLED = get_feature_flags().ENABLE_ATS
 
 # Ensure cache directory exists
 CACHE_DIR = Path(__file__).resolve().parents[2] / "data" / "cache" / "KP"
@@ -261,8 +266,10 @@ async def lifespan(app: FastAPI):
     background_tasks = []
     try:
         await _startup_initialization()
-        background_tasks = await _initialize_background_services()
+        with phase("background_services"):
+            background_tasks = await _initialize_background_services()
         _set_startup_feature_flags()
+        mark_ready()
         yield
     finally:
         await _graceful_shutdown(app, background_tasks)
@@ -271,14 +278,18 @@ async def lifespan(app: FastAPI):
 async def _startup_initialization():
     """Initialize core application components."""
     await validate_production_security()
-    await initialize_configurations()
-    await initialize_systems()
-    await _initialize_advisory_adapters()
+    with phase("configurations"):
+        await initialize_configurations()
+    with phase("systems"):
+        await initialize_systems()
+        await _initialize_advisory_adapters()
     # Skip production hardening and JIT warmup during tests/CI or when explicitly disabled
     if not IN_TEST:
-        await _initialize_production_hardening()
+        with phase("production_hardening"):
+            await _initialize_production_hardening()
     if not (IN_TEST or SKIP_WARMUP):
-        await initialize_warmup()
+        with phase("warmup"):
+            await initialize_warmup()
 
 
 async def _initialize_advisory_adapters():
@@ -336,6 +347,7 @@ async def _initialize_background_services():
     if not IN_TEST:
         _setup_prometheus_metrics()
         _initialize_streaming_services()
+        await _attach_stream_broker()
         await _start_moon_publisher()
     return []  # Return empty task list for now
 
@@ -364,6 +376,32 @@ def _initialize_streaming_services():
         logger.warning(f"Streaming metrics initialization failed: {e}")
 
 
+async def _attach_stream_broker():
+    """Attach the cross-worker stream broker selected by STREAM_BROKER."""
+    try:
+        from api.services.stream_broker import create_broker
+        from api.services.stream_manager import stream_manager
+
+        broker = await create_broker()
+        if broker is None:
+            logger.info("Stream broker disabled (single-worker fan-out)")
+            return
+        await stream_manager.attach_broker(broker)
+        logger.info(f"Stream broker attached: {broker.name} worker={broker.worker_id}")
+    except Exception as e:
+        logger.warning(f"Stream broker initialization failed: {e}")
+
+
+async def _detach_stream_broker():
+    """Release topic leases and close the stream broker."""
+    try:
+        from api.services.stream_manager import stream_manager
+
+        await stream_manager.detach_broker()
+    except Exception as e:
+        logger.warning(f"Error closing stream broker: {e}")
+
+
 async def _start_moon_publisher():
     """Start Moon publisher service."""
     try:
@@ -396,6 +434,7 @@ async def _graceful_shutdown(app: FastAPI, background_tasks):
         sleep_sec = 5 if os.getenv("ENVIRONMENT", "development").lower() == "production" else 0.5
         await asyncio.sleep(sleep_sec)
         await _stop_moon_publisher()
+        await _detach_stream_broker()
         await _shutdown_production_hardening()
         logger.info("Graceful shutdown completed successfully")
     except Exception as e:
@@ -460,7 +499,10 @@ app_kwargs = {
 }
 
 if ORJSON_AVAILABLE:
-    app_kwargs["default_response_class"] = ORJSONResponse
+    # ORJSONResponse subclass that reports render time in Server-Timing
+    from api.services.response_encoding import TimedJSONResponse
+
+    app_kwargs["default_response_class"] = TimedJSONResponse
 
 app = FastAPI(**app_kwargs)
 
@@ -662,6 +704,11 @@ if config.feature_v1_routing and PRODUCTION_HARDENING_AVAILABLE:
     # Install ephemeris headers (PM requirement: numerical reproducibility)
     app.add_middleware(EphemerisHeadersMiddleware)
     logger.info("🔢 Ephemeris headers middleware installed")
+
+    # Per-stage Server-Timing header and admin request profiling (outermost)
+    app.add_middleware(RequestProfilingMiddleware)
+    app.add_middleware(ServerTimingMiddleware)
+    logger.info("⏱️ Server-Timing and request profiling middleware installed")
 elif config.feature_v1_routing:
     logger.warning("🚨 Production hardening middleware not available - running without full security")
 
@@ -705,8 +752,6 @@ app.include_router(advisory_router, dependencies=[Depends(rest_qps_guard)])  # P
 app.include_router(tara_router, dependencies=[Depends(rest_qps_guard)])  # KP: Tara Bala
 app.include_router(fortuna_router, dependencies=[Depends(rest_qps_guard)])  # KP: Fortuna Points
 app.include_router(transit_events_router, dependencies=[Depends(rest_qps_guard)])  # Transit Event System
-# Always include ATS router; endpoints gated by feature flag to return 403 when disabled
-app.include_router(ats_router, dependencies=[Depends(rest_qps_guard)])  # ATS: Aspect-Transfer Scoring
 app.include_router(panchanga_router, dependencies=[Depends(rest_qps_guard)])  # Panchanga: SystemAdapter registry demo
 app.include_router(kp_horary_router, dependencies=[Depends(rest_qps_guard)])  # KP: Horary Numbers (1-249)
 app.include_router(kp_ruling_planets_router, dependencies=[Depends(rest_qps_guard)])  # KP: Ruling Planets System
@@ -714,13 +759,41 @@ app.include_router(stream_router)  # Streaming: SSE endpoints
 app.include_router(ws_router)  # Streaming: WebSocket endpoints
 app.include_router(atlas_router, dependencies=[Depends(require_jwt_header_or_query)])  # Atlas: City search/resolution
 app.include_router(location_stream_router)  # Location features SSE stream
+app.include_router(profiling_router, include_in_schema=False)  # Admin: on-demand sampling profiles (PROFILING_ENABLED)
+
+
+
+def _feature_disabled_router(prefix: str, flag: str):
+    """Catch-all that answers 403 for a subsystem whose router was not imported."""
+    stub = APIRouter(prefix=prefix, include_in_schema=False)
+
+    @stub.api_route("/{path:path}", methods=["GET", "POST", "PUT", "PATCH", "DELETE"])
+    async def feature_disabled(path: str):
+        raise HTTPException(status_code=403, detail=f"Feature disabled ({flag}=false)")
+
+    return stub
+
+
+# ATS: Aspect-Transfer Scoring; endpoints answer 403 when disabled
+if ATS_ENABLED:
+    app.include_router(_router("ats"), dependencies=[Depends(rest_qps_guard)])
+else:
+    record_skipped("api.routers.ats")
+    app.include_router(_feature_disabled_router("/api/v1/ats", "ENABLE_ATS"))
+    logger.info("ATS disabled - router not imported")
 
 # Global Locality Research - Activation API (if enabled)
 if ACTIVATION_ENABLED:
-    app.include_router(
-        activation_router, prefix="/api/v1/location", dependencies=[Depends(rest_qps_guard)]
-    )  # GLR: Activation field mapping
-    logger.info("Activation router mounted at /api/v1/location/activation")
+    try:
+        app.include_router(
+            _router("activation"), prefix="/api/v1/location", dependencies=[Depends(rest_qps_guard)]
+        )  # GLR: Activation field mapping
+        logger.info("Activation router mounted at /api/v1/location/activation")
+    except ImportError as e:
+        logger.warning(f"Activation API import failed: {e}")
+        ACTIVATION_ENABLED = False
+else:
+    record_skipped("api.routers.activation")
 
 
 ## Root endpoint moved below response model definitions
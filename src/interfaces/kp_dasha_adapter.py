@@ -7,7 +7,7 @@ Provides snapshot and changes methods for dasha periods.
 import logging
 
 from datetime import date, datetime
-from typing import Any
+from typing import Any, Iterator
 
 from refactor.dasha import VimshottariDashaEngine
 from refactor.time_utils import validate_utc_datetime
@@ -240,17 +240,9 @@ class KPDashaAdapter:
         Returns:
             Full cycle structure as dictionary
         """
-        # Get birth data
-        if chart_id and chart_id in self._birth_charts:
-            birth_data = self._birth_charts[chart_id]
-            birth_time = birth_data["birth_time"]
-            moon_longitude = birth_data["moon_longitude"]
-        elif birth_time:
-            birth_time = validate_utc_datetime(birth_time)
-            if moon_longitude is None:
-                moon_longitude = self.engine.get_moon_longitude(birth_time)
-        else:
-            raise ValueError("Either chart_id or birth_time must be provided")
+        birth_time, moon_longitude = self._resolve_birth(
+            chart_id, birth_time, moon_longitude
+        )
 
         # Calculate full cycle
         full_cycle = self.engine.calculate_full_cycle(
@@ -259,19 +251,74 @@ class KPDashaAdapter:
 
         # Convert to dictionary and add metadata
         result = full_cycle.to_dict()
-        result["system"] = self.system
-        result["birth_time"] = birth_time.isoformat()
-        result["moon_longitude"] = moon_longitude
-        result["meta"] = {
-            "adapter": self.system,
-            "version": "1.0.0",
-            "ayanamsa": "Krishnamurti",
-            "chart_id": chart_id,
-            "levels": levels,
-        }
+        result.update(self._cycle_header(chart_id, birth_time, moon_longitude, levels))
 
         return result
 
+    def iter_full_cycle(
+        self,
+        chart_id: str | None = None,
+        birth_time: datetime | None = None,
+        moon_longitude: float | None = None,
+        levels: int = 3,
+    ) -> tuple[dict[str, Any], Iterator[dict[str, Any]]]:
+        """
+        Stream the full cycle one Mahadasha at a time.
+
+        Birth data is resolved eagerly (so bad input fails before a response
+        starts); nested periods are computed as the iterator is consumed.
+
+        Returns:
+            (header, iterator of Mahadasha dictionaries) where header holds
+            the same system/birth_time/moon_longitude/meta keys as
+            get_full_cycle
+        """
+        birth_time, moon_longitude = self._resolve_birth(
+            chart_id, birth_time, moon_longitude
+        )
+        periods = self.engine.iter_full_cycle(
+            birth_time=birth_time, moon_longitude=moon_longitude, levels=levels
+        )
+        header = self._cycle_header(chart_id, birth_time, moon_longitude, levels)
+        return header, (maha.to_dict() for maha in periods)
+
+    def _resolve_birth(
+        self,
+        chart_id: str | None,
+        birth_time: datetime | None,
+        moon_longitude: float | None,
+    ) -> tuple[datetime, float]:
+        """Birth time and Moon longitude from a stored chart or explicit input."""
+        if chart_id and chart_id in self._birth_charts:
+            birth_data = self._birth_charts[chart_id]
+            return birth_data["birth_time"], birth_data["moon_longitude"]
+        if birth_time:
+            birth_time = validate_utc_datetime(birth_time)
+            if moon_longitude is None:
+                moon_longitude = self.engine.get_moon_longitude(birth_time)
+            return birth_time, moon_longitude
+        raise ValueError("Either chart_id or birth_time must be provided")
+
+    def _cycle_header(
+        self,
+        chart_id: str | None,
+        birth_time: datetime,
+        moon_longitude: float,
+        levels: int,
+    ) -> dict[str, Any]:
+        return {
+            "system": self.system,
+            "birth_time": birth_time.isoformat(),
+            "moon_longitude": moon_longitude,
+            "meta": {
+                "adapter": self.system,
+                "version": "1.0.0",
+                "ayanamsa": "Krishnamurti",
+                "chart_id": chart_id,
+                "levels": levels,
+            },
+        }
+
     def get_birth_balance(
         self, birth_time: datetime, moon_longitude: float | None = None
     ) -> dict[str, Any]:
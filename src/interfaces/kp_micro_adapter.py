@@ -9,7 +9,7 @@ import logging
 
 from dataclasses import dataclass
 from datetime import UTC, date, datetime, timedelta
-from typing import Any
+from typing import Any, Iterator
 
 from refactor.micro_config import MicroConfig, get_micro_config
 from refactor.micro_timing import (
@@ -125,25 +125,11 @@ class KPMicroAdapter:
         Returns:
             Dictionary with merged windows across all days
         """
-        if end_day < start_day:
-            raise ValueError("end_day must be >= start_day")
-
-        # Check range limit
-        days_diff = (end_day - start_day).days + 1
-        if days_diff > self.cfg.max_days_range:
-            raise ValueError(f"Range exceeds maximum of {self.cfg.max_days_range} days")
+        days_diff = self._check_range(start_day, end_day)
 
         all_windows = []
-        current = start_day
-
-        while current <= end_day:
-            try:
-                windows = build_day_timeline(current, cfg=self.cfg)
-                all_windows.extend(windows)
-            except Exception as e:
-                logger.warning(f"Error processing {current}: {e}")
-
-            current = current + timedelta(days=1)
+        for windows in self._iter_day_windows(start_day, end_day):
+            all_windows.extend(windows)
 
         # Sort by start time
         all_windows.sort(key=lambda w: w.start)
@@ -166,6 +152,48 @@ class KPMicroAdapter:
             "meta": {"version": self.version},
         }
 
+    def iter_range(self, start_day: date, end_day: date) -> Iterator[list[dict[str, Any]]]:
+        """
+        Generate volatility windows for a date range one day at a time.
+
+        The range is validated eagerly; the returned generator computes each
+        day only when the previous one has been consumed.
+
+        Args:
+            start_day: Start date (inclusive)
+            end_day: End date (inclusive)
+
+        Returns:
+            Iterator of per-day window lists (window dicts, start-ordered)
+        """
+        self._check_range(start_day, end_day)
+        return (
+            [w.to_dict() for w in sorted(windows, key=lambda w: w.start)]
+            for windows in self._iter_day_windows(start_day, end_day)
+        )
+
+    def _check_range(self, start_day: date, end_day: date) -> int:
+        """Validate a date range and return its length in days."""
+        if end_day < start_day:
+            raise ValueError("end_day must be >= start_day")
+
+        days_diff = (end_day - start_day).days + 1
+        if days_diff > self.cfg.max_days_range:
+            raise ValueError(f"Range exceeds maximum of {self.cfg.max_days_range} days")
+        return days_diff
+
+    def _iter_day_windows(self, start_day: date, end_day: date) -> Iterator[list]:
+        current = start_day
+        while current <= end_day:
+            try:
+                windows = build_day_timeline(current, cfg=self.cfg)
+            except Exception as e:
+                logger.warning(f"Error processing {current}: {e}")
+            else:
+                yield windows
+
+            current = current + timedelta(days=1)
+
     def next(self, threshold: str = "high") -> dict[str, Any]:
         """
         Find next volatility window meeting threshold.
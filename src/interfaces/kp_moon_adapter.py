@@ -16,6 +16,7 @@ from refactor.moon_config import MoonConfig
 from refactor.moon_factors_enhanced import (
     EnhancedMoonCalculator,
 )
+from refactor.moon_series import find_panchanga_changes
 
 logger = logging.getLogger(__name__)
 
@@ -196,33 +197,19 @@ class KPMoonAdapter(BaseSystemAdapter):
             }
 
     def _find_tithi_changes(self, start: datetime, end: datetime) -> list[SystemChange]:
-        """Find tithi changes in range"""
-        changes = []
-        current = start
-        step = timedelta(hours=1)
-        prev_tithi = None
-
-        while current <= end:
-            profile = self.calculator.calculate_profile(current)
-            tithi = profile.basic_factors.tithi_num
-
-            if prev_tithi is not None and tithi != prev_tithi:
-                changes.append(
-                    SystemChange(
-                        system=self.system,
-                        timestamp=current,
-                        change_type="tithi_change",
-                        from_value=prev_tithi,
-                        to_value=tithi,
-                        entity="Tithi",
-                        metadata={"tithi_name": profile.basic_factors.tithi},
-                    )
-                )
-
-            prev_tithi = tithi
-            current += step
-
-        return changes
+        """Find tithi changes in range (exact elongation crossings)"""
+        return [
+            SystemChange(
+                system=self.system,
+                timestamp=datetime.fromisoformat(event["timestamp"]),
+                change_type="tithi_change",
+                from_value=event["from_num"],
+                to_value=event["to_num"],
+                entity="Tithi",
+                metadata={"tithi_name": event["to"]},
+            )
+            for event in find_panchanga_changes(start, end, elements=("tithi",))
+        ]
 
     def _find_nakshatra_changes(
         self, start: datetime, end: datetime
@@ -16,10 +16,11 @@ import logging
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from decimal import Decimal
-from typing import Any
+from typing import Any, Iterator
 
 import swisseph as swe
 
+from refactor.swe_backend import _swe_lock, get_planet_longitude, set_ephemeris_path
 from refactor.time_utils import validate_utc_datetime
 
 logger = logging.getLogger(__name__)
@@ -130,9 +131,10 @@ class VimshottariDashaEngine:
         Args:
             ephe_path: Path to Swiss Ephemeris data files
         """
-        swe.set_ephe_path(ephe_path)
+        set_ephemeris_path(ephe_path)
         # Set sidereal mode to Krishnamurti ayanamsa
-        swe.set_sid_mode(5)  # KP ayanamsa
+        with _swe_lock:
+            swe.set_sid_mode(5)  # KP ayanamsa
         self.total_cycle_years = Decimal(str(TOTAL_CYCLE_YEARS))
         logger.info("VimshottariDashaEngine initialized with KP ayanamsa")
 
@@ -147,16 +149,9 @@ class VimshottariDashaEngine:
             Moon's sidereal longitude in degrees (0-360)
         """
         ts_utc = validate_utc_datetime(ts_utc)
-        jd = swe.julday(
-            ts_utc.year,
-            ts_utc.month,
-            ts_utc.day,
-            ts_utc.hour + ts_utc.minute / 60.0 + ts_utc.second / 3600.0,
-        )
 
-        # Get Moon position (planet ID 1 in Swiss Ephemeris)
-        result = swe.calc_ut(jd, 1, swe.FLG_SIDEREAL)
-        moon_longitude = result[0][0]  # Sidereal longitude
+        # Moon is planet 2 in the KP numbering (locked ephemeris call)
+        moon_longitude, _ = get_planet_longitude(ts_utc, 2)
 
         return moon_longitude
 
@@ -661,6 +656,40 @@ class VimshottariDashaEngine:
         Returns:
             Root DashaPeriod with nested sub-periods
         """
+        mahadashas = list(self.iter_full_cycle(birth_time, moon_longitude, levels))
+
+        # Create root period containing full cycle
+        root = DashaPeriod(
+            level="root",
+            planet="CYCLE",
+            start_date=mahadashas[0].start_date,
+            end_date=mahadashas[-1].end_date,
+            duration_days=Decimal(str(120 * 365.25)),
+            sub_periods=mahadashas,
+        )
+
+        return root
+
+    def iter_full_cycle(
+        self,
+        birth_time: datetime,
+        moon_longitude: float | None = None,
+        levels: int = 3,
+    ) -> Iterator[DashaPeriod]:
+        """
+        Yield the 120-year cycle one Mahadasha at a time.
+
+        Each Mahadasha's nested periods are only built when it is reached, so
+        deep cycles (levels 4-5) never have to be held in memory at once.
+
+        Args:
+            birth_time: Birth UTC timestamp
+            moon_longitude: Pre-calculated Moon longitude (optional)
+            levels: Depth of nesting (1-5)
+
+        Yields:
+            Mahadasha periods with sub-periods filled to the requested depth
+        """
         # Generate mahadashas
         mahadashas = self.generate_mahadashas(birth_time, moon_longitude, 120)
 
@@ -685,17 +714,7 @@ class VimshottariDashaEngine:
                                             sookshma
                                         )
 
-        # Create root period containing full cycle
-        root = DashaPeriod(
-            level="root",
-            planet="CYCLE",
-            start_date=mahadashas[0].start_date,
-            end_date=mahadashas[-1].end_date,
-            duration_days=Decimal(str(120 * 365.25)),
-            sub_periods=mahadashas,
-        )
-
-        return root
+            yield maha
 
 
 # Module-level instance for convenience
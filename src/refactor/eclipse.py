@@ -26,6 +26,7 @@ from zoneinfo import ZoneInfo
 import swisseph as swe
 
 from .eclipse_config import EclipseConfig, get_eclipse_config
+from .swe_backend import _swe_lock, set_ephemeris_path
 
 logger = logging.getLogger(__name__)
 
@@ -173,7 +174,7 @@ def solar_events_between(
         )
 
     # Set ephemeris path
-    swe.set_ephe_path(cfg.ephemeris_path)
+    set_ephemeris_path(cfg.ephemeris_path)
 
     events: list[EclipseEvent] = []
     current = start_utc
@@ -183,9 +184,10 @@ def solar_events_between(
 
         # Find next solar eclipse
         # Search forward for next eclipse
-        retflag, tret = swe.sol_eclipse_when_glob(
-            jd, swe.FLG_SWIEPH, swe.ECL_ALLTYPES_SOLAR, False
-        )
+        with _swe_lock:
+            retflag, tret = swe.sol_eclipse_when_glob(
+                jd, swe.FLG_SWIEPH, swe.ECL_ALLTYPES_SOLAR, False
+            )
 
         if retflag < 0:
             logger.warning(f"Solar eclipse search failed at {current}")
@@ -203,7 +205,8 @@ def solar_events_between(
             classification = _classify_solar(retflag)
 
             # Get eclipse attributes at maximum
-            ret2, geopos, attr = swe.sol_eclipse_where(peak_jd, swe.FLG_SWIEPH)
+            with _swe_lock:
+                ret2, geopos, attr = swe.sol_eclipse_where(peak_jd, swe.FLG_SWIEPH)
 
             magnitude = None
             gamma = None
@@ -294,7 +297,7 @@ def lunar_events_between(
         )
 
     # Set ephemeris path
-    swe.set_ephe_path(cfg.ephemeris_path)
+    set_ephemeris_path(cfg.ephemeris_path)
 
     events: list[EclipseEvent] = []
     current = start_utc
@@ -304,9 +307,10 @@ def lunar_events_between(
 
         # Find next lunar eclipse
         # Search forward for next eclipse
-        retflag, tret = swe.lun_eclipse_when(
-            jd, swe.FLG_SWIEPH, swe.ECL_ALLTYPES_LUNAR, False
-        )
+        with _swe_lock:
+            retflag, tret = swe.lun_eclipse_when(
+                jd, swe.FLG_SWIEPH, swe.ECL_ALLTYPES_LUNAR, False
+            )
 
         if retflag < 0:
             logger.warning(f"Lunar eclipse search failed at {current}")
@@ -324,7 +328,8 @@ def lunar_events_between(
             classification = _classify_lunar(retflag)
 
             # Get magnitude
-            ret2, attr = swe.lun_eclipse_how(peak_jd, (0, 0, 0), swe.FLG_SWIEPH)
+            with _swe_lock:
+                ret2, attr = swe.lun_eclipse_how(peak_jd, (0, 0, 0), swe.FLG_SWIEPH)
 
             magnitude = None
             if ret2 >= 0 and len(attr) > 0:
@@ -419,7 +424,8 @@ def solar_visibility(
     attr = [0.0] * 20
     geopos = [lon, lat, altitude]
 
-    retflag, attr = swe.sol_eclipse_how(jd, tuple(geopos), swe.FLG_SWIEPH)
+    with _swe_lock:
+        retflag, attr = swe.sol_eclipse_how(jd, tuple(geopos), swe.FLG_SWIEPH)
 
     visible = retflag > 0
 
@@ -439,9 +445,10 @@ def solar_visibility(
 
         # Get contact times for this location
         tret = [0.0] * 10
-        ret2, tret, attr2 = swe.sol_eclipse_when_loc(
-            jd - 1, tuple(geopos), swe.FLG_SWIEPH, False
-        )
+        with _swe_lock:
+            ret2, tret, attr2 = swe.sol_eclipse_when_loc(
+                jd - 1, tuple(geopos), swe.FLG_SWIEPH, False
+            )
 
         start_time = None
         max_time = None
@@ -499,7 +506,8 @@ def lunar_visibility(
     attr = [0.0] * 20
     geopos = [lon, lat, altitude]
 
-    retflag, attr = swe.lun_eclipse_how(jd, tuple(geopos), swe.FLG_SWIEPH)
+    with _swe_lock:
+        retflag, attr = swe.lun_eclipse_how(jd, tuple(geopos), swe.FLG_SWIEPH)
 
     visible = retflag > 0
 
@@ -557,9 +565,10 @@ def solar_path(
 
     # First check if this is actually a solar eclipse
     tret = [0.0] * 10
-    retflag, tret = swe.sol_eclipse_when_glob(
-        jd, swe.FLG_SWIEPH, swe.ECL_ALLTYPES_SOLAR, False
-    )
+    with _swe_lock:
+        retflag, tret = swe.sol_eclipse_when_glob(
+            jd, swe.FLG_SWIEPH, swe.ECL_ALLTYPES_SOLAR, False
+        )
 
     if retflag < 0:
         return None
@@ -589,7 +598,8 @@ def solar_path(
         sample_jd = start_jd + (end_jd - start_jd) * i / (num_samples - 1)
 
         # Get the geographic position of maximum eclipse at this time
-        ret2, geopos, attr = swe.sol_eclipse_where(sample_jd, swe.FLG_SWIEPH)
+        with _swe_lock:
+            ret2, geopos, attr = swe.sol_eclipse_where(sample_jd, swe.FLG_SWIEPH)
 
         if ret2 >= 0 and len(geopos) >= 2:
             central_line.append((geopos[1], geopos[0]))  # (lat, lon)
@@ -6,8 +6,8 @@ Minimal Facade - Compatibility layer for refactored modules
 
 import logging
 
-from datetime import UTC, datetime
-from typing import TYPE_CHECKING, Optional
+from datetime import UTC, datetime, timedelta
+from typing import TYPE_CHECKING, Iterator, Optional
 
 from app.utils.hash_keys import analysis_id_hash
 
@@ -86,6 +86,27 @@ def get_positions(
     # Get full position data from Swiss Ephemeris at calculation time
     pos_data = get_planet_position_full(ts_calc, planet_id)
 
+    return build_planet_data(ts_utc, planet_id, apply_kp_offset, pos_data)
+
+
+def build_planet_data(
+    ts_utc: datetime, planet_id: int, apply_kp_offset: bool, pos_data: dict
+) -> PlanetData:
+    """Assemble PlanetData from a raw ephemeris position
+
+    Split out of get_positions so batch callers (HFT cache prefill) that
+    evaluate the ephemeris over a whole grid build identical objects.
+
+    Args:
+        ts_utc: Requested UTC time (shown in extras)
+        planet_id: Planet ID
+        apply_kp_offset: Whether pos_data was taken at ts_utc + 307s
+        pos_data: longitude, latitude, distance and speed_lon
+
+    Returns:
+        PlanetData object with all fields populated
+    """
+
     # Extract key values
     longitude = pos_data["longitude"]
     speed = pos_data["speed_lon"]
@@ -171,6 +192,45 @@ def get_kp_lord_changes(
     return changes
 
 
+def iter_kp_lord_changes(
+    start_utc: datetime,
+    end_utc: datetime,
+    planet_ids: tuple[int, ...] = (2,),
+    levels: tuple[str, ...] = ("nl", "sl", "sl2"),
+    chunk: timedelta = timedelta(hours=6),
+) -> Iterator[list[KPLordChange]]:
+    """Detect KP lord changes chunk by chunk
+
+    Splits the range into contiguous chunks and yields each chunk's changes
+    (all planets, time-ordered) as soon as it is computed, so long windows
+    never hold every event at once.
+
+    Args:
+        start_utc: Start time (UTC)
+        end_utc: End time (UTC)
+        planet_ids: Planets to scan (default: Moon only)
+        levels: Lord levels to detect changes for
+        chunk: Span of time computed per yielded batch
+
+    Yields:
+        Lists of KPLordChange objects, one list per chunk
+    """
+    start_utc = validate_utc_datetime(start_utc)
+    end_utc = validate_utc_datetime(end_utc)
+
+    chunk_start = start_utc
+    while chunk_start < end_utc:
+        chunk_end = min(chunk_start + chunk, end_utc)
+        changes = [
+            change
+            for planet_id in planet_ids
+            for change in detect_kp_lord_changes(chunk_start, chunk_end, planet_id, levels)
+        ]
+        changes.sort(key=lambda c: c.timestamp_utc)
+        yield changes
+        chunk_start = chunk_end
+
+
 # ============================================================================
 # BATCH OPERATIONS
 # ============================================================================
@@ -894,19 +954,42 @@ def find_best_matches(nakshatra: int, min_compatibility: float = 65.0) -> list[d
     Returns:
         List of compatible nakshatra matches
     """
+    return find_best_matches_batch([nakshatra], min_compatibility)[0]
+
+
+def find_best_matches_batch(
+    nakshatras: list[int], min_compatibility: float = 65.0, top_k: int | None = None
+) -> list[list[dict]]:
+    """
+    Find most compatible nakshatras for many birth stars at once.
+
+    Ranks against the precomputed compatibility table, so a matchmaking
+    batch costs one array lookup rather than 27 pair evaluations per person.
+
+    Args:
+        nakshatras: Birth nakshatras to match (1-27)
+        min_compatibility: Minimum compatibility percentage
+        top_k: Optional cap on matches returned per person
+
+    Returns:
+        One list of compatible nakshatra matches per input nakshatra
+    """
     from .constants import NAKSHATRA_NAMES
-    from .nakshatra_compatibility import find_compatible_nakshatras
+    from .nakshatra_compatibility import rank_compatible_nakshatras
 
-    matches = find_compatible_nakshatras(nakshatra, min_compatibility)
+    ranked = rank_compatible_nakshatras(nakshatras, min_compatibility, top_k=top_k)
 
     return [
-        {
-            "nakshatra": match[0],
-            "name": NAKSHATRA_NAMES.get(match[0], f"Nakshatra-{match[0]}"),
-            "compatibility": round(match[1], 1),
-            "quality": match[2],
-        }
-        for match in matches
+        [
+            {
+                "nakshatra": match[0],
+                "name": NAKSHATRA_NAMES.get(match[0], f"Nakshatra-{match[0]}"),
+                "compatibility": round(match[1], 1),
+                "quality": match[2],
+            }
+            for match in matches
+        ]
+        for matches in ranked
     ]
 
 
@@ -1080,6 +1163,9 @@ def get_part_of_fortune(
     return result
 
 
+FORTUNA_TRACK_TYPES = ("FORTUNE", "SPIRIT", "LOVE", "MARRIAGE", "CAREER", "WEALTH")
+
+
 def track_fortuna_movement_for_day(
     date: datetime, latitude: float, longitude: float, fortuna_type: str = "FORTUNE"
 ) -> list[dict]:
@@ -1095,25 +1181,37 @@ def track_fortuna_movement_for_day(
     Returns:
         List of hourly positions
     """
-    from .fortuna_points import FortunaType, calculate_fortuna_point
-    from .houses import compute_houses
+    return list(iter_fortuna_movement_for_day(date, latitude, longitude, fortuna_type))
 
-    movements = []
 
-    # Map string to FortunaType
-    type_map = {
-        "FORTUNE": FortunaType.FORTUNE,
-        "SPIRIT": FortunaType.SPIRIT,
-        "LOVE": FortunaType.LOVE,
-        "MARRIAGE": FortunaType.MARRIAGE,
-        "CAREER": FortunaType.CAREER,
-        "WEALTH": FortunaType.WEALTH,
-    }
+def iter_fortuna_movement_for_day(
+    date: datetime,
+    latitude: float,
+    longitude: float,
+    fortuna_type: str = "FORTUNE",
+    interval_hours: int = 1,
+) -> Iterator[dict]:
+    """
+    Yield fortuna point positions through a day, one sample at a time.
+
+    Args:
+        date: Date to track
+        latitude: Location latitude
+        longitude: Location longitude
+        fortuna_type: Which fortuna to track (see FORTUNA_TRACK_TYPES)
+        interval_hours: Hours between samples
 
-    fortuna_enum = type_map.get(fortuna_type.upper(), FortunaType.FORTUNE)
+    Yields:
+        Position dict per sample hour
+    """
+    from .fortuna_points import FortunaType, calculate_fortuna_point
+    from .houses import compute_houses
 
-    # Calculate for each hour
-    for hour in range(24):
+    name = fortuna_type.upper()
+    fortuna_enum = FortunaType[name] if name in FORTUNA_TRACK_TYPES else FortunaType.FORTUNE
+
+    # Calculate for each sample hour
+    for hour in range(0, 24, max(1, interval_hours)):
         timestamp = date.replace(hour=hour, minute=0, second=0)
 
         # Calculate houses
@@ -1128,17 +1226,13 @@ def track_fortuna_movement_for_day(
         # Calculate fortuna point
         point = calculate_fortuna_point(fortuna_enum, planet_positions, houses.cusps)
 
-        movements.append(
-            {
-                "hour": hour,
-                "timestamp": timestamp.isoformat(),
-                "longitude": round(point.longitude, 4),
-                "house": point.house,
-                "sign": point.sign,
-            }
-        )
-
-    return movements
+        yield {
+            "hour": hour,
+            "timestamp": timestamp.isoformat(),
+            "longitude": round(point.longitude, 4),
+            "house": point.house,
+            "sign": point.sign,
+        }
 
 
 # Helper function for house lords
@@ -1331,13 +1425,17 @@ def get_all_shodasavarga(timestamp: datetime, planet_id: int = None) -> dict[str
     Returns:
         Dictionary of "D{n}" -> {planet_id: sign}
     """
+    from refactor.varga import varga_sign_matrix
     from refactor.varga_config import get_varga_config
+    from refactor.varga_piecewise import register_piecewise_schemes
 
     ts_utc = validate_utc_datetime(timestamp)
+    register_piecewise_schemes()
     config = get_varga_config()
 
     # Get Shodasavarga divisors
     divisors = config.get_shodasavarga_divisors()
+    schemes = [config.get_scheme_for_divisor(divisor) for divisor in divisors]
 
     # Determine which planets to calculate
     if planet_id is not None:
@@ -1345,13 +1443,13 @@ def get_all_shodasavarga(timestamp: datetime, planet_id: int = None) -> dict[str
     else:
         planets = [1, 2, 3, 4, 5, 6, 7, 8, 9]
 
-    # Calculate all vargas
-    results = {}
-    for divisor in divisors:
-        varga_name = f"D{divisor}"
-        results[varga_name] = get_varga_chart(ts_utc, divisor, planets)
+    # One position per planet, then all 16 vargas in a single kernel call
+    longitudes = [get_positions(ts_utc, pid).longitude for pid in planets]
+    signs = varga_sign_matrix(longitudes, divisors, schemes).T.tolist()
 
-    return results
+    return {
+        f"D{divisor}": dict(zip(planets, row)) for divisor, row in zip(divisors, signs)
+    }
 
 
 def get_varga_strength(
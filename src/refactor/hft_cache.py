@@ -1,174 +1,92 @@
 #!/usr/bin/env python3
 """
 High-Frequency Trading Cache Module
-Implements microsecond-precision caching with 1-second TTL for KP calculations
-Designed for 100k+ calculations per second
-"""
+Clock-bucketed ring cache for KP position lookups (100k+ lookups per second)
 
-import threading
-import time
+A position at a given whole second never changes, so entries need no TTL:
+each planet gets a fixed-size ring of slots indexed by an integer key
+(UTC second, offset flag) modulo the ring size. A newer second simply
+overwrites the slot of an older one; there is no cleanup thread and reads
+take no lock (storing a tuple into a list slot is atomic under the GIL).
+"""
 
-from dataclasses import dataclass
-from datetime import datetime, timedelta
+from datetime import UTC, datetime, timedelta
 from typing import Any
 
+import numpy as np
+
+# 65536 slots hold both offset flags for ~9 hours of seconds per planet,
+# i.e. a full 6.5 hour NY session at one-second resolution
+DEFAULT_RING_SIZE = 1 << 16
+
+# Finance offset applied to the calculation time (see facade.get_positions)
+KP_OFFSET_SECONDS = 307
 
-@dataclass
-class CacheEntry:
-    """Single cache entry with timestamp and value"""
 
-    value: Any
-    timestamp: float  # Unix timestamp when cached
-    hit_count: int = 0  # Track popularity for optimization
+def cache_key(timestamp: datetime, apply_offset: bool) -> int:
+    """Integer cache key: UTC second bucket with the offset flag in bit 0."""
+    return (int(timestamp.timestamp()) << 1) | bool(apply_offset)
 
 
 class HFTCache:
     """
-    Thread-safe, high-performance cache for KP calculations.
+    Fixed-size ring of (key, value) slots for one planet.
 
-    Features:
-    - 1-second TTL for planet positions (safe for Moon SL2)
-    - Thread-safe with minimal lock contention
-    - Automatic cleanup of expired entries
-    - Sub-microsecond lookup times
+    Slot ``key % size`` holds the most recent key that mapped there; a
+    lookup is a list index plus one integer compare. Statistics counters
+    are updated without a lock, so they may undercount under heavy thread
+    contention.
     """
 
-    def __init__(self, ttl: float = 1.0, max_size: int = 10000):
+    def __init__(self, size: int = DEFAULT_RING_SIZE):
         """
-        Initialize HFT cache.
+        Initialize ring cache.
 
         Args:
-            ttl: Time-to-live in seconds (default 1.0)
-            max_size: Maximum cache entries before cleanup
+            size: Number of slots (a power of two keeps ``%`` cheap)
         """
-        self.ttl = ttl
-        self.max_size = max_size
-        self._cache: dict[str, CacheEntry] = {}
-        self._lock = threading.RLock()  # Reentrant lock for nested calls
+        if size <= 0:
+            raise ValueError(f"Ring size must be positive, got {size}")
+        self.size = size
+        self._slots: list[tuple[int, Any] | None] = [None] * size
 
         # Statistics
         self._hits = 0
         self._misses = 0
         self._evictions = 0
+        self._filled = 0
 
-        # Start cleanup thread
-        self._cleanup_interval = max(
-            ttl * 10, 10.0
-        )  # Cleanup every 10 TTLs or 10 seconds
-        self._stop_cleanup = threading.Event()
-        self._cleanup_thread = threading.Thread(
-            target=self._cleanup_worker, daemon=True
-        )
-        self._cleanup_thread.start()
-
-    def _make_key(
-        self,
-        timestamp: datetime,
-        planet_id: int,
-        apply_offset: bool,
-        calculation_type: str = "position",
-    ) -> str:
+    def get(self, key: int) -> Any | None:
         """
-        Create cache key from parameters.
-
-        For HFT, we round timestamp to nearest second for Moon calculations
-        since Moon moves only 0.00015°/second.
-        """
-        # Round to nearest second for caching
-        ts_seconds = int(timestamp.timestamp())
-
-        # Create unique key
-        key_parts = [
-            str(ts_seconds),
-            str(planet_id),
-            str(apply_offset),
-            calculation_type,
-        ]
-
-        return "|".join(key_parts)
-
-    def get(
-        self,
-        timestamp: datetime,
-        planet_id: int,
-        apply_offset: bool,
-        calculation_type: str = "position",
-    ) -> Any | None:
-        """
-        Get cached value if available and not expired.
+        Get cached value for an integer key.
 
         Returns:
-            Cached value or None if not found/expired
+            Cached value or None if the slot holds another (or no) key
         """
-        key = self._make_key(timestamp, planet_id, apply_offset, calculation_type)
-
-        with self._lock:
-            entry = self._cache.get(key)
-
-            if entry is None:
-                self._misses += 1
-                return None
-
-            # Check if expired
-            age = time.time() - entry.timestamp
-            if age > self.ttl:
-                # Expired - remove it
-                del self._cache[key]
-                self._misses += 1
-                self._evictions += 1
-                return None
-
-            # Valid hit
+        entry = self._slots[key % self.size]
+        if entry is not None and entry[0] == key:
             self._hits += 1
-            entry.hit_count += 1
-            return entry.value
-
-    def set(
-        self,
-        timestamp: datetime,
-        planet_id: int,
-        apply_offset: bool,
-        value: Any,
-        calculation_type: str = "position",
-    ) -> None:
-        """
-        Store value in cache.
-        """
-        key = self._make_key(timestamp, planet_id, apply_offset, calculation_type)
-
-        with self._lock:
-            # Check size limit
-            if len(self._cache) >= self.max_size:
-                self._cleanup_old_entries()
-
-            self._cache[key] = CacheEntry(value=value, timestamp=time.time())
-
-    def _cleanup_old_entries(self) -> None:
-        """Remove expired entries."""
-        current_time = time.time()
-        expired_keys = []
-
-        with self._lock:
-            for key, entry in self._cache.items():
-                if current_time - entry.timestamp > self.ttl:
-                    expired_keys.append(key)
-
-            for key in expired_keys:
-                del self._cache[key]
-                self._evictions += 1
-
-    def _cleanup_worker(self) -> None:
-        """Background thread for periodic cleanup."""
-        while not self._stop_cleanup.wait(self._cleanup_interval):
-            self._cleanup_old_entries()
+            return entry[1]
+        self._misses += 1
+        return None
+
+    def set(self, key: int, value: Any) -> None:
+        """Store value, overwriting whatever key owned the slot."""
+        i = key % self.size
+        old = self._slots[i]
+        if old is None:
+            self._filled += 1
+        elif old[0] != key:
+            self._evictions += 1
+        self._slots[i] = (key, value)
 
     def clear(self) -> None:
         """Clear all cache entries."""
-        with self._lock:
-            self._cache.clear()
-            self._hits = 0
-            self._misses = 0
-            self._evictions = 0
+        self._slots = [None] * self.size
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._filled = 0
 
     def get_stats(self) -> dict[str, Any]:
         """Get cache statistics."""
@@ -180,61 +98,45 @@ class HFTCache:
             "misses": self._misses,
             "hit_rate": hit_rate,
             "evictions": self._evictions,
-            "size": len(self._cache),
-            "ttl": self.ttl,
-            "max_size": self.max_size,
+            "size": self._filled,
+            "capacity": self.size,
         }
 
     def shutdown(self) -> None:
-        """Shutdown cleanup thread."""
-        self._stop_cleanup.set()
-        self._cleanup_thread.join(timeout=1.0)
+        """Kept for API compatibility; the ring owns no thread."""
 
 
 class PlanetPositionCache:
     """
-    Specialized cache for planet positions with automatic KP lord calculation.
+    Per-planet rings of PlanetData keyed by (second bucket, offset flag).
     Optimized for Moon tracking in HFT scenarios.
     """
 
-    def __init__(self, ttl_seconds: dict[int, float] = None):
+    def __init__(self, ring_size: int = DEFAULT_RING_SIZE):
         """
-        Initialize with per-planet TTL settings.
+        Initialize with an empty ring set; rings are allocated per planet on
+        first store so an idle planet costs nothing.
 
         Args:
-            ttl_seconds: Dict mapping planet_id to TTL in seconds
-                        Defaults to optimized values for each planet
+            ring_size: Slots per planet ring
         """
-        if ttl_seconds is None:
-            # Optimized TTLs based on planet speeds
-            ttl_seconds = {
-                1: 60.0,  # Sun: moves ~1°/day, safe for 60s
-                2: 1.0,  # Moon: moves ~13°/day, cache for 1s
-                3: 300.0,  # Jupiter: slow, cache for 5 min
-                4: 10.0,  # Rahu: moderate, cache for 10s
-                5: 30.0,  # Mercury: variable, cache for 30s
-                6: 30.0,  # Venus: moderate, cache for 30s
-                7: 10.0,  # Ketu: same as Rahu
-                8: 300.0,  # Saturn: slow, cache for 5 min
-                9: 60.0,  # Mars: moderate, cache for 60s
-            }
-
-        self.ttl_seconds = ttl_seconds
-        self._caches = {
-            planet_id: HFTCache(ttl=ttl, max_size=1000)
-            for planet_id, ttl in ttl_seconds.items()
-        }
+        self.ring_size = ring_size
+        self._caches: dict[int, HFTCache] = {}
+
+    def _ring(self, planet_id: int) -> HFTCache:
+        ring = self._caches.get(planet_id)
+        if ring is None:
+            ring = self._caches.setdefault(planet_id, HFTCache(self.ring_size))
+        return ring
 
     def get_position(
         self, timestamp: datetime, planet_id: int, apply_offset: bool
     ) -> Any | None:
         """Get cached planet position."""
-        if planet_id not in self._caches:
+        ring = self._caches.get(planet_id)
+        if ring is None:
             return None
-
-        return self._caches[planet_id].get(
-            timestamp, planet_id, apply_offset, "position"
-        )
+        return ring.get(cache_key(timestamp, apply_offset))
 
     def set_position(
         self,
@@ -244,13 +146,64 @@ class PlanetPositionCache:
         position_data: Any,
     ) -> None:
         """Cache planet position."""
-        if planet_id not in self._caches:
-            # Create cache with default TTL
-            self._caches[planet_id] = HFTCache(ttl=1.0, max_size=1000)
+        self._ring(planet_id).set(cache_key(timestamp, apply_offset), position_data)
 
-        self._caches[planet_id].set(
-            timestamp, planet_id, apply_offset, position_data, "position"
-        )
+    def prefill(
+        self,
+        start_time: datetime,
+        end_time: datetime,
+        planet_id: int = 2,
+        apply_offsets: tuple[bool, ...] = (True, False),
+    ) -> int:
+        """
+        Fill every whole second in [start_time, end_time] for each offset flag.
+
+        Positions for the whole range come from one batched ephemeris sweep
+        per flag (swe_backend.get_planet_series) instead of one
+        get_positions call per entry; PlanetData is assembled with the same
+        helper get_positions uses, so cached values are identical.
+
+        Args:
+            start_time: Start of range (UTC)
+            end_time: End of range (UTC, inclusive)
+            planet_id: Planet to cache (default Moon)
+            apply_offsets: Offset flags to fill
+
+        Returns:
+            Number of entries cached
+        """
+        from .facade import build_planet_data
+        from .swe_backend import get_planet_series
+        from .time_utils import datetime_to_julian_day
+
+        first = int(start_time.timestamp())
+        last = int(end_time.timestamp())
+        if last < first:
+            return 0
+
+        stamps = [
+            datetime.fromtimestamp(s, UTC) for s in range(first, last + 1)
+        ]
+        ring = self._ring(planet_id)
+        count = 0
+        for flag in apply_offsets:
+            shift = timedelta(seconds=KP_OFFSET_SECONDS if flag else 0)
+            jd = np.array([datetime_to_julian_day(ts + shift) for ts in stamps])
+            lons, speeds, lats, dists = get_planet_series(
+                jd, [planet_id], with_latitude=True, with_distance=True
+            )[planet_id]
+            columns = zip(lons.tolist(), lats.tolist(), dists.tolist(), speeds.tolist())
+            for ts, (lon, lat, dist, speed) in zip(stamps, columns):
+                pos = {
+                    "longitude": lon,
+                    "latitude": lat,
+                    "distance": dist,
+                    "speed_lon": speed,
+                }
+                ring.set(cache_key(ts, flag), build_planet_data(ts, planet_id, flag, pos))
+            count += len(stamps)
+
+        return count
 
     def get_all_stats(self) -> dict[int, dict[str, Any]]:
         """Get statistics for all planet caches."""
@@ -264,9 +217,7 @@ class PlanetPositionCache:
             cache.clear()
 
     def shutdown(self) -> None:
-        """Shutdown all cache cleanup threads."""
-        for cache in self._caches.values():
-            cache.shutdown()
+        """Kept for API compatibility; no cleanup threads to stop."""
 
 
 # Global cache instance for HFT
@@ -285,7 +236,7 @@ def warmup_cache(
     start_time: datetime,
     end_time: datetime,
     planet_id: int = 2,
-    interval_seconds: int = 60,
+    interval_seconds: int = 1,
 ) -> int:
     """
     Pre-warm cache with calculations for a time range.
@@ -294,24 +245,27 @@ def warmup_cache(
         start_time: Start of range
         end_time: End of range
         planet_id: Planet to calculate (default Moon)
-        interval_seconds: Calculation interval
+        interval_seconds: Calculation interval; 1 uses the batched prefill
 
     Returns:
         Number of entries cached
     """
+    cache = get_hft_cache()
+    if interval_seconds == 1:
+        return cache.prefill(start_time, end_time, planet_id)
+
     from refactor.facade import get_positions
 
-    cache = get_hft_cache()
     count = 0
     current = start_time
 
     while current <= end_time:
         # Calculate with offset
-        pos = get_positions(current, planet_id, apply_kp_offset=True)
+        pos = get_positions(current, planet_id, apply_kp_offset=True, use_hft_cache=False)
         cache.set_position(current, planet_id, True, pos)
 
         # Calculate without offset
-        pos = get_positions(current, planet_id, apply_kp_offset=False)
+        pos = get_positions(current, planet_id, apply_kp_offset=False, use_hft_cache=False)
         cache.set_position(current, planet_id, False, pos)
 
         count += 2
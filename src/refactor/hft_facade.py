@@ -34,7 +34,7 @@ def get_positions_hft(
     timestamp_utc: datetime, planet_id: int = 2, apply_kp_offset: bool = True
 ) -> PlanetData:
     """
-    HFT-optimized version of get_positions with 1-second caching.
+    HFT-optimized version of get_positions with per-second ring caching.
 
     This function wraps the original get_positions with intelligent caching
     that's safe for HFT operations. Moon SL2 won't change within 1 second.
@@ -187,8 +187,8 @@ def preload_trading_day(
     start_utc = start_ny.astimezone(UTC)
     end_utc = end_ny.astimezone(UTC)
 
-    # Preload with 60-second intervals (more than enough for SL2)
-    return warmup_cache(start_utc, end_utc, planet_id=2, interval_seconds=60)
+    # Every second of the session, both offset flags, from one batched sweep
+    return warmup_cache(start_utc, end_utc, planet_id=2, interval_seconds=1)
 
 
 def get_all_sl2_changes_for_day(
@@ -259,7 +259,7 @@ def print_cache_stats():
             print(f"  Misses: {stats['misses']:,}")
             print(f"  Hit Rate: {stats['hit_rate']:.1%}")
             print(f"  Cache Size: {stats['size']}")
-            print(f"  TTL: {stats['ttl']}s")
+            print(f"  Capacity: {stats['capacity']} (evictions: {stats['evictions']:,})")
 
     # Performance metrics
     metrics = monitor.get_metrics()
@@ -289,7 +289,7 @@ def clear_cache():
 
 
 def shutdown_cache():
-    """Shutdown cache cleanup threads."""
+    """Shutdown the cache (no-op for the ring cache, kept for callers)."""
     cache = get_hft_cache()
     cache.shutdown()
     print("Cache shutdown complete.")
@@ -0,0 +1,305 @@
+"""
+Precomputed Placidus cusp grid indexed by ARMC and latitude.
+
+Tropical Placidus cusps depend only on ARMC (sidereal time + longitude),
+geographic latitude and the obliquity of the ecliptic. This module tabulates
+all 12 cusps over an (ARMC, latitude) grid for two obliquity planes and
+answers cusp queries by arithmetic:
+
+- bicubic (Catmull-Rom) interpolation over ARMC and latitude, on angle
+  differences so the 360° wrap never splits a stencil
+- linear interpolation between the two obliquity planes (obliquity moves
+  ~0.013° per century, the planes are 0.04° apart)
+- exact Swiss Ephemeris fallback outside the table's latitude band, where
+  Placidus cusps bend sharply towards the polar circles
+
+With the default 0.5° grid and ±56° band the interpolation error stays
+below 1 arcsecond (float32 storage limits it to ~0.1" at best).
+
+The grid is a float32 .npy file opened memory-mapped, so worker processes
+share one page-cache copy. It is built on first use (about 2 s) or ahead of
+time with ``python -m refactor.house_grid``; the file name encodes the grid
+parameters so a changed configuration never reads a stale table.
+
+The per-instant sky terms (apparent sidereal time, true obliquity,
+ayanamsa) are interpolated from cached hourly Swiss Ephemeris values, so a
+query costs no ephemeris call once its hour has been seen.
+"""
+
+from __future__ import annotations
+
+import logging
+import math
+import os
+import threading
+
+from functools import lru_cache
+from pathlib import Path
+
+import numpy as np
+import swisseph as swe
+
+from numba import njit
+
+from .swe_backend import _swe_lock
+
+__all__ = [
+    "PlacidusGrid",
+    "build_grid",
+    "get_grid",
+    "placidus_cusps",
+    "placidus_cusps_at",
+    "sky_terms",
+]
+
+logger = logging.getLogger(__name__)
+
+HOUSE_GRID_ENABLED = os.getenv("HOUSE_GRID_ENABLED", "true").lower() == "true"
+HOUSE_GRID_DIR = os.getenv("HOUSE_GRID_DIR", "data/house_grid")
+HOUSE_GRID_STEP = float(os.getenv("HOUSE_GRID_STEP", "0.5"))  # degrees, ARMC and latitude
+HOUSE_GRID_MAX_LAT = float(os.getenv("HOUSE_GRID_MAX_LAT", "56.0"))
+
+GRID_VERSION = 1
+EPS_REF = 23.44  # obliquity of plane 0 (degrees)
+EPS_DELTA = -0.04  # plane 1 = EPS_REF + EPS_DELTA
+_STENCIL_PAD = 2  # extra latitude rows on each side for the cubic stencil
+
+
+# ---------------------------------------------------------------------------
+# Interpolation kernel
+# ---------------------------------------------------------------------------
+
+
+@njit(cache=True)
+def _wrap180(x: float) -> float:
+    # Inputs are differences of two angles in [0, 360): one step suffices
+    if x > 180.0:
+        return x - 360.0
+    if x < -180.0:
+        return x + 360.0
+    return x
+
+
+@njit(cache=True)
+def _catmull_rom_weights(t: float, w: np.ndarray) -> None:
+    t2 = t * t
+    t3 = t2 * t
+    w[0] = 0.5 * (-t + 2.0 * t2 - t3)
+    w[1] = 0.5 * (2.0 - 5.0 * t2 + 3.0 * t3)
+    w[2] = 0.5 * (t + 4.0 * t2 - 3.0 * t3)
+    w[3] = 0.5 * (-t2 + t3)
+
+
+@njit(cache=True)
+def _interp_cusps(table, step, lat0, eps_weight, armc, lat, out):
+    """Tropical cusps for each (armc[n], lat[n]) into out[n, 0:12].
+
+    Bicubic over the 4x4 stencil around the query on both obliquity planes,
+    on differences from the stencil's base corner, then linear in obliquity.
+    """
+    na = table.shape[2]
+    wx = np.empty(4)
+    wy = np.empty(4)
+    acc = np.empty((2, 12))
+    for n in range(armc.shape[0]):
+        x = (armc[n] % 360.0) / step
+        j = int(math.floor(x))
+        _catmull_rom_weights(x - j, wx)
+        y = (lat[n] - lat0) / step
+        i = int(math.floor(y))
+        _catmull_rom_weights(y - i, wy)
+        for plane in range(2):
+            for k in range(12):
+                acc[plane, k] = 0.0
+            for a in range(4):
+                r = i - 1 + a
+                for b in range(4):
+                    c = (j - 1 + b) % na
+                    w = wy[a] * wx[b]
+                    for k in range(12):
+                        acc[plane, k] += w * _wrap180(table[plane, r, c, k] - table[plane, i, j % na, k])
+        for k in range(12):
+            c0 = table[0, i, j % na, k] + acc[0, k]
+            c1 = table[1, i, j % na, k] + acc[1, k]
+            out[n, k] = (c0 + eps_weight[n] * _wrap180(c1 - c0)) % 360.0
+
+
+@njit(cache=True)
+def _interp_cusps_one(table, step, lat0, eps_weight, armc, lat):
+    """Scalar entry point (cheaper dispatch than building 1-element arrays)."""
+    out = np.empty((1, 12))
+    _interp_cusps(
+        table, step, lat0, np.full(1, eps_weight), np.full(1, armc), np.full(1, lat), out
+    )
+    return out[0]
+
+
+# ---------------------------------------------------------------------------
+# Grid file
+# ---------------------------------------------------------------------------
+
+
+class PlacidusGrid:
+    """Memory-mapped tropical Placidus cusps, shape (2, n_lat, n_armc, 12)."""
+
+    def __init__(self, table: np.ndarray, step: float, max_lat: float) -> None:
+        self.table = table
+        self.step = step
+        self.max_lat = max_lat
+        self.lat0 = -(max_lat + _STENCIL_PAD * step)
+
+    def covers(self, lat: float) -> bool:
+        return -self.max_lat <= lat <= self.max_lat
+
+    def tropical_cusps(self, armc: np.ndarray, lat: np.ndarray, eps: np.ndarray) -> np.ndarray:
+        """Interpolated tropical cusps (n, 12); every lat must be covered."""
+        armc = np.ascontiguousarray(armc, dtype=np.float64)
+        lat = np.ascontiguousarray(lat, dtype=np.float64)
+        weight = (np.ascontiguousarray(eps, dtype=np.float64) - EPS_REF) / EPS_DELTA
+        out = np.empty((armc.shape[0], 12), dtype=np.float64)
+        _interp_cusps(self.table, self.step, self.lat0, weight, armc, lat, out)
+        return out
+
+
+def grid_path(directory: str | Path = HOUSE_GRID_DIR, step: float = HOUSE_GRID_STEP,
+              max_lat: float = HOUSE_GRID_MAX_LAT) -> Path:
+    name = f"placidus_s{step:g}_lat{max_lat:g}_eps{EPS_REF:g}{EPS_DELTA:+g}_v{GRID_VERSION}.npy"
+    return Path(directory) / name
+
+
+def build_grid(path: str | Path, step: float = HOUSE_GRID_STEP,
+               max_lat: float = HOUSE_GRID_MAX_LAT) -> Path:
+    """Tabulate the grid with swe.houses_armc and write it atomically to path."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    n_armc = int(round(360.0 / step))
+    lats = -(max_lat + _STENCIL_PAD * step) + step * np.arange(
+        int(round(2 * (max_lat + _STENCIL_PAD * step) / step)) + 1
+    )
+    tmp = path.with_suffix(f".{os.getpid()}.tmp")
+    table = np.lib.format.open_memmap(
+        tmp, mode="w+", dtype=np.float32, shape=(2, lats.size, n_armc, 12)
+    )
+    armcs = step * np.arange(n_armc)
+    for plane, eps in enumerate((EPS_REF, EPS_REF + EPS_DELTA)):
+        for i, lat in enumerate(lats):
+            # One lock per latitude row keeps other ephemeris users responsive
+            with _swe_lock:
+                for j, armc in enumerate(armcs):
+                    cusps, _ = swe.houses_armc(float(armc), float(lat), eps, b"P")
+                    table[plane, i, j] = cusps[:12]
+    table.flush()
+    del table
+    os.replace(tmp, path)
+    logger.info(f"Built Placidus grid {path} ({lats.size}x{n_armc}, step {step}°)")
+    return path
+
+
+def load_grid(path: str | Path, step: float, max_lat: float) -> PlacidusGrid:
+    table = np.load(path, mmap_mode="r")
+    # Plain ndarray view over the same mapping (numba does not take memmap)
+    return PlacidusGrid(np.asarray(table), step, max_lat)
+
+
+_grid: PlacidusGrid | None = None
+_grid_failed = False
+_grid_lock = threading.Lock()
+
+
+def get_grid() -> PlacidusGrid | None:
+    """The process-wide grid, loading or building it on first use.
+
+    Returns None when disabled (HOUSE_GRID_ENABLED=false) or when the grid
+    cannot be built; callers then compute cusps exactly.
+    """
+    global _grid, _grid_failed
+    if _grid is not None or _grid_failed or not HOUSE_GRID_ENABLED:
+        return _grid
+    with _grid_lock:
+        if _grid is None and not _grid_failed:
+            path = grid_path()
+            try:
+                if not path.exists():
+                    build_grid(path)
+                _grid = load_grid(path, HOUSE_GRID_STEP, HOUSE_GRID_MAX_LAT)
+            except Exception as e:
+                _grid_failed = True
+                logger.warning(f"Placidus grid unavailable, using exact houses: {e}")
+    return _grid
+
+
+# ---------------------------------------------------------------------------
+# Queries
+# ---------------------------------------------------------------------------
+
+
+# Sky terms vary smoothly: tabulate them at hourly knots and interpolate.
+# Sidereal time is interpolated as a residual from the mean sidereal rate;
+# the residual (equation of the equinoxes, precession terms) and the other
+# terms change by well under 0.01" within an hour.
+_SKY_KNOT_DAYS = 1.0 / 24.0
+_J2000 = 2451545.0
+_SIDEREAL_RATE = 360.98564736629  # degrees of ARMC per day
+
+
+@lru_cache(maxsize=8192)
+def _sky_knot(k: int) -> tuple[float, float, float]:
+    jd = _J2000 + k * _SKY_KNOT_DAYS
+    with _swe_lock:
+        armc0 = swe.sidtime(jd) * 15.0
+        eps = swe.calc_ut(jd, swe.ECL_NUT)[0][0]
+        ayanamsa = swe.get_ayanamsa_ut(jd)
+    residual = (armc0 - _SIDEREAL_RATE * (k * _SKY_KNOT_DAYS)) % 360.0
+    return residual, eps, ayanamsa
+
+
+def sky_terms(jd_ut: float) -> tuple[float, float, float]:
+    """(Greenwich ARMC, true obliquity, ayanamsa) in degrees for a Julian Day."""
+    x = (jd_ut - _J2000) / _SKY_KNOT_DAYS
+    k = math.floor(x)
+    f = x - k
+    r0, e0, a0 = _sky_knot(k)
+    r1, e1, a1 = _sky_knot(k + 1)
+    dr = (r1 - r0 + 180.0) % 360.0 - 180.0
+    armc0 = (r0 + f * dr + _SIDEREAL_RATE * (jd_ut - _J2000)) % 360.0
+    return armc0, e0 + f * (e1 - e0), a0 + f * (a1 - a0)
+
+
+def placidus_cusps(jd_ut: float, lats, lons) -> tuple[np.ndarray, np.ndarray] | None:
+    """Sidereal Placidus cusps (n, 12) for many places at one instant.
+
+    Returns (cusps, covered) where rows with covered=False are NaN and must
+    be computed exactly, or None when no grid is available.
+    """
+    grid = get_grid()
+    if grid is None:
+        return None
+    lats = np.asarray(lats, dtype=np.float64).reshape(-1)
+    lons = np.asarray(lons, dtype=np.float64).reshape(-1)
+    armc0, eps, ayanamsa = sky_terms(float(jd_ut))
+    covered = np.abs(lats) <= grid.max_lat
+    cusps = np.full((lats.size, 12), np.nan)
+    if covered.any():
+        rows = grid.tropical_cusps(
+            (armc0 + lons[covered]) % 360.0, lats[covered], np.full(int(covered.sum()), eps)
+        )
+        cusps[covered] = (rows - ayanamsa) % 360.0
+    return cusps, covered
+
+
+def placidus_cusps_at(jd_ut: float, lat: float, lon: float) -> list[float] | None:
+    """Sidereal Placidus cusps for one place, or None if the grid does not cover it."""
+    grid = get_grid()
+    if grid is None or not grid.covers(lat):
+        return None
+    armc0, eps, ayanamsa = sky_terms(float(jd_ut))
+    cusps = _interp_cusps_one(
+        grid.table, grid.step, grid.lat0, (eps - EPS_REF) / EPS_DELTA, armc0 + lon, float(lat)
+    )
+    return [(c - ayanamsa) % 360.0 for c in cusps.tolist()]
+
+
+if __name__ == "__main__":  # pragma: no cover - build step
+    target = grid_path()
+    build_grid(target)
+    print(target)
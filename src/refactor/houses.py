@@ -10,7 +10,11 @@ from zoneinfo import ZoneInfo
 
 import swisseph as swe
 
+from shared.otel import timed_stage
+
+from . import house_grid
 from .house_config import ensure_config_initialized, is_topocentric_enabled
+from .swe_backend import _swe_lock
 
 # NOTE: sidereal mode (Krishnamurti) should already be set once at process start
 # e.g., in refactor/swe_backend.py: swe.set_sid_mode(swe.SIDM_KRISHNAMURTI, 0, 0)
@@ -41,18 +45,35 @@ def _norm360(x: float) -> float:
 
 def _placidus(ts_utc: datetime, lat: float, lon: float) -> Houses:
     """
-    Placidus houses using Swiss Ephemeris.
+    Placidus houses, sidereal (KP ayanamsa).
+    - Inside the precomputed grid's latitude band, cusps are interpolated from
+      the ARMC/latitude table (refactor.house_grid); elsewhere Swiss Ephemeris
+      computes them exactly.
     - Geocentric by default.
-    - Topocentric support (optional) can be enabled at startup with swe.set_topo(lon, lat, elev).
     - Raises ValueError for latitudes where Placidus is undefined (beyond Arctic/Antarctic circles)
+    """
+    jd = _julday(ts_utc)
+    cusps = house_grid.placidus_cusps_at(jd, lat, lon)
+    if cusps is not None:
+        # Placidus: cusp 1 is the Ascendant, cusp 10 the MC
+        return Houses(system="PLACIDUS", asc=cusps[0], mc=cusps[9], cusps=cusps)
+    return _placidus_exact(jd, lat, lon)
+
+
+def _placidus_exact(jd: float, lat: float, lon: float) -> Houses:
+    """
+    Placidus houses using Swiss Ephemeris (under the ephemeris lock).
+    - Topocentric support (optional) can be enabled at startup with swe.set_topo(lon, lat, elev).
     - Applies sidereal correction as Swiss Ephemeris houses() returns tropical values
     """
     # Check for polar latitudes where Placidus may be undefined
     if abs(lat) > 66.5:
         # Try calculation, but prepare for potential failure
         try:
-            jd = _julday(ts_utc)
-            cusps, ascmc = swe.houses_ex(jd, lat, lon, b"P")
+            with _swe_lock:
+                cusps, ascmc = swe.houses_ex(jd, lat, lon, b"P")
+                # Get ayanamsa for sidereal correction (Swiss Ephemeris houses returns tropical)
+                ayanamsa = swe.get_ayanamsa_ut(jd)
 
             # Check if Swiss Ephemeris returned valid values
             if cusps is None or ascmc is None or any(math.isnan(c) for c in cusps):
@@ -62,9 +83,6 @@ def _placidus(ts_utc: datetime, lat: float, lon: float) -> Houses:
                     f"Consider using Equal or Porphyry house system for polar regions."
                 )
 
-            # Get ayanamsa for sidereal correction (Swiss Ephemeris houses returns tropical)
-            ayanamsa = swe.get_ayanamsa_ut(jd)
-
             # Apply sidereal correction
             asc = _norm360(ascmc[0] - ayanamsa)
             mc = _norm360(ascmc[1] - ayanamsa)
@@ -79,11 +97,10 @@ def _placidus(ts_utc: datetime, lat: float, lon: float) -> Houses:
             )
 
     # Normal calculation for non-polar latitudes
-    jd = _julday(ts_utc)
-    cusps, ascmc = swe.houses_ex(jd, lat, lon, b"P")
-
-    # Get ayanamsa for sidereal correction (Swiss Ephemeris houses returns tropical)
-    ayanamsa = swe.get_ayanamsa_ut(jd)
+    with _swe_lock:
+        cusps, ascmc = swe.houses_ex(jd, lat, lon, b"P")
+        # Get ayanamsa for sidereal correction (Swiss Ephemeris houses returns tropical)
+        ayanamsa = swe.get_ayanamsa_ut(jd)
 
     # Apply sidereal correction
     asc = _norm360(ascmc[0] - ayanamsa)
@@ -111,6 +128,7 @@ def _sripati_from_placidus(plac_cusps: list[float]) -> list[float]:
     return out
 
 
+@timed_stage("houses")
 def compute_houses(
     ts_utc: datetime,
     lat: float,
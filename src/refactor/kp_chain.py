@@ -7,10 +7,13 @@ Minimal, dependency-free implementation to avoid cross-repo imports.
 
 from __future__ import annotations
 
+from functools import lru_cache
 from typing import Tuple
 
 import numpy as np
 
+from shared.otel import timed_stage
+
 from .angles_indices import nakshatra_number
 from .constants import (
     LORD_ARRAY,
@@ -61,6 +64,7 @@ def _chain_for_fraction(start_lord_idx: int, frac: float) -> Tuple[int, int, int
     return nl, sl, ssl
 
 
+@timed_stage("kp_chain")
 def kp_chain_for_longitude(longitude: float, levels: int = 3) -> Tuple[int, ...]:
     """Return KP chain for a longitude as planet IDs (1-9).
 
@@ -90,6 +94,58 @@ def get_kp_lords_for_planet(longitude: float) -> Tuple[int, int, int]:
     return int(chain[0]), int(chain[1]) if len(chain) > 1 else 0, int(chain[2]) if len(chain) > 2 else 0
 
 
+@lru_cache(maxsize=1)
+def kp_boundary_table() -> Tuple[np.ndarray, np.ndarray]:
+    """Start longitude and (NL, SL, SSL) of every sub-sub-lord segment.
+
+    The zodiac splits into 27 * 9 * 9 = 2187 segments with a constant KP
+    chain, so the next chain change for any longitude is a searchsorted away.
+
+    Returns:
+        (starts, lords): sorted float64 start longitudes in [0, 360) and an
+        int8 array of shape (2187, 3) with the chain valid from each start
+    """
+    starts = []
+    lords = []
+    for nak in range(27):
+        start_idx = nak % 9
+        nl = int(LORD_ARRAY[start_idx])
+        sub_start = nak * NAKSHATRA_SPAN
+        for p1, sl in zip(_rotate(VIMSHOTTARI_PROP, start_idx), _rotate(LORD_ARRAY, start_idx)):
+            start2 = LORD_INDEX[int(sl)]
+            ssl_start = sub_start
+            for p2, ssl in zip(_rotate(VIMSHOTTARI_PROP, start2), _rotate(LORD_ARRAY, start2)):
+                starts.append(ssl_start)
+                lords.append((nl, int(sl), int(ssl)))
+                ssl_start += p1 * p2 * NAKSHATRA_SPAN
+            sub_start += p1 * NAKSHATRA_SPAN
+
+    starts_arr = np.array(starts, dtype=np.float64)
+    lords_arr = np.array(lords, dtype=np.int8)
+    starts_arr.setflags(write=False)
+    lords_arr.setflags(write=False)
+    return starts_arr, lords_arr
+
+
+def next_kp_boundary(
+    longitude: float,
+) -> Tuple[float, Tuple[int, int, int], Tuple[int, int, int]]:
+    """Next KP chain boundary ahead of a longitude (direct motion).
+
+    Returns:
+        (boundary, chain_before, chain_after) where boundary is expressed on
+        the same unwrapped scale as ``longitude`` (may exceed 360)
+    """
+    starts, lords = kp_boundary_table()
+    base = float(longitude) - (float(longitude) % 360.0)
+    lon = float(longitude) % 360.0
+    idx = int(np.searchsorted(starts, lon, side="right"))
+    before = tuple(int(x) for x in lords[idx - 1])
+    if idx >= len(starts):
+        return base + 360.0, before, tuple(int(x) for x in lords[0])
+    return base + float(starts[idx]), before, tuple(int(x) for x in lords[idx])
+
+
 def warmup_kp_calculations() -> None:  # pragma: no cover - trivial
     """Warmup placeholder: precomputes nothing but validates functions are importable."""
     _ = kp_chain_for_longitude(0.0, levels=3)
@@ -22,15 +22,17 @@ import math
 
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
+from typing import TYPE_CHECKING
 
 from numba import njit
 
-import swisseph as swe
-
 from .constants import NAKSHATRA_NAMES
-from .swe_backend import get_planet_position_full
+from .swe_backend import get_planet_position_full, set_ephemeris_path
 from .time_utils import validate_utc_datetime
 
+if TYPE_CHECKING:
+    from .moon_series import MoonFactorSeries
+
 # Planet IDs
 MOON_ID = 2
 SUN_ID = 1
@@ -414,12 +416,14 @@ def calculate_dignity_score(longitude: float, speed: float) -> float:
 class MoonFactorsCalculator:
     """Calculator for comprehensive moon factors."""
 
-    def __init__(self, ephe_path: str = "./swisseph/ephe"):
-        """Initialize calculator with ephemeris path."""
-        # Set ephemeris path
-        swe.set_ephe_path(ephe_path)
-        # Set KP ayanamsa
-        swe.set_sid_mode(KP_AYANAMSA_ID, 0, 0)
+    def __init__(self, ephe_path: str | None = None):
+        """Initialize calculator, optionally overriding the ephemeris path.
+
+        The KP ayanamsa is configured once by swe_backend at import; it is
+        not re-set per instance.
+        """
+        if ephe_path:
+            set_ephemeris_path(ephe_path)
         self._cache = {}
 
     def calculate(self, ts_utc: datetime) -> MoonFactors:
@@ -543,56 +547,48 @@ class MoonFactorsCalculator:
 
         return result
 
+    def calculate_series(
+        self, start_utc: datetime, end_utc: datetime, step_minutes: int = 1
+    ) -> "MoonFactorSeries":
+        """
+        Calculate moon factors over an evenly spaced time grid.
+
+        Args:
+            start_utc: Start time (UTC)
+            end_utc: End time (UTC, inclusive)
+            step_minutes: Grid spacing in minutes
+
+        Returns:
+            MoonFactorSeries with NumPy arrays for every factor
+        """
+        from .moon_series import compute_moon_factor_series, jd_grid
+
+        grid = jd_grid(start_utc, end_utc, timedelta(minutes=step_minutes))
+        return compute_moon_factor_series(grid)
+
     def find_tithi_changes(
         self, start_utc: datetime, end_utc: datetime, step_minutes: int = 5
     ) -> list[dict]:
         """
         Find all tithi changes in a time range.
 
+        Change times are solved exactly on the Moon-Sun elongation.
+
         Args:
             start_utc: Start time (UTC)
             end_utc: End time (UTC)
-            step_minutes: Scan step size in minutes
+            step_minutes: Unused; kept for signature compatibility
 
         Returns:
             List of tithi change events
         """
-        changes = []
-        current = start_utc
-        prev_tithi = None
-
-        while current <= end_utc:
-            factors = self.calculate(current)
-
-            if prev_tithi is not None and factors.tithi_num != prev_tithi:
-                # Refine the exact moment
-                left = current - timedelta(minutes=step_minutes)
-                right = current
-
-                # Binary search for exact moment
-                while (right - left).total_seconds() > 1:
-                    mid = left + (right - left) / 2
-                    mid_factors = self.calculate(mid)
-
-                    if mid_factors.tithi_num == prev_tithi:
-                        left = mid
-                    else:
-                        right = mid
-
-                changes.append(
-                    {
-                        "timestamp": right.isoformat(),
-                        "type": "tithi_change",
-                        "from": TITHI_NAMES[prev_tithi - 1],
-                        "to": factors.tithi,
-                        "longitude": factors.longitude,
-                    }
-                )
-
-            prev_tithi = factors.tithi_num
-            current += timedelta(minutes=step_minutes)
-
-        return changes
+        from .moon_series import find_panchanga_changes
+
+        return find_panchanga_changes(
+            validate_utc_datetime(start_utc),
+            validate_utc_datetime(end_utc),
+            elements=("tithi",),
+        )
 
     def find_phase_events(self, start_utc: datetime, end_utc: datetime) -> list[dict]:
         """
@@ -605,70 +601,11 @@ class MoonFactorsCalculator:
         Returns:
             List of phase events
         """
-        events = []
-        current = start_utc
-
-        # Target phase angles
-        phase_targets = {
-            0: "New Moon",
-            90: "First Quarter",
-            180: "Full Moon",
-            270: "Last Quarter",
-        }
+        from .moon_series import find_phase_events
 
-        # Scan for each phase
-        for target_angle, phase_name in phase_targets.items():
-            current = start_utc
-
-            while current <= end_utc:
-                factors = self.calculate(current)
-
-                # Check if close to target
-                angle_diff = abs(factors.phase_angle - target_angle)
-                if angle_diff > 180:
-                    angle_diff = 360 - angle_diff
-
-                if angle_diff < 1.0:
-                    # Refine with bisection
-                    left = current - timedelta(hours=1)
-                    right = current + timedelta(hours=1)
-
-                    while (right - left).total_seconds() > 60:
-                        mid = left + (right - left) / 2
-                        mid_factors = self.calculate(mid)
-
-                        mid_diff = abs(mid_factors.phase_angle - target_angle)
-                        if mid_diff > 180:
-                            mid_diff = 360 - mid_diff
-
-                        left_factors = self.calculate(left)
-                        left_diff = abs(left_factors.phase_angle - target_angle)
-                        if left_diff > 180:
-                            left_diff = 360 - left_diff
-
-                        if mid_diff < left_diff:
-                            right = mid
-                        else:
-                            left = mid
-
-                    events.append(
-                        {
-                            "timestamp": left.isoformat(),
-                            "type": "lunar_phase",
-                            "phase": phase_name,
-                            "angle": target_angle,
-                            "illumination": self.calculate(left).illumination,
-                        }
-                    )
-
-                    # Skip ahead to avoid duplicate detection
-                    current += timedelta(days=5)
-                else:
-                    current += timedelta(hours=6)
-
-        # Sort by timestamp
-        events.sort(key=lambda x: x["timestamp"])
-        return events
+        return find_phase_events(
+            validate_utc_datetime(start_utc), validate_utc_datetime(end_utc)
+        )
 
 
 # Public API
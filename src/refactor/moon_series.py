@@ -0,0 +1,427 @@
+#!/usr/bin/env python3
+"""
+Moon Factor Series - Vectorized lunar factors over a time grid
+
+Time-series counterpart of MoonFactorsCalculator. Sun and Moon longitudes
+and speeds are fetched for the whole grid in one ephemeris batch and every
+factor (tithi, yoga, karana, phase, illumination, gandanta, dignity) is
+computed as a NumPy array.
+
+Panchanga change times are solved exactly: elongation (Moon - Sun) and the
+yoga sum (Moon + Sun) both increase monotonically, so each boundary is
+bracketed on a coarse grid and refined with safeguarded Newton iterations
+using the ephemeris speeds as derivatives.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+
+from .moon_factors import (
+    MOON_DEBILITATION,
+    MOON_EXALTATION,
+    MOON_ID,
+    SUN_ID,
+    TITHI_NAMES,
+    YOGA_NAMES,
+    get_karana_name,
+)
+from .swe_backend import get_planet_series
+from .time_utils import datetime_to_julian_day, ensure_utc
+
+# Julian Day of the Unix epoch (UT)
+_JD_UNIX_EPOCH = 2440587.5
+_UNIX_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+# Angular widths of the Panchanga divisions (degrees)
+TITHI_SPAN = 12.0
+KARANA_SPAN = 6.0
+YOGA_SPAN = 360.0 / 27.0
+PHASE_SPAN = 90.0
+
+# Coarse bracketing step for root finding; elongation moves 11-15°/day and
+# must advance < 180° per step for unwrapping to stay unambiguous
+DEFAULT_SCAN_STEP_DAYS = 0.5
+
+# Newton refinement tolerance (~1 ms)
+ROOT_TOLERANCE_DAYS = 1e-8
+MAX_ROOT_ITERATIONS = 12
+
+PHASE_EVENT_NAMES = {
+    0: "New Moon",
+    1: "First Quarter",
+    2: "Full Moon",
+    3: "Last Quarter",
+}
+
+
+@dataclass(frozen=True)
+class MoonFactorSeries:
+    """Moon factors over a time grid, one array element per sample"""
+
+    jd: np.ndarray  # Julian Day (UT)
+
+    moon_longitude: np.ndarray
+    moon_speed: np.ndarray
+    sun_longitude: np.ndarray
+    sun_speed: np.ndarray
+
+    sign_num: np.ndarray  # 0-based, as MoonFactors.sign_num
+    nakshatra_num: np.ndarray  # 1-based
+    pada: np.ndarray  # 1-4
+
+    tithi_num: np.ndarray  # 1-based
+    tithi_percent: np.ndarray
+    yoga_num: np.ndarray  # 1-based
+    yoga_percent: np.ndarray
+    karana_num: np.ndarray  # 0-59
+
+    phase_angle: np.ndarray
+    illumination: np.ndarray
+    is_waxing: np.ndarray
+
+    is_exalted: np.ndarray
+    is_debilitated: np.ndarray
+    is_own_sign: np.ndarray
+    dignity_score: np.ndarray
+
+    is_gandanta: np.ndarray
+    is_sandhi: np.ndarray
+    is_combust: np.ndarray
+
+    quality_score: np.ndarray
+
+    def __len__(self) -> int:
+        return int(self.jd.size)
+
+    def timestamps(self) -> list[datetime]:
+        """UTC datetimes for each sample"""
+        return [jd_to_datetime(jd) for jd in self.jd]
+
+
+# ============================================================================
+# TIME GRID HELPERS
+# ============================================================================
+
+
+def jd_to_datetime(jd: float) -> datetime:
+    """Convert Julian Day (UT) to an aware UTC datetime with microsecond precision."""
+    return _UNIX_EPOCH + timedelta(days=float(jd) - _JD_UNIX_EPOCH)
+
+
+def jd_grid(start_utc: datetime, end_utc: datetime, step: timedelta) -> np.ndarray:
+    """
+    Build an inclusive Julian Day grid from start to end.
+
+    Args:
+        start_utc: Grid start (UTC)
+        end_utc: Grid end (UTC)
+        step: Sample spacing
+
+    Returns:
+        1-D float64 array of Julian Days
+    """
+    if step.total_seconds() <= 0:
+        raise ValueError("step must be positive")
+    jd_start = datetime_to_julian_day(ensure_utc(start_utc))
+    jd_end = datetime_to_julian_day(ensure_utc(end_utc))
+    if jd_end < jd_start:
+        raise ValueError("end_utc must not be before start_utc")
+
+    step_days = step.total_seconds() / 86400.0
+    count = int(np.floor((jd_end - jd_start) / step_days + 1e-9)) + 1
+    return jd_start + np.arange(count, dtype=np.float64) * step_days
+
+
+def _as_jd_array(times: Sequence[datetime] | np.ndarray) -> np.ndarray:
+    """Accept either datetimes or Julian Days and return a float64 JD array."""
+    if isinstance(times, np.ndarray) and times.dtype.kind == "f":
+        return times.reshape(-1)
+    return np.array(
+        [datetime_to_julian_day(ensure_utc(t)) for t in times], dtype=np.float64
+    )
+
+
+# ============================================================================
+# VECTORIZED FACTORS
+# ============================================================================
+
+
+def compute_moon_factor_series(
+    times: Sequence[datetime] | np.ndarray,
+) -> MoonFactorSeries:
+    """
+    Compute every moon factor over a time grid.
+
+    Mirrors the per-instant formulas of MoonFactorsCalculator.calculate.
+
+    Args:
+        times: UTC datetimes or a float array of Julian Days (UT)
+
+    Returns:
+        MoonFactorSeries with one element per input time
+    """
+    jd = _as_jd_array(times)
+    positions = get_planet_series(jd, [MOON_ID, SUN_ID])
+    moon_lon, moon_speed = positions[MOON_ID]
+    sun_lon, sun_speed = positions[SUN_ID]
+
+    # Sign, nakshatra, pada
+    sign_num = (moon_lon // 30.0).astype(np.int8)
+    nak_pos = moon_lon * 27.0 / 360.0
+    nakshatra_idx = np.floor(nak_pos)
+    pada = ((nak_pos - nakshatra_idx) * 4.0).astype(np.int8) + 1
+
+    # Panchanga
+    elongation = np.mod(moon_lon - sun_lon, 360.0)
+    tithi_idx = (elongation // TITHI_SPAN).astype(np.int16)
+    tithi_percent = np.mod(elongation, TITHI_SPAN) / TITHI_SPAN * 100.0
+    yoga_sum = np.mod(moon_lon + sun_lon, 360.0)
+    yoga_idx = (yoga_sum // YOGA_SPAN).astype(np.int16)
+    yoga_percent = np.mod(yoga_sum, YOGA_SPAN) / YOGA_SPAN * 100.0
+    karana_num = tithi_idx * 2 + (tithi_percent >= 50.0)
+
+    # Phase
+    illumination = np.clip((1.0 - np.cos(np.radians(elongation))) * 50.0, 0.0, 100.0)
+    is_waxing = elongation < 180.0
+
+    # Dignity
+    is_exalted = np.abs(moon_lon - MOON_EXALTATION) < 5.0
+    is_debilitated = np.abs(moon_lon - MOON_DEBILITATION) < 5.0
+    is_own_sign = (moon_lon >= 90.0) & (moon_lon <= 120.0)
+    dignity = 50.0 + 30.0 * is_exalted - 30.0 * (is_debilitated & ~is_exalted)
+    dignity = dignity + 20.0 * is_own_sign
+    dignity = dignity + 10.0 * (moon_speed > 14.0) - 10.0 * (moon_speed < 12.0)
+    dignity_score = np.clip(dignity, 0.0, 100.0)
+
+    # Special conditions
+    is_gandanta = (
+        (moon_lon >= 359.0)
+        | (moon_lon <= 1.0)
+        | ((moon_lon >= 119.0) & (moon_lon <= 121.0))
+        | ((moon_lon >= 239.0) & (moon_lon <= 241.0))
+    )
+    sign_pos = np.mod(moon_lon, 30.0)
+    is_sandhi = (sign_pos < 1.0) | (sign_pos > 29.0)
+    is_combust = np.abs(moon_lon - sun_lon) < 12.0
+
+    # Quality score (mean of the five factors used by MoonFactorsCalculator)
+    quality_score = (
+        (
+            dignity_score / 100.0
+            + np.minimum(1.0, moon_speed / 13.0)
+            + illumination / 100.0
+            + (~is_gandanta)
+            + (~is_sandhi)
+        )
+        / 5.0
+        * 100.0
+    )
+
+    return MoonFactorSeries(
+        jd=jd,
+        moon_longitude=moon_lon,
+        moon_speed=moon_speed,
+        sun_longitude=sun_lon,
+        sun_speed=sun_speed,
+        sign_num=sign_num,
+        nakshatra_num=nakshatra_idx.astype(np.int8) + 1,
+        pada=pada,
+        tithi_num=tithi_idx + 1,
+        tithi_percent=tithi_percent,
+        yoga_num=yoga_idx + 1,
+        yoga_percent=yoga_percent,
+        karana_num=karana_num.astype(np.int16),
+        phase_angle=elongation,
+        illumination=illumination,
+        is_waxing=is_waxing,
+        is_exalted=is_exalted,
+        is_debilitated=is_debilitated,
+        is_own_sign=is_own_sign,
+        dignity_score=dignity_score,
+        is_gandanta=is_gandanta,
+        is_sandhi=is_sandhi,
+        is_combust=is_combust,
+        quality_score=quality_score,
+    )
+
+
+# ============================================================================
+# EXACT BOUNDARY SOLVING
+# ============================================================================
+
+
+def _angle_and_rate(
+    jd: np.ndarray, kind: str
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Return (angle mod 360, rate deg/day, moon longitude) for elongation or yoga sum."""
+    positions = get_planet_series(jd, [MOON_ID, SUN_ID])
+    moon_lon, moon_speed = positions[MOON_ID]
+    sun_lon, sun_speed = positions[SUN_ID]
+    if kind == "elongation":
+        return np.mod(moon_lon - sun_lon, 360.0), moon_speed - sun_speed, moon_lon
+    return np.mod(moon_lon + sun_lon, 360.0), moon_speed + sun_speed, moon_lon
+
+
+def _solve_crossing(
+    jd_lo: float, jd_hi: float, target: float, kind: str, guess: float
+) -> tuple[float, float]:
+    """
+    Solve angle(jd) == target inside [jd_lo, jd_hi] (angle increasing).
+
+    Newton steps use the ephemeris speed as derivative; any step leaving the
+    bracket falls back to bisection.
+
+    Returns:
+        (jd of crossing, Moon longitude at crossing)
+    """
+    jd = min(max(guess, jd_lo), jd_hi)
+    moon_lon = 0.0
+    for _ in range(MAX_ROOT_ITERATIONS):
+        angle, rate, moon = _angle_and_rate(np.array([jd]), kind)
+        moon_lon = float(moon[0])
+        # Signed distance to target in (-180, 180]
+        err = (float(angle[0]) - target + 180.0) % 360.0 - 180.0
+        if err < 0:
+            jd_lo = jd
+        else:
+            jd_hi = jd
+
+        step = err / float(rate[0]) if rate[0] > 0 else 0.0
+        candidate = jd - step
+        if not (jd_lo < candidate < jd_hi) or rate[0] <= 0:
+            candidate = 0.5 * (jd_lo + jd_hi)
+        if abs(candidate - jd) < ROOT_TOLERANCE_DAYS:
+            return candidate, moon_lon
+        jd = candidate
+    return jd, moon_lon
+
+
+def _find_boundary_crossings(
+    jd_start: float,
+    jd_end: float,
+    kind: str,
+    span: float,
+    scan_step_days: float = DEFAULT_SCAN_STEP_DAYS,
+) -> list[tuple[float, int, float]]:
+    """
+    Find every time the angle crosses a multiple of ``span`` in [start, end].
+
+    Returns:
+        List of (jd, new division index, Moon longitude) sorted by time
+    """
+    if jd_end <= jd_start:
+        return []
+
+    count = int(np.ceil((jd_end - jd_start) / scan_step_days))
+    grid = np.linspace(jd_start, jd_end, max(count, 1) + 1)
+    angle, _, _ = _angle_and_rate(grid, kind)
+
+    # Unwrap: both quantities increase monotonically, so every step is positive
+    steps = np.mod(np.diff(angle), 360.0)
+    unwrapped = angle[0] + np.concatenate(([0.0], np.cumsum(steps)))
+
+    first = np.floor(unwrapped[:-1] / span).astype(np.int64)
+    last = np.floor(unwrapped[1:] / span).astype(np.int64)
+    divisions = int(round(360.0 / span))
+
+    crossings = []
+    for i in np.nonzero(last > first)[0]:
+        lo_val, hi_val = unwrapped[i], unwrapped[i + 1]
+        for m in range(first[i] + 1, last[i] + 1):
+            boundary = m * span
+            frac = (boundary - lo_val) / (hi_val - lo_val)
+            guess = grid[i] + frac * (grid[i + 1] - grid[i])
+            jd, moon_lon = _solve_crossing(
+                float(grid[i]), float(grid[i + 1]), boundary % 360.0, kind, guess
+            )
+            crossings.append((jd, m % divisions, moon_lon))
+
+    return crossings
+
+
+def find_panchanga_changes(
+    start_utc: datetime,
+    end_utc: datetime,
+    elements: Sequence[str] = ("tithi", "yoga", "karana"),
+) -> list[dict]:
+    """
+    Find exact tithi, yoga and karana change times in a range.
+
+    Args:
+        start_utc: Start time (UTC)
+        end_utc: End time (UTC)
+        elements: Subset of "tithi", "yoga", "karana"
+
+    Returns:
+        List of change events sorted by timestamp
+    """
+    jd_start = datetime_to_julian_day(ensure_utc(start_utc))
+    jd_end = datetime_to_julian_day(ensure_utc(end_utc))
+
+    specs = {
+        "tithi": ("elongation", TITHI_SPAN, lambda i: TITHI_NAMES[i], 1),
+        "karana": ("elongation", KARANA_SPAN, get_karana_name, 0),
+        "yoga": ("sum", YOGA_SPAN, lambda i: YOGA_NAMES[i], 1),
+    }
+
+    events = []
+    for element in elements:
+        if element not in specs:
+            raise ValueError(f"Unknown panchanga element: {element}")
+        kind, span, name_of, number_base = specs[element]
+        divisions = int(round(360.0 / span))
+        for jd, new_idx, moon_lon in _find_boundary_crossings(
+            jd_start, jd_end, kind, span
+        ):
+            old_idx = (new_idx - 1) % divisions
+            events.append(
+                {
+                    "timestamp": jd_to_datetime(jd).isoformat(),
+                    "type": f"{element}_change",
+                    "from": name_of(old_idx),
+                    "to": name_of(new_idx),
+                    "from_num": old_idx + number_base,
+                    "to_num": new_idx + number_base,
+                    "longitude": moon_lon,
+                }
+            )
+
+    events.sort(key=lambda e: e["timestamp"])
+    return events
+
+
+def find_phase_events(start_utc: datetime, end_utc: datetime) -> list[dict]:
+    """
+    Find exact New Moon, quarter and Full Moon times in a range.
+
+    Args:
+        start_utc: Start time (UTC)
+        end_utc: End time (UTC)
+
+    Returns:
+        List of phase events sorted by timestamp
+    """
+    jd_start = datetime_to_julian_day(ensure_utc(start_utc))
+    jd_end = datetime_to_julian_day(ensure_utc(end_utc))
+
+    events = []
+    for jd, quarter, _ in _find_boundary_crossings(
+        jd_start, jd_end, "elongation", PHASE_SPAN
+    ):
+        angle = quarter * 90
+        events.append(
+            {
+                "timestamp": jd_to_datetime(jd).isoformat(),
+                "type": "lunar_phase",
+                "phase": PHASE_EVENT_NAMES[quarter],
+                "angle": angle,
+                "illumination": float((1.0 - np.cos(np.radians(angle))) * 50.0),
+            }
+        )
+
+    return events
@@ -4,10 +4,13 @@ Nakshatra Compatibility Module
 Tara Kuta and other nakshatra-based compatibility calculations for KP
 """
 
+from collections.abc import Sequence
 from dataclasses import dataclass
 from enum import Enum
 
-from .constants import NAKSHATRA_NAMES
+import numpy as np
+
+from .constants import NAKSHATRA_NAMES, NUM_NAKSHATRAS
 
 
 class TaraKutaType(Enum):
@@ -381,6 +384,26 @@ def calculate_yoni_kuta(nakshatra1: int, nakshatra2: int) -> int:
     return 2  # Neutral
 
 
+def _relationship_quality(percentage: float, nadi_points: int) -> str:
+    """Map a compatibility percentage (and Nadi result) to a quality label."""
+    if percentage >= 80:
+        quality = "Excellent - Highly Compatible"
+    elif percentage >= 65:
+        quality = "Good - Compatible"
+    elif percentage >= 50:
+        quality = "Average - Acceptable with remedies"
+    elif percentage >= 35:
+        quality = "Below Average - Challenges expected"
+    else:
+        quality = "Poor - Not recommended"
+
+    # Special case: Nadi Dosha
+    if nadi_points == 0:
+        quality += " (Nadi Dosha present - affects progeny)"
+
+    return quality
+
+
 def calculate_nakshatra_compatibility(
     nakshatra1: int, nakshatra2: int, include_all_kutas: bool = True
 ) -> NakshatraCompatibility:
@@ -436,22 +459,7 @@ def calculate_nakshatra_compatibility(
     # Calculate percentage and quality
     max_points = 36
     percentage = (total_points / max_points) * 100
-
-    # Determine relationship quality
-    if percentage >= 80:
-        quality = "Excellent - Highly Compatible"
-    elif percentage >= 65:
-        quality = "Good - Compatible"
-    elif percentage >= 50:
-        quality = "Average - Acceptable with remedies"
-    elif percentage >= 35:
-        quality = "Below Average - Challenges expected"
-    else:
-        quality = "Poor - Not recommended"
-
-    # Special case: Nadi Dosha
-    if nadi_points == 0:
-        quality += " (Nadi Dosha present - affects progeny)"
+    quality = _relationship_quality(percentage, nadi_points)
 
     return NakshatraCompatibility(
         nakshatra1=nakshatra1,
@@ -480,6 +488,9 @@ def find_compatible_nakshatras(
     """
     Find all compatible nakshatras for a given nakshatra.
 
+    Uses the precomputed Tara-only compatibility table (same scoring as
+    ``calculate_nakshatra_compatibility(..., include_all_kutas=False)``).
+
     Args:
         nakshatra: Birth nakshatra to match
         min_compatibility: Minimum compatibility percentage
@@ -487,26 +498,199 @@ def find_compatible_nakshatras(
     Returns:
         List of (nakshatra, compatibility%, quality) tuples
     """
-    compatible = []
+    return rank_compatible_nakshatras(
+        [nakshatra], min_compatibility, include_all_kutas=False
+    )[0]
+
+
+# ============================================================================
+# PRECOMPUTED COMPATIBILITY TABLES
+# ============================================================================
+# There are only 27 x 27 nakshatra pairs, so every kuta is evaluated once at
+# import time and stored in read-only arrays indexed by (nakshatra - 1).
+
+
+@dataclass(frozen=True)
+class CompatibilityTables:
+    """Read-only 27x27 compatibility arrays, row = person 1, column = person 2"""
+
+    tara_position: np.ndarray  # int8, Tara count 1-9 from row to column
+    tara_points: np.ndarray  # int8, bidirectional Tara points after vedha
+    has_vedha: np.ndarray  # bool
+    yoni_points: np.ndarray  # int8
+    gana_points: np.ndarray  # int8
+    nadi_points: np.ndarray  # int8
+    total_points: np.ndarray  # int16, full analysis (all kutas)
+    total_points_tara_only: np.ndarray  # int16, Tara-only analysis
+    percentage: np.ndarray  # float64, full analysis
+    percentage_tara_only: np.ndarray  # float64, Tara-only analysis
+    quality: tuple[tuple[str, ...], ...]  # full analysis labels
+    quality_tara_only: tuple[tuple[str, ...], ...]  # Tara-only labels
+
+
+def _build_compatibility_tables() -> CompatibilityTables:
+    """Evaluate every nakshatra pair once with the reference functions."""
+    shape = (NUM_NAKSHATRAS, NUM_NAKSHATRAS)
+    tara_position = np.zeros(shape, dtype=np.int8)
+    tara_points = np.zeros(shape, dtype=np.int8)
+    has_vedha = np.zeros(shape, dtype=bool)
+    yoni_points = np.zeros(shape, dtype=np.int8)
+    gana_points = np.zeros(shape, dtype=np.int8)
+    nadi_points = np.zeros(shape, dtype=np.int8)
+    total_points = np.zeros(shape, dtype=np.int16)
+    total_points_tara_only = np.zeros(shape, dtype=np.int16)
+    quality: list[list[str]] = []
+    quality_tara_only: list[list[str]] = []
+
+    for i in range(NUM_NAKSHATRAS):
+        row_quality = []
+        row_quality_tara_only = []
+        for j in range(NUM_NAKSHATRAS):
+            full = calculate_nakshatra_compatibility(i + 1, j + 1, True)
+            tara = calculate_nakshatra_compatibility(i + 1, j + 1, False)
+
+            tara_position[i, j] = full.tara_from_1_to_2.position
+            tara_points[i, j] = full.tara_points
+            has_vedha[i, j] = full.has_vedha_dosha
+            yoni_points[i, j] = full.yoni_points
+            gana_points[i, j] = full.gana_points
+            nadi_points[i, j] = full.nadi_points
+            total_points[i, j] = full.total_points
+            total_points_tara_only[i, j] = tara.total_points
+            row_quality.append(full.relationship_quality)
+            row_quality_tara_only.append(tara.relationship_quality)
+        quality.append(row_quality)
+        quality_tara_only.append(row_quality_tara_only)
+
+    # Same arithmetic as calculate_nakshatra_compatibility so values compare equal
+    percentage = (total_points / 36) * 100
+    percentage_tara_only = (total_points_tara_only / 36) * 100
+
+    arrays = (
+        tara_position,
+        tara_points,
+        has_vedha,
+        yoni_points,
+        gana_points,
+        nadi_points,
+        total_points,
+        total_points_tara_only,
+        percentage,
+        percentage_tara_only,
+    )
+    for arr in arrays:
+        arr.setflags(write=False)
+
+    return CompatibilityTables(
+        *arrays,
+        quality=tuple(tuple(row) for row in quality),
+        quality_tara_only=tuple(tuple(row) for row in quality_tara_only),
+    )
+
+
+COMPATIBILITY_TABLES = _build_compatibility_tables()
+
+
+def _nakshatra_indices(nakshatras: Sequence[int] | np.ndarray) -> np.ndarray:
+    """Validate 1-27 nakshatra numbers and convert to 0-based table indices."""
+    idx = np.asarray(nakshatras, dtype=np.int64).reshape(-1) - 1
+    if idx.size and (idx.min() < 0 or idx.max() >= NUM_NAKSHATRAS):
+        raise ValueError(f"Nakshatra numbers must be in 1-{NUM_NAKSHATRAS}")
+    return idx
+
+
+def get_compatibility_percentage(
+    nakshatra1: int, nakshatra2: int, include_all_kutas: bool = True
+) -> float:
+    """
+    O(1) compatibility percentage lookup from the precomputed table.
 
-    for other_nakshatra in range(1, 28):
-        if other_nakshatra == nakshatra:
-            continue  # Skip same nakshatra
+    Args:
+        nakshatra1: First person's birth nakshatra (1-27)
+        nakshatra2: Second person's birth nakshatra (1-27)
+        include_all_kutas: Use full analysis or Tara-only scoring
 
-        compat = calculate_nakshatra_compatibility(
-            nakshatra, other_nakshatra, include_all_kutas=False
-        )
+    Returns:
+        Compatibility percentage (0-100)
+    """
+    i, j = _nakshatra_indices((nakshatra1, nakshatra2))
+    table = (
+        COMPATIBILITY_TABLES.percentage
+        if include_all_kutas
+        else COMPATIBILITY_TABLES.percentage_tara_only
+    )
+    return float(table[i, j])
 
-        if compat.compatibility_percentage >= min_compatibility:
-            compatible.append(
-                (
-                    other_nakshatra,
-                    compat.compatibility_percentage,
-                    compat.relationship_quality,
-                )
-            )
 
-    # Sort by compatibility percentage
-    compatible.sort(key=lambda x: x[1], reverse=True)
+def compatibility_matrix(
+    nakshatras1: Sequence[int] | np.ndarray,
+    nakshatras2: Sequence[int] | np.ndarray,
+    include_all_kutas: bool = True,
+) -> np.ndarray:
+    """
+    Compatibility percentages for every (person1, person2) combination.
+
+    Args:
+        nakshatras1: Birth nakshatras of the first group (1-27)
+        nakshatras2: Birth nakshatras of the second group (1-27)
+        include_all_kutas: Use full analysis or Tara-only scoring
+
+    Returns:
+        Array of shape (len(nakshatras1), len(nakshatras2))
+    """
+    table = (
+        COMPATIBILITY_TABLES.percentage
+        if include_all_kutas
+        else COMPATIBILITY_TABLES.percentage_tara_only
+    )
+    return table[np.ix_(_nakshatra_indices(nakshatras1), _nakshatra_indices(nakshatras2))]
+
+
+def rank_compatible_nakshatras(
+    nakshatras: Sequence[int] | np.ndarray,
+    min_compatibility: float = 65.0,
+    include_all_kutas: bool = False,
+    top_k: int | None = None,
+) -> list[list[tuple[int, float, str]]]:
+    """
+    Rank compatible partner nakshatras for many people in one call.
+
+    Args:
+        nakshatras: Birth nakshatras to match (1-27), one per person
+        min_compatibility: Minimum compatibility percentage
+        include_all_kutas: Use full analysis or Tara-only scoring
+        top_k: Optional cap on matches returned per person
+
+    Returns:
+        One list of (nakshatra, compatibility%, quality) tuples per input,
+        sorted by compatibility descending (ties by nakshatra number)
+    """
+    idx = _nakshatra_indices(nakshatras)
+    if include_all_kutas:
+        table = COMPATIBILITY_TABLES.percentage
+        labels = COMPATIBILITY_TABLES.quality
+    else:
+        table = COMPATIBILITY_TABLES.percentage_tara_only
+        labels = COMPATIBILITY_TABLES.quality_tara_only
+
+    scores = table[idx]  # (n, 27)
+    eligible = scores >= min_compatibility
+    eligible[np.arange(idx.size), idx] = False  # Skip same nakshatra
+
+    # Stable sort keeps ascending nakshatra order within equal scores
+    order = np.argsort(-scores, axis=1, kind="stable")
+
+    results: list[list[tuple[int, float, str]]] = []
+    for row, person in enumerate(idx):
+        ranked_cols = order[row][eligible[row, order[row]]]
+        if top_k is not None:
+            ranked_cols = ranked_cols[:top_k]
+        row_labels = labels[person]
+        results.append(
+            [
+                (int(col) + 1, float(scores[row, col]), row_labels[col])
+                for col in ranked_cols
+            ]
+        )
 
-    return compatible
+    return results
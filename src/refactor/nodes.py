@@ -14,6 +14,7 @@ from typing import Any
 import swisseph as swe
 
 from refactor.nodes_config import get_node_config
+from refactor.swe_backend import _swe_lock, get_planet_longitude, set_ephemeris_path
 from refactor.time_utils import validate_utc_datetime
 
 logger = logging.getLogger(__name__)
@@ -97,8 +98,9 @@ class NodePerturbationCalculator:
         Args:
             ephe_path: Path to Swiss Ephemeris data files
         """
-        swe.set_ephe_path(ephe_path)
-        swe.set_sid_mode(5)  # KP ayanamsa for consistency
+        set_ephemeris_path(ephe_path)
+        with _swe_lock:
+            swe.set_sid_mode(5)  # KP ayanamsa for consistency
         self.config = get_node_config()
         logger.info(
             f"NodePerturbationCalculator initialized with config: {self.config.to_dict()}"
@@ -116,36 +118,15 @@ class NodePerturbationCalculator:
         """
         ts_utc = validate_utc_datetime(ts_utc)
 
-        # Convert to Julian day
-        jd = swe.julday(
-            ts_utc.year,
-            ts_utc.month,
-            ts_utc.day,
-            ts_utc.hour + ts_utc.minute / 60.0 + ts_utc.second / 3600.0,
-        )
-
-        # Get True Node position (sidereal)
-        result = swe.calc_ut(jd, TRUE_NODE_ID, swe.FLG_SIDEREAL | swe.FLG_SPEED)
-
-        longitude = result[0][0]  # Sidereal longitude
-        speed = result[0][3]  # Speed in degrees/day
-
-        return longitude, speed
+        # True Node is Rahu (planet 4) in the KP numbering
+        return get_planet_longitude(ts_utc, 4)
 
     def _get_sun_position(self, ts_utc: datetime) -> float:
         """Get Sun's sidereal longitude for elongation calculation"""
         ts_utc = validate_utc_datetime(ts_utc)
 
-        jd = swe.julday(
-            ts_utc.year,
-            ts_utc.month,
-            ts_utc.day,
-            ts_utc.hour + ts_utc.minute / 60.0 + ts_utc.second / 3600.0,
-        )
-
-        # Sun ID = 0 in Swiss Ephemeris
-        result = swe.calc_ut(jd, 0, swe.FLG_SIDEREAL)
-        return result[0][0]
+        # Sun is planet 1 in the KP numbering
+        return get_planet_longitude(ts_utc, 1)[0]
 
     def _calculate_solar_elongation(self, node_lon: float, sun_lon: float) -> float:
         """Calculate angular separation between node and Sun"""
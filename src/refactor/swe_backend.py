@@ -10,8 +10,12 @@ import warnings
 
 from datetime import datetime
 
+import numpy as np
+
 import swisseph as swe
 
+from shared.otel import timed_stage
+
 from .constants import PLANET_IDS, PLANET_NAMES
 from .numerics import normalize_angle
 from .time_utils import datetime_to_julian_day, ensure_utc
@@ -23,6 +27,9 @@ from .time_utils import datetime_to_julian_day, ensure_utc
 # Thread lock for Swiss Ephemeris calls (it's not thread-safe)
 _swe_lock = threading.Lock()
 
+# Evaluations per lock acquisition in get_planet_series (~1 ms of work)
+SERIES_LOCK_CHUNK = 256
+
 # Track if ayanamsa has been set
 _ayanamsa_initialized = False
 _current_ayanamsa = None
@@ -111,6 +118,7 @@ def validate_ayanamsa(ayanamsa_id: int) -> None:
 # ============================================================================
 
 
+@timed_stage("ephemeris")
 def get_planet_longitude(ts_utc: datetime, planet_id: int) -> tuple[float, float]:
     """Get sidereal longitude and speed for planet at timestamp
 
@@ -150,6 +158,7 @@ def get_planet_longitude(ts_utc: datetime, planet_id: int) -> tuple[float, float
     return longitude, speed
 
 
+@timed_stage("ephemeris")
 def get_planet_position_full(ts_utc: datetime, planet_id: int) -> dict:
     """Get full planetary position data
 
@@ -221,6 +230,7 @@ def get_planet_state(speed: float, threshold: float = 0.05) -> int:
 # ============================================================================
 
 
+@timed_stage("ephemeris")
 def get_planets_batch(
     ts_utc: datetime, planet_ids: list[int] | None = None
 ) -> dict[int, dict]:
@@ -275,11 +285,67 @@ def get_planets_batch(
     return results
 
 
+@timed_stage("ephemeris")
+def get_planet_series(
+    jd_ut: np.ndarray,
+    planet_ids: list[int],
+    with_latitude: bool = False,
+    with_distance: bool = False,
+) -> dict[int, tuple[np.ndarray, ...]]:
+    """Get longitude and speed arrays for planets over a Julian Day grid
+
+    The ephemeris lock is taken once per SERIES_LOCK_CHUNK evaluations, so
+    a grid costs a handful of lock round-trips instead of one per point,
+    while a long sweep (a trading day of seconds) still lets single-point
+    callers in between chunks.
+
+    Args:
+        jd_ut: 1-D array of Julian Days (UT)
+        planet_ids: Planet IDs (1-9 in KP system)
+        with_latitude: Also return ecliptic latitude (Ketu opposite Rahu)
+        with_distance: Also return distance (AU)
+
+    Returns:
+        Dictionary mapping planet_id to a tuple of float64 arrays:
+        (longitude, speed), followed by latitude when with_latitude is set
+        and distance when with_distance is set
+    """
+    jds = np.asarray(jd_ut, dtype=np.float64).reshape(-1)
+    n = jds.size
+
+    for planet_id in planet_ids:
+        if planet_id not in PLANET_IDS:
+            raise ValueError(f"Invalid planet_id: {planet_id}")
+
+    results = {}
+    for planet_id in planet_ids:
+        swe_id = PLANET_IDS[planet_id]
+        body = -swe_id if swe_id < 0 else swe_id
+        out = np.empty((n, 4), dtype=np.float64)
+        for lo in range(0, n, SERIES_LOCK_CHUNK):
+            with _swe_lock:
+                for i in range(lo, min(lo + SERIES_LOCK_CHUNK, n)):
+                    xx, _ = swe.calc_ut(float(jds[i]), body, FLAGS)
+                    out[i] = xx[0], xx[3], xx[1], xx[2]
+        if swe_id < 0:  # Ketu: Rahu + 180°, opposite latitude
+            out[:, 0] += 180.0
+            out[:, 2] = -out[:, 2]
+        columns = [np.mod(out[:, 0], 360.0), out[:, 1].copy()]
+        if with_latitude:
+            columns.append(out[:, 2].copy())
+        if with_distance:
+            columns.append(out[:, 3].copy())
+        results[planet_id] = tuple(columns)
+
+    return results
+
+
 # ============================================================================
 # HOUSE CALCULATIONS (Not used in v1, included for completeness)
 # ============================================================================
 
 
+@timed_stage("ephemeris")
 def get_houses(
     ts_utc: datetime, latitude: float, longitude: float, house_system: bytes = b"P"
 ) -> tuple[list[float], list[float]]:
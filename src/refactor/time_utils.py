@@ -7,7 +7,7 @@ Provides UTC validation, Julian day conversions, and timezone helpers.
 
 from __future__ import annotations
 
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 from zoneinfo import ZoneInfo
 
 try:
@@ -49,10 +49,8 @@ def julian_day_to_datetime(jd: float) -> datetime:
         epoch = datetime(1970, 1, 1, tzinfo=timezone.utc)
         return epoch + timedelta(days=(jd - 2440587.5))
     y, m, d, h = swe.revjul(jd, swe.GREG_CAL)
-    hours = int(h)
-    minutes = int((h - hours) * 60)
-    seconds = int(round((((h - hours) * 60) - minutes) * 60))
-    return datetime(y, m, d, hours, minutes, seconds, tzinfo=timezone.utc)
+    # Round the whole day fraction at once so 59.6s carries into the minute
+    return datetime(y, m, d, tzinfo=timezone.utc) + timedelta(seconds=round(h * 3600))
 
 
 def to_ny(dt: datetime) -> datetime:
@@ -0,0 +1,503 @@
+#!/usr/bin/env python3
+"""
+Transit Backtest - Replay TransitEventDetector over a historical range
+
+Time-series counterpart of TransitEventDetector.detect_events. Instead of
+one ephemeris call per planet per minute, the nine bodies are evaluated on a
+coarse knot grid and interpolated to the sample grid with cubic Hermite
+splines (the ephemeris speeds are the knot derivatives; the error at the
+default 3-hour knots is far below 0.001"). Moon KP chains come from the
+precomputed sub-sub-lord boundary table, and gates, resonances and scores
+are evaluated as (time x planet) arrays one chunk at a time.
+
+Only the few candidates that clear the fire threshold reach Python-level
+code. Dedup runs against simulated time in memory: a contact keyed like the
+live ledger (minus the minute stamp) fires once per cooldown window, or
+again on a significant score rise. Backtests never touch the detector's
+ledger, history or live metrics.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterator
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from .angles_indices import find_nakshatra_pada
+from .constants import PLANET_NAMES
+from .kp_chain import kp_boundary_table
+from .swe_backend import get_planet_series
+from .time_utils import datetime_to_julian_day, validate_utc_datetime
+from .transit_gate_system import GateComponents
+from .transit_moon_engine import MOON_ID, MoonChainData
+from .transit_resonance import ResonanceResult
+
+if TYPE_CHECKING:
+    from .transit_event_detector import TransitEvent, TransitEventDetector
+
+PLANET_IDS = tuple(range(1, 10))
+TARGET_IDS = np.array([pid for pid in PLANET_IDS if pid != MOON_ID], dtype=np.int64)
+
+# Ephemeris knot spacing; finer sample steps are Hermite-interpolated
+DEFAULT_KNOT_STEP = timedelta(hours=3)
+
+# Span of time evaluated (and yielded) per batch
+DEFAULT_CHUNK = timedelta(days=7)
+
+# Sign (1-12) -> ruling planet, as compute_dispositor_map
+_SIGN_RULERS = np.array([0, 9, 6, 5, 2, 1, 5, 6, 9, 3, 8, 8, 3], dtype=np.int64)
+
+# Applying check projects both bodies this many days ahead (ResonanceKernel)
+_APPLY_LOOKAHEAD_DAYS = 0.1
+
+
+# ============================================================================
+# SKY SERIES
+# ============================================================================
+
+
+@dataclass(frozen=True)
+class SkySeries:
+    """Sidereal longitudes and speeds on a sample grid, columns by planet ID"""
+
+    jd: np.ndarray  # (T,)
+    longitude: np.ndarray  # (T, 10); column 0 unused
+    speed: np.ndarray  # (T, 10)
+
+    def __len__(self) -> int:
+        return int(self.jd.size)
+
+
+def _hermite(
+    knots: np.ndarray, values: np.ndarray, slopes: np.ndarray, t: np.ndarray
+) -> tuple[np.ndarray, np.ndarray]:
+    """Cubic Hermite value and derivative on an evenly spaced knot grid."""
+    h = knots[1] - knots[0]
+    k = np.clip(((t - knots[0]) / h).astype(np.int64), 0, knots.size - 2)
+    s = (t - knots[k]) / h
+    y0, y1 = values[k], values[k + 1]
+    m0, m1 = slopes[k] * h, slopes[k + 1] * h
+    s2 = s * s
+    s3 = s2 * s
+    value = (
+        (2 * s3 - 3 * s2 + 1) * y0
+        + (s3 - 2 * s2 + s) * m0
+        + (-2 * s3 + 3 * s2) * y1
+        + (s3 - s2) * m1
+    )
+    deriv = (
+        (6 * s2 - 6 * s) * (y0 - y1) + (3 * s2 - 4 * s + 1) * m0 + (3 * s2 - 2 * s) * m1
+    ) / h
+    return value, deriv
+
+
+def sky_series(jd: np.ndarray, knot_step: timedelta = DEFAULT_KNOT_STEP) -> SkySeries:
+    """
+    Positions of all nine bodies over a Julian Day grid.
+
+    Args:
+        jd: Evenly spaced sample grid (UT)
+        knot_step: Ephemeris knot spacing; grids at least this coarse are
+            evaluated exactly at every sample
+
+    Returns:
+        SkySeries for the grid
+    """
+    jd = np.asarray(jd, dtype=np.float64).reshape(-1)
+    h = knot_step.total_seconds() / 86400.0
+    step = float(jd[1] - jd[0]) if jd.size > 1 else h
+
+    if step >= h:
+        series = get_planet_series(jd, list(PLANET_IDS))
+        lon = np.zeros((jd.size, 10))
+        speed = np.zeros((jd.size, 10))
+        for pid, (plon, pspeed) in series.items():
+            lon[:, pid] = plon
+            speed[:, pid] = pspeed
+        return SkySeries(jd, lon, speed)
+
+    count = int(np.ceil((jd[-1] - jd[0]) / h)) + 1
+    knots = jd[0] + np.arange(max(count, 2), dtype=np.float64) * h
+    series = get_planet_series(knots, list(PLANET_IDS))
+    lon = np.zeros((jd.size, 10))
+    speed = np.zeros((jd.size, 10))
+    for pid, (klon, kspeed) in series.items():
+        value, deriv = _hermite(knots, np.unwrap(klon, period=360.0), kspeed, jd)
+        lon[:, pid] = np.mod(value, 360.0)
+        speed[:, pid] = deriv
+    return SkySeries(jd, lon, speed)
+
+
+# ============================================================================
+# VECTORIZED SCORING
+# ============================================================================
+
+
+@dataclass
+class _ChunkScores:
+    """Per-sample Moon chain and (time x target) gate/kernel/score arrays"""
+
+    chain: np.ndarray  # (T, 4) NL, SL, SSL, S3 (0 when S3 disabled)
+    dispositors: np.ndarray  # (T, 10)
+    gates: np.ndarray  # (T, P, 6) nl, sl, ssl, s3, bridge, total
+    aspect: np.ndarray  # (T, P) index into aspect table, -1 if none
+    orb: np.ndarray
+    kernel: np.ndarray  # 0 where no aspect within orb
+    applying: np.ndarray
+    score: np.ndarray  # (T, P) int, -1 where gate < 0.1
+    confirm: np.ndarray  # (T, P, 3) promise, dasha, rp (candidates only)
+
+
+def moon_chains(moon_lon: np.ndarray, s3_fn=None) -> np.ndarray:
+    """(NL, SL, SSL, S3) for every Moon longitude via the boundary table."""
+    starts, lords = kp_boundary_table()
+    idx = np.searchsorted(starts, np.mod(moon_lon, 360.0), side="right") - 1
+    chain = np.zeros((moon_lon.size, 4), dtype=np.int64)
+    chain[:, :3] = lords[idx]
+    if s3_fn is not None:
+        chain[:, 3] = [s3_fn(float(x)) for x in moon_lon]
+    return chain
+
+
+def dispositor_matrix(lon: np.ndarray) -> np.ndarray:
+    """Sign-ruler dispositor per sample and planet; 0 where self-ruled."""
+    rulers = _SIGN_RULERS[(np.mod(lon, 360.0) // 30.0).astype(np.int64) + 1]
+    rulers[:, 0] = 0
+    rulers[rulers == np.arange(10)] = 0
+    return rulers
+
+
+def _gate_matrix(
+    detector: TransitEventDetector, chain: np.ndarray, disp: np.ndarray, speed: np.ndarray
+) -> np.ndarray:
+    """KPGateCalculator.calculate_gate for every (sample, target) at once."""
+    calc = detector.gate_calculator
+    rows = np.arange(chain.shape[0])[:, None]
+    targets = TARGET_IDS[None, :]
+    nl, sl, ssl, s3 = (chain[:, i : i + 1] for i in range(4))
+
+    gates = np.zeros((chain.shape[0], TARGET_IDS.size, 6))
+    gates[..., 0] = np.where(nl == targets, calc.weights.get("NL", 1.00), 0.0)
+    gates[..., 1] = np.where(sl == targets, calc.weights.get("SL", 0.60), 0.0)
+    gates[..., 2] = np.where(ssl == targets, calc.weights.get("SSL", 0.35), 0.0)
+    gates[..., 3] = np.where((s3 > 0) & (s3 == targets), calc.weights.get("S3", 0.20), 0.0)
+    has_direct = (gates[..., :4] > 0).any(axis=-1) & (disp > 0).any(axis=1)[:, None]
+
+    # Direct dispositor bridge: Moon NL's dispositor, then SL/SSL (weaker)
+    bonus = calc.bridge_bonus
+    bridge = np.where(disp[rows, nl] == targets, bonus, 0.0)
+    alt = (disp[rows, sl] == targets) | (disp[rows, ssl] == targets)
+    bridge = np.where((bridge == 0) & alt, bonus * 0.7, bridge)
+
+    # Dispositor chain intersection: lords, their dispositors and theirs,
+    # as planet bitmasks (bit 0 marks an absent dispositor and is ignored)
+    lords = chain[:, :3]
+    d1 = disp[rows, lords]
+    d2 = disp[rows, d1]
+    moon_set = np.concatenate([lords, d1, d2], axis=1)
+    moon_mask = np.bitwise_or.reduce(np.left_shift(1, moon_set), axis=1)
+    t1 = disp[:, TARGET_IDS]
+    t2 = disp[rows, t1]
+    target_mask = np.left_shift(1, targets) | np.left_shift(1, t1) | np.left_shift(1, t2)
+    meets = (moon_mask[:, None] & target_mask & ~1) != 0
+    bridge = np.where((bridge == 0) & meets, bonus * 0.5, bridge)
+
+    # Retrograde targets keep half the bridge (detect_events gates separating)
+    bridge = np.where(speed[:, TARGET_IDS] < 0, bridge * 0.5, bridge)
+    gates[..., 4] = np.where(has_direct, bridge, 0.0)
+
+    raw = gates[..., 0] + gates[..., 1] + gates[..., 2] + gates[..., 3] + gates[..., 4]
+    gates[..., 5] = np.minimum(calc.max_gate, raw)
+    return gates
+
+
+def _aspect_table(
+    detector: TransitEventDetector,
+) -> tuple[list, np.ndarray, np.ndarray, np.ndarray]:
+    """Aspect types in closest-match order with their angles, orbs and strengths."""
+    kernel = detector.resonance_kernel
+    types = list(kernel._aspect_angles.values())
+    angles = np.array([float(a.angle) for a in types])
+    max_orbs = np.array([kernel.orb_allowances.get(a.name, 2.0) for a in types])
+    strengths = np.array([kernel.base_strengths.get(a.name, 0.5) for a in types])
+    return types, angles, max_orbs, strengths
+
+
+def _separation(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    diff = np.abs(a - b)
+    return np.where(diff > 180, 360 - diff, diff)
+
+
+def _resonance_matrix(detector: TransitEventDetector, sky: SkySeries) -> tuple[np.ndarray, ...]:
+    """ResonanceKernel.calculate_kernel for Moon vs every target at once."""
+    _, angles, max_orbs, strengths = _aspect_table(detector)
+    moon_lon = sky.longitude[:, MOON_ID : MOON_ID + 1]
+    moon_speed = sky.speed[:, MOON_ID : MOON_ID + 1]
+    lon = sky.longitude[:, TARGET_IDS]
+    speed = sky.speed[:, TARGET_IDS]
+
+    sep = _separation(moon_lon, lon)
+    orbs = np.abs(sep[..., None] - angles)
+    aspect = orbs.argmin(axis=-1)  # first closest, as _find_closest_aspect
+    orb = np.take_along_axis(orbs, aspect[..., None], axis=-1)[..., 0]
+    max_orb = max_orbs[aspect]
+    angle = angles[aspect]
+
+    within = (orb <= max_orb) & (max_orb > 0)
+    kernel = np.where(
+        within, strengths[aspect] * np.exp(-((orb / np.where(max_orb > 0, max_orb, 1.0)) ** 2)), 0.0
+    )
+    future = _separation(
+        np.mod(moon_lon + moon_speed * _APPLY_LOOKAHEAD_DAYS, 360),
+        np.mod(lon + speed * _APPLY_LOOKAHEAD_DAYS, 360),
+    )
+    applying = np.abs(future - angle) < np.abs(sep - angle)
+    bonus = detector.resonance_kernel.APPLYING_BONUS
+    kernel = np.where(applying, np.minimum(1.0, kernel * bonus), kernel)
+
+    aspect = np.where(kernel > 0, aspect, -1)
+    return aspect, orb, sep, kernel, applying
+
+
+def _confirm_scores(
+    detector: TransitEventDetector,
+    chain: np.ndarray,
+    disp: np.ndarray,
+    cand: tuple[np.ndarray, np.ndarray],
+    dasha_data: dict | None,
+    promise_data: dict | None,
+    rp_data: dict | None,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Promise/dasha/RP scores for candidate cells, via the scalar rules.
+
+    Each rule depends on a handful of small integers (target, its dispositor,
+    the Moon chain), so the scalar method runs once per distinct combination.
+    """
+    t_idx, p_idx = cand
+    pids = TARGET_IDS[p_idx]
+    pdisp = disp[t_idx, pids]
+
+    promise_by_pid = np.zeros(10)
+    for pid in TARGET_IDS:
+        promise_by_pid[pid] = detector._calculate_promise_score(int(pid), promise_data)
+
+    dasha_table = np.zeros((10, 10))
+    for pid in TARGET_IDS:
+        for d in range(10):
+            dmap = {int(pid): d} if d else {}
+            dasha_table[pid, d] = detector._calculate_dasha_score(int(pid), dasha_data, dmap)
+
+    # Pack (NL, SL, SSL, S3, target, dispositor) into one int, 4 bits each
+    rows = np.column_stack([chain[t_idx], pids, pdisp])
+    packed = (rows << np.arange(20, -1, -4)).sum(axis=1)
+    combos, first, inverse = np.unique(packed, return_index=True, return_inverse=True)
+    rp_unique = np.empty(len(combos))
+    for n, (nl, sl, ssl, s3, pid, d) in enumerate(rows[first].tolist()):
+        moon_chain = {"NL": nl, "SL": sl, "SSL": ssl}
+        if s3:
+            moon_chain["S3"] = s3
+        rp_unique[n] = detector._calculate_rp_score(moon_chain, pid, rp_data, {pid: d} if d else {})
+
+    return promise_by_pid[pids], dasha_table[pids, pdisp], rp_unique[inverse.reshape(-1)]
+
+
+def score_chunk(
+    detector: TransitEventDetector,
+    sky: SkySeries,
+    dasha_data: dict | None = None,
+    rp_data: dict | None = None,
+    promise_data: dict | None = None,
+) -> _ChunkScores:
+    """Gate, resonance and final score for every (sample, target) of a chunk."""
+    s3_fn = detector.moon_engine._calculate_s3 if detector.moon_engine.enable_s3 else None
+    chain = moon_chains(sky.longitude[:, MOON_ID], s3_fn)
+    disp = dispositor_matrix(sky.longitude)
+    gates = _gate_matrix(detector, chain, disp, sky.speed)
+    aspect, orb, _, kernel, applying = _resonance_matrix(detector, sky)
+
+    score = np.full(aspect.shape, -1, dtype=np.int64)
+    confirm_parts = np.zeros(aspect.shape + (3,))
+    cand = np.nonzero(gates[..., 5] >= 0.1)
+    if cand[0].size:
+        promise, dasha, rp = _confirm_scores(
+            detector, chain, disp, cand, dasha_data, promise_data, rp_data
+        )
+        w = detector.SCORE_WEIGHTS
+        cw = detector.CONFIRM_WEIGHTS
+        gate_norm = np.minimum(1.0, gates[..., 5][cand] / 1.2)
+        confirm = cw["promise"] * promise + cw["dasha"] * dasha + cw["rp"] * rp
+        raw = 100 * (w["gate"] * gate_norm + w["kernel"] * kernel[cand] + w["confirm"] * confirm)
+        score[cand] = np.round(np.clip(raw, 0, 100)).astype(np.int64)
+        confirm_parts[cand] = np.column_stack([promise, dasha, rp])
+
+    return _ChunkScores(chain, disp, gates, aspect, orb, kernel, applying, score, confirm_parts)
+
+
+# ============================================================================
+# EVENT STREAM
+# ============================================================================
+
+
+def _sample_grid(start: datetime, end: datetime, step: timedelta) -> tuple[float, float, int]:
+    step_days = step.total_seconds() / 86400.0
+    if step_days <= 0:
+        raise ValueError("step must be positive")
+    if end < start:
+        raise ValueError("end must not be before start")
+    jd0 = datetime_to_julian_day(start)
+    count = int((end - start) / step) + 1
+    return jd0, step_days, count
+
+
+def iter_backtest_events(
+    detector: TransitEventDetector,
+    start_utc: datetime,
+    end_utc: datetime,
+    step: timedelta = timedelta(minutes=1),
+    dasha_data: dict | None = None,
+    rp_data: dict | None = None,
+    promise_data: dict | None = None,
+    chunk: timedelta = DEFAULT_CHUNK,
+    knot_step: timedelta = DEFAULT_KNOT_STEP,
+    fire_threshold: int | None = None,
+    cooldown_minutes: int | None = None,
+) -> Iterator[list[TransitEvent]]:
+    """
+    Replay the detector over [start_utc, end_utc] at a fixed step.
+
+    Args:
+        detector: Supplies thresholds, weights and component calculators
+        start_utc: First sample (UTC)
+        end_utc: Last sample, inclusive when on the step grid (UTC)
+        step: Sample spacing
+        dasha_data: Dasha periods, held fixed over the range
+        rp_data: Ruling planets, held fixed over the range
+        promise_data: Birth chart promise tags
+        chunk: Span of time evaluated and yielded per batch
+        knot_step: Ephemeris knot spacing for interpolation
+        fire_threshold: Override the detector's fire threshold
+        cooldown_minutes: Override the detector's dedup cooldown
+
+    Yields:
+        Lists of fired TransitEvents, one list per chunk, time-ordered
+    """
+    from .transit_event_detector import TransitEvent
+
+    start_utc = validate_utc_datetime(start_utc)
+    end_utc = validate_utc_datetime(end_utc)
+    jd0, step_days, count = _sample_grid(start_utc, end_utc, step)
+    per_chunk = max(1, int(chunk / step))
+    types = _aspect_table(detector)[0]
+    if fire_threshold is None:
+        fire_threshold = detector.fire_threshold
+    if cooldown_minutes is None:
+        cooldown_minutes = detector.cooldown_minutes
+    cooldown = timedelta(minutes=cooldown_minutes) / step  # in samples
+    up_threshold = detector.UP_THRESHOLD
+
+    last_fire: dict[int, tuple[int, int]] = {}  # contact -> (sample, score)
+
+    for first in range(0, count, per_chunk):
+        n = min(per_chunk, count - first)
+        sky = sky_series(jd0 + (first + np.arange(n)) * step_days, knot_step)
+        scores = score_chunk(detector, sky, dasha_data, rp_data, promise_data)
+
+        # Contact = Moon chain + target + aspect, packed 4 bits per field
+        t_idx, p_idx = np.nonzero(scores.score >= fire_threshold)
+        contacts = (scores.chain[t_idx] << np.array([24, 20, 16, 12])).sum(axis=1)
+        contacts += (TARGET_IDS[p_idx] << 8) + scores.aspect[t_idx, p_idx] + 1
+
+        events: list[TransitEvent] = []
+        pending: list[TransitEvent] = []
+        pending_t = -1
+        for t, p, contact, score in zip(
+            t_idx.tolist(), p_idx.tolist(), contacts.tolist(), scores.score[t_idx, p_idx].tolist()
+        ):
+            sample = first + t
+            prev = last_fire.get(contact)
+            if prev is not None and sample - prev[0] < cooldown:
+                if not (score >= up_threshold and score > prev[1] + 10):
+                    continue
+            last_fire[contact] = (sample, score)
+
+            if t != pending_t:
+                events.extend(detector._apply_combo_bonus(pending))
+                pending, pending_t = [], t
+            ts = start_utc + step * sample
+            pending.append(
+                _build_event(TransitEvent, detector, scores, sky, t, p, ts, score, types)
+            )
+        events.extend(detector._apply_combo_bonus(pending))
+
+        # Forget contacts whose cooldown has lapsed; keeps the map chunk-sized
+        horizon = first + n - cooldown
+        last_fire = {k: v for k, v in last_fire.items() if v[0] >= horizon}
+        yield events
+
+
+def _build_event(
+    event_cls,
+    detector: TransitEventDetector,
+    scores: _ChunkScores,
+    sky: SkySeries,
+    t: int,
+    p: int,
+    ts: datetime,
+    score: int,
+    types: list,
+) -> TransitEvent:
+    nl, sl, ssl, s3 = scores.chain[t].tolist()
+    pid = int(TARGET_IDS[p])
+    nl_w, sl_w, ssl_w, s3_w, bridge, total = scores.gates[t, p].tolist()
+    gates = GateComponents(nl=nl_w, sl=sl_w, ssl=ssl_w, s3=s3_w, bridge=bridge, total=total)
+
+    resonance = None
+    a = int(scores.aspect[t, p])
+    if a >= 0:
+        orb = float(scores.orb[t, p])
+        resonance = ResonanceResult(
+            aspect_type=types[a],
+            exact_angle=float(_separation(sky.longitude[t, MOON_ID], sky.longitude[t, pid])),
+            orb=orb,
+            kernel_value=float(scores.kernel[t, p]),
+            is_applying=bool(scores.applying[t, p]),
+            is_tight=orb <= 1.0,
+        )
+
+    moon_lon = float(sky.longitude[t, MOON_ID])
+    nakshatra, pada = find_nakshatra_pada(moon_lon)
+    moon_chain = MoonChainData(
+        timestamp=ts,
+        longitude=moon_lon,
+        speed=float(sky.speed[t, MOON_ID]),
+        sign=int(moon_lon // 30.0) + 1,
+        nakshatra=nakshatra,
+        pada=pada,
+        nl=nl,
+        sl=sl,
+        ssl=ssl,
+        s3=s3 or None,
+    )
+    signature = moon_chain.get_signature()
+    aspect_name = resonance.aspect_type.name if resonance else "NONE"
+    promise, dasha, rp = scores.confirm[t, p].tolist()
+
+    event = event_cls(
+        id=detector._generate_event_key(signature, pid, aspect_name, ts),
+        ts=ts,
+        target=pid,
+        target_name=PLANET_NAMES.get(pid, str(pid)),
+        gates=gates,
+        kernel=resonance,
+        promise_score=promise,
+        dasha_score=dasha,
+        rp_score=rp,
+        score=score,
+        window_start=ts,
+        moon_chain_sig=signature,
+    )
+    event.explain = detector._generate_explanation(event, moon_chain)
+    return event
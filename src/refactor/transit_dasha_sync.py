@@ -2,18 +2,36 @@
 """
 Transit Dasha Synchronizer - Dasha Period Alignment Scoring
 Checks alignment between current dasha periods and transit events
+
+Forward horizons are scored as intervals: the Maha/Antar/Pratyantar
+boundaries inside the horizon are built once, the transit windows of each
+target (spans where a transiting planet's KP lord at a level is the target)
+come from one ephemeris sweep, and the two are intersected into exact
+scored intervals. The sweep is shared by every target and natal chart.
 """
 
 import logging
+import math
 
-from dataclasses import dataclass
+from collections.abc import Sequence
+from dataclasses import dataclass, field
 from datetime import UTC, datetime, timedelta
 
+import numpy as np
+
 from .constants import PLANET_NAMES
 from .dasha import VimshottariDashaEngine
+from .kp_chain import kp_boundary_table
+from .swe_backend import get_planet_series
+from .time_utils import datetime_to_julian_day, julian_day_to_datetime, validate_utc_datetime
 
 logger = logging.getLogger(__name__)
 
+# Transit window sweep: coarse grid, then Newton refinement of each crossing
+TRANSIT_STEP = timedelta(hours=1)
+REFINE_ITERATIONS = 2
+LORD_LEVELS = {"nl": 0, "sl": 1, "ssl": 2}
+
 
 # Map planet names to IDs
 PLANET_NAME_TO_ID = {
@@ -70,6 +88,137 @@ class DashaSyncResult:
         }
 
 
+@dataclass
+class DashaSpan:
+    """Stretch of time with one Maha/Antar/Pratyantar combination"""
+
+    start: datetime
+    end: datetime
+    mahadasha: str
+    antardasha: str
+    pratyantara: str
+
+
+@dataclass
+class DashaSyncInterval:
+    """Transit window of a target clipped to one dasha span, with its score"""
+
+    start: datetime
+    end: datetime
+    target_planet: int
+    mahadasha: str
+    antardasha: str
+    pratyantara: str
+    sync_score: float
+    sync_level: str
+    reasons: list[str] = field(default_factory=list)
+
+    def to_dict(self) -> dict:
+        """Convert to dictionary for API response"""
+        return {
+            "start": self.start.isoformat(),
+            "end": self.end.isoformat(),
+            "target_planet": self.target_planet,
+            "target_name": PLANET_NAMES.get(
+                self.target_planet, str(self.target_planet)
+            ),
+            "dasha": self.mahadasha,
+            "antardasha": self.antardasha,
+            "pratyantara": self.pratyantara,
+            "sync_score": round(self.sync_score, 2),
+            "sync_level": self.sync_level,
+            "reasons": self.reasons,
+        }
+
+
+# ============================================================================
+# TRANSIT WINDOWS
+# ============================================================================
+
+
+def _level_boundaries(level: str) -> tuple[np.ndarray, np.ndarray]:
+    """Starts and lord of the KP segments that change the lord at level."""
+    starts, lords = kp_boundary_table()
+    col = LORD_LEVELS[level]
+    keep = np.ones(len(starts), dtype=bool)
+    keep[1:] = (lords[1:, : col + 1] != lords[:-1, : col + 1]).any(axis=1)
+    return starts[keep], lords[keep, col].astype(np.int64)
+
+
+def kp_lord_windows(
+    target_planets: Sequence[int],
+    start: datetime,
+    end: datetime,
+    level: str = "sl",
+    planet_id: int = 2,
+    step: timedelta = TRANSIT_STEP,
+) -> dict[int, np.ndarray]:
+    """Spans where a transiting planet's KP lord at level is each target
+
+    The planet is sampled on a coarse grid, every segment boundary crossed
+    between two samples is located by linear interpolation, and all
+    crossings are then refined together with a few Newton steps, so the
+    windows are exact to well under a second.
+
+    Args:
+        target_planets: Target planet IDs (1-9)
+        start: Horizon start (UTC)
+        end: Horizon end (UTC)
+        level: KP lord level ('nl', 'sl', 'ssl')
+        planet_id: Transiting planet (default: 2 for Moon)
+        step: Coarse sampling step
+
+    Returns:
+        Dictionary mapping target to a (k, 2) array of [start, end) Julian Days
+    """
+    if level not in LORD_LEVELS:
+        raise ValueError(f"Unknown KP level: {level}")
+    jd0 = datetime_to_julian_day(validate_utc_datetime(start))
+    jd1 = datetime_to_julian_day(validate_utc_datetime(end))
+    if jd1 <= jd0:
+        return {int(t): np.empty((0, 2)) for t in target_planets}
+
+    starts, lords = _level_boundaries(level)
+    n_seg = len(starts)
+    n = max(2, math.ceil((jd1 - jd0) / (step.total_seconds() / 86400.0)) + 1)
+    jd = np.linspace(jd0, jd1, n)
+    lon = np.unwrap(get_planet_series(jd, [planet_id])[planet_id][0], period=360.0)
+    turns = np.floor(lon / 360.0)
+    seg = np.searchsorted(starts, lon - 360.0 * turns, side="right") - 1
+    seg = seg + n_seg * turns.astype(np.int64)
+
+    # Every boundary m in (lo, hi] is crossed between samples i and i + 1
+    lo = np.minimum(seg[:-1], seg[1:])
+    count = np.abs(seg[1:] - seg[:-1])
+    idx = np.repeat(np.arange(n - 1), count)
+    offset = np.arange(count.sum()) - np.repeat(np.cumsum(count) - count, count)
+    forward = seg[idx + 1] > seg[idx]
+    m = np.repeat(lo + 1, count) + np.where(forward, offset, np.repeat(count, count) - 1 - offset)
+    boundary = starts[m % n_seg] + 360.0 * (m // n_seg)
+
+    t = jd[idx] + (boundary - lon[idx]) / (lon[idx + 1] - lon[idx]) * (jd[idx + 1] - jd[idx])
+    for _ in range(REFINE_ITERATIONS if t.size else 0):
+        lon_t, speed_t = get_planet_series(t, [planet_id])[planet_id]
+        diff = (lon_t - boundary + 180.0) % 360.0 - 180.0
+        moving = np.abs(speed_t) > 1e-9
+        t = np.where(moving, t - diff / np.where(moving, speed_t, 1.0), t)
+        t = np.clip(t, jd[idx], jd[idx + 1])
+
+    # Lord held after each crossing; a backward crossing re-enters m - 1
+    after = np.where(forward, m, m - 1) % n_seg
+    order = np.argsort(t, kind="stable")
+    times = np.concatenate(([jd0], t[order], [jd1]))
+    held = np.concatenate(([lords[seg[0] % n_seg]], lords[after[order]]))
+
+    windows = {}
+    for target in target_planets:
+        hit = np.concatenate(([False], held == target, [False]))
+        edges = np.flatnonzero(hit[1:] != hit[:-1])
+        spans = np.column_stack((times[edges[::2]], times[edges[1::2]]))
+        windows[int(target)] = spans[spans[:, 1] > spans[:, 0]]
+    return windows
+
+
 class TransitDashaSync:
     """
     Synchronize transit events with Vimshottari Dasha periods.
@@ -175,12 +324,9 @@ class TransitDashaSync:
         if current_time is None:
             current_time = datetime.now(UTC)
 
-        # Get current dasha periods
-        current_periods = self.dasha_engine.get_current_dasha_periods(
-            birth_time, moon_longitude, current_time, levels=3
-        )
+        active = self._get_active_dasha_dict(birth_time, moon_longitude, current_time)
 
-        if not current_periods:
+        if not active:
             return DashaSyncResult(
                 current_dasha="Unknown",
                 current_antardasha="Unknown",
@@ -192,61 +338,17 @@ class TransitDashaSync:
             )
 
         # Extract period names
-        maha = current_periods[0].planet if current_periods else "Unknown"
-        antar = current_periods[1].planet if len(current_periods) > 1 else "Unknown"
-        pratyantar = current_periods[2].planet if len(current_periods) > 2 else None
-
-        # Convert to IDs
-        maha_id = self._name_to_id(maha)
-        antar_id = self._name_to_id(antar)
-        pratyantar_id = self._name_to_id(pratyantar) if pratyantar else None
-
-        # Analyze synchronization
-        sync_score = 0.0
-        sync_level = "neutral"
-        reasons = []
-
-        # Direct match check
-        if target_planet == maha_id:
-            sync_score = 1.0
-            sync_level = "direct"
-            reasons.append("Target is Mahadasha lord")
-        elif target_planet == antar_id:
-            sync_score = 0.95
-            sync_level = "direct"
-            reasons.append("Target is Antardasha lord")
-        elif target_planet == pratyantar_id:
-            sync_score = 0.85
-            sync_level = "direct"
-            reasons.append("Target is Pratyantara lord")
-
-        # Dispositor check
-        elif dispositor_map:
-            disp_score, disp_reason = self._check_dispositor_sync(
-                target_planet, [maha_id, antar_id], dispositor_map
-            )
-            if disp_score > 0.5:
-                sync_score = disp_score
-                sync_level = "friendly"
-                reasons.append(disp_reason)
-
-        # Friendship check
-        if sync_score < 0.5:
-            friend_score = self._calculate_friendship_score(
-                target_planet, [maha_id, antar_id, pratyantar_id]
-            )
-            if friend_score > 0.5:
-                sync_score = 0.6
-                sync_level = "friendly"
-                reasons.append("Friendly with dasha lords")
-            elif friend_score < -0.5:
-                sync_score = 0.2
-                sync_level = "hostile"
-                reasons.append("Hostile to dasha lords")
-            else:
-                sync_score = 0.4
-                sync_level = "neutral"
-                reasons.append("Neutral relationship")
+        maha = active.get("mahadasha", "Unknown")
+        antar = active.get("antardasha", "Unknown")
+        pratyantar = active.get("pratyantara")
+
+        sync_score, sync_level, reasons = self._score_lords(
+            target_planet,
+            self._name_to_id(maha),
+            self._name_to_id(antar),
+            self._name_to_id(pratyantar) if pratyantar else None,
+            dispositor_map,
+        )
 
         return DashaSyncResult(
             current_dasha=maha,
@@ -258,13 +360,188 @@ class TransitDashaSync:
             reasons=reasons,
         )
 
+    def dasha_spans(
+        self,
+        birth_time: datetime,
+        start: datetime,
+        end: datetime,
+        moon_longitude: float | None = None,
+    ) -> list[DashaSpan]:
+        """
+        All Maha/Antar/Pratyantar spans overlapping a horizon, clipped to it.
+
+        Sub-periods are only expanded for the periods that reach the horizon,
+        so a multi-year horizon costs a handful of hierarchy builds.
+
+        Args:
+            birth_time: Birth time
+            start: Horizon start (UTC)
+            end: Horizon end (UTC)
+            moon_longitude: Birth moon longitude
+
+        Returns:
+            Contiguous spans in time order
+        """
+        birth_time = validate_utc_datetime(birth_time)
+        start = validate_utc_datetime(start)
+        end = validate_utc_datetime(end)
+        years = max(1, math.ceil((end - birth_time).days / 365.25) + 1)
+
+        spans = []
+        engine = self.dasha_engine
+        for maha in engine.generate_mahadashas(birth_time, moon_longitude, years):
+            if maha.end_date <= start or maha.start_date >= end:
+                continue
+            for antar in engine.calculate_antardashas(maha):
+                if antar.end_date <= start or antar.start_date >= end:
+                    continue
+                for pratyantar in engine.calculate_pratyantar(antar):
+                    if pratyantar.end_date <= start or pratyantar.start_date >= end:
+                        continue
+                    spans.append(
+                        DashaSpan(
+                            start=max(start, pratyantar.start_date),
+                            end=min(end, pratyantar.end_date),
+                            mahadasha=maha.planet,
+                            antardasha=antar.planet,
+                            pratyantara=pratyantar.planet,
+                        )
+                    )
+        return spans
+
+    def sync_intervals(
+        self,
+        target_planets: Sequence[int],
+        birth_time: datetime,
+        moon_longitude: float | None,
+        start: datetime,
+        end: datetime,
+        level: str | None = "sl",
+        dispositor_map: dict[int, int] | None = None,
+        min_score: float = 0.0,
+        windows: dict[int, np.ndarray] | None = None,
+    ) -> list[DashaSyncInterval]:
+        """
+        Scored intervals where each target's transit window meets a dasha span.
+
+        Args:
+            target_planets: Target planet IDs
+            birth_time: Birth time
+            moon_longitude: Birth moon longitude
+            start: Horizon start (UTC)
+            end: Horizon end (UTC)
+            level: Moon KP lord level defining the transit windows
+                ('nl', 'sl', 'ssl'); None scores the whole horizon
+            dispositor_map: Planet dispositor mapping
+            min_score: Drop intervals scoring below this
+            windows: Precomputed kp_lord_windows output to reuse
+
+        Returns:
+            DashaSyncInterval list ordered by start time
+        """
+        spans = self.dasha_spans(birth_time, start, end, moon_longitude)
+        if not spans:
+            return []
+
+        if windows is None:
+            if level is None:
+                jd_range = np.array(
+                    [[datetime_to_julian_day(spans[0].start), datetime_to_julian_day(end)]]
+                )
+                windows = {int(t): jd_range for t in target_planets}
+            else:
+                windows = kp_lord_windows(target_planets, start, end, level)
+
+        span_start = np.array([datetime_to_julian_day(s.start) for s in spans])
+        span_end = np.array([datetime_to_julian_day(s.end) for s in spans])
+        span_ids = [
+            tuple(self._name_to_id(name) for name in (s.mahadasha, s.antardasha, s.pratyantara))
+            for s in spans
+        ]
+
+        intervals = []
+        for target in target_planets:
+            scores: dict[int, tuple[float, str, list[str]]] = {}
+            for w_start, w_end in windows.get(int(target), ()):
+                # Spans overlapping [w_start, w_end)
+                first = int(np.searchsorted(span_end, w_start, side="right"))
+                last = int(np.searchsorted(span_start, w_end, side="left"))
+                for k in range(first, last):
+                    if k not in scores:
+                        scores[k] = self._score_lords(target, *span_ids[k], dispositor_map)
+                    score, sync_level, reasons = scores[k]
+                    if score < min_score:
+                        continue
+                    intervals.append(
+                        DashaSyncInterval(
+                            start=julian_day_to_datetime(max(w_start, span_start[k])),
+                            end=julian_day_to_datetime(min(w_end, span_end[k])),
+                            target_planet=int(target),
+                            mahadasha=spans[k].mahadasha,
+                            antardasha=spans[k].antardasha,
+                            pratyantara=spans[k].pratyantara,
+                            sync_score=score,
+                            sync_level=sync_level,
+                            reasons=list(reasons),
+                        )
+                    )
+
+        intervals.sort(key=lambda iv: (iv.start, iv.target_planet))
+        return intervals
+
+    def batch_sync_intervals(
+        self,
+        charts: Sequence[tuple[datetime, float | None]],
+        target_planets: Sequence[int],
+        start: datetime,
+        end: datetime,
+        level: str | None = "sl",
+        dispositor_map: dict[int, int] | None = None,
+        min_score: float = 0.0,
+    ) -> list[list[DashaSyncInterval]]:
+        """
+        sync_intervals for many natal charts over one shared transit sweep.
+
+        Args:
+            charts: (birth_time, moon_longitude) per chart
+            target_planets: Target planet IDs
+            start: Horizon start (UTC)
+            end: Horizon end (UTC)
+            level: Moon KP lord level defining the transit windows
+            dispositor_map: Planet dispositor mapping
+            min_score: Drop intervals scoring below this
+
+        Returns:
+            One interval list per chart, in input order
+        """
+        windows = None
+        if level is not None:
+            windows = kp_lord_windows(target_planets, start, end, level)
+        return [
+            self.sync_intervals(
+                target_planets,
+                birth_time,
+                moon_longitude,
+                start,
+                end,
+                level,
+                dispositor_map,
+                min_score,
+                windows,
+            )
+            for birth_time, moon_longitude in charts
+        ]
+
     def get_best_transit_times(
         self,
         target_planet: int,
         birth_time: datetime,
         moon_longitude: float,
         days_ahead: int = 30,
-    ) -> list[tuple[datetime, float]]:
+        start: datetime | None = None,
+        level: str | None = "sl",
+        limit: int = 10,
+    ) -> list[DashaSyncInterval]:
         """
         Find best times for transit events based on dasha periods.
 
@@ -273,42 +550,25 @@ class TransitDashaSync:
             birth_time: Birth time
             moon_longitude: Birth moon longitude
             days_ahead: How many days to look ahead
+            start: Horizon start (None = now)
+            level: Moon KP lord level defining the transit windows
+            limit: Maximum number of intervals returned
 
         Returns:
-            List of (datetime, score) tuples for best times
+            Highest scoring intervals, earliest first among equal scores
         """
-        best_times = []
-        current_time = datetime.now(UTC)
-
-        # Check dasha changes in the period
-        for days in range(days_ahead):
-            check_time = current_time + timedelta(days=days)
-
-            # Get dasha at this time
-            periods = self.dasha_engine.get_current_dasha_periods(
-                birth_time, moon_longitude, check_time, levels=3
-            )
-
-            if periods:
-                # Check if target planet rules any period
-                for period in periods:
-                    lord_id = self._name_to_id(period.planet)
-                    if lord_id == target_planet:
-                        # Higher score for higher level periods
-                        if period.level == "mahadasha":
-                            score = 1.0
-                        elif period.level == "antardasha":
-                            score = 0.9
-                        else:
-                            score = 0.8
-
-                        best_times.append((check_time, score))
-                        break
-
-        # Sort by score
-        best_times.sort(key=lambda x: x[1], reverse=True)
-
-        return best_times[:10]  # Return top 10
+        if start is None:
+            start = datetime.now(UTC)
+        intervals = self.sync_intervals(
+            [target_planet],
+            birth_time,
+            moon_longitude,
+            start,
+            start + timedelta(days=days_ahead),
+            level,
+        )
+        intervals.sort(key=lambda iv: (-iv.sync_score, iv.start))
+        return intervals[:limit]
 
     def _get_active_dasha_dict(
         self,
@@ -330,17 +590,18 @@ class TransitDashaSync:
         if current_time is None:
             current_time = datetime.now(UTC)
 
-        periods = self.dasha_engine.get_current_dasha_periods(
-            birth_time, moon_longitude, current_time, levels=3
+        periods = self.dasha_engine.get_current_dashas(
+            birth_time, current_time, levels=3, moon_longitude=moon_longitude
         )
 
         result = {}
-        if periods:
-            result["mahadasha"] = periods[0].planet
-            if len(periods) > 1:
-                result["antardasha"] = periods[1].planet
-            if len(periods) > 2:
-                result["pratyantara"] = periods[2].planet
+        for level, key in (
+            ("mahadasha", "mahadasha"),
+            ("antardasha", "antardasha"),
+            ("pratyantardasha", "pratyantara"),
+        ):
+            if level in periods:
+                result[key] = periods[level].planet
 
         return result
 
@@ -409,6 +670,75 @@ class TransitDashaSync:
 
         return score / count
 
+    def _score_lords(
+        self,
+        target: int,
+        maha_id: int | None,
+        antar_id: int | None,
+        pratyantar_id: int | None,
+        dispositor_map: dict[int, int] | None = None,
+    ) -> tuple[float, str, list[str]]:
+        """
+        Score a target against one set of dasha lords.
+
+        Args:
+            target: Target planet ID
+            maha_id: Mahadasha lord ID
+            antar_id: Antardasha lord ID
+            pratyantar_id: Pratyantara lord ID
+            dispositor_map: Planet dispositor mapping
+
+        Returns:
+            Tuple of (score, sync level, reasons)
+        """
+        sync_score = 0.0
+        sync_level = "neutral"
+        reasons = []
+
+        # Direct match check
+        if target == maha_id:
+            sync_score = 1.0
+            sync_level = "direct"
+            reasons.append("Target is Mahadasha lord")
+        elif target == antar_id:
+            sync_score = 0.95
+            sync_level = "direct"
+            reasons.append("Target is Antardasha lord")
+        elif target == pratyantar_id:
+            sync_score = 0.85
+            sync_level = "direct"
+            reasons.append("Target is Pratyantara lord")
+
+        # Dispositor check
+        elif dispositor_map:
+            disp_score, disp_reason = self._check_dispositor_sync(
+                target, [maha_id, antar_id], dispositor_map
+            )
+            if disp_score > 0.5:
+                sync_score = disp_score
+                sync_level = "friendly"
+                reasons.append(disp_reason)
+
+        # Friendship check
+        if sync_score < 0.5:
+            friend_score = self._calculate_friendship_score(
+                target, [maha_id, antar_id, pratyantar_id]
+            )
+            if friend_score > 0.5:
+                sync_score = 0.6
+                sync_level = "friendly"
+                reasons.append("Friendly with dasha lords")
+            elif friend_score < -0.5:
+                sync_score = 0.2
+                sync_level = "hostile"
+                reasons.append("Hostile to dasha lords")
+            else:
+                sync_score = 0.4
+                sync_level = "neutral"
+                reasons.append("Neutral relationship")
+
+        return sync_score, sync_level, reasons
+
     def _check_dispositor_sync(
         self,
         target: int,
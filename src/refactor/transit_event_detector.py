@@ -4,10 +4,10 @@ Transit Event Detector - Main Event Detection and Scoring Logic
 Implements the complete transit event detection system with Promise + Dasha + Transit + RP formula
 """
 
-import json
 import logging
 import time
 
+from collections.abc import Iterator
 from dataclasses import dataclass, field
 from datetime import UTC, datetime, timedelta
 from pathlib import Path
@@ -21,6 +21,7 @@ from .monitoring import (
     transit_events_emitted,
     transit_events_suppressed,
 )
+from .transit_ledger import DedupIndex, EventLedger, RedisDedupStore
 from .transit_gate_system import (
     GateComponents,
     KPGateCalculator,
@@ -118,6 +119,7 @@ class TransitEventDetector:
         ledger_path: Path | None = None,
         fire_threshold: int = FIRE_THRESHOLD,
         cooldown_minutes: int = COOLDOWN_MINUTES,
+        shared_store: RedisDedupStore | None = None,
     ):
         """
         Initialize event detector with components.
@@ -129,6 +131,7 @@ class TransitEventDetector:
             ledger_path: Path for event ledger persistence
             fire_threshold: Minimum score to fire event
             cooldown_minutes: Deduplication cooldown period
+            shared_store: Cross-worker dedup store (from env if None)
         """
         self.moon_engine = moon_engine or MoonTransitEngine()
         self.gate_calculator = gate_calculator or KPGateCalculator()
@@ -137,14 +140,15 @@ class TransitEventDetector:
         self.fire_threshold = fire_threshold
         self.cooldown_minutes = cooldown_minutes
 
-        # Event tracking
-        self.fired_events: dict[str, datetime] = {}  # event_key -> last_fire_time
-        self.event_scores: dict[str, int] = {}  # event_key -> last_score
+        # Event tracking: event_key -> (last_fire_time, last_score)
+        self.dedup = DedupIndex()
         self.event_history: list[TransitEvent] = []
+        self.shared_store = shared_store or RedisDedupStore.from_env()
 
-        # Ledger for persistence
-        self.ledger_path = ledger_path or Path("transit_events.json")
-        self._load_ledger()
+        # Append-only ledger for persistence
+        self.ledger_path = ledger_path or Path("transit_events.jsonl")
+        self.ledger = EventLedger(self.ledger_path)
+        self.ledger.load(self.dedup)
 
         logger.info(
             f"TransitEventDetector initialized: threshold={fire_threshold}, "
@@ -163,6 +167,9 @@ class TransitEventDetector:
         """
         Main detection loop - analyze sky and detect transit events.
 
+        Applies the local dedup index only; use detect_events_async to also
+        claim fires in the cross-worker shared store.
+
         Args:
             ts: UTC timestamp for detection
             planet_positions: Current planetary positions
@@ -174,8 +181,53 @@ class TransitEventDetector:
         Returns:
             List of detected transit events
         """
-        # Start timing for metrics
         start_time = time.perf_counter()
+        candidates = self._collect_candidates(
+            ts, planet_positions, aspects, dasha_data, rp_data, promise_data
+        )
+        return self._commit_events(ts, candidates, start_time)
+
+    async def detect_events_async(
+        self,
+        ts: datetime,
+        planet_positions: dict[int, dict],
+        aspects: list[dict] | None = None,
+        dasha_data: dict | None = None,
+        rp_data: dict | None = None,
+        promise_data: dict | None = None,
+    ) -> list[TransitEvent]:
+        """
+        detect_events plus one batched claim of all fires in the shared store.
+
+        Candidates that another worker already fired are dropped before they
+        are recorded, so each event is emitted once across workers.
+        """
+        start_time = time.perf_counter()
+        candidates = self._collect_candidates(
+            ts, planet_positions, aspects, dasha_data, rp_data, promise_data
+        )
+        if self.shared_store is not None and candidates:
+            granted = await self.shared_store.claim_many(
+                [(event.id, event.score) for event in candidates],
+                timedelta(minutes=self.cooldown_minutes),
+                self.UP_THRESHOLD,
+            )
+            denied = granted.count(False)
+            if denied:
+                transit_events_suppressed.labels(reason="dedup").inc(denied)
+            candidates = [event for event, ok in zip(candidates, granted) if ok]
+        return self._commit_events(ts, candidates, start_time)
+
+    def _collect_candidates(
+        self,
+        ts: datetime,
+        planet_positions: dict[int, dict],
+        aspects: list[dict] | None,
+        dasha_data: dict | None,
+        rp_data: dict | None,
+        promise_data: dict | None,
+    ) -> list[TransitEvent]:
+        """Events that pass the score threshold and the local dedup index."""
         events = []
         suppressed_count = {"dedup": 0, "low_score": 0, "session_filter": 0}
 
@@ -262,9 +314,18 @@ class TransitEventDetector:
 
                 events.append(event)
 
-                # Update tracking
-                self.fired_events[event_key] = ts
-                self.event_scores[event_key] = score
+        logger.debug(f"Detection candidates: {len(events)}, suppressed: {suppressed_count}")
+        return events
+
+    def _commit_events(
+        self, ts: datetime, events: list[TransitEvent], start_time: float
+    ) -> list[TransitEvent]:
+        """Record fired events, apply combo bonus and update history/metrics."""
+        for event in events:
+            self.dedup.record(event.id, ts, event.score)
+            self.ledger.append(event.id, ts, event.score)
+        if events:
+            transit_events_emitted.labels(market="DEFAULT", session="REGULAR").inc(len(events))
 
         # Check for double/triple transits and add combo bonus
         events = self._apply_combo_bonus(events)
@@ -274,21 +335,51 @@ class TransitEventDetector:
         if len(self.event_history) > 1000:
             self.event_history = self.event_history[-1000:]
 
-        # Persist ledger
-        if events:
-            self._save_ledger()
+        # Expire old dedup entries
+        self.dedup.prune()
 
         # Record detection duration
         duration = time.perf_counter() - start_time
         transit_events_detect_duration.observe(duration)
 
-        logger.debug(
-            f"Detection completed: {len(events)} events in {duration*1000:.2f}ms, "
-            f"suppressed: {suppressed_count}"
-        )
+        logger.debug(f"Detection completed: {len(events)} events in {duration*1000:.2f}ms")
 
         return events
 
+    def backtest(
+        self,
+        start: datetime,
+        end: datetime,
+        step: timedelta = timedelta(minutes=1),
+        dasha_data: dict | None = None,
+        rp_data: dict | None = None,
+        promise_data: dict | None = None,
+    ) -> Iterator[TransitEvent]:
+        """
+        Replay detection over a historical range as an event stream.
+
+        Same scoring as detect_events, evaluated in vectorized chunks (see
+        transit_backtest). Dedup is kept in memory against simulated time;
+        the ledger, history and live metrics are left untouched.
+
+        Args:
+            start: First sample (UTC)
+            end: Last sample (UTC)
+            step: Sample spacing
+            dasha_data: Dasha periods, held fixed over the range
+            rp_data: Ruling planets, held fixed over the range
+            promise_data: Birth chart promise tags
+
+        Yields:
+            Fired TransitEvents in time order
+        """
+        from .transit_backtest import iter_backtest_events
+
+        for batch in iter_backtest_events(
+            self, start, end, step, dasha_data, rp_data, promise_data
+        ):
+            yield from batch
+
     def _calculate_final_score(
         self, gate: float, kernel: float, promise: float, dasha: float, rp: float
     ) -> int:
@@ -440,21 +531,13 @@ class TransitEventDetector:
         fraction = matches / len(rp_planets) if rp_planets else 0
         return 0.25 + (0.75 * fraction)
 
-    def _should_fire_event(
-        self,
-        event_key: str,
-        score: int,
-        market: str = "DEFAULT",
-        session: str = "REGULAR",
-    ) -> bool:
+    def _should_fire_event(self, event_key: str, score: int) -> bool:
         """
-        Determine if event should fire based on score and cooldown.
+        Determine if event should fire based on score and local cooldown.
 
         Args:
             event_key: Unique event identifier
             score: Current event score
-            market: Market type for metrics
-            session: Session type for metrics
 
         Returns:
             True if should fire
@@ -465,20 +548,16 @@ class TransitEventDetector:
             return False
 
         # Check if recently fired
-        if event_key in self.fired_events:
-            last_fire = self.fired_events[event_key]
-            cooldown_end = last_fire + timedelta(minutes=self.cooldown_minutes)
-
-            if datetime.now(UTC) < cooldown_end:
-                # Check for significant score increase
-                last_score = self.event_scores.get(event_key, 0)
-                if score >= self.UP_THRESHOLD and score > last_score + 10:
-                    transit_events_emitted.labels(market=market, session=session).inc()
-                    return True  # Re-fire for significant increase
-                transit_events_suppressed.labels(reason="dedup").inc()
-                return False
-
-        transit_events_emitted.labels(market=market, session=session).inc()
+        cooldown = timedelta(minutes=self.cooldown_minutes)
+        last = self.dedup.get(event_key)
+        if last is not None:
+            last_fire, last_score = last
+            if datetime.now(UTC) < last_fire + cooldown:
+                # Re-fire only for a significant score increase
+                if not (score >= self.UP_THRESHOLD and score > last_score + 10):
+                    transit_events_suppressed.labels(reason="dedup").inc()
+                    return False
+
         return True
 
     def _generate_event_key(
@@ -657,45 +736,9 @@ class TransitEventDetector:
 
         return resonances
 
-    def _load_ledger(self) -> None:
-        """Load persisted event ledger"""
-        if self.ledger_path.exists():
-            try:
-                with open(self.ledger_path) as f:
-                    data = json.load(f)
-                    # Convert ISO strings to datetime
-                    for key, iso_str in data.get("fired_events", {}).items():
-                        self.fired_events[key] = datetime.fromisoformat(iso_str)
-                    self.event_scores = data.get("event_scores", {})
-                logger.info(f"Loaded {len(self.fired_events)} events from ledger")
-            except Exception as e:
-                logger.warning(f"Could not load ledger: {e}")
-
-    def _save_ledger(self) -> None:
-        """Save event ledger for persistence"""
-        try:
-            # Clean old entries
-            cutoff = datetime.now(UTC) - timedelta(hours=24)
-            self.fired_events = {
-                k: v for k, v in self.fired_events.items() if v > cutoff
-            }
-
-            data = {
-                "fired_events": {
-                    k: v.isoformat() for k, v in self.fired_events.items()
-                },
-                "event_scores": self.event_scores,
-                "last_save": datetime.now(UTC).isoformat(),
-            }
-
-            with open(self.ledger_path, "w") as f:
-                json.dump(data, f, indent=2)
-        except Exception as e:
-            logger.warning(f"Could not save ledger: {e}")
-
     def clear_history(self) -> None:
         """Clear event history and caches"""
-        self.fired_events.clear()
-        self.event_scores.clear()
+        self.dedup.clear()
+        self.ledger.compact()
         self.event_history.clear()
         logger.info("Event history cleared")
@@ -0,0 +1,340 @@
+#!/usr/bin/env python3
+"""
+Transit Ledger - Bounded dedup index and append-only event ledger
+
+DedupIndex holds event_key -> (fired_at, score) with a min-heap on fire
+time, so expired entries are dropped in O(log n) each however out of order
+fires arrive, and the index never outgrows its TTL window (or max_entries,
+whichever is hit first).
+
+EventLedger persists fires as one JSON line per record. Appends go to a
+queue drained by a background writer in batches, so detection never waits
+on the disk. When dead lines outnumber live entries by compact_ratio the
+writer rewrites the file from the index (temp file + atomic rename). The
+pre-JSONL ledger ({"fired_events": ..., "event_scores": ...}), at the same
+path or as the .json sibling of a .jsonl path, is read once and rewritten
+in the new format.
+
+RedisDedupStore is an optional cross-worker layer: a fire must also claim
+its key in Redis, with the same cooldown and re-fire rule, so several
+workers ticking the same Moon chain emit each event once.
+"""
+
+import atexit
+import heapq
+import itertools
+import json
+import logging
+import os
+import queue
+import threading
+
+from collections.abc import Iterator
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+LEDGER_TTL_HOURS = float(os.getenv("TRANSIT_LEDGER_TTL_HOURS", "24"))
+LEDGER_MAX_ENTRIES = int(os.getenv("TRANSIT_LEDGER_MAX_ENTRIES", "50000"))
+LEDGER_FLUSH_INTERVAL_S = float(os.getenv("TRANSIT_LEDGER_FLUSH_INTERVAL_S", "1.0"))
+LEDGER_BATCH_SIZE = 256
+LEDGER_COMPACT_RATIO = 4  # Compact when lines > ratio * live entries
+LEDGER_COMPACT_MIN_LINES = 1000
+
+TRANSIT_DEDUP_SHARED = os.getenv("TRANSIT_DEDUP_SHARED", "false").lower() == "true"
+DEDUP_KEY_PREFIX = "transit:dedup:"
+
+
+# ============================================================================
+# IN-MEMORY DEDUP INDEX
+# ============================================================================
+
+
+class DedupIndex:
+    """event_key -> (fired_at, score), expired by fire time, TTL-bounded
+
+    A min-heap on fired_at finds expired (or, over max_entries, oldest)
+    entries in O(log n) whatever order fires arrive in; request timestamps
+    are arbitrary, so insertion order says nothing about age. Heap entries
+    superseded by a re-fire are skipped lazily and compacted away when they
+    outnumber live entries.
+    """
+
+    def __init__(
+        self,
+        ttl: timedelta = timedelta(hours=LEDGER_TTL_HOURS),
+        max_entries: int = LEDGER_MAX_ENTRIES,
+    ):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: dict[str, tuple[datetime, int]] = {}
+        self._heap: list[tuple[datetime, int, str]] = []
+        self._seq = itertools.count()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> tuple[datetime, int] | None:
+        return self._entries.get(key)
+
+    def record(self, key: str, fired_at: datetime, score: int) -> None:
+        """Record a fire; a re-fire replaces the key's previous entry."""
+        self._entries[key] = (fired_at, score)
+        heapq.heappush(self._heap, (fired_at, next(self._seq), key))
+        while len(self._entries) > self.max_entries:
+            self._pop_oldest()
+        if len(self._heap) > 2 * len(self._entries) + 64:
+            self._rebuild()
+
+    def prune(self, now: datetime | None = None) -> int:
+        """Drop entries fired before now - ttl; returns how many."""
+        cutoff = (now or datetime.now(UTC)) - self.ttl
+        dropped = 0
+        while self._heap and self._heap[0][0] < cutoff:
+            if self._pop_oldest():
+                dropped += 1
+        return dropped
+
+    def _pop_oldest(self) -> bool:
+        """Pop the heap top; delete its key if the entry is still live."""
+        fired_at, _, key = heapq.heappop(self._heap)
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] == fired_at:
+            del self._entries[key]
+            return True
+        return False
+
+    def _rebuild(self) -> None:
+        self._heap = [(t, next(self._seq), k) for k, (t, _) in self._entries.items()]
+        heapq.heapify(self._heap)
+
+    def items(self) -> Iterator[tuple[str, tuple[datetime, int]]]:
+        """Entries oldest fire first."""
+        return iter(sorted(self._entries.items(), key=lambda kv: kv[1][0]))
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._heap.clear()
+
+
+# ============================================================================
+# APPEND-ONLY LEDGER
+# ============================================================================
+
+
+def _encode(key: str, fired_at: datetime, score: int) -> str:
+    return json.dumps({"k": key, "t": fired_at.isoformat(), "s": score}, separators=(",", ":"))
+
+
+class EventLedger:
+    """JSONL fire log with a batching background writer and compaction"""
+
+    def __init__(
+        self,
+        path: Path,
+        flush_interval: float = LEDGER_FLUSH_INTERVAL_S,
+        batch_size: int = LEDGER_BATCH_SIZE,
+        compact_ratio: int = LEDGER_COMPACT_RATIO,
+    ):
+        self.path = Path(path)
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.compact_ratio = compact_ratio
+
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._wake = threading.Event()
+        self._pending = 0
+        self._written = threading.Condition()
+        self._file_lock = threading.Lock()
+        self._writer: threading.Thread | None = None
+        self._closed = False
+        self._lines = 0
+        self._index: DedupIndex | None = None
+
+    def load(self, index: DedupIndex) -> None:
+        """Replay the ledger into index (latest record per key wins)."""
+        self._index = index
+        source = self.path
+        if not source.exists():
+            # Pick up a pre-JSONL ledger left next to the new one
+            source = self.path.with_suffix(".json")
+            if self.path.suffix != ".jsonl" or not source.exists():
+                return
+        try:
+            text = source.read_text()
+        except OSError as e:
+            logger.warning(f"Could not load ledger: {e}")
+            return
+
+        legacy = None
+        try:
+            legacy = json.loads(text)
+        except ValueError:
+            pass
+
+        if isinstance(legacy, dict) and "fired_events" in legacy:
+            scores = legacy.get("event_scores", {})
+            for key, iso in sorted(legacy["fired_events"].items(), key=lambda kv: kv[1]):
+                index.record(key, datetime.fromisoformat(iso), int(scores.get(key, 0)))
+            index.prune()
+            self.compact()
+            logger.info(f"Migrated {len(index)} events from legacy ledger")
+            return
+
+        records = []
+        for line in text.splitlines():
+            try:
+                rec = json.loads(line)
+                records.append((datetime.fromisoformat(rec["t"]), rec["k"], int(rec["s"])))
+            except (ValueError, KeyError, TypeError):
+                continue  # torn tail write or foreign line
+        for fired_at, key, score in sorted(records):
+            index.record(key, fired_at, score)
+        index.prune()
+        self._lines = len(records)
+        logger.info(f"Loaded {len(index)} events from ledger")
+
+    def append(self, key: str, fired_at: datetime, score: int) -> None:
+        """Queue a fire for the writer thread; never blocks on I/O."""
+        if self._closed:
+            return
+        with self._written:
+            self._pending += 1
+        self._queue.put(_encode(key, fired_at, score))
+        if self._writer is None:
+            self._start_writer()
+        if self._queue.qsize() >= self.batch_size:
+            self._wake.set()
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Wait until everything queued so far is on disk."""
+        self._wake.set()
+        with self._written:
+            return self._written.wait_for(lambda: self._pending == 0, timeout)
+
+    def close(self) -> None:
+        self.flush()
+        self._closed = True
+        self._wake.set()
+
+    def compact(self) -> None:
+        """Rewrite the file with one line per unexpired index entry."""
+        if self._index is None:
+            return
+        cutoff = datetime.now(UTC) - self._index.ttl
+        lines = [_encode(k, t, s) for k, (t, s) in self._index.items() if t >= cutoff]
+        tmp = self.path.with_suffix(self.path.suffix + ".tmp")
+        with self._file_lock:
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                with open(tmp, "w") as f:
+                    f.write("".join(line + "\n" for line in lines))
+                os.replace(tmp, self.path)
+                self._lines = len(lines)
+            except OSError as e:
+                logger.warning(f"Could not compact ledger: {e}")
+
+    def _start_writer(self) -> None:
+        self._writer = threading.Thread(target=self._run, name="transit-ledger", daemon=True)
+        self._writer.start()
+        atexit.register(self.close)
+
+    def _run(self) -> None:
+        while not self._closed:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            self._drain()
+
+    def _drain(self) -> None:
+        batch = []
+        while True:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        if batch:
+            with self._file_lock:
+                try:
+                    with open(self.path, "a") as f:
+                        f.write("".join(line + "\n" for line in batch))
+                    self._lines += len(batch)
+                except OSError as e:
+                    logger.warning(f"Could not append to ledger: {e}")
+            live = len(self._index) if self._index is not None else 0
+            if self._lines > max(LEDGER_COMPACT_MIN_LINES, self.compact_ratio * live):
+                self.compact()
+            with self._written:
+                self._pending -= len(batch)
+                self._written.notify_all()
+
+
+# ============================================================================
+# SHARED (CROSS-WORKER) DEDUP
+# ============================================================================
+
+# KEYS: one per candidate. ARGV: cooldown ms, up threshold, then one score
+# per key. Returns a 0/1 claim flag per key, all in one round trip.
+_CLAIM_SCRIPT = """
+local ms = ARGV[1]
+local up = tonumber(ARGV[2])
+local out = {}
+for i, key in ipairs(KEYS) do
+  local score = tonumber(ARGV[i + 2])
+  local prev = redis.call('GET', key)
+  if prev and not (score >= up and score > tonumber(prev) + 10) then
+    out[i] = 0
+  else
+    redis.call('SET', key, ARGV[i + 2], 'PX', ms)
+    out[i] = 1
+  end
+end
+return out
+"""
+
+
+class RedisDedupStore:
+    """Cross-worker fire claims in Redis (fails open on Redis errors)
+
+    Uses the process-wide pooled async client (api.services.redis_config)
+    unless one is passed in; all claims of one detection go out as a single
+    script call.
+    """
+
+    def __init__(self, client=None, prefix: str = DEDUP_KEY_PREFIX):
+        self.client = client
+        self.prefix = prefix
+        self._claim = client.register_script(_CLAIM_SCRIPT) if client is not None else None
+
+    @classmethod
+    def from_env(cls) -> "RedisDedupStore | None":
+        """Store on the shared Redis client when TRANSIT_DEDUP_SHARED=true, else None."""
+        if not TRANSIT_DEDUP_SHARED:
+            return None
+        return cls()
+
+    async def _script(self):
+        if self._claim is None:
+            from api.services.redis_config import get_redis
+
+            self.client = await (await get_redis()).get_client()
+            self._claim = self.client.register_script(_CLAIM_SCRIPT)
+        return self._claim
+
+    async def claim_many(
+        self, claims: list[tuple[str, int]], cooldown: timedelta, up_threshold: int
+    ) -> list[bool]:
+        """Claim (key, score) fires; True for each this worker may emit."""
+        if not claims:
+            return []
+        try:
+            script = await self._script()
+            ms = max(1, int(cooldown.total_seconds() * 1000))
+            flags = await script(
+                keys=[self.prefix + key for key, _ in claims],
+                args=[ms, up_threshold, *(score for _, score in claims)],
+            )
+            return [bool(flag) for flag in flags]
+        except Exception as e:
+            logger.warning(f"Shared dedup claim failed, firing locally: {e}")
+            return [True] * len(claims)
@@ -5,7 +5,9 @@ This module provides flexible divisional chart calculations supporting:
 - Equal segment divisions (linear)
 - Classical schemes (Navamsa D9, Dasamsa D10)
 - Custom offset-based schemes
-- High-performance batch processing with Numba JIT
+- High-performance batch processing with Numba JIT: every built-in and
+  custom offset scheme compiles to a numeric rule, so a whole
+  (longitudes x divisors) sign matrix is one kernel call
 
 All calculations are pure mathematical operations without ephemeris dependencies,
 making them suitable for high-frequency trading applications.
@@ -15,7 +17,10 @@ from __future__ import annotations
 
 import logging
 
-from collections.abc import Callable, Iterable
+from collections.abc import Callable, Iterable, Sequence
+from typing import NamedTuple
+
+import numpy as np
 
 from numba import njit
 
@@ -28,6 +33,9 @@ __all__ = [
     "varga_pada",
     "varga_sign",
     "varga_sign_batch",
+    "varga_sign_matrix",
+    "varga_strength_array",
+    "vargottama_matrix",
 ]
 
 logger = logging.getLogger(__name__)
@@ -39,6 +47,35 @@ SchemeFn = Callable[[float, int], int]
 _SCHEMES: dict[str, SchemeFn] = {}
 
 
+class VargaRule(NamedTuple):
+    """Numeric form of a scheme at one divisor, evaluated by the batch kernel.
+
+    offsets: per base sign start offset (RULE_OFFSET / RULE_SCALED)
+    bounds, signs: (2, k) within-sign upper bounds and resulting signs for
+        odd (row 0) and even (row 1) signs (RULE_PIECEWISE); last bound inf
+    """
+
+    kind: int
+    offsets: np.ndarray | None = None
+    bounds: np.ndarray | None = None
+    signs: np.ndarray | None = None
+
+
+RuleFn = Callable[[int], VargaRule]
+
+# Rule kinds understood by _varga_sign_kernel
+RULE_RASI = 0  # D1: base sign
+RULE_OFFSET = 1  # (base + offsets[base] + pada) % 12, pada = within // (30 / divisor)
+RULE_SCALED = 2  # as RULE_OFFSET with pada = int(within * divisor / 30)
+RULE_PIECEWISE = 3  # fixed sign per within-sign interval, by sign parity
+RULE_PYTHON = -1  # no rule registered: column computed by the scheme function
+
+_MAX_PIECES = 8
+
+# Scheme name -> divisor -> VargaRule, for schemes the kernel can evaluate
+_RULES: dict[str, RuleFn] = {}
+
+
 @njit(cache=True)
 def _normalize_longitude(longitude: float) -> float:
     """Normalize longitude to [0, 360) range.
@@ -215,12 +252,36 @@ def _dasamsa_wrapper(longitude: float, divisor: int) -> int:
     return _dasamsa_classical(longitude)
 
 
-def register_scheme(name: str, fn: SchemeFn) -> None:
+def linear_rule(divisor: int) -> VargaRule:
+    """Rule for _linear_varga: base * divisor == base + base * (divisor - 1)."""
+    offsets = (np.arange(12, dtype=np.int64) * (divisor - 1)) % 12
+    return VargaRule(RULE_OFFSET, offsets)
+
+
+_NAVAMSA_OFFSETS = np.array([(0, 8, 4)[sign % 3] for sign in range(12)], dtype=np.int64)
+_DASAMSA_OFFSETS = np.array([0 if sign % 2 == 0 else 8 for sign in range(12)], dtype=np.int64)
+
+
+def _navamsa_rule(divisor: int) -> VargaRule:
+    if divisor != 9:
+        return linear_rule(divisor)
+    return VargaRule(RULE_OFFSET, _NAVAMSA_OFFSETS)
+
+
+def _dasamsa_rule(divisor: int) -> VargaRule:
+    if divisor != 10:
+        return linear_rule(divisor)
+    return VargaRule(RULE_OFFSET, _DASAMSA_OFFSETS)
+
+
+def register_scheme(name: str, fn: SchemeFn, rule: RuleFn | None = None) -> None:
     """Register a varga calculation scheme.
 
     Args:
         name: Scheme identifier
         fn: Function that takes (longitude, divisor) and returns sign index
+        rule: Optional divisor -> VargaRule equivalent of fn; schemes without
+            one still work in varga_sign_matrix, column by column in Python
 
     Raises:
         ValueError: If name is empty or fn is not callable
@@ -231,6 +292,10 @@ def register_scheme(name: str, fn: SchemeFn) -> None:
         raise ValueError("Scheme function must be callable")
 
     _SCHEMES[name] = fn
+    if rule is None:
+        _RULES.pop(name, None)
+    else:
+        _RULES[name] = rule
     logger.debug(f"Registered varga scheme: {name}")
 
 
@@ -264,7 +329,8 @@ def make_custom_offsets_scheme(offsets: dict[int, int], name: str) -> None:
         start_sign = (base_sign + offset_table[base_sign]) % 12
         return (start_sign + pada) % 12
 
-    register_scheme(name, custom_fn)
+    offset_array = np.array([offset_table[i] for i in range(12)], dtype=np.int64)
+    register_scheme(name, custom_fn, lambda divisor: VargaRule(RULE_OFFSET, offset_array))
 
 
 def varga_pada(longitude: float, divisor: int) -> int:
@@ -333,26 +399,160 @@ def varga_sign_batch(
     Returns:
         List of varga sign indices
     """
-    fn = _SCHEMES.get(scheme)
-    if fn is None:
-        available = list_schemes()
-        raise KeyError(f"Unknown varga scheme: {scheme}. Available: {available}")
-
-    return [fn(lon, divisor) for lon in longitudes]
+    lons = np.fromiter(longitudes, dtype=np.float64)
+    return varga_sign_matrix(lons, [divisor], scheme)[:, 0].tolist()
 
 
 @njit(cache=True)
-def _is_vargottama_single(d1_sign: int, varga_sign: int) -> bool:
-    """Check if a planet is vargottama (same sign in D1 and varga).
+def _varga_sign_kernel(lons, kinds, divisors, offsets, bounds, signs, out):
+    """Fill out[i, j] with the sign of lons[i] under column rule j."""
+    for i in range(lons.shape[0]):
+        lon = _normalize_longitude(lons[i])
+        base = int(lon // 30.0)
+        within = lon % 30.0
+        for j in range(kinds.shape[0]):
+            kind = kinds[j]
+            if kind == RULE_RASI:
+                out[i, j] = base
+            elif kind == RULE_PIECEWISE:
+                parity = base % 2
+                k = 0
+                while within >= bounds[j, parity, k]:
+                    k += 1
+                out[i, j] = signs[j, parity, k]
+            elif kind == RULE_OFFSET or kind == RULE_SCALED:
+                divisor = divisors[j]
+                if kind == RULE_OFFSET:
+                    pada = int(within // (30.0 / float(divisor)))
+                else:
+                    pada = int(within * divisor / 30.0)
+                if pada >= divisor:
+                    pada = divisor - 1
+                out[i, j] = (base + offsets[j, base] + pada) % 12
+
+
+def _compile_columns(
+    divisors: Sequence[int], schemes: Sequence[str]
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Turn (divisor, scheme) columns into the kernel's rule arrays."""
+    m = len(divisors)
+    kinds = np.full(m, RULE_PYTHON, dtype=np.int64)
+    divs = np.asarray(divisors, dtype=np.int64)
+    offsets = np.zeros((m, 12), dtype=np.int64)
+    bounds = np.full((m, 2, _MAX_PIECES), np.inf)
+    signs = np.zeros((m, 2, _MAX_PIECES), dtype=np.int64)
+
+    for j, (divisor, scheme) in enumerate(zip(divisors, schemes)):
+        if not (1 <= divisor <= 300):
+            raise ValueError(f"Divisor must be between 1 and 300, got {divisor}")
+        if scheme not in _SCHEMES:
+            available = list_schemes()
+            raise KeyError(f"Unknown varga scheme: {scheme}. Available: {available}")
+        if divisor == 1:
+            kinds[j] = RULE_RASI  # D1 is the base sign under every scheme
+            continue
+        rule_fn = _RULES.get(scheme)
+        if rule_fn is None:
+            continue
+        rule = rule_fn(divisor)
+        kinds[j] = rule.kind
+        if rule.offsets is not None:
+            offsets[j] = rule.offsets
+        if rule.bounds is not None:
+            k = rule.bounds.shape[1]
+            bounds[j, :, :k] = rule.bounds
+            signs[j, :, :k] = rule.signs
+
+    return kinds, divs, offsets, bounds, signs
+
+
+def varga_sign_matrix(
+    longitudes, divisors: Sequence[int], schemes: str | Sequence[str] = "linear"
+) -> np.ndarray:
+    """Varga signs for every longitude under every (divisor, scheme) column.
+
+    One compiled pass covers any number of planets and timestamps; built-in
+    and custom offset schemes run in the kernel, schemes registered without
+    a rule are filled column by column from their Python function.
+
+    Args:
+        longitudes: Array-like of ecliptic longitudes, any shape (for
+            example planets x timestamps)
+        divisors: Divisors, one per output column (1 = D1 rasi)
+        schemes: One scheme for all columns, or one per divisor
+
+    Returns:
+        int8 array of shape longitudes.shape + (len(divisors),) with sign
+        indices 0-11
+
+    Raises:
+        KeyError: If a scheme is not registered
+        ValueError: If a divisor is out of range or schemes/divisors differ
+            in length
+    """
+    divisors = [int(d) for d in divisors]
+    if isinstance(schemes, str):
+        schemes = [schemes] * len(divisors)
+    elif len(schemes) != len(divisors):
+        raise ValueError(f"Got {len(schemes)} schemes for {len(divisors)} divisors")
+
+    lons = np.asarray(longitudes, dtype=np.float64)
+    flat = np.ascontiguousarray(lons.reshape(-1))
+    kinds, divs, offsets, bounds, signs = _compile_columns(divisors, schemes)
+
+    out = np.zeros((flat.size, len(divisors)), dtype=np.int8)
+    _varga_sign_kernel(flat, kinds, divs, offsets, bounds, signs, out)
+    for j in np.flatnonzero(kinds == RULE_PYTHON):
+        fn = _SCHEMES[schemes[j]]
+        out[:, j] = [fn(float(lon), divisors[j]) for lon in flat]
+
+    return out.reshape(lons.shape + (len(divisors),))
+
+
+def _vargottama_schemes(check_vargas: Sequence[int]) -> list[str]:
+    """Scheme used per divisor by the vargottama checks."""
+    schemes = []
+    for divisor in check_vargas:
+        if divisor == 9 and "navamsa_classical" in _SCHEMES:
+            schemes.append("navamsa_classical")
+        elif divisor == 10 and "dasamsa_classical" in _SCHEMES:
+            schemes.append("dasamsa_classical")
+        else:
+            schemes.append("linear")
+    return schemes
+
+
+def vargottama_matrix(longitudes, check_vargas: Sequence[int]) -> np.ndarray:
+    """Vargottama flags: varga sign equals D1 sign, for every longitude.
 
     Args:
-        d1_sign: Sign in D1 (rasi chart)
-        varga_sign: Sign in divisional chart
+        longitudes: Array-like of ecliptic longitudes, any shape
+        check_vargas: Divisors to check
 
     Returns:
-        True if signs match (vargottama)
+        bool array of shape longitudes.shape + (len(check_vargas),)
     """
-    return d1_sign == varga_sign
+    divisors = [1, *check_vargas]
+    signs = varga_sign_matrix(longitudes, divisors, ["linear", *_vargottama_schemes(check_vargas)])
+    return signs[..., 1:] == signs[..., :1]
+
+
+def varga_strength_array(
+    longitudes, check_vargas: Sequence[int], weights: dict[int, float]
+) -> np.ndarray:
+    """Weighted vargottama strength (0-100) for every longitude.
+
+    Args:
+        longitudes: Array-like of ecliptic longitudes, any shape
+        check_vargas: Divisors to check
+        weights: Divisor -> weight; normalized over all entries
+
+    Returns:
+        float64 array of longitudes.shape
+    """
+    total_weight = sum(weights.values())
+    norm = np.array([weights.get(d, 0.0) / total_weight for d in check_vargas])
+    return vargottama_matrix(longitudes, check_vargas) @ norm * 100.0
 
 
 def detect_vargottama(
@@ -377,29 +577,11 @@ def detect_vargottama(
     if check_vargas is None:
         check_vargas = [9]  # Default to D9 (Navamsa)
 
-    results = {}
-
-    for planet_id, longitude in longitudes.items():
-        d1_sign = _get_base_sign(longitude)
-        planet_results = {}
-
-        for divisor in check_vargas:
-            # Select appropriate scheme
-            if divisor == 1:
-                # D1 is always the same as base sign (always vargottama with itself)
-                varga_sign = d1_sign
-            elif divisor == 9 and "navamsa_classical" in _SCHEMES:
-                varga_sign = _navamsa_classical(longitude)
-            elif divisor == 10 and "dasamsa_classical" in _SCHEMES:
-                varga_sign = _dasamsa_classical(longitude)
-            else:
-                varga_sign = _linear_varga(longitude, divisor)
-
-            planet_results[f"D{divisor}"] = _is_vargottama_single(d1_sign, varga_sign)
-
-        results[planet_id] = planet_results
-
-    return results
+    flags = vargottama_matrix(list(longitudes.values()), check_vargas).tolist()
+    keys = [f"D{divisor}" for divisor in check_vargas]
+    return {
+        planet_id: dict(zip(keys, row)) for planet_id, row in zip(longitudes, flags)
+    }
 
 
 def get_varga_strength(
@@ -426,30 +608,14 @@ def get_varga_strength(
     if weights is None:
         weights = {d: 1.0 for d in check_vargas}
 
-    # Normalize weights
-    total_weight = sum(weights.values())
-    norm_weights = {d: w / total_weight for d, w in weights.items()}
-
-    vargottama_results = detect_vargottama(longitudes, check_vargas)
-    strength_scores = {}
-
-    for planet_id in longitudes:
-        score = 0.0
-        for divisor in check_vargas:
-            varga_key = f"D{divisor}"
-            if vargottama_results[planet_id].get(varga_key, False):
-                score += norm_weights.get(divisor, 0.0)
-
-        # Convert to 0-100 scale
-        strength_scores[planet_id] = score * 100.0
-
-    return strength_scores
+    scores = varga_strength_array(list(longitudes.values()), check_vargas, weights)
+    return dict(zip(longitudes, scores.tolist()))
 
 
 # Register default schemes
-register_scheme("linear", _linear_varga)
-register_scheme("navamsa_classical", _navamsa_wrapper)
-register_scheme("dasamsa_classical", _dasamsa_wrapper)
+register_scheme("linear", _linear_varga, linear_rule)
+register_scheme("navamsa_classical", _navamsa_wrapper, _navamsa_rule)
+register_scheme("dasamsa_classical", _dasamsa_wrapper, _dasamsa_rule)
 
 
 # Initialize common custom schemes
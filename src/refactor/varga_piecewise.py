@@ -5,9 +5,18 @@ This module handles divisional charts that don't follow equal segment patterns,
 such as D30 Trimsamsa and special D2 Hora calculations.
 """
 
+import numpy as np
+
 from numba import njit
 
-from refactor.varga import _get_base_sign, _normalize_longitude
+from refactor.varga import (
+    RULE_PIECEWISE,
+    RULE_SCALED,
+    VargaRule,
+    _get_base_sign,
+    _normalize_longitude,
+    linear_rule,
+)
 
 __all__ = [
     "calculate_hora",
@@ -23,6 +32,26 @@ __all__ = [
 TRIMSAMSA_ODD_SEGMENTS = [(5, 8), (5, 10), (8, 3), (7, 5), (5, 6)]  # (span, ruler_id)
 TRIMSAMSA_EVEN_SEGMENTS = [(5, 6), (7, 5), (8, 3), (5, 10), (5, 8)]
 
+# Kernel rules (refactor.varga.varga_sign_matrix); row 0 = odd signs, row 1 = even
+_TRIMSAMSA_RULE = VargaRule(
+    RULE_PIECEWISE,
+    bounds=np.array([[5.0, 10.0, 18.0, 25.0, np.inf], [5.0, 12.0, 20.0, 25.0, np.inf]]),
+    signs=np.array([[0, 9, 8, 2, 1], [1, 2, 8, 9, 0]]),
+)
+_HORA_RULE = VargaRule(
+    RULE_PIECEWISE,
+    bounds=np.array([[15.0, np.inf], [15.0, np.inf]]),
+    signs=np.array([[4, 3], [3, 4]]),
+)
+_SAPTAMSA_RULE = VargaRule(
+    RULE_SCALED, offsets=np.array([0 if sign % 2 == 0 else 6 for sign in range(12)])
+)
+
+
+def _rule_at(divisor: int, classical: int, rule: VargaRule) -> VargaRule:
+    return rule if divisor == classical else linear_rule(divisor)
+
+
 # Sign mapping for Trimsamsa rulers
 TRIMSAMSA_SIGN_MAP = {
     8: 0,  # Mars -> Aries
@@ -214,7 +243,9 @@ def register_piecewise_schemes():
             return _linear_varga(longitude, divisor)
         return calculate_trimsamsa(longitude)
 
-    register_scheme("trimsamsa_classical", trimsamsa_wrapper)
+    register_scheme(
+        "trimsamsa_classical", trimsamsa_wrapper, lambda d: _rule_at(d, 30, _TRIMSAMSA_RULE)
+    )
 
     # D2 Hora
     def hora_wrapper(longitude: float, divisor: int) -> int:
@@ -224,7 +255,7 @@ def register_piecewise_schemes():
             return _linear_varga(longitude, divisor)
         return calculate_hora(longitude)
 
-    register_scheme("hora_classical", hora_wrapper)
+    register_scheme("hora_classical", hora_wrapper, lambda d: _rule_at(d, 2, _HORA_RULE))
 
     # D7 Saptamsa
     def saptamsa_wrapper(longitude: float, divisor: int) -> int:
@@ -234,7 +265,9 @@ def register_piecewise_schemes():
             return _linear_varga(longitude, divisor)
         return calculate_saptamsa(longitude)
 
-    register_scheme("saptamsa_classical", saptamsa_wrapper)
+    register_scheme(
+        "saptamsa_classical", saptamsa_wrapper, lambda d: _rule_at(d, 7, _SAPTAMSA_RULE)
+    )
 
 
 # Additional unequal vargas can be added here:
@@ -1,7 +1,11 @@
 from __future__ import annotations
 
+import functools
+import inspect
 import os
-from typing import Any
+import time
+from contextvars import ContextVar
+from typing import Any, Callable
 from contextlib import contextmanager
 
 
@@ -72,6 +76,9 @@ class _NoopTracer:
 def get_tracer(service: str = "vedacore-api"):
     """Return an OTEL tracer or a no-op tracer if OTEL not installed.
 
+    Spans whose name maps to a Server-Timing stage (see stage_for_span) are
+    also timed into the current request's StageTimings.
+
     Usage:
       tracer = get_tracer("stream")
       with tracer.start_as_current_span("stream.publish") as span:
@@ -79,6 +86,158 @@ def get_tracer(service: str = "vedacore-api"):
     """
     try:
         from opentelemetry import trace  # type: ignore
-        return trace.get_tracer(service)
+        return _StageTracer(trace.get_tracer(service))
     except Exception:
-        return _NoopTracer()
+        return _StageTracer(_NoopTracer())
+
+
+# ---------- Per-request stage timings (Server-Timing) ---------------------
+
+SERVER_TIMING_STAGES = ("ephemeris", "houses", "kp_chain", "cache", "serialization")
+
+# Span-name fragments -> stage; first match wins
+_SPAN_STAGE_RULES = (
+    (".cache", "cache"),
+    ("houses.", "houses"),
+    ("kp.chain", "kp_chain"),
+    ("ephemeris", "ephemeris"),
+    ("serializ", "serialization"),
+)
+
+
+class StageTimings:
+    """Durations per stage for one request.
+
+    Durations are inclusive (a KP chain stage contains the ephemeris calls it
+    makes); re-entering a stage that is already open is not counted twice.
+    """
+
+    __slots__ = ("durations", "counts", "_open")
+
+    def __init__(self) -> None:
+        self.durations: dict[str, float] = {}
+        self.counts: dict[str, int] = {}
+        self._open: dict[str, int] = {}
+
+    def enter(self, stage: str) -> bool:
+        """Open a stage; returns False when it is already open (nested)."""
+        depth = self._open.get(stage, 0)
+        self._open[stage] = depth + 1
+        return depth == 0
+
+    def exit(self, stage: str, seconds: float | None) -> None:
+        self._open[stage] -= 1
+        if seconds is not None:
+            self.durations[stage] = self.durations.get(stage, 0.0) + seconds
+            self.counts[stage] = self.counts.get(stage, 0) + 1
+
+    def header(self, total_seconds: float | None = None) -> str:
+        """Server-Timing header value (durations in milliseconds)."""
+        parts = [
+            f'{stage};dur={self.durations[stage] * 1000:.2f};desc="{self.counts[stage]} calls"'
+            for stage in SERVER_TIMING_STAGES
+            if stage in self.durations
+        ]
+        if total_seconds is not None:
+            parts.append(f"total;dur={total_seconds * 1000:.2f}")
+        return ", ".join(parts)
+
+
+_stage_timings: ContextVar[StageTimings | None] = ContextVar("vc_stage_timings", default=None)
+
+
+def begin_request_timings() -> tuple[StageTimings, Any]:
+    """Start collecting stage timings in this context; returns (timings, token)."""
+    timings = StageTimings()
+    return timings, _stage_timings.set(timings)
+
+
+def end_request_timings(token: Any) -> None:
+    _stage_timings.reset(token)
+
+
+def current_stage_timings() -> StageTimings | None:
+    return _stage_timings.get()
+
+
+def stage_for_span(name: str) -> str | None:
+    for fragment, stage in _SPAN_STAGE_RULES:
+        if fragment in name:
+            return stage
+    return None
+
+
+@contextmanager
+def stage(name: str):
+    """Time a block into the current request's stage timings (if any)."""
+    timings = _stage_timings.get()
+    if timings is None:
+        yield
+        return
+    outer = timings.enter(name)
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings.exit(name, time.perf_counter() - t0 if outer else None)
+
+
+def timed_stage(name: str) -> Callable[[Callable], Callable]:
+    """Decorator form of stage(); near-free outside a timed request."""
+
+    def decorator(func: Callable) -> Callable:
+        if inspect.iscoroutinefunction(func):
+
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                timings = _stage_timings.get()
+                if timings is None:
+                    return await func(*args, **kwargs)
+                outer = timings.enter(name)
+                t0 = time.perf_counter()
+                try:
+                    return await func(*args, **kwargs)
+                finally:
+                    timings.exit(name, time.perf_counter() - t0 if outer else None)
+
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            timings = _stage_timings.get()
+            if timings is None:
+                return func(*args, **kwargs)
+            outer = timings.enter(name)
+            t0 = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                timings.exit(name, time.perf_counter() - t0 if outer else None)
+
+        return wrapper
+
+    return decorator
+
+
+@contextmanager
+def _staged_span(cm: Any, name: str):
+    with stage(name):
+        with cm as span:
+            yield span
+
+
+class _StageTracer:
+    """Tracer wrapper that also feeds stage spans into StageTimings."""
+
+    def __init__(self, tracer: Any) -> None:
+        self._tracer = tracer
+
+    def start_as_current_span(self, name: str, *args: Any, **kwargs: Any):  # type: ignore
+        cm = self._tracer.start_as_current_span(name, *args, **kwargs)
+        stage_name = stage_for_span(name)
+        if stage_name is None or _stage_timings.get() is None:
+            return cm
+        return _staged_span(cm, stage_name)
+
+    def __getattr__(self, attr: str) -> Any:
+        return getattr(self._tracer, attr)
@@ -1,4 +1,8 @@
+import atexit
 import os
+import shutil
+import tempfile
+
 import pytest
 
 
@@ -7,6 +11,16 @@ os.environ.setdefault("VC_SKIP_WARMUP", "1")
 os.environ.setdefault("NUMBA_DISABLE_JIT", "1")
 # Provide a default JWT secret for tests that generate tokens
 os.environ.setdefault("AUTH_JWT_SECRET", "test-secret")
+# Build the lazily created Placidus grid in a scratch dir, never in data/
+if "HOUSE_GRID_DIR" not in os.environ:
+    _grid_dir = tempfile.mkdtemp(prefix="vc-house-grid-")
+    atexit.register(shutil.rmtree, _grid_dir, ignore_errors=True)
+    os.environ["HOUSE_GRID_DIR"] = _grid_dir
+# Same for the service file cache (CacheService / UnifiedCache file backend)
+if "VEDACORE_CACHE_DIR" not in os.environ:
+    _cache_dir = tempfile.mkdtemp(prefix="vc-test-cache-")
+    atexit.register(shutil.rmtree, _cache_dir, ignore_errors=True)
+    os.environ["VEDACORE_CACHE_DIR"] = _cache_dir
 
 
 @pytest.fixture(scope="session")
@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+import asyncio
+import json
+
+from api.services.stream_manager import Frame, StreamManager
+
+
+def test_publish_shares_one_preframed_frame_across_subscribers():
+    async def run():
+        sm = StreamManager()
+        sm._resume_init_attempted = True  # memory only
+        queues = [await sm.subscribe("t") for _ in range(50)]
+        await sm.publish("t", {"x": 1}, event="tick")
+        frames = [q.get_nowait() for q in queues]
+        return frames
+
+    frames = asyncio.run(run())
+    first = frames[0]
+    assert all(f is first for f in frames)
+    env = json.loads(first.text)
+    assert env["payload"] == {"x": 1} and env["event"] == "tick"
+    assert first.sse == f"id: {env['seq']}\nevent: tick\ndata: {first.text}\n\n".encode()
+
+
+def test_replay_since_bisects_ring():
+    async def run():
+        sm = StreamManager()
+        sm._resume_init_attempted = True
+        for _ in range(10):
+            await sm.publish("t", {"k": 1})
+        tail = await sm.replay_since("t", 7)
+        limited = await sm.replay_since("t", 0, limit=3)
+        stats = await sm.resume_stats("t")
+        return tail, limited, stats
+
+    tail, limited, stats = asyncio.run(run())
+    assert [f.seq for f in tail] == [8, 9, 10]
+    assert [f.seq for f in limited] == [1, 2, 3]
+    assert stats["memory"] == {"size": 10, "min_seq": 1, "max_seq": 10}
+
+
+def test_frame_from_stored_text():
+    f = Frame.from_text(b'{"seq": 42, "event": "update", "payload": {}}')
+    assert f.seq == 42 and f.sse.startswith(b"id: 42\nevent: update\n")
@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+import asyncio
+import json
+
+import pytest
+
+from api.services.stream_broker import LocalBroker, LocalBus, StreamBroker
+from api.services.stream_manager import StreamManager
+
+
+def _worker() -> StreamManager:
+    sm = StreamManager()
+    sm._resume_init_attempted = True  # memory only
+    return sm
+
+
+def test_frames_fan_out_across_workers_without_echo():
+    async def run():
+        bus = LocalBus()
+        a, b = _worker(), _worker()
+        broker_a = LocalBroker("a", bus)
+        broker_b = LocalBroker("b", bus)
+        await a.attach_broker(broker_a)
+        await b.attach_broker(broker_b)
+        qa = await a.subscribe("moon")
+        qb = await b.subscribe("moon")
+
+        await a.publish("moon", {"x": 1}, event="tick")
+
+        fa = qa.get_nowait()
+        fb = qb.get_nowait()
+        assert qa.empty() and qb.empty()  # publisher does not receive its echo
+        assert fa.text == fb.text
+        assert [s for s, _ in b._ring["moon"]] == [fa.seq]
+        assert broker_a.stats["echo_skipped"] == 1
+        assert broker_b.stats["received"] == 1
+
+    asyncio.run(run())
+
+
+def test_publish_many_is_one_broker_batch():
+    async def run():
+        bus = LocalBus()
+        a, b = _worker(), _worker()
+        broker_a = LocalBroker("a", bus)
+        await a.attach_broker(broker_a)
+        await b.attach_broker(LocalBroker("b", bus))
+        qb = await b.subscribe("t")
+
+        calls = []
+        orig = broker_a.publish_batch
+
+        async def spy(items):
+            calls.append(len(items))
+            await orig(items)
+
+        broker_a.publish_batch = spy
+        await a.publish_many([("t", {"i": i}, "update") for i in range(5)])
+
+        got = [json.loads(qb.get_nowait().text)["payload"]["i"] for _ in range(5)]
+        assert got == list(range(5))
+        assert calls == [5]
+
+    asyncio.run(run())
+
+
+def test_only_one_worker_leads_a_topic():
+    async def run():
+        bus = LocalBus()
+        a, b = _worker(), _worker()
+        await a.attach_broker(LocalBroker("a", bus))
+        await b.attach_broker(LocalBroker("b", bus))
+
+        assert await a.ensure_topic_leadership("moon", ttl=30)
+        assert not await b.ensure_topic_leadership("moon", ttl=30)
+        assert await b.ensure_topic_leadership("other", ttl=30)
+
+        # Leader shutdown releases the lease to the next worker
+        await a.detach_broker()
+        assert await b.ensure_topic_leadership("moon", ttl=30)
+
+    asyncio.run(run())
+
+
+def test_lease_store_outage_degrades_to_local_leadership(monkeypatch):
+    from api.services import stream_manager as sm_mod
+
+    clock = {"t": 1000.0}
+    monkeypatch.setattr(sm_mod.time, "monotonic", lambda: clock["t"])
+
+    async def run():
+        bus = LocalBus()
+        a, b = _worker(), _worker()
+        broker_a, broker_b = LocalBroker("a", bus), LocalBroker("b", bus)
+        await a.attach_broker(broker_a)
+        await b.attach_broker(broker_b)
+        assert await a.ensure_topic_leadership("moon", ttl=30)
+        assert not await b.ensure_topic_leadership("moon", ttl=30)
+
+        async def down(topic, ttl):
+            raise ConnectionError("redis down")
+
+        broker_a.acquire_leadership = broker_b.acquire_leadership = down
+        clock["t"] += 16  # past a's renewal point
+        # Neither worker can reach the lease store; both keep the topic alive
+        assert await a.ensure_topic_leadership("moon", ttl=30)
+        assert await b.ensure_topic_leadership("moon", ttl=30)
+
+        # Once the store is back the normal lease decides again
+        del broker_a.acquire_leadership, broker_b.acquire_leadership
+        clock["t"] += 16
+        assert await a.ensure_topic_leadership("moon", ttl=30)
+        assert not await b.ensure_topic_leadership("moon", ttl=30)
+        assert not b._degraded
+
+    asyncio.run(run())
+
+
+def test_no_broker_means_every_worker_leads():
+    async def run():
+        sm = StreamManager()
+        return await sm.ensure_topic_leadership("moon")
+
+    assert asyncio.run(run())
+
+
+def test_ring_stays_sorted_for_out_of_order_remote_frames():
+    sm = StreamManager()
+    for seq in (1, 2, 5, 3, 4):
+        sm._store_ring("t", json.dumps({"seq": seq, "event": "update"}))
+    assert [s for s, _ in sm._ring["t"]] == [1, 2, 3, 4, 5]
+
+
+def test_broker_interface_requires_transport_methods():
+    class Partial(StreamBroker):
+        async def publish_batch(self, items):
+            pass
+
+    with pytest.raises(TypeError):
+        Partial("p")
+    with pytest.raises(TypeError):
+        StreamBroker("base")
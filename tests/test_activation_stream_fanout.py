@@ -0,0 +1,156 @@
+from __future__ import annotations
+
+import asyncio
+import json
+
+from datetime import datetime, timezone
+
+import pytest
+
+from api.routers import activation
+from api.routers.activation import LocationRef
+from api.services.minute_fanout import MinuteFanoutCache
+
+MINUTE = datetime(2025, 1, 1, 12, 0, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def counted(monkeypatch):
+    calls = {"sky": 0, "location": []}
+
+    async def fake_sky(ts, profile, request_id):
+        calls["sky"] += 1
+        await asyncio.sleep(0)
+        return object()
+
+    async def fake_location(ts, sky, location, profile, house_system, request_id):
+        calls["location"].append(location.id)
+        await asyncio.sleep(0)
+        return {"id": location.id, "name": location.name, "lat": location.latitude}
+
+    monkeypatch.setattr(activation, "_load_sky_state", fake_sky)
+    monkeypatch.setattr(activation, "_compute_location_activation", fake_location)
+    monkeypatch.setattr(activation, "_activation_cache", MinuteFanoutCache())
+    return calls
+
+
+def _loc(id_: str, lat: float) -> LocationRef:
+    return LocationRef(id=id_, name=id_.title(), latitude=lat, longitude=10.0)
+
+
+def test_identical_streams_share_one_computation(counted):
+    locs = [_loc("a", 10.0), _loc("b", 20.0)]
+
+    async def run():
+        return await asyncio.gather(
+            *[
+                activation._shared_activation_event(
+                    MINUTE, "default", locs, "KP", f"r{i}", False
+                )
+                for i in range(20)
+            ]
+        )
+
+    payloads = asyncio.run(run())
+    assert len(set(payloads)) == 1
+    assert counted["sky"] == 1
+    assert sorted(counted["location"]) == ["a", "b"]
+    body = json.loads(payloads[0])
+    assert [loc["id"] for loc in body["locations"]] == ["a", "b"]
+
+
+def test_overlapping_location_lists_share_per_location_work(counted):
+    async def run():
+        first = await activation._shared_activation_event(
+            MINUTE, "default", [_loc("a", 10.0), _loc("b", 20.0)], "KP", "r1", False
+        )
+        # Same coordinates as "b" under another id, plus one new location
+        second = await activation._shared_activation_event(
+            MINUTE, "default", [_loc("x", 20.0), _loc("c", 30.0)], "KP", "r2", False
+        )
+        return first, second
+
+    _, second = asyncio.run(run())
+    assert counted["sky"] == 1
+    assert sorted(counted["location"]) == ["a", "b", "c"]
+    locs = json.loads(second)["locations"]
+    assert [(loc["id"], loc["name"]) for loc in locs] == [("x", "X"), ("c", "C")]
+
+
+def test_cache_keeps_recent_minutes_and_retries_failures():
+    cache = MinuteFanoutCache(retain_minutes=2)
+    attempts = []
+
+    async def flaky():
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise RuntimeError("boom")
+        return "ok"
+
+    async def run():
+        with pytest.raises(RuntimeError):
+            await cache.get_or_compute(MINUTE, "k", flaky)
+        assert await cache.get_or_compute(MINUTE, "k", flaky) == "ok"
+        assert await cache.get_or_compute(MINUTE, "k", flaky) == "ok"
+        for m in range(1, 4):
+            await cache.get_or_compute(MINUTE.replace(minute=m), "k", flaky)
+
+    asyncio.run(run())
+    assert len(attempts) == 5
+    assert cache.snapshot()["minutes"] == 2
+
+
+def test_late_older_minute_survives_until_newer_buckets_arrive():
+    cache = MinuteFanoutCache(retain_minutes=2)
+    calls = []
+
+    async def compute():
+        calls.append(1)
+        return len(calls)
+
+    async def run():
+        await cache.get_or_compute(MINUTE.replace(minute=5), "k", compute)
+        await cache.get_or_compute(MINUTE.replace(minute=6), "k", compute)
+        # A lagging client asks for an older minute; it must stay cached
+        await cache.get_or_compute(MINUTE.replace(minute=1), "k", compute)
+        await cache.get_or_compute(MINUTE.replace(minute=1), "k", compute)
+
+    asyncio.run(run())
+    assert len(calls) == 3
+    assert sorted(m.minute for m in cache._buckets) == [1, 6]
+
+
+def test_next_aligned_tick_lands_on_interval_grid():
+    assert activation._next_aligned_tick(119.5, 60) == 120
+    assert activation._next_aligned_tick(120.0, 60) == 180
+
+
+def test_stream_events_follow_interval_grid(monkeypatch):
+    seen = []
+
+    async def fake_event(ts, profile, locations, house_system, request_id, include_sky):
+        seen.append(ts)
+        return "{}"
+
+    async def no_sleep(_):
+        return None
+
+    monkeypatch.setattr(activation, "_shared_activation_event", fake_event)
+    monkeypatch.setattr(activation, "_get_kp_effective_timestamp", lambda ts: ts)
+    monkeypatch.setattr(activation.asyncio, "sleep", no_sleep)
+
+    async def run():
+        # Connect 10 s before a minute boundary
+        gen = activation._generate_activation_stream(
+            "2025-01-01T12:00:50Z", "default", [_loc("a", 1.0)], "KP", "r", 60
+        )
+        for _ in range(3):
+            await gen.__anext__()
+        await gen.aclose()
+
+    asyncio.run(run())
+    assert [ts.isoformat() for ts in seen] == [
+        "2025-01-01T12:00:00+00:00",
+        "2025-01-01T12:01:00+00:00",
+        "2025-01-01T12:02:00+00:00",
+    ]
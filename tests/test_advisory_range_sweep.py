@@ -0,0 +1,155 @@
+from __future__ import annotations
+
+import time
+
+from datetime import UTC, datetime
+
+import pytest
+
+from app.services import advisory_service
+from app.services.advisory_service import AdvisoryService
+
+START = datetime(2025, 1, 1, tzinfo=UTC)
+END = datetime(2025, 1, 1, 6, tzinfo=UTC)
+
+
+@pytest.fixture
+def service():
+    svc = AdvisoryService()
+    svc.modules = {}
+    svc.timeout_ms = 200
+    return svc
+
+
+def test_range_reuses_modules_until_inputs_change(service):
+    calls = {"signs": 0, "exact": 0}
+
+    def by_sign(ctx):
+        calls["signs"] += 1
+        return {"asc_sign": int(ctx["ascendant"] / 30)}
+
+    def exact(ctx):
+        calls["exact"] += 1
+        return {"ts": ctx["timestamp"]}
+
+    service.modules = {"ashtakavarga": by_sign, "shadbala": exact}
+    snapshots = service.get_advisory_for_range(START, END, interval_minutes=60)
+
+    assert len(snapshots) == 7
+    # Timestamp-dependent module runs every step; sign-based one only on change
+    assert calls["exact"] == 7
+    assert calls["signs"] < 7
+    assert service.range_stats["reused"] == 7 - calls["signs"]
+    assert [s["advisory"]["shadbala"]["ts"] for s in snapshots] == [
+        s["timestamp"] for s in snapshots
+    ]
+    assert all("ashtakavarga" in s["advisory"] for s in snapshots)
+
+
+def test_range_matches_point_collection(service):
+    service.modules = {
+        "ashtakavarga": lambda ctx: {"n": len(ctx["planets"])},
+        "vedic_aspects": lambda ctx: {"moon": ctx["moon_longitude"]},
+        "declination_lat_flags": lambda ctx: {"moon_lat": ctx["planets"][2]["latitude"]},
+    }
+    snapshots = service.get_advisory_for_range(START, END, interval_minutes=180)
+    for snap in snapshots:
+        point = service.collect_advisory_layers(datetime.fromisoformat(snap["timestamp"]))
+        assert snap["advisory"] == point["advisory"]
+
+
+def test_day_module_reruns_when_local_date_changes(service):
+    dates = []
+
+    def windows(ctx):
+        dates.append(ctx["date"])
+        return {"date": ctx["date"].isoformat()}
+
+    service.modules = {"daily_windows": windows}
+    # 2025-01-01 18:00 UTC to 2025-01-02 18:00 UTC; NYC local midnight ~04:56 UTC
+    snapshots = service.get_advisory_for_range(
+        datetime(2025, 1, 1, 18, tzinfo=UTC), datetime(2025, 1, 2, 18, tzinfo=UTC), 360
+    )
+
+    assert [d.isoformat() for d in dates] == ["2025-01-01", "2025-01-02"]
+    assert [s["advisory"]["daily_windows"]["date"] for s in snapshots] == [
+        "2025-01-01", "2025-01-01", "2025-01-02", "2025-01-02", "2025-01-02"
+    ]
+
+
+def test_module_timeout_is_enforced(service):
+    def slow(ctx):
+        time.sleep(1.0)
+        return {"done": True}
+
+    service.modules = {"slow": slow, "fast": lambda ctx: {"ok": True}}
+
+    started = time.perf_counter()
+    result = service.collect_advisory_layers(START, include_timing=True)
+    assert time.perf_counter() - started < 0.9
+    assert "timed out" in result["advisory"]["slow"]["error"]
+    assert result["advisory"]["fast"] == {"ok": True}
+    assert "slow" not in result["timing"]
+
+
+def test_timed_out_module_is_skipped_for_rest_of_sweep(service):
+    calls = []
+
+    def slow(ctx):
+        calls.append(ctx["timestamp"])
+        time.sleep(0.5)
+        return {"done": True}
+
+    service.modules = {"slow": slow}
+    snapshots = service.get_advisory_for_range(START, END, interval_minutes=120)
+    assert len(calls) == 1
+    assert all("timed out" in s["advisory"]["slow"]["error"] for s in snapshots)
+
+
+def test_range_budget_disables_module(service, monkeypatch):
+    monkeypatch.setattr(advisory_service, "ADVISORY_RANGE_BUDGET_MS", 30)
+
+    def costly(ctx):
+        time.sleep(0.02)
+        return {"ts": ctx["timestamp"]}
+
+    service.modules = {"costly": costly}
+    snapshots = service.get_advisory_for_range(START, END, interval_minutes=60)
+    assert service.range_stats["evaluated"] == 2
+    assert "budget" in snapshots[-1]["advisory"]["costly"]["error"]
+
+
+def test_planet_series_carries_real_latitude(monkeypatch):
+    from datetime import timedelta
+
+    from refactor.swe_backend import get_planet_position_full
+
+    monkeypatch.setattr(advisory_service, "FACADE_AVAILABLE", True)
+    series = advisory_service._load_planet_series([START])
+    calc_time = START + timedelta(seconds=307)  # KP offset, as in the series
+    for planet_id in (2, 9):
+        ref = get_planet_position_full(calc_time, planet_id)
+        assert series[0][planet_id]["latitude"] == pytest.approx(ref["latitude"], abs=1e-6)
+    assert series[0][2]["latitude"] != 0.0
+
+
+def test_repeated_timeouts_bench_module(service, monkeypatch):
+    monkeypatch.setattr(advisory_service, "ADVISORY_TIMEOUT_STRIKES", 2)
+    service.timeout_ms = 50
+    calls = []
+
+    def slow(ctx):
+        calls.append(1)
+        time.sleep(0.15)
+        return {"done": True}
+
+    service.modules = {"slow": slow}
+
+    assert "timed out" in service.collect_advisory_layers(START)["advisory"]["slow"]["error"]
+    # Earlier call still holds its worker: not resubmitted
+    assert "still running" in service.collect_advisory_layers(START)["advisory"]["slow"]["error"]
+    time.sleep(0.2)
+    assert "timed out" in service.collect_advisory_layers(START)["advisory"]["slow"]["error"]
+    time.sleep(0.2)
+    assert "consecutive timeouts" in service.collect_advisory_layers(START)["advisory"]["slow"]["error"]
+    assert len(calls) == 2
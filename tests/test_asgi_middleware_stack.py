@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from fastapi import FastAPI, Request
+from fastapi.responses import StreamingResponse
+
+from api.middleware import asgi
+
+httpx = pytest.importorskip("httpx")
+
+LAYERS = ["request_id", "idempotency", "usage_metering", "log_redaction", "ephemeris_headers"]
+
+
+def _build_app():
+    from api.middleware.ephemeris_headers import EphemerisHeadersMiddleware
+    from api.middleware.idempotency import IdempotencyMiddleware
+    from api.middleware.log_redaction import LogRedactionMiddleware
+    from api.middleware.request_id import RequestIDMiddleware
+    from api.middleware.usage_metering import UsageMeteringMiddleware
+
+    app = FastAPI()
+    # Same order as apps.api.main
+    app.add_middleware(RequestIDMiddleware)
+    app.add_middleware(IdempotencyMiddleware)
+    app.add_middleware(UsageMeteringMiddleware, enable_metering=True)
+    app.add_middleware(LogRedactionMiddleware)
+    app.add_middleware(EphemerisHeadersMiddleware)
+
+    @app.get("/houses")
+    async def houses(request: Request):
+        request.state.cache_status = "HIT"
+        return {
+            "request_id": request.state.request_id,
+            "redacted_url": request.state.redacted_url,
+        }
+
+    @app.get("/stream")
+    async def stream():
+        async def events():
+            for i in range(3):
+                yield f"data: {i}\n\n".encode()
+                await asyncio.sleep(0)
+
+        return StreamingResponse(events(), media_type="text/event-stream")
+
+    return app
+
+
+def _get(app, path, **kwargs):
+    async def run():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://t") as client:
+            return await client.get(path, **kwargs)
+
+    return asyncio.run(run())
+
+
+def test_headers_and_request_state_flow_through_stack():
+    app = _build_app()
+    resp = _get(app, "/houses?token=abcdef123456789", headers={"X-Request-ID": "req-1"})
+
+    assert resp.status_code == 200
+    assert resp.headers["x-request-id"] == "req-1"
+    assert resp.headers["x-cache-status"] == "HIT"
+    assert resp.headers["computed_from_cache"] == "true"
+    assert resp.headers["x-ephemeris-build"].startswith("swe-")
+    assert "x-ratelimit-limit" in resp.headers
+    body = resp.json()
+    assert body["request_id"] == "req-1"
+    assert "abcdef123456789" not in body["redacted_url"]
+
+
+def test_streaming_response_passes_through_unbuffered():
+    app = _build_app()
+    resp = _get(app, "/stream")
+    assert resp.text == "data: 0\n\ndata: 1\n\ndata: 2\n\n"
+    assert resp.headers["x-request-id"]
+
+
+def test_timing_mode_records_every_layer(monkeypatch):
+    from prometheus_client import REGISTRY
+
+    monkeypatch.setattr(asgi, "MIDDLEWARE_TIMING", True)
+    app = _build_app()
+
+    def counts():
+        return {
+            layer: REGISTRY.get_sample_value(
+                "vc_middleware_layer_seconds_count", {"layer": layer}
+            )
+            or 0.0
+            for layer in LAYERS
+        }
+
+    before = counts()
+    _get(app, "/houses")
+    after = counts()
+    assert all(after[layer] == before[layer] + 1 for layer in LAYERS)
+
+
+def test_non_http_scopes_pass_through():
+    seen = []
+
+    async def inner(scope, receive, send):
+        seen.append(scope["type"])
+
+    mw = asgi.ASGIMiddleware(inner)
+    asyncio.run(mw({"type": "lifespan"}, None, None))
+    assert seen == ["lifespan"]
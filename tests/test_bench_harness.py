@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+import asyncio
+
+from benchmarks import harness
+
+
+def test_run_case_times_per_call_and_supports_async_setup():
+    calls = []
+
+    async def setup():
+        await asyncio.sleep(0)
+
+        async def run():
+            calls.append(1)
+
+        return run
+
+    case = harness.Case("t.async", "core", setup, number=4, rounds=3, warmup=2)
+    result = harness.run_case(case)
+    assert len(calls) == 2 + 4 * 3
+    assert result.rounds == 3 and result.number == 4
+    assert result.min_s <= result.median_s <= result.p95_s
+
+
+def test_compare_flags_regressions_against_saved_baseline(tmp_path):
+    case = harness.Case("t.case", "core", lambda: None)
+    base = harness.summarize(case, [1.0, 1.0, 1.0])
+    path = harness.save_baseline(str(tmp_path / "b.json"), [base])
+    assert path.exists()
+    baseline = harness.load_baseline(str(path))
+
+    slower = harness.summarize(case, [1.3, 1.3, 1.3])
+    same = harness.summarize(case, [1.05, 1.0, 1.1])
+    other = harness.summarize(harness.Case("t.new", "core", lambda: None), [1.0])
+
+    rows = {r["name"]: r for r in harness.compare([slower, other], baseline, threshold=0.2)}
+    assert rows["t.case"]["status"] == "regression"
+    assert rows["t.new"]["status"] == "new"
+    assert harness.compare([same], baseline)[0]["status"] == "ok"
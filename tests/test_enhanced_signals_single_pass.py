@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import asyncio
+
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+
+from app.core.config import NY_TZ
+from app.services.enhanced_signals_service import EnhancedSignalsService
+from refactor.facade import get_positions
+
+DAY = datetime(2025, 3, 12, tzinfo=NY_TZ)
+
+
+def _changes():
+    base = DAY.replace(hour=9, minute=30)
+    return [
+        SimpleNamespace(timestamp_ny=base + timedelta(minutes=47, seconds=13), level="sl2"),
+        SimpleNamespace(timestamp_ny=base + timedelta(seconds=20), level="sl"),
+        SimpleNamespace(timestamp_ny=base + timedelta(hours=5, minutes=2), level="nl"),
+    ]
+
+
+def _reference_strength(svc, ts, changes, timeframe):
+    delta = min(abs((c.timestamp_ny - ts).total_seconds()) for c in changes)
+    factor = max(0, 1 - delta / (svc.timeframes[timeframe] * 2))
+    mult = {"1m": 1.0, "5m": 0.8, "15m": 0.6, "1h": 0.4, "4h": 0.2, "1d": 0.1}[timeframe]
+    return round(factor * mult * 100, 2)
+
+
+@pytest.fixture
+def svc(monkeypatch):
+    service = EnhancedSignalsService()
+
+    async def changes_for_day(date, planet_id):
+        return _changes()
+
+    monkeypatch.setattr(service.facade_adapter, "get_changes_for_day", changes_for_day)
+    return service
+
+
+def test_single_pass_matches_per_slice_scoring(svc):
+    changes = _changes()
+    out = asyncio.run(
+        svc._analyze_multi_timeframe_signals(DAY, list(svc.timeframes), 2, changes)
+    )
+    assert set(out) == set(svc.timeframes)
+    assert out["1m"], "expected 1m signals around the changes"
+
+    for timeframe, signals in out.items():
+        for sig in signals:
+            ts = datetime.fromisoformat(sig["timestamp"])
+            assert sig["strength"] == _reference_strength(svc, ts, changes, timeframe)
+            assert sig["strength"] > 0
+
+    # Around the open only the SL change is within the 30-minute level window
+    near_open = [s for s in out["1m"] if s["timestamp"].startswith("2025-03-12T09:3")]
+    assert all(s["level"] == "sl" for s in near_open)
+
+
+def test_positions_match_facade(svc):
+    out = asyncio.run(svc._analyze_multi_timeframe_signals(DAY, ["1m", "1h"], 2, _changes()))
+    for sig in out["1m"][:3] + out["1h"][:1]:
+        interval = svc.timeframes[sig["timeframe"]]
+        mid = datetime.fromisoformat(sig["timestamp"]) + timedelta(seconds=interval / 2)
+        ref = get_positions(mid.astimezone(timezone.utc), 2, apply_kp_offset=True)
+        assert sig["position"] == pytest.approx(ref.position, abs=1e-6)
+        assert (sig["nl"], sig["sl"], sig["sl2"]) == (ref.nl, ref.sl, ref.sl2)
+
+
+def test_multi_timeframe_response(svc):
+    result = asyncio.run(
+        svc.get_multi_timeframe_signals("2025-03-12", use_cache=False)
+    )
+    counts = {tf: body["signal_count"] for tf, body in result["timeframes"].items()}
+    assert counts["1m"] > 0 and counts["1d"] >= 0
+    assert result["planets"]["2"]["signal_count"] == sum(counts.values())
+
+
+def test_slices_stay_on_epoch_grid_across_dst(svc):
+    # 2025-03-09 is the spring-forward day; the 4h/1d windows span it
+    dst_day = datetime(2025, 3, 9, tzinfo=NY_TZ)
+    base = dst_day.replace(hour=1)
+    changes = [
+        SimpleNamespace(timestamp_ny=base + timedelta(hours=h), level="sl") for h in (0, 4, 8)
+    ]
+    out = asyncio.run(svc._analyze_multi_timeframe_signals(dst_day, ["4h"], 2, changes))
+    epochs = [datetime.fromisoformat(s["timestamp"]).timestamp() for s in out["4h"]]
+    assert len(epochs) > 3
+    window_start = (dst_day - timedelta(days=1)).timestamp()
+    assert all((e - window_start) % 14400 == 0 for e in epochs)
+    for sig in out["4h"]:
+        ts = datetime.fromisoformat(sig["timestamp"])
+        assert sig["strength"] == _reference_strength(svc, ts, changes, "4h")
+
+
+def test_real_adapter_changes_for_day():
+    from app.services.facade_adapter import FacadeAdapter
+
+    events = asyncio.run(FacadeAdapter().get_changes_for_day(DAY, 2))
+    assert events, "the Moon changes sub-lord several times a day"
+    day_start = DAY.astimezone(timezone.utc)
+    for event in events:
+        assert event.level in {"nl", "sl", "sl2"}
+        assert day_start <= event.timestamp_utc < day_start + timedelta(days=1)
+        assert event.timestamp_ny.utcoffset() == timedelta(hours=-4)  # EDT on 2025-03-12
+        assert event.timestamp_ny == event.timestamp_utc
+    assert [e.timestamp_utc for e in events] == sorted(e.timestamp_utc for e in events)
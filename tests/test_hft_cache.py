@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import threading
+
+from datetime import UTC, datetime, timedelta
+
+from refactor import swe_backend
+from refactor.facade import get_positions
+from refactor.hft_cache import HFTCache, PlanetPositionCache, cache_key
+
+T0 = datetime(2025, 3, 12, 13, 30, tzinfo=UTC)
+
+
+def test_prefill_matches_get_positions_every_second():
+    cache = PlanetPositionCache()
+    assert cache.prefill(T0, T0 + timedelta(minutes=5), planet_id=2) == 2 * 301
+
+    for s in range(0, 301, 7):
+        ts = T0 + timedelta(seconds=s)
+        for flag in (True, False):
+            assert cache.get_position(ts, 2, flag) == get_positions(
+                ts, 2, flag, use_hft_cache=False
+            )
+    # Sub-second timestamps fall into the same bucket
+    assert cache.get_position(T0 + timedelta(seconds=3.7), 2, True) is cache.get_position(
+        T0 + timedelta(seconds=3), 2, True
+    )
+    assert cache.get_all_stats()[2]["size"] == 602
+
+
+def test_ketu_prefill_matches_get_positions():
+    cache = PlanetPositionCache()
+    cache.prefill(T0, T0 + timedelta(seconds=2), planet_id=7, apply_offsets=(False,))
+    assert cache.get_position(T0, 7, False) == get_positions(T0, 7, False, use_hft_cache=False)
+    assert cache.get_position(T0, 7, True) is None
+
+
+def test_ring_overwrites_older_bucket():
+    ring = HFTCache(size=8)
+    old, new = cache_key(T0, True), cache_key(T0 + timedelta(seconds=4), True)
+    assert old % 8 == new % 8
+
+    ring.set(old, "old")
+    assert ring.get(old) == "old"
+    ring.set(new, "new")
+    assert ring.get(old) is None and ring.get(new) == "new"
+
+    stats = ring.get_stats()
+    assert (stats["hits"], stats["misses"], stats["evictions"], stats["size"]) == (2, 1, 1, 1)
+
+
+def test_caches_start_no_threads():
+    before = threading.active_count()
+    cache = PlanetPositionCache()
+    for pid in range(1, 10):
+        cache.set_position(T0, pid, True, pid)
+    assert threading.active_count() == before
+    assert cache.get_position(T0, 5, True) == 5
+    assert cache.get_position(T0, 5, False) is None
+
+
+def test_prefill_releases_ephemeris_lock_between_chunks(monkeypatch):
+    acquisitions = []
+    real = swe_backend._swe_lock
+
+    class CountingLock:
+        def __enter__(self):
+            acquisitions.append(1)
+            return real.__enter__()
+
+        def __exit__(self, *exc):
+            return real.__exit__(*exc)
+
+    monkeypatch.setattr(swe_backend, "_swe_lock", CountingLock())
+    monkeypatch.setattr(swe_backend, "SERIES_LOCK_CHUNK", 50)
+    PlanetPositionCache().prefill(T0, T0 + timedelta(seconds=199), apply_offsets=(False,))
+    assert len(acquisitions) == 4
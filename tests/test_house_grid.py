@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+from datetime import UTC, datetime
+
+import numpy as np
+import pytest
+import swisseph as swe
+
+from refactor import house_grid, houses
+from refactor.house_config import initialize_house_config
+
+
+def _arcsec(a, b) -> float:
+    return float(np.abs((np.asarray(a) - np.asarray(b) + 180.0) % 360.0 - 180.0).max() * 3600.0)
+
+
+@pytest.fixture(scope="module")
+def grid(tmp_path_factory):
+    path = house_grid.grid_path(tmp_path_factory.mktemp("grid"), step=1.0, max_lat=50.0)
+    house_grid.build_grid(path, step=1.0, max_lat=50.0)
+    return house_grid.load_grid(path, 1.0, 50.0)
+
+
+def _exact_tropical(armc, lat, eps):
+    return np.array(swe.houses_armc(armc, lat, eps, b"P")[0][:12])
+
+
+def test_interpolated_cusps_match_houses_armc(grid):
+    rng = np.random.default_rng(7)
+    armc = rng.uniform(0.0, 360.0, 200)
+    lat = rng.uniform(-50.0, 50.0, 200)
+    eps = rng.uniform(23.40, 23.45, 200)
+    got = grid.tropical_cusps(armc, lat, eps)
+    worst = max(_arcsec(got[n], _exact_tropical(armc[n], lat[n], eps[n])) for n in range(200))
+    assert worst < 5.0  # 1° test grid; the default 0.5° grid stays under 1"
+
+
+def test_armc_wraparound_and_grid_nodes(grid):
+    armc = np.array([0.0, 359.999, 0.001, 180.0])
+    lat = np.array([40.0, 40.0, -12.5, 0.0])
+    eps = np.full(4, house_grid.EPS_REF)
+    got = grid.tropical_cusps(armc, lat, eps)
+    for n in range(4):
+        assert _arcsec(got[n], _exact_tropical(armc[n], lat[n], eps[n])) < 1.0
+
+
+def test_sky_terms_track_swiss_ephemeris():
+    for jd in (2451545.0, 2460747.123456, 2470000.987):
+        armc0, eps, ayanamsa = house_grid.sky_terms(jd)
+        assert _arcsec(armc0, swe.sidtime(jd) * 15.0) < 0.01
+        assert abs(eps - swe.calc_ut(jd, swe.ECL_NUT)[0][0]) * 3600 < 0.01
+        assert abs(ayanamsa - swe.get_ayanamsa_ut(jd)) * 3600 < 0.01
+
+
+def test_batch_marks_uncovered_latitudes(grid, monkeypatch):
+    monkeypatch.setattr(house_grid, "get_grid", lambda: grid)
+    cusps, covered = house_grid.placidus_cusps(2460747.1, [40.7, 61.0, -33.9], [-74.0, 10.0, 151.2])
+    assert covered.tolist() == [True, False, True]
+    assert np.isnan(cusps[1]).all() and not np.isnan(cusps[[0, 2]]).any()
+
+
+def test_compute_houses_uses_grid_and_falls_back(grid, monkeypatch):
+    monkeypatch.setattr(house_grid, "get_grid", lambda: grid)
+    initialize_house_config()
+    ts = datetime(2025, 3, 12, 14, 30, tzinfo=UTC)
+    jd = houses._julday(ts)
+
+    for lat, lon in ((40.7128, -74.0060), (-33.87, 151.21), (60.17, 24.94)):
+        got = houses.compute_houses(ts, lat, lon)
+        exact = houses._placidus_exact(jd, lat, lon)
+        assert _arcsec(got.cusps, exact.cusps) < 5.0
+        assert got.asc == got.cusps[0] and got.mc == got.cusps[9]
+        if not grid.covers(lat):
+            assert got == exact
+
+    with pytest.raises(ValueError):
+        houses.compute_houses(ts, 89.0, 0.0)
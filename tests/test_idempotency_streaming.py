@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from api.middleware import idempotency
+from api.middleware.idempotency import IdempotencyMiddleware
+
+httpx = pytest.importorskip("httpx")
+
+
+class FakeRedis:
+    def __init__(self):
+        self.data: dict[str, bytes] = {}
+
+    async def set(self, key, value, ex=None):
+        self.data[key] = value
+
+    async def execute_command(self, name, key, **options):
+        assert name == "GET"
+        return self.data.get(key)
+
+
+class FakeManager:
+    def __init__(self):
+        self.client = FakeRedis()
+
+    async def get_client(self):
+        return self.client
+
+
+def _app(max_body_bytes=idempotency.IDEMPOTENCY_MAX_BODY_BYTES):
+    from fastapi import FastAPI
+    from fastapi.responses import StreamingResponse
+
+    app = FastAPI()
+    app.add_middleware(IdempotencyMiddleware, max_body_bytes=max_body_bytes)
+    app.state.calls = 0
+
+    @app.post("/batch")
+    async def batch():
+        app.state.calls += 1
+
+        async def rows():
+            for i in range(500):
+                yield f'{{"row":{i},"value":"{"x" * 64}"}}\n'.encode()
+
+        return StreamingResponse(rows(), media_type="application/x-ndjson")
+
+    return app
+
+
+@pytest.fixture
+def redis_mgr(monkeypatch):
+    mgr = FakeManager()
+
+    async def get_redis():
+        return mgr
+
+    monkeypatch.setattr(idempotency, "get_redis", get_redis)
+    return mgr
+
+
+def _post_twice(app, key="batch-9c1e"):
+    async def run():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://t") as client:
+            headers = {"Idempotency-Key": key}
+            first = await client.post("/batch", json={"n": 500}, headers=headers)
+            second = await client.post("/batch", json={"n": 500}, headers=headers)
+            return first, second
+
+    return asyncio.run(run())
+
+
+def test_streamed_response_is_cached_compressed_and_replayed(redis_mgr):
+    app = _app()
+    first, second = _post_twice(app)
+
+    assert app.state.calls == 1
+    assert first.content == second.content
+    assert len(first.content.splitlines()) == 500
+    assert second.headers["x-idempotency-replayed"] == "true"
+    assert second.headers["content-type"] == "application/x-ndjson"
+
+    (stored,) = redis_mgr.client.data.values()
+    assert isinstance(stored, bytes)
+    assert len(stored) < len(first.content) // 4
+
+
+def test_response_over_size_cap_is_not_cached(redis_mgr):
+    app = _app(max_body_bytes=4096)
+    first, second = _post_twice(app)
+
+    assert app.state.calls == 2
+    assert first.content == second.content
+    assert "x-idempotency-replayed" not in second.headers
+    assert redis_mgr.client.data == {}
+
+
+def test_invalid_key_is_rejected(redis_mgr):
+    app = _app()
+
+    async def run():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://t") as client:
+            return await client.post("/batch", json={}, headers={"Idempotency-Key": "null"})
+
+    assert asyncio.run(run()).status_code == 400
+    assert app.state.calls == 0
+
+
+def test_entry_codec_round_trips_and_reads_legacy_json():
+    entry = {
+        "status_code": 201,
+        "headers": [["content-type", "application/json"]],
+        "body": b'{"ok":true}' * 200,
+        "timestamp": 1700000000,
+        "idempotency_key": "k",
+    }
+    assert idempotency._decode_entry(idempotency._encode_entry(entry)) == entry
+
+    legacy = (
+        '{"status_code": 200, "headers": {"content-type": "application/json"},'
+        ' "body": "{}", "media_type": null, "timestamp": 1, "idempotency_key": "k"}'
+    )
+    decoded = idempotency._decode_entry(legacy)
+    assert decoded["body"] == b"{}"
+    assert decoded["headers"] == [["content-type", "application/json"]]
@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+import asyncio
+import sys
+import types
+
+from datetime import datetime, timezone
+
+from api.middleware.usage_metering import UsageMeteringMiddleware
+from loadtest import runner, standins
+
+
+def test_recorder_summary_percentiles():
+    rec = runner.Recorder()
+    for ms in range(1, 101):
+        rec.ok(ms / 1000)
+    rec.fail(500)
+    rec.started, rec.finished = 0.0, 2.0
+
+    summary = rec.summary()
+    assert summary["requests"] == 101 and summary["errors"] == 1
+    assert summary["statuses"] == {"200": 100, "500": 1}
+    assert summary["throughput_rps"] == 50.0
+    assert summary["latency_ms"]["p50"] == 50.5
+    assert 99.0 <= summary["latency_ms"]["p99"] <= 100.0
+
+
+def test_diff_reports_relative_changes():
+    def report(rps, p95, rss):
+        return {"scenarios": {"kp_chain": {"throughput_rps": rps, "latency_ms": {"p95": p95, "p99": p95},
+                                           "rss_mb": {"peak": rss}}}}
+
+    old, new = report(100.0, 20.0, 200.0), report(120.0, 15.0, 210.0)
+    new["scenarios"]["ws"] = new["scenarios"]["kp_chain"]
+    rows = {r["scenario"]: r for r in runner.diff_reports(old, new)}
+    assert rows["kp_chain"]["throughput"] == 0.2
+    assert rows["kp_chain"]["p95"] == -0.25
+    assert rows["kp_chain"]["rss_peak"] == 0.05
+    assert rows["ws"]["status"] == "new"
+
+
+def test_memory_db_records_usage_events(monkeypatch):
+    db = standins.MemoryDB()
+
+    async def service():
+        return db
+
+    module = types.ModuleType("app.services.supabase_signals")
+    module.get_supabase_signals_service = service
+    monkeypatch.setitem(sys.modules, "app.services.supabase_signals", module)
+
+    mw = UsageMeteringMiddleware(lambda *a: None, enable_metering=True)
+    event = {"ts": datetime.now(timezone.utc).isoformat(), "tenant_id": "lt-1", "status_code": 200,
+             "duration_ms": 5, "compute_units": 1.0}
+    asyncio.run(mw._insert_usage_event(event))
+
+    assert db.snapshot() == {"statements": 1, "rows": {"usage_events": 1}}
+    assert db.tables["usage_events"][0][1] == "lt-1"
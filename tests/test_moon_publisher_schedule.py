@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import asyncio
+import time
+
+import numpy as np
+
+from api.services import moon_publisher as mp
+from refactor.kp_chain import get_kp_lords_for_planet, kp_boundary_table, kp_chain_for_longitude
+from refactor.swe_backend import get_planet_series
+
+
+def _moon_chain_at(t: float):
+    lon = get_planet_series(np.array([mp._unix_to_jd(t)]), [mp.MOON_ID])[mp.MOON_ID][0][0]
+    return get_kp_lords_for_planet(lon)
+
+
+def test_boundary_table_matches_chain_function():
+    starts, lords = kp_boundary_table()
+    assert len(starts) == 27 * 9 * 9
+    mids = (starts[:-1] + starts[1:]) / 2
+    for i in range(0, len(mids), 7):
+        assert kp_chain_for_longitude(float(mids[i])) == tuple(lords[i])
+
+
+def test_scheduled_change_is_exact():
+    pub = mp.MoonPublisher()
+    pub.horizon_s = 7200  # SL2 segments last ~20 min, so one falls in range
+    pub._ensure_track(time.time())
+    change = pub._next_change
+    assert change is not None and change.levels
+    assert _moon_chain_at(change.at - 0.5) == change.chain_before
+    assert _moon_chain_at(change.at + 0.5) == change.chain_after
+
+
+def test_ticks_are_interpolated_without_ephemeris(monkeypatch):
+    published = []
+
+    async def fake_publish(topic, payload, *, event="update", v=1):
+        published.append((event, payload))
+
+    monkeypatch.setattr(mp.stream_manager, "publish", fake_publish)
+
+    pub = mp.MoonPublisher()
+    pub.enabled = True
+    pub.interval_ms = 100
+
+    async def run():
+        await pub.start()
+        await asyncio.sleep(0.6)
+        await pub.stop()
+
+    asyncio.run(run())
+
+    ticks = [p for e, p in published if e == "moon_update"]
+    assert len(ticks) >= 3
+    assert [p["seq"] for _, p in published] == list(range(1, len(published) + 1))
+    # One track fit (+ at most one boundary polish) regardless of tick count
+    assert pub.stats["ephemeris_calls"] <= 4
+    assert ticks[0]["kp_lords"]["nl"] != "unknown"
+
+
+def test_boundary_tick_carries_new_chain_and_next_change(monkeypatch):
+    published = []
+
+    async def fake_publish(topic, payload, *, event="update", v=1):
+        published.append((event, payload))
+
+    async def leader(topic):
+        return True
+
+    monkeypatch.setattr(mp.stream_manager, "publish", fake_publish)
+    monkeypatch.setattr(mp.stream_manager, "ensure_topic_leadership", leader)
+
+    pub = mp.MoonPublisher()
+    pub.horizon_s = 7200
+    pub.interval_ms = 3_600_000  # Only the boundary wakes the loop
+    now = time.time()
+    pub._ensure_track(now)
+    change = pub._next_change
+    assert change is not None
+    # Pretend the boundary is due now, keeping the exact chain it crosses into
+    clock = {"t": change.at}
+    monkeypatch.setattr(mp.time, "time", lambda: clock["t"])
+
+    async def run():
+        task = asyncio.create_task(pub._publisher_loop())
+        while not any(e == "moon_update" for e, _ in published):
+            await asyncio.sleep(0.01)
+        pub.should_stop = True
+        task.cancel()
+
+    asyncio.run(run())
+
+    events = [e for e, _ in published]
+    assert events[:2] == ["moon_change", "moon_update"]
+    tick = published[1][1]
+    names = published[0][1]["to"]
+    assert tick["kp_lords"] == {"nl": names["nl"], "sl": names["sl"], "sl2": names["sl2"]}
+    nxt = tick["next_change"]
+    assert nxt is None or nxt["timestamp"] != mp._iso(change.at)
@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+
+from refactor.moon_factors import MoonFactorsCalculator
+from refactor.moon_series import find_panchanga_changes, find_phase_events
+
+
+START = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def test_series_matches_scalar_calculator():
+    calc = MoonFactorsCalculator()
+    series = calc.calculate_series(START, START + timedelta(hours=6), step_minutes=30)
+    assert len(series) == 13
+    for k, ts in enumerate(series.timestamps()):
+        f = calc.calculate(ts)
+        assert f.tithi_num == series.tithi_num[k]
+        assert f.yoga_num == series.yoga_num[k]
+        assert f.karana_num == series.karana_num[k]
+        assert f.nakshatra_num == series.nakshatra_num[k]
+        assert f.pada == series.pada[k]
+        assert np.isclose(f.illumination, series.illumination[k])
+        assert np.isclose(f.quality_score, series.quality_score[k])
+
+
+def test_tithi_changes_are_exact():
+    calc = MoonFactorsCalculator()
+    changes = find_panchanga_changes(START, START + timedelta(days=3), ("tithi",))
+    assert len(changes) >= 2
+    for event in changes:
+        t0 = datetime.fromisoformat(event["timestamp"])
+        before = calc.calculate(t0 - timedelta(seconds=1))
+        after = calc.calculate(t0 + timedelta(seconds=1))
+        assert before.tithi_num == event["from_num"]
+        assert after.tithi_num == event["to_num"]
+
+
+def test_phase_events_cover_one_lunation():
+    events = find_phase_events(START, START + timedelta(days=30))
+    phases = {e["phase"] for e in events}
+    assert {"New Moon", "First Quarter", "Full Moon", "Last Quarter"} <= phases
+    new_moon = next(e for e in events if e["phase"] == "New Moon")
+    # Astronomical New Moon: 2024-01-11 11:57 UTC
+    assert new_moon["timestamp"].startswith("2024-01-11T11:5")
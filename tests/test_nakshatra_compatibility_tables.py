@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+import pytest
+
+from refactor import nakshatra_compatibility as nc
+
+
+def _reference_matches(nakshatra: int, min_compatibility: float):
+    out = []
+    for other in range(1, 28):
+        if other == nakshatra:
+            continue
+        c = nc.calculate_nakshatra_compatibility(nakshatra, other, include_all_kutas=False)
+        if c.compatibility_percentage >= min_compatibility:
+            out.append((other, c.compatibility_percentage, c.relationship_quality))
+    out.sort(key=lambda x: x[1], reverse=True)
+    return out
+
+
+def test_table_lookup_matches_pairwise_calculation():
+    for n1 in range(1, 28):
+        for n2 in range(1, 28):
+            full = nc.calculate_nakshatra_compatibility(n1, n2)
+            tara = nc.calculate_nakshatra_compatibility(n1, n2, include_all_kutas=False)
+            assert nc.get_compatibility_percentage(n1, n2) == full.compatibility_percentage
+            assert (
+                nc.get_compatibility_percentage(n1, n2, include_all_kutas=False)
+                == tara.compatibility_percentage
+            )
+
+
+@pytest.mark.parametrize("min_compat", [0.0, 50.0, 65.0])
+def test_batch_ranking_matches_reference_loop(min_compat):
+    people = list(range(1, 28))
+    ranked = nc.rank_compatible_nakshatras(people, min_compat)
+    for n, matches in zip(people, ranked):
+        assert matches == _reference_matches(n, min_compat)
+        assert nc.find_compatible_nakshatras(n, min_compat) == matches
+
+
+def test_batch_ranking_top_k_and_validation():
+    ranked = nc.rank_compatible_nakshatras([1, 1, 14], 0.0, include_all_kutas=True, top_k=3)
+    assert len(ranked) == 3 and all(len(r) == 3 for r in ranked)
+    assert ranked[0] == ranked[1]
+    with pytest.raises(ValueError):
+        nc.rank_compatible_nakshatras([0, 28])
+
+
+def test_compatibility_matrix_shape_and_readonly():
+    m = nc.compatibility_matrix([1, 2, 3], [4, 5])
+    assert m.shape == (3, 2)
+    assert not nc.COMPATIBILITY_TABLES.percentage.flags.writeable
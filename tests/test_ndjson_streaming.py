@@ -0,0 +1,194 @@
+from __future__ import annotations
+
+import asyncio
+import json
+
+from datetime import UTC, datetime, timedelta
+
+import pytest
+
+from fastapi import FastAPI
+
+import api.routers.dasha as dasha_router
+import api.routers.fortuna as fortuna_router
+import api.routers.micro as micro_router
+import refactor.facade as facade
+
+from api.routers.v1 import jyotish as jyotish_router
+from api.services.response_encoding import stream_ndjson
+
+httpx = pytest.importorskip("httpx")
+
+NDJSON = {"Accept": "application/x-ndjson"}
+
+
+def _post(router, path, body, headers=NDJSON):
+    app = FastAPI()
+    app.include_router(router)
+
+    async def run():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://t") as client:
+            return await client.post(path, json=body, headers=headers)
+
+    return asyncio.run(run())
+
+
+def _lines(resp):
+    return [json.loads(line) for line in resp.text.splitlines()]
+
+
+def test_stream_is_consumed_lazily():
+    produced = []
+
+    def batches():
+        for day in range(3):
+            produced.append(day)
+            yield [{"day": day}]
+
+    async def run():
+        resp = stream_ndjson({"n": 3}, batches(), summary=lambda: {"days": len(produced)})
+        it = resp.body_iterator
+        meta = await it.__anext__()
+        first = await it.__anext__()
+        seen_after_first = list(produced)
+        rest = [chunk async for chunk in it]
+        return meta, first, seen_after_first, rest
+
+    meta, first, seen_after_first, rest = asyncio.run(run())
+    assert json.loads(meta) == {"meta": {"n": 3}}
+    assert json.loads(first) == {"day": 0}
+    # The second day is not computed until the first one has been sent
+    assert seen_after_first == [0]
+    assert json.loads(rest[-1]) == {"summary": {"days": 3}}
+
+
+def test_stream_error_ends_with_error_line():
+    def batches():
+        yield [{"ok": 1}]
+        raise RuntimeError("ephemeris unavailable")
+
+    async def run():
+        resp = stream_ndjson({}, batches(), summary=lambda: {"never": True})
+        return [json.loads(chunk) async for chunk in resp.body_iterator]
+
+    lines = asyncio.run(run())
+    assert lines == [{"meta": {}}, {"ok": 1}, {"error": "ephemeris unavailable"}]
+
+
+class _FakeMicro:
+    def iter_range(self, start_day, end_day):
+        def days():
+            for offset in range((end_day - start_day).days + 1):
+                start = datetime(2025, 9, 1, tzinfo=UTC) + timedelta(days=offset)
+                yield [
+                    {"start": start.isoformat(), "end": (start + timedelta(minutes=30)).isoformat(),
+                     "score": 0.5 + offset / 10, "strength": "high" if offset else "low", "factors": {}},
+                ]
+
+        return days()
+
+
+def test_micro_range_streams_one_day_at_a_time(monkeypatch):
+    monkeypatch.setattr(micro_router, "get_system", lambda name: _FakeMicro())
+    resp = _post(micro_router.router, "/api/v1/micro/range", {"start": "2025-09-01", "end": "2025-09-03"})
+
+    assert resp.status_code == 200
+    assert resp.headers["content-type"] == "application/x-ndjson"
+    lines = _lines(resp)
+    assert lines[0]["meta"]["start_date"] == "2025-09-01"
+    assert len(lines) == 5
+    summary = lines[-1]["summary"]
+    assert summary["total_windows"] == 3
+    assert summary["high_volatility"] == 2 and summary["low_volatility"] == 1
+    assert summary["max_score"] == 0.7
+
+
+def test_dasha_iter_full_cycle_matches_tree():
+    from refactor.dasha import VimshottariDashaEngine
+
+    engine = VimshottariDashaEngine()
+    birth = datetime(1990, 1, 1, 12, tzinfo=UTC)
+    tree = engine.calculate_full_cycle(birth, moon_longitude=123.4, levels=2)
+    streamed = list(engine.iter_full_cycle(birth, moon_longitude=123.4, levels=2))
+    assert [m.to_dict() for m in streamed] == [m.to_dict() for m in tree.sub_periods]
+
+
+def test_dasha_cycle_streams_mahadashas(monkeypatch):
+    class NoCache:
+        def get(self, key):
+            return None
+
+        def set(self, *args, **kwargs):
+            raise AssertionError("streamed cycles are not cached")
+
+    monkeypatch.setattr(dasha_router, "cache_service", NoCache())
+    resp = _post(
+        dasha_router.router,
+        "/api/v1/dasha/cycle",
+        {"birth_time": "1990-01-01T12:00:00Z", "moon_longitude": 123.4, "levels": 2},
+    )
+
+    assert resp.status_code == 200
+    lines = _lines(resp)
+    assert lines[0]["meta"]["system"] == "KP_DASHA"
+    assert lines[0]["meta"]["meta"]["levels"] == 2
+    mahadashas = lines[1:-1]
+    assert all(m["level"] == "mahadasha" and len(m["sub_periods"]) == 9 for m in mahadashas)
+    assert "compute_time_ms" in lines[-1]["summary"]
+
+
+def _fake_fortuna(date, latitude, longitude, fortuna_type="FORTUNE", interval_hours=1):
+    for hour in range(0, 24, interval_hours):
+        yield {"hour": hour, "timestamp": date.replace(hour=hour).isoformat(),
+               "longitude": 10.0 + hour, "house": 1, "sign": 1}
+
+
+def test_fortuna_movement_json_and_stream(monkeypatch):
+    monkeypatch.setattr(fortuna_router, "iter_fortuna_movement_for_day", _fake_fortuna)
+    body = {"date": "2024-08-20", "latitude": 40.7, "longitude": -74.0,
+            "points": ["FORTUNE", "spirit", "UNKNOWN"], "interval_hours": 6}
+
+    resp = _post(fortuna_router.router, "/api/v1/fortuna/movement", body, headers={})
+    assert resp.status_code == 200
+    data = resp.json()
+    assert set(data["movement"]) == {"FORTUNE", "SPIRIT"}
+    assert len(data["movement"]["FORTUNE"]) == 4
+    assert data["statistics"]["FORTUNE"]["total_movement"] == 18.0
+
+    lines = _lines(_post(fortuna_router.router, "/api/v1/fortuna/movement", body))
+    assert lines[0]["meta"]["points"] == ["FORTUNE", "SPIRIT"]
+    assert [(line["point"], line["hour"]) for line in lines[1:3]] == [("FORTUNE", 0), ("FORTUNE", 6)]
+    assert len(lines) == 9
+
+
+def test_transits_window_streams_chunks(monkeypatch):
+    calls = []
+
+    class Change:
+        def __init__(self, ts):
+            self.ts = ts
+
+        def to_dict(self):
+            return {"timestamp_utc": self.ts.isoformat(), "level": "sl"}
+
+    def fake_iter(start, end, planet_ids, levels):
+        calls.append((planet_ids, levels))
+        t = start
+        while t < end:
+            yield [Change(t)]
+            t += timedelta(hours=6)
+
+    monkeypatch.setattr(facade, "iter_kp_lord_changes", fake_iter)
+    resp = _post(
+        jyotish_router.router,
+        "/api/v1/jyotish/transits/window",
+        {"datetime": "2025-01-01T00:00:00Z", "lat": 0, "lon": 0, "window_hours": 24,
+         "filters": {"planets": [2, 1]}},
+    )
+
+    assert resp.status_code == 200
+    lines = _lines(resp)
+    assert lines[0]["meta"]["planets"] == [2, 1]
+    assert len(lines) == 5
+    assert calls == [((2, 1), ("nl", "sl", "sl2"))]
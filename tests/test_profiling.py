@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import threading
+import time
+
+import jwt
+import pytest
+
+from fastapi import FastAPI
+
+from api.middleware.profiling import RequestProfilingMiddleware, ServerTimingMiddleware
+from api.services.profiler import Profiler, ProfilerBusyError, StackSampler
+from shared.otel import get_tracer, stage_for_span, timed_stage
+
+httpx = pytest.importorskip("httpx")
+
+
+def _request(app, method, path, **kwargs):
+    async def run():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://t") as client:
+            return await client.request(method, path, **kwargs)
+
+    return asyncio.run(run())
+
+
+def _metrics(header: str) -> dict[str, str]:
+    return {part.strip().split(";")[0]: part.strip() for part in header.split(",")}
+
+
+@timed_stage("ephemeris")
+def _fake_ephemeris(depth: int = 0) -> int:
+    time.sleep(0.002)
+    return _fake_ephemeris(depth - 1) if depth else 0
+
+
+def test_span_names_map_to_stages():
+    assert stage_for_span("houses.cache.hit") == "cache"
+    assert stage_for_span("houses.compute") == "houses"
+    assert stage_for_span("kp.chain") == "kp_chain"
+    assert stage_for_span("atlas.search") is None
+
+
+def test_server_timing_header_reports_stages():
+    app = FastAPI()
+    app.add_middleware(ServerTimingMiddleware, enabled=True)
+    tracer = get_tracer("test")
+
+    @app.get("/work")
+    def work():
+        _fake_ephemeris(depth=2)  # nested calls count once
+        with tracer.start_as_current_span("dasha.cache.get"):
+            pass
+        return {"ok": True}
+
+    r = _request(app, "GET", "/work")
+    assert r.status_code == 200
+    metrics = _metrics(r.headers["server-timing"])
+    assert set(metrics) == {"ephemeris", "cache", "total"}
+    assert 'desc="1 calls"' in metrics["ephemeris"]
+    assert float(metrics["ephemeris"].split("dur=")[1].split(";")[0]) >= 6.0
+
+
+def test_stage_timers_are_inert_outside_requests():
+    assert _fake_ephemeris() == 0
+    with get_tracer("test").start_as_current_span("houses.compute"):
+        pass
+
+
+def test_sampler_records_folded_stacks():
+    stop = threading.Event()
+
+    def spin_in_profiled_function():
+        while not stop.is_set():
+            sum(range(1000))
+
+    worker = threading.Thread(target=spin_in_profiled_function, name="spinner")
+    worker.start()
+    sampler = StackSampler(interval=0.001)
+    try:
+        sampler.start()
+        time.sleep(0.1)
+    finally:
+        sampler.stop()
+        stop.set()
+        worker.join()
+
+    assert sampler.samples > 0
+    lines = sampler.folded().splitlines()
+    spinner = [line for line in lines if line.startswith("spinner;")]
+    assert spinner and "spin_in_profiled_function" in spinner[0]
+    stack, count = spinner[0].rsplit(" ", 1)
+    assert int(count) > 0 and ";" in stack
+
+
+def test_requests_mode_profiles_next_matching_requests(monkeypatch):
+    import api.middleware.profiling as profiling_middleware
+
+    prof = Profiler()
+    monkeypatch.setattr(profiling_middleware, "profiler", prof)
+    app = FastAPI()
+    app.add_middleware(RequestProfilingMiddleware)
+
+    @app.get("/api/v1/strategy/day")
+    async def slow():
+        await asyncio.sleep(0.03)
+        return {}
+
+    @app.get("/other")
+    async def other():
+        return {}
+
+    session = prof.arm("/api/v1/strategy", count=2, interval=0.001)
+    with pytest.raises(ProfilerBusyError):
+        prof.arm("/x", count=1)
+
+    _request(app, "GET", "/other")
+    _request(app, "GET", "/api/v1/strategy/day")
+    assert not session.done
+    _request(app, "GET", "/api/v1/strategy/day")
+
+    assert session.done and prof.active() is None
+    summary = session.summary()
+    assert summary["requests_profiled"] == 2
+    assert summary["paths"] == {"/api/v1/strategy/day": 2}
+    assert summary["samples"] > 0
+
+
+def _token(role: str, scopes: str = "") -> str:
+    now = int(time.time())
+    claims = {"sub": "u1", "tenant_id": "t1", "role": role, "scope": scopes, "iat": now, "exp": now + 60}
+    return jwt.encode(claims, os.environ["AUTH_JWT_SECRET"], algorithm="HS256")
+
+
+def test_profile_endpoint_gating(client, monkeypatch):
+    import api.routers.profiling as profiling_router
+
+    path = "/api/v1/admin/profile/sample?seconds=0.05&interval_ms=1"
+    admin = {"Authorization": f"Bearer {_token('admin')}"}
+
+    monkeypatch.setattr(profiling_router, "PROFILING_ENABLED", False)
+    assert client.post(path, headers=admin).status_code == 404
+
+    monkeypatch.setattr(profiling_router, "PROFILING_ENABLED", True)
+    r = client.post(path, headers={"Authorization": f"Bearer {_token('user')}"})
+    assert r.status_code == 403
+    assert r.json()["code"] == "FORBIDDEN_PROFILE"
+
+    r = client.post(path, headers={"Authorization": f"Bearer {_token('user', 'debug:profile')}"})
+    assert r.status_code == 200
+    assert r.headers["content-type"].startswith("text/plain")
+    assert int(r.headers["x-profile-samples"]) > 0
+
+
+def test_app_responses_carry_server_timing(client):
+    r = client.post(
+        "/api/v1/kp/chain",
+        json={"datetime": "2025-03-12T14:30:00Z", "lat": 40.7, "lon": -74.0, "target": {"type": "planet", "id": "2"}},
+    )
+    assert r.status_code == 200
+    metrics = _metrics(r.headers["server-timing"])
+    assert {"kp_chain", "cache", "serialization", "total"} <= set(metrics)
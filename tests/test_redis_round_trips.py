@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+import asyncio
+
+from api.services import token_auditing
+from api.services.redis_config import RedisConfig, RedisManager
+from api.services.stream_resume import RedisResumeStore
+from api.services.token_auditing import TokenAuditingService, TokenEventType
+
+
+class FakePipeline:
+    def __init__(self, client):
+        self.client = client
+        self.queued = []
+
+    def __getattr__(self, name):
+        def queue(*args, **kwargs):
+            self.queued.append(name)
+            return self
+
+        return queue
+
+    async def execute(self):
+        self.client.round_trips += 1
+        self.client.commands.extend(self.queued)
+        return [None] * len(self.queued)
+
+
+class FakeRedis:
+    """Counts network round-trips: each awaited command or pipeline is one."""
+
+    def __init__(self):
+        self.round_trips = 0
+        self.commands = []
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+    def register_script(self, script):
+        async def run(keys=(), args=()):
+            self.round_trips += 1
+            self.commands.append("evalsha")
+
+        return run
+
+    def __getattr__(self, name):
+        async def command(*args, **kwargs):
+            self.round_trips += 1
+            self.commands.append(name)
+
+        return command
+
+
+def _manager(fake):
+    mgr = RedisManager(RedisConfig())
+    mgr._client = fake
+    return mgr
+
+
+def test_manager_operations_are_single_round_trip():
+    fake = FakeRedis()
+    mgr = _manager(fake)
+
+    async def run():
+        assert await mgr.register_subscriber("t1", "kp.moon") is True
+        await mgr.unregister_subscriber("t1", "kp.moon")
+        await mgr.store_jti("abc", "t1")
+        await mgr.check_jti("abc")
+
+    asyncio.run(run())
+    assert fake.round_trips == 4
+    assert fake.commands[:3] == ["setex", "incr", "incr"]
+
+
+def test_get_client_is_shared_and_survives_close():
+    mgr = RedisManager(RedisConfig(port=1, socket_connect_timeout=0.2))
+
+    async def run():
+        first = await mgr.get_client()
+        await first.aclose()
+        second = await mgr.get_client()
+        assert first is second
+        assert mgr._pool is not None
+        await mgr.close()
+
+    asyncio.run(run())
+
+
+def test_resume_store_appends_in_one_round_trip():
+    fake = FakeRedis()
+    store = RedisResumeStore(fake, prefix="sse:resume:test", ttl=60, max_items=10)
+
+    async def run():
+        for seq in range(5):
+            await store.store("kp.moon.chain", seq, f"frame-{seq}")
+
+    asyncio.run(run())
+    assert fake.round_trips == 5
+
+
+def test_token_audit_event_is_one_pipeline(monkeypatch):
+    fake = FakeRedis()
+    mgr = _manager(fake)
+
+    async def get_redis():
+        return mgr
+
+    monkeypatch.setattr(token_auditing, "get_redis", get_redis)
+    service = TokenAuditingService()
+    service.enabled = True
+    payload = {"jti": "j1", "sub": "k", "tid": "t", "topic": "kp.moon", "region": "us"}
+
+    assert asyncio.run(service.record_token_event(payload, TokenEventType.ISSUED)) is True
+    assert fake.round_trips == 1
+    assert fake.commands == [
+        "hset", "expire", "sadd", "expire", "sadd", "expire", "set"
+    ]
+
+
+def test_concurrent_first_get_client_initializes_once(monkeypatch):
+    mgr = RedisManager(RedisConfig())
+    calls = []
+
+    async def initialize():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        mgr._client = FakeRedis()
+
+    monkeypatch.setattr(mgr, "initialize", initialize)
+
+    async def run():
+        return await asyncio.gather(*(mgr.get_client() for _ in range(10)))
+
+    clients = asyncio.run(run())
+    assert len(calls) == 1
+    assert all(c is clients[0] for c in clients)
@@ -0,0 +1,193 @@
+from __future__ import annotations
+
+import asyncio
+import json
+
+import msgpack
+import numpy as np
+import pyarrow as pa
+import pyarrow.ipc
+import pytest
+
+from fastapi import FastAPI, HTTPException
+
+import api.routers.micro as micro_router
+import api.routers.strategy as strategy_router
+from api.services import response_encoding as enc
+
+httpx = pytest.importorskip("httpx")
+
+ROWS = [
+    {
+        "t": "2025-09-05T13:30:00+00:00",
+        "confidence": 61.5,
+        "direction": "UP",
+        "tags": ["moon"],
+        "factors": {"moon": 0.25, "nodes": 1},
+    },
+    {
+        "t": "2025-09-05T13:31:00+00:00",
+        "confidence": 60.0,
+        "direction": "DOWN",
+        "tags": [],
+        "factors": {"moon": 0.5},
+    },
+]
+
+
+def test_negotiate_prefers_highest_quality():
+    assert enc.negotiate(None) == enc.JSON
+    assert enc.negotiate("*/*") == enc.JSON
+    assert enc.negotiate("application/x-ndjson") == enc.NDJSON
+    assert enc.negotiate("application/json;q=0.5, application/x-ndjson") == enc.NDJSON
+    assert enc.negotiate("application/x-ndjson;q=0.1, application/json") == enc.JSON
+    assert enc.negotiate("text/html") == enc.JSON
+
+
+def test_negotiate_406_when_only_unavailable_formats(monkeypatch):
+    monkeypatch.setattr(enc, "MSGPACK_AVAILABLE", False)
+    with pytest.raises(HTTPException) as exc:
+        enc.negotiate("application/msgpack")
+    assert exc.value.status_code == 406
+    assert enc.negotiate("application/msgpack, application/json;q=0.5") == enc.JSON
+
+
+def test_columnize_types():
+    cols = enc.columnize(ROWS)
+    assert cols["t"].dtype == np.int64
+    assert cols["t"][1] - cols["t"][0] == 60_000
+    assert cols["confidence"].dtype == np.float32
+    assert cols["direction"] == ["UP", "DOWN"]
+    assert cols["tags"] == [["moon"], []]
+    assert cols["factors.moon"].dtype == np.float32
+    # Missing in second row -> float column with NaN
+    assert cols["factors.nodes"].dtype == np.float32
+    assert np.isnan(cols["factors.nodes"][1])
+
+
+def test_columnize_keeps_large_ints_exact():
+    cols = enc.columnize([{"t": ROWS[0]["t"], "volume": 3_000_000_000}, {"t": ROWS[1]["t"], "volume": 7}])
+    assert cols["volume"].dtype == np.int64
+    assert cols["volume"].tolist() == [3_000_000_000, 7]
+
+
+def test_missing_time_is_null_in_every_encoding():
+    rows = [ROWS[0], {"confidence": 1.0}]
+    cols = enc.columnize(rows)
+    assert cols["t"] == [enc.columnize(ROWS)["t"][0], None]
+
+    t = msgpack.unpackb(enc.encode_msgpack({}, cols))["columns"]["t"]
+    assert t == {"dtype": "timestamp_ms_nullable", "data": cols["t"]}
+    table = pyarrow.ipc.open_stream(pa.py_buffer(enc.encode_arrow({}, cols))).read_all()
+    assert table.column("t").null_count == 1
+
+
+def test_ndjson_has_meta_then_rows():
+    lines = enc.encode_ndjson({"date": "2025-09-05"}, ROWS).splitlines()
+    assert json.loads(lines[0]) == {"meta": {"date": "2025-09-05"}}
+    assert [json.loads(line)["direction"] for line in lines[1:]] == ["UP", "DOWN"]
+
+
+def test_msgpack_columns_roundtrip():
+    payload = msgpack.unpackb(enc.encode_msgpack({}, enc.columnize(ROWS)))
+    assert payload["length"] == 2
+    t = payload["columns"]["t"]
+    assert t["dtype"] == "timestamp_ms"
+    assert np.frombuffer(t["data"], dtype="<i8").tolist() == enc.columnize(ROWS)["t"].tolist()
+
+
+def test_arrow_stream_roundtrip():
+
+    table = pyarrow.ipc.open_stream(pa.py_buffer(enc.encode_arrow({"n": 2}, enc.columnize(ROWS)))).read_all()
+    assert table.num_rows == 2
+    assert table.schema.field("t").type == pa.timestamp("ms", tz="UTC")
+    assert table.schema.field("confidence").type == pa.float32()
+    assert json.loads(table.schema.metadata[b"meta"]) == {"n": 2}
+
+
+class _FakeStrategy:
+    def day(self, day, ticker="TSLA"):
+        return {"timeline": ROWS, "summary": {"minutes": len(ROWS)}}
+
+
+def test_strategy_day_serves_ndjson(monkeypatch):
+    monkeypatch.setattr(strategy_router, "get_system", lambda name: _FakeStrategy())
+    app = FastAPI()
+    app.include_router(strategy_router.router)
+
+    async def run():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://t") as client:
+            return await client.post(
+                "/api/v1/strategy/day",
+                json={"date": "2025-09-05", "ticker": "ENC"},
+                headers={"Accept": "application/x-ndjson"},
+            )
+
+    resp = asyncio.run(run())
+    assert resp.status_code == 200
+    assert resp.headers["content-type"] == "application/x-ndjson"
+    assert resp.headers["x-row-count"] == "2"
+    lines = resp.text.splitlines()
+    assert json.loads(lines[0])["meta"]["summary"] == {"minutes": 2}
+    assert len(lines) == 3
+
+
+WINDOWS = [
+    {"start": "2025-09-01T14:00:00+00:00", "end": "2025-09-01T14:30:00+00:00",
+     "score": 0.75, "strength": "high", "factors": {"moon": 0.5}},
+    {"start": "2025-09-02T15:00:00+00:00", "end": "2025-09-02T15:10:00+00:00",
+     "score": 0.25, "strength": "low", "factors": {"moon": 0.125}},
+]
+
+
+class _FakeMicro:
+    def range(self, start_day, end_day):
+        return {"windows": WINDOWS, "summary": {"total_windows": len(WINDOWS)}}
+
+    def iter_range(self, start_day, end_day):
+        return iter([WINDOWS[:1], WINDOWS[1:]])
+
+
+def _micro_range(monkeypatch, accept=None):
+    monkeypatch.setattr(micro_router, "get_system", lambda name: _FakeMicro())
+    app = FastAPI()
+    app.include_router(micro_router.router)
+    headers = {"Accept": accept} if accept else {}
+
+    async def run():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://t") as client:
+            return await client.post(
+                "/api/v1/micro/range", json={"start": "2025-09-01", "end": "2025-09-02"}, headers=headers
+            )
+
+    return asyncio.run(run())
+
+
+def test_micro_range_formats_round_trip(monkeypatch):
+    resp = _micro_range(monkeypatch)
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body["total_windows"] == 2
+    assert [d["date"] for d in body["daily_windows"]] == ["2025-09-01", "2025-09-02"]
+    json_rows = [w for day in body["daily_windows"] for w in day["windows"]]
+    assert json_rows == WINDOWS
+
+    lines = [json.loads(line) for line in _micro_range(monkeypatch, enc.MEDIA_TYPES[enc.NDJSON]).text.splitlines()]
+    assert lines[1:-1] == json_rows
+    assert lines[-1]["summary"]["total_windows"] == 2
+
+    resp = _micro_range(monkeypatch, enc.MEDIA_TYPES[enc.MSGPACK])
+    cols = msgpack.unpackb(resp.content)["columns"]
+    start = np.frombuffer(cols["start"]["data"], dtype="<i8")
+    assert start.tolist() == enc.columnize(json_rows, ("start", "end"))["start"].tolist()
+    score = np.frombuffer(cols["score"]["data"], dtype="<f4")
+    assert score.tolist() == [w["score"] for w in json_rows]
+
+
+def test_micro_range_406_for_unavailable_encoding(monkeypatch):
+    monkeypatch.setattr(enc, "MSGPACK_AVAILABLE", False)
+    resp = _micro_range(monkeypatch, "application/msgpack")
+    assert resp.status_code == 406
+    assert "application/x-ndjson" in resp.json()["detail"]
@@ -0,0 +1,187 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from api.services.singleflight import SingleFlight, request_fingerprint
+
+
+def test_fingerprint_is_canonical():
+    a = request_fingerprint("strategy.day", {"date": "2025-01-02", "ticker": "SPY"})
+    b = request_fingerprint("strategy.day", {"ticker": "SPY", "date": "2025-01-02"})
+    c = request_fingerprint("micro.day", {"ticker": "SPY", "date": "2025-01-02"})
+    assert a == b
+    assert a != c
+    assert a.startswith("strategy.day:")
+
+
+def test_concurrent_callers_share_one_computation():
+    sf = SingleFlight(use_redis=False)
+    calls = []
+
+    async def compute():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return {"value": 42}
+
+    async def run():
+        return await asyncio.gather(*[sf.do("k", compute) for _ in range(25)])
+
+    results = asyncio.run(run())
+    assert len(calls) == 1
+    assert all(r is results[0] for r in results)
+    assert sf.stats["leader"] == 1 and sf.stats["coalesced"] == 24
+    assert sf.in_flight() == 0
+
+
+def test_failure_reaches_every_waiter_and_is_not_cached():
+    sf = SingleFlight(use_redis=False)
+    attempts = []
+
+    async def boom():
+        attempts.append(1)
+        await asyncio.sleep(0.01)
+        raise ValueError("bad input")
+
+    async def run():
+        results = await asyncio.gather(
+            *[sf.do("k", boom) for _ in range(3)], return_exceptions=True
+        )
+        assert all(isinstance(r, ValueError) for r in results)
+        with pytest.raises(ValueError):
+            await sf.do("k", boom)
+
+    asyncio.run(run())
+    assert len(attempts) == 2
+
+
+def test_run_sync_moves_blocking_work_off_the_loop():
+    sf = SingleFlight(use_redis=False)
+    threads = []
+
+    def blocking(x, *, scale):
+        threads.append(threading.get_ident())
+        time.sleep(0.05)
+        return x * scale
+
+    async def run():
+        return await asyncio.gather(
+            *[sf.run_sync("k", blocking, 3, scale=2) for _ in range(10)]
+        )
+
+    assert asyncio.run(run()) == [6] * 10
+    assert len(threads) == 1 and threads[0] != threading.get_ident()
+
+
+def test_cancelled_waiter_does_not_cancel_leader():
+    sf = SingleFlight(use_redis=False)
+
+    async def compute():
+        await asyncio.sleep(0.05)
+        return "done"
+
+    async def run():
+        first = asyncio.create_task(sf.do("k", compute))
+        await asyncio.sleep(0)
+        second = asyncio.create_task(sf.do("k", compute))
+        await asyncio.sleep(0)
+        first.cancel()
+        return await second
+
+    assert asyncio.run(run()) == "done"
+
+
+def test_idempotency_middleware_coalesces_concurrent_duplicates():
+    httpx = pytest.importorskip("httpx")
+    from fastapi import FastAPI
+
+    from api.middleware.idempotency import IdempotencyMiddleware
+
+    app = FastAPI()
+    app.add_middleware(IdempotencyMiddleware)
+    calls = []
+
+    @app.post("/orders")
+    async def create_order():
+        calls.append(1)
+        await asyncio.sleep(0.1)
+        return {"order": len(calls)}
+
+    async def run():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://t") as client:
+            headers = {"Idempotency-Key": "order-7f3a"}
+            return await asyncio.gather(
+                *[client.post("/orders", json={"qty": 1}, headers=headers) for _ in range(3)]
+            )
+
+    responses = asyncio.run(run())
+    assert len(calls) == 1
+    assert all(r.status_code == 200 and r.json() == {"order": 1} for r in responses)
+    assert sum(r.headers.get("X-Idempotency-Replayed") == "true" for r in responses) == 2
+
+
+def test_redis_leader_unlocks_without_closing_shared_client(monkeypatch):
+    from api.services import redis_config
+
+    class SharedClient:
+        def __init__(self):
+            self.calls = []
+
+        async def set(self, *args, **kwargs):
+            self.calls.append("set")
+            return True
+
+        async def eval(self, *args):
+            self.calls.append("eval")
+
+        async def close(self):
+            self.calls.append("close")
+
+    client = SharedClient()
+
+    class Manager:
+        async def get_client(self):
+            return client
+
+    async def get_redis():
+        return Manager()
+
+    monkeypatch.setattr(redis_config, "get_redis", get_redis)
+    sf = SingleFlight(use_redis=True)
+
+    async def compute():
+        return 42
+
+    assert asyncio.run(sf.do("k", compute)) == 42
+    assert client.calls == ["set", "eval"]
+
+
+@pytest.mark.parametrize("call", ["dasha", "nodes", "eclipse"])
+def test_threaded_ephemeris_callers_share_the_swe_lock(call):
+    from datetime import UTC, datetime
+
+    from refactor import eclipse
+    from refactor.dasha import VimshottariDashaEngine
+    from refactor.nodes import NodePerturbationCalculator
+    from refactor.swe_backend import _swe_lock
+
+    ts = datetime(2025, 3, 14, 6, tzinfo=UTC)
+    run = {
+        "dasha": lambda: VimshottariDashaEngine().get_moon_longitude(ts),
+        "nodes": lambda: NodePerturbationCalculator()._get_node_position(ts),
+        "eclipse": lambda: eclipse.solar_visibility(ts, 40.7, -74.0),
+    }[call]
+    run()  # Warm imports and ephemeris files outside the lock
+
+    done = threading.Event()
+    with _swe_lock:
+        worker = threading.Thread(target=lambda: (run(), done.set()))
+        worker.start()
+        # Computation offloaded by the single-flight layer must wait its turn
+        assert not done.wait(0.2)
+    worker.join(5)
+    assert done.is_set()
@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.core import startup_timing
+from app.services import atlas_service
+
+
+def test_startup_report_lists_router_imports(client):
+    r = client.get("/api/v1/health/startup")
+    timing = r.json()["startup_timing"]
+    assert "api.routers.advisory" in timing["imports_ms"]
+    assert list(timing["imports_ms"].values()) == sorted(timing["imports_ms"].values(), reverse=True)
+    assert "api.routers.activation" in timing["lazy_skipped"]
+
+
+def test_timed_import_and_phases():
+    startup_timing.timed_import("json")  # already loaded: not charged
+    assert "json" not in startup_timing.startup_report(top=100)["imports_ms"]
+    with startup_timing.phase("unit"):
+        pass
+    assert startup_timing.startup_report()["phases_ms"]["unit"] >= 0.0
+
+
+def test_disabled_feature_answers_403():
+    from apps.api.main import _feature_disabled_router
+
+    app = FastAPI()
+    app.include_router(_feature_disabled_router("/api/v1/ats", "ENABLE_ATS"))
+    c = TestClient(app)
+    assert c.post("/api/v1/ats/transit", json={}).status_code == 403
+    assert c.get("/api/v1/ats/status").status_code == 403
+    assert c.get("/api/v1/other").status_code == 404
+
+
+def test_atlas_reads_prebuilt_index(tmp_path, monkeypatch):
+    monkeypatch.setattr(atlas_service, "NORMALIZED_FILE", tmp_path / "atlas_normalized.csv")
+    monkeypatch.setattr(atlas_service, "INDEX_FILE", tmp_path / "index.json")
+    atlas_service.build_outputs()
+    raw = list(atlas_service._ATLAS)
+
+    assert atlas_service._normalized_is_fresh()
+    assert atlas_service._load_normalized() == raw
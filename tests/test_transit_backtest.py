@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+from datetime import UTC, datetime, timedelta
+
+import numpy as np
+import pytest
+
+from refactor.swe_backend import get_planets_batch
+from refactor.time_utils import datetime_to_julian_day
+from refactor.transit_backtest import sky_series
+from refactor.transit_event_detector import TransitEventDetector
+
+PROMISE = {"FINANCE": [2, 3, 6], "GAINS": [3, 6, 11]}
+DASHA = {"active": "VENUS", "sub": "MERCURY"}
+
+
+@pytest.fixture
+def detector(tmp_path):
+    return TransitEventDetector(ledger_path=tmp_path / "ledger.json", fire_threshold=0, cooldown_minutes=0)
+
+
+def _live_positions(ts: datetime) -> dict[int, dict]:
+    return {
+        pid: {"longitude": p["longitude"], "speed": p["speed_lon"], "sign": int(p["longitude"] // 30) + 1}
+        for pid, p in get_planets_batch(ts).items()
+    }
+
+
+def test_interpolated_sky_matches_ephemeris():
+    start = datetime(2025, 3, 1, tzinfo=UTC)
+    jd = datetime_to_julian_day(start) + np.arange(0, 2 * 1440, 7) / 1440.0
+    sky = sky_series(jd)
+    exact = sky_series(jd, knot_step=timedelta(minutes=7))
+    lon_err = np.abs((sky.longitude - exact.longitude + 180.0) % 360.0 - 180.0).max() * 3600
+    assert lon_err < 0.01
+    assert np.abs(sky.speed - exact.speed).max() < 1e-4  # deg/day
+
+
+def test_backtest_matches_detect_events(detector, tmp_path):
+    start = datetime(2025, 3, 12, 9, 0, tzinfo=UTC)
+    step = timedelta(minutes=97)
+    replay = list(detector.backtest(start, start + step * 40, step, DASHA, None, PROMISE))
+
+    live = TransitEventDetector(ledger_path=tmp_path / "live.json", fire_threshold=0, cooldown_minutes=0)
+    expected = []
+    for i in range(41):
+        ts = start + step * i
+        expected.extend(live.detect_events(ts, _live_positions(ts), None, DASHA, None, PROMISE))
+
+    assert len(replay) == len(expected) > 0
+    for got, want in zip(replay, expected):
+        assert (got.id, got.ts, got.target, got.score) == (want.id, want.ts, want.target, want.score)
+        assert got.gates.to_dict() == want.gates.to_dict()
+        assert got.explain == want.explain
+        assert (got.kernel is None) == (want.kernel is None)
+        if got.kernel:
+            assert got.kernel.to_dict() == want.kernel.to_dict()
+
+
+def test_backtest_dedups_in_simulated_time(tmp_path):
+    start = datetime(2025, 3, 12, tzinfo=UTC)
+    end = start + timedelta(days=2)
+    every = TransitEventDetector(ledger_path=tmp_path / "a.json", cooldown_minutes=0)
+    deduped = TransitEventDetector(ledger_path=tmp_path / "b.json", cooldown_minutes=60)
+
+    all_events = list(every.backtest(start, end))
+    kept = list(deduped.backtest(start, end))
+
+    assert 0 < len(kept) < len(all_events)
+    assert [e.ts for e in kept] == sorted(e.ts for e in kept)
+    assert all(e.score >= every.fire_threshold for e in kept)
+    last: dict[tuple, datetime] = {}
+    for e in kept:
+        contact = (e.moon_chain_sig, e.target, e.kernel.aspect_type.name if e.kernel else None)
+        if contact in last and e.ts - last[contact] < timedelta(minutes=60):
+            assert e.score >= deduped.UP_THRESHOLD
+        last[contact] = e.ts
+
+    assert len(deduped.dedup) == 0 and not deduped.event_history
+    assert not (tmp_path / "b.json").exists()
+
+
+def test_backtest_endpoint_streams_ndjson(client):
+    import json
+
+    body = {"start": "2025-03-12T00:00:00Z", "end": "2025-03-13T00:00:00Z", "step_minutes": 5}
+    r = client.post("/api/v1/transit-events/backtest", json=body, headers={"Accept": "application/x-ndjson"})
+    assert r.status_code == 200
+    lines = [json.loads(line) for line in r.text.splitlines()]
+    assert lines[0]["meta"]["step_minutes"] == 5
+    assert len(lines) > 1 and all(row["score"] >= 60 for row in lines[1:])
+
+    r = client.post("/api/v1/transit-events/backtest", json={**body, "end": "2026-06-01T00:00:00Z"})
+    assert r.status_code == 400
@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+from datetime import UTC, datetime, timedelta
+
+import numpy as np
+import pytest
+
+from refactor.kp_chain import kp_boundary_table
+from refactor.swe_backend import get_planet_series
+from refactor.time_utils import datetime_to_julian_day
+from refactor.transit_dasha_sync import LORD_LEVELS, TransitDashaSync, kp_lord_windows
+
+START = datetime(2025, 3, 10, tzinfo=UTC)
+BIRTH = datetime(1990, 5, 17, 4, 30, tzinfo=UTC)
+
+
+def _sampled_lords(jd: np.ndarray, planet_id: int, level: str) -> np.ndarray:
+    starts, lords = kp_boundary_table()
+    lon = get_planet_series(jd, [planet_id])[planet_id][0] % 360.0
+    return lords[np.searchsorted(starts, lon, side="right") - 1, LORD_LEVELS[level]]
+
+
+def _inside(jd: np.ndarray, windows: np.ndarray) -> np.ndarray:
+    return ((jd[:, None] >= windows[:, 0]) & (jd[:, None] < windows[:, 1])).any(axis=1)
+
+
+@pytest.mark.parametrize("planet_id,level,days", [(2, "sl", 4), (2, "ssl", 1), (5, "sl", 20)])
+def test_windows_match_sampled_lords(planet_id, level, days):
+    end = START + timedelta(days=days)
+    windows = kp_lord_windows(range(1, 10), START, end, level, planet_id)
+    jd0, jd1 = datetime_to_julian_day(START), datetime_to_julian_day(end)
+
+    # Windows of all targets tile the horizon exactly once
+    total = sum((w[:, 1] - w[:, 0]).sum() for w in windows.values())
+    assert total == pytest.approx(jd1 - jd0, abs=1e-9)
+
+    jd = np.linspace(jd0, jd1, 2000, endpoint=False)
+    lords = _sampled_lords(jd, planet_id, level)
+    edges = np.concatenate([w.ravel() for w in windows.values()])
+    clear = np.abs(jd[:, None] - edges).min(axis=1) > 1e-5  # ~1 s from any edge
+    for target, w in windows.items():
+        assert (_inside(jd, w) == (lords == target))[clear].all()
+
+
+def test_crossings_are_refined_to_the_boundary():
+    windows = kp_lord_windows([6], START, START + timedelta(days=3), "sl")[6]
+    inner = windows[(windows[:, 0] > windows.min()) & (windows[:, 1] < windows.max())]
+    assert len(inner) > 0
+    before = _sampled_lords(inner[:, 0] - 1 / 86400, 2, "sl")
+    after = _sampled_lords(inner[:, 0] + 1 / 86400, 2, "sl")
+    assert (after == 6).all() and (before != 6).all()
+
+
+def test_intervals_agree_with_point_checks():
+    sync = TransitDashaSync()
+    end = START + timedelta(days=10)
+    intervals = sync.sync_intervals(range(1, 10), BIRTH, 123.4, START, end)
+    assert intervals and all(START <= iv.start < iv.end <= end for iv in intervals)
+
+    for iv in intervals[::25]:
+        mid = iv.start + (iv.end - iv.start) / 2
+        point = sync.check_dasha_sync(iv.target_planet, BIRTH, 123.4, mid)
+        assert (point.current_dasha, point.current_antardasha, point.current_pratyantara) == (
+            iv.mahadasha,
+            iv.antardasha,
+            iv.pratyantara,
+        )
+        assert point.sync_score == iv.sync_score
+
+    # Without a transit level the spans cover the whole horizon per target
+    whole = sync.sync_intervals([3], BIRTH, 123.4, START, end, level=None)
+    assert whole[0].start == START and whole[-1].end == end
+    assert all(a.end == b.start for a, b in zip(whole, whole[1:]))
+
+
+def test_batch_matches_single_chart_and_ranks_best_times():
+    sync = TransitDashaSync()
+    end = START + timedelta(days=5)
+    charts = [(BIRTH, 123.4), (datetime(1984, 11, 2, 18, 5, tzinfo=UTC), 301.9)]
+    batch = sync.batch_sync_intervals(charts, [3, 6, 8], START, end, min_score=0.5)
+
+    for (birth, moon), got in zip(charts, batch):
+        want = sync.sync_intervals([3, 6, 8], birth, moon, START, end, min_score=0.5)
+        assert [iv.to_dict() for iv in got] == [iv.to_dict() for iv in want]
+        assert all(iv.sync_score >= 0.5 for iv in got)
+
+    best = sync.get_best_transit_times(6, BIRTH, 123.4, days_ahead=5, start=START, limit=4)
+    assert len(best) == 4
+    assert [iv.sync_score for iv in best] == sorted((iv.sync_score for iv in best), reverse=True)
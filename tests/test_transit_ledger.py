@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+import asyncio
+import json
+
+from datetime import UTC, datetime, timedelta
+
+import pytest
+
+from refactor import transit_ledger
+from refactor.swe_backend import get_planets_batch
+from refactor.transit_event_detector import TransitEventDetector
+from refactor.transit_ledger import DedupIndex, EventLedger, RedisDedupStore
+
+NOW = datetime.now(UTC).replace(microsecond=0)
+
+
+def _positions(ts: datetime) -> dict[int, dict]:
+    return {
+        pid: {"longitude": p["longitude"], "speed": p["speed_lon"], "sign": int(p["longitude"] // 30) + 1}
+        for pid, p in get_planets_batch(ts).items()
+    }
+
+
+def test_dedup_index_expires_oldest_first_and_stays_bounded():
+    index = DedupIndex(ttl=timedelta(hours=1), max_entries=3)
+    index.record("a", NOW - timedelta(hours=2), 70)
+    index.record("b", NOW - timedelta(minutes=90), 70)
+    index.record("c", NOW - timedelta(minutes=5), 70)
+    index.record("a", NOW, 80)  # re-fire moves "a" to the back
+
+    assert index.prune(NOW) == 1  # only "b"
+    assert [k for k, _ in index.items()] == ["c", "a"]
+    assert index.get("a") == (NOW, 80)
+
+    for n in range(5):
+        index.record(f"k{n}", NOW, 60)
+    assert len(index) == 3 and index.get("c") is None
+
+
+def test_dedup_index_prunes_by_fire_time_not_insertion_order():
+    index = DedupIndex(ttl=timedelta(hours=1))
+    index.record("recent", NOW, 70)  # a request for "now" arrives first
+    for n in range(100):
+        index.record(f"old{n}", NOW - timedelta(hours=3, minutes=n), 70)
+
+    assert index.prune(NOW) == 100
+    assert [k for k, _ in index.items()] == ["recent"]
+
+
+def test_ledger_batches_appends_and_compacts(tmp_path, monkeypatch):
+    monkeypatch.setattr(transit_ledger, "LEDGER_COMPACT_MIN_LINES", 0)
+    path = tmp_path / "events.jsonl"
+    index = DedupIndex()
+    ledger = EventLedger(path, flush_interval=60.0, compact_ratio=1000)
+    ledger.load(index)
+
+    for n in range(50):
+        key = f"k{n % 5}"
+        index.record(key, NOW + timedelta(seconds=n), n)
+        ledger.append(key, NOW + timedelta(seconds=n), n)
+    assert ledger.flush(timeout=5.0)
+    assert len(path.read_text().splitlines()) == 50
+
+    reloaded = DedupIndex()
+    EventLedger(path).load(reloaded)
+    assert reloaded.get("k4") == (NOW + timedelta(seconds=49), 49)
+    assert len(reloaded) == 5
+
+    ledger.compact()
+    lines = [json.loads(line) for line in path.read_text().splitlines()]
+    assert sorted(r["k"] for r in lines) == [f"k{n}" for n in range(5)]
+    ledger.close()
+
+
+def test_ledger_migrates_legacy_json(tmp_path):
+    legacy = {
+        "fired_events": {"old": (NOW - timedelta(days=3)).isoformat(), "fresh": NOW.isoformat()},
+        "event_scores": {"old": 61, "fresh": 77},
+    }
+    (tmp_path / "transit_events.json").write_text(json.dumps(legacy, indent=2))
+
+    index = DedupIndex()
+    EventLedger(tmp_path / "transit_events.jsonl").load(index)
+    assert index.get("fresh") == (NOW, 77) and index.get("old") is None
+    assert json.loads((tmp_path / "transit_events.jsonl").read_text())["k"] == "fresh"
+
+
+def test_detector_dedup_survives_restart(tmp_path):
+    ts = datetime.now(UTC).replace(second=0, microsecond=0)
+    path = tmp_path / "ledger.jsonl"
+    first = TransitEventDetector(ledger_path=path, fire_threshold=0)
+    events = first.detect_events(ts, _positions(ts))
+    assert events
+    assert first.detect_events(ts, _positions(ts)) == []  # within cooldown
+    assert first.ledger.flush()
+
+    second = TransitEventDetector(ledger_path=path, fire_threshold=0)
+    assert second.detect_events(ts, _positions(ts)) == []
+    assert {e.id for e in events} <= {k for k, _ in second.dedup.items()}
+
+
+class _Store:
+    def __init__(self, allow: bool):
+        self.allow = allow
+        self.calls = []
+
+    async def claim_many(self, claims, cooldown, up_threshold):
+        self.calls.append([key for key, _ in claims])
+        return [self.allow] * len(claims)
+
+
+def test_shared_store_gates_fires_in_one_batch(tmp_path):
+    ts = datetime(2025, 3, 12, 14, 30, tzinfo=UTC)
+    denied = _Store(allow=False)
+    detector = TransitEventDetector(
+        ledger_path=tmp_path / "a.jsonl", fire_threshold=0, shared_store=denied
+    )
+    assert asyncio.run(detector.detect_events_async(ts, _positions(ts))) == []
+    assert len(denied.calls) == 1 and denied.calls[0]
+    assert len(detector.dedup) == 0  # denied fires are not recorded locally
+
+    allowed = _Store(allow=True)
+    detector = TransitEventDetector(
+        ledger_path=tmp_path / "b.jsonl", fire_threshold=0, shared_store=allowed
+    )
+    events = asyncio.run(detector.detect_events_async(ts, _positions(ts)))
+    assert len(allowed.calls) == 1
+    assert sorted(e.id for e in events) == sorted(allowed.calls[0])
+
+
+def test_redis_store_batches_claims_and_fails_open():
+    calls = []
+
+    class Client:
+        def __init__(self, fail: bool):
+            self.fail = fail
+
+        def register_script(self, script):
+            async def run(keys, args):
+                calls.append((keys, args))
+                if self.fail:
+                    raise ConnectionError("redis down")
+                return [1, 0]
+
+            return run
+
+    claims = [("a", 70), ("b", 80)]
+    store = RedisDedupStore(Client(fail=False))
+    assert asyncio.run(store.claim_many(claims, timedelta(minutes=10), 75)) == [True, False]
+    assert calls == [(["transit:dedup:a", "transit:dedup:b"], [600_000, 75, 70, 80])]
+
+    store = RedisDedupStore(Client(fail=True))
+    assert asyncio.run(store.claim_many(claims, timedelta(minutes=10), 75)) == [True, True]
+
+
+@pytest.mark.parametrize("shared", ["false", "true"])
+def test_redis_store_from_env(monkeypatch, shared):
+    monkeypatch.setattr(transit_ledger, "TRANSIT_DEDUP_SHARED", shared == "true")
+    store = RedisDedupStore.from_env()
+    assert (store is not None) == (shared == "true")
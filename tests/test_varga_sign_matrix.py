@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from refactor import varga
+from refactor.varga_piecewise import register_piecewise_schemes
+
+DIVISORS = [1, 2, 3, 4, 7, 9, 10, 12, 16, 20, 24, 27, 30, 40, 45, 60]
+
+register_piecewise_schemes()
+varga.make_custom_offsets_scheme({i: (5 * i) % 12 for i in range(12)}, "test_offsets_5i")
+varga.register_scheme("test_python_only", lambda lon, divisor: int(lon) % 12)
+
+
+def _longitudes() -> np.ndarray:
+    rng = np.random.default_rng(7)
+    # Random values plus exact segment edges of every divisor in use
+    edges = np.unique(np.concatenate([np.arange(0.0, 360.0, 30.0 / d) for d in DIVISORS]))
+    return np.concatenate([rng.uniform(-400.0, 760.0, 400), edges])
+
+
+@pytest.mark.parametrize("scheme", varga.list_schemes())
+def test_matrix_matches_scalar_varga_sign(scheme):
+    lons = _longitudes()
+    matrix = varga.varga_sign_matrix(lons, DIVISORS, scheme)
+    assert matrix.shape == (lons.size, len(DIVISORS))
+
+    for j, divisor in enumerate(DIVISORS):
+        expected = [varga.varga_sign(float(lon), divisor, scheme) for lon in lons]
+        assert matrix[:, j].tolist() == expected
+
+
+def test_matrix_keeps_planet_by_time_shape_and_mixed_schemes():
+    lons = np.random.default_rng(3).uniform(0.0, 360.0, (9, 50))
+    schemes = ["linear", "hora_classical", "navamsa_classical", "test_offsets_5i"]
+    matrix = varga.varga_sign_matrix(lons, [1, 2, 9, 16], schemes)
+    assert matrix.shape == (9, 50, 4)
+    assert matrix[4, 17, 2] == varga.varga_sign(lons[4, 17], 9, "navamsa_classical")
+    assert matrix[8, 3, 3] == varga.varga_sign(lons[8, 3], 16, "test_offsets_5i")
+    assert varga.varga_sign_batch(lons[0], 2, "hora_classical") == matrix[0, :, 1].tolist()
+
+    with pytest.raises(KeyError):
+        varga.varga_sign_matrix(lons, [9], "no_such_scheme")
+    with pytest.raises(ValueError):
+        varga.varga_sign_matrix(lons, [301], "linear")
+
+
+def test_vargottama_and_strength_are_matrix_reductions():
+    longitudes = {pid: float(lon) for pid, lon in zip(range(1, 10), _longitudes()[::45])}
+    check = [9, 10, 12, 30]
+    flags = varga.detect_vargottama(longitudes, check)
+
+    for pid, lon in longitudes.items():
+        d1 = varga.varga_sign(lon, 1)
+        for divisor, scheme in zip(check, varga._vargottama_schemes(check)):
+            assert flags[pid][f"D{divisor}"] == (varga.varga_sign(lon, divisor, scheme) == d1)
+
+    weights = {9: 5.0, 10: 3.0, 12: 2.0, 30: 1.0}
+    strengths = varga.get_varga_strength(longitudes, check, weights)
+    for pid in longitudes:
+        expected = sum(weights[d] for d in check if flags[pid][f"D{d}"]) / 11.0 * 100.0
+        assert strengths[pid] == pytest.approx(expected)
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Pre-populate on-disk caches at image build time so workers boot warm.
+
+Runs every @njit(cache=True) kernel once with the argument types production
+uses (writing Numba's cache to $NUMBA_CACHE_DIR), builds the Placidus
+ARMC/latitude grid (refactor.house_grid) and the normalized atlas index.
+Containers run read-only, so anything not built here is rebuilt in memory
+by every worker on every boot.
+
+Usage:
+  PYTHONPATH=./src:. NUMBA_CACHE_DIR=.numba_cache python tools/prebuild_caches.py
+"""
+
+from __future__ import annotations
+
+import sys
+import time
+
+from collections.abc import Callable
+from datetime import UTC, datetime
+
+
+def _numba_kernels() -> None:
+    from refactor import moon_factors, varga, varga_piecewise
+    from refactor.kp_horary import HoraryConfig, compute_horary
+    from refactor.transit_resonance import get_resonance_kernel
+
+    for scheme in varga.list_schemes():
+        for divisor in (2, 3, 7, 9, 10, 12, 16, 20, 24, 27, 30, 40, 45, 60):
+            try:
+                varga.varga_sign(123.45, divisor, scheme)
+            except ValueError:
+                continue  # scheme bound to other divisors
+    varga.detect_vargottama({1: 10.0, 2: 200.0}, [9])
+    varga_piecewise.calculate_trimsamsa(17.5)
+    varga_piecewise.calculate_hora(17.5)
+    varga_piecewise.calculate_saptamsa(17.5)
+
+    now = datetime.now(UTC)
+    moon_factors.get_moon_factors(now)
+    moon_factors.get_panchanga(now)
+    get_resonance_kernel().calculate_kernel(10.0, 130.0, 13.0, 1.0)
+    for mode in ("unix_mod", "daily_mod"):
+        compute_horary(1_700_000_000, HoraryConfig(mode=mode), moon_chain_planets=("MO", "MO", "MO"))
+
+
+def _house_grid() -> None:
+    from refactor import house_grid
+
+    path = house_grid.grid_path()
+    if not path.exists():
+        house_grid.build_grid(path)
+    # Compile the interpolation kernels against the real table
+    house_grid.placidus_cusps_at(2460747.5, 40.7128, -74.0060)
+    house_grid.placidus_cusps(2460747.5, [40.7128, -33.87], [-74.0060, 151.21])
+
+
+def _atlas() -> None:
+    from app.services import atlas_service
+
+    atlas_service.build_outputs()
+
+
+STEPS: list[tuple[str, Callable[[], None]]] = [
+    ("numba", _numba_kernels),
+    ("house_grid", _house_grid),
+    ("atlas", _atlas),
+]
+
+
+def main() -> int:
+    failed = 0
+    for name, step in STEPS:
+        start = time.perf_counter()
+        try:
+            step()
+            print(f"prebuild {name}: {time.perf_counter() - start:.2f}s")
+        except Exception as e:
+            failed += 1
+            print(f"prebuild {name} FAILED: {e}", file=sys.stderr)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())